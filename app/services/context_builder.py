@@ -117,23 +117,27 @@ def build_context(
     # --- Entity summary ---
     entity_count = 0
     try:
-        entities = engine_manager.with_lock("data_manager", lambda d: d.list_entities())
-        entity_count = len(entities)
-
-        if entities:
+        # Per-type counts plus the first five names of each type, read
+        # from the type index rather than materialising every summary.
+        def _summarise(d):
+            return {
+                etype: (count, [
+                    e.get("name") or e["id"]
+                    for e in d.query_entities(entity_type=etype, limit=5, fields=["name"])
+                ])
+                for etype, count in d.entity_type_counts().items()
+            }
+
+        by_type = engine_manager.with_lock("data_manager", _summarise)
+        entity_count = sum(count for count, _ in by_type.values())
+
+        if by_type:
             lines = []
-            # Group by type
-            by_type: dict[str, list[str]] = {}
-            for e in entities:
-                etype = e.get("entity_type", "unknown")
-                name = e.get("name", e.get("id", "?"))
-                by_type.setdefault(etype, []).append(name)
-
-            for etype, names in sorted(by_type.items()):
-                display = etype.replace("_", " ").title()
-                name_list = ", ".join(names[:5])
-                if len(names) > 5:
-                    name_list += f" (+{len(names) - 5} more)"
+            for etype, (count, names) in sorted(by_type.items(), key=lambda kv: str(kv[0])):
+                display = str(etype or "unknown").replace("_", " ").title()
+                name_list = ", ".join(names)
+                if count > 5:
+                    name_list += f" (+{count - 5} more)"
                 lines.append(f"  {display}: {name_list}")
 
             summary = f"Existing entities ({entity_count}):\n" + "\n".join(lines)
@@ -61,6 +61,24 @@ class _StartupWorker(QThread):
                 all_entities = {}
 
             self.entities_loaded = len(all_entities)
+            try:
+                timings = self._engine.with_lock(
+                    "data_manager", lambda d: dict(d.last_load_timings)
+                )
+                if timings:
+                    logger.info(
+                        "Loaded %d entities from %d files in %.3fs "
+                        "(walk %.3fs, read/parse %.3fs on %d %s workers)",
+                        timings.get("entities", 0),
+                        timings.get("files", 0),
+                        timings.get("total_s", 0.0),
+                        timings.get("walk_s", 0.0),
+                        timings.get("load_s", 0.0),
+                        timings.get("workers", 0),
+                        timings.get("codec", "json"),
+                    )
+            except Exception:
+                logger.debug("Load timings unavailable", exc_info=True)
 
             # 1. Create backup (using pre-loaded data)
             self.status.emit("Creating backup...")
@@ -76,12 +94,14 @@ class _StartupWorker(QThread):
             except Exception:
                 logger.debug("Backup manager unavailable", exc_info=True)
 
-            # 2. Sync SQLite (using pre-loaded data)
+            # 2. Sync SQLite: reconciled against the storage stamps, so
+            #    only entities changed since the last sync are read (and a
+            #    failed load above cannot empty the mirror)
             self.status.emit("Syncing database...")
             try:
                 self._engine.with_lock(
                     "sqlite_sync",
-                    lambda s: s.full_sync(entities=all_entities),
+                    lambda s: s.full_sync(),
                 )
                 logger.info("SQLite sync complete")
             except Exception:
@@ -220,9 +240,35 @@ class SessionManager(QObject):
         # Start auto-save timer (must happen on main thread)
         self._auto_save_timer.start()
 
+        # Watch for entity files written outside the app (e.g. by the
+        # Claude Code hooks) so engine caches stay coherent
+        try:
+            self._engine.start_entity_watcher(self._on_external_entity_changes)
+        except Exception:
+            logger.debug("Entity watcher unavailable", exc_info=True)
+
+        # Checkpoint the WAL and merge search index segments while idle
+        try:
+            self._engine.start_sqlite_maintenance()
+        except Exception:
+            logger.debug("SQLite maintenance unavailable", exc_info=True)
+
         self._bus.status_message.emit("Session started")
         self.session_started.emit()
 
+    def _on_external_entity_changes(self, changes: Any) -> None:
+        """Announce entity changes found by the watcher on the EventBus.
+
+        Runs on the watcher thread after the engine caches have been
+        updated; Qt queues the signals to the main thread.
+        """
+        for entity_id in changes.added:
+            self._bus.entity_created.emit(entity_id)
+        for entity_id in changes.modified:
+            self._bus.entity_updated.emit(entity_id)
+        for entity_id in changes.removed:
+            self._bus.entity_deleted.emit(entity_id)
+
     def _detect_crash(self) -> None:
         """Check for signs of an incomplete prior session."""
         # Check if state has in-progress steps with no session
@@ -440,8 +486,16 @@ class SessionManager(QObject):
     # ------------------------------------------------------------------
 
     def end_session(self) -> None:
-        """Clean shutdown: stop timer, save, end bookkeeper session."""
+        """Clean shutdown: stop background work, save, end bookkeeper session."""
         self._auto_save_timer.stop()
+        try:
+            self._engine.stop_entity_watcher()
+        except Exception:
+            logger.debug("Entity watcher stop failed", exc_info=True)
+        try:
+            self._engine.stop_sqlite_maintenance()
+        except Exception:
+            logger.debug("SQLite maintenance stop failed", exc_info=True)
 
         # Final save
         self._store.save()
@@ -28,6 +28,7 @@ from typing import Any
 
 from PySide6.QtCore import QObject, QTimer, Signal
 
+from engine.entity_summary import EntitySummary, summaries_from_state
 from engine.utils import safe_read_json, safe_write_json
 
 logger = logging.getLogger(__name__)
@@ -167,7 +168,7 @@ class StateStore(QObject):
         """Add or update an entity in the index."""
         with self._lock:
             index = self._state.setdefault("entity_index", {})
-            index[entity_id] = meta
+            index[entity_id] = EntitySummary.from_dict(entity_id, meta)
             self._dirty = True
         self.entity_index_changed.emit()
 
@@ -223,6 +224,7 @@ class StateStore(QObject):
         state = safe_read_json(self._state_path, default=default)
         if not isinstance(state, dict):
             return default
+        state["entity_index"] = summaries_from_state(state.get("entity_index", {}))
         return state
 
     def _auto_save(self) -> None:
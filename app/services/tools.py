@@ -20,6 +20,8 @@ import json
 import logging
 from typing import Any
 
+from engine.utils import batch as write_batch
+
 logger = logging.getLogger(__name__)
 
 
@@ -258,7 +260,10 @@ def execute_tool(
         executor = _EXECUTORS.get(tool_name)
         if executor is None:
             return json.dumps({"error": f"Unknown tool: {tool_name}"})
-        result = executor(tool_input, engine_manager, current_step)
+        # One group commit per tool call: every file and log line the
+        # tool writes is fsynced together before the result is returned.
+        with write_batch():
+            result = executor(tool_input, engine_manager, current_step)
         return json.dumps(result, indent=2, default=str)
     except Exception as e:
         logger.exception("Tool execution failed: %s", tool_name)
@@ -40,6 +40,8 @@ import zipfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import STORAGE_FILES, close_storage, get_storage, migrate_storage
 from engine.utils import safe_read_json as _safe_read_json
 
 
@@ -71,6 +73,10 @@ class BackupManager:
         self.user_world_dir = self.root / "user-world"
         self.state_path = self.user_world_dir / "state.json"
         self.backups_dir = self.root / "backups"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # Ensure the backups directory exists
         os.makedirs(str(self.backups_dir), exist_ok=True)
@@ -99,6 +105,10 @@ class BackupManager:
             Non-entity files (state.json, worksheets, etc.) are still
             read from disk as usual.
 
+        With SQLite entity storage the backup still holds one JSON file
+        per entity: documents are exported from the database into the
+        archive, and the database itself is not copied.
+
         Returns
         -------
         dict
@@ -131,6 +141,10 @@ class BackupManager:
 
         # Collect files to back up
         files_to_backup = self._collect_backup_files()
+        stored_ids: dict[str, str] = {}
+        if self.storage.name != "json":
+            stored_ids = {rel: eid for eid, rel in self.storage.entity_paths().items()}
+            files_to_backup = sorted(set(files_to_backup) | set(stored_ids))
 
         # Build a lookup of rel_path -> entity_data for pre-loaded entities
         # so we can write from memory instead of re-reading from disk.
@@ -192,6 +206,10 @@ class BackupManager:
                             ensure_ascii=False,
                         )
                         zf.writestr(rel_path, content)
+                    elif norm_rel in stored_ids:
+                        doc = self.storage.read(self.root / norm_rel)
+                        if doc is not None:
+                            zf.writestr(rel_path, json.dumps(doc, indent=2, ensure_ascii=False))
                     else:
                         abs_path = self.root / rel_path
                         zf.write(str(abs_path), rel_path)
@@ -228,7 +246,8 @@ class BackupManager:
         files that should be included in a backup.
 
         Walks the ``user-world/`` directory and includes everything it finds.
-        Does NOT include runtime/, bookkeeping/, or reference-databases/.
+        Does NOT include runtime/, bookkeeping/, or reference-databases/,
+        nor the SQLite entity store (see :meth:`create_backup`).
         """
         files: list[str] = []
         uw = self.user_world_dir
@@ -240,6 +259,8 @@ class BackupManager:
             for fname in filenames:
                 abs_path = dirpath / fname
                 rel_path = str(abs_path.relative_to(self.root)).replace("\\", "/")
+                if rel_path in STORAGE_FILES:
+                    continue
                 files.append(rel_path)
 
         files.sort()
@@ -457,6 +478,8 @@ class BackupManager:
             ) from exc
 
         # 3. Extraction succeeded -- now swap: remove current and move extracted
+        backend = self.storage.name
+        close_storage(self.root)
         if self.user_world_dir.exists():
             shutil.rmtree(str(self.user_world_dir))
 
@@ -469,6 +492,11 @@ class BackupManager:
         if os.path.exists(tmp_extract_dir):
             shutil.rmtree(tmp_extract_dir, ignore_errors=True)
 
+        # Backups hold a JSON tree; load it back into SQLite storage
+        if backend != "json":
+            migrate_storage(str(self.root), backend, remove_source=True)
+        self.storage = get_storage(self.root)
+
         return {
             "restored": True,
             "pre_restore_backup": pre_restore_meta["path"],
@@ -540,10 +568,9 @@ class BackupManager:
         # Create safety backup
         pre_restore_meta = self.create_backup(label="pre_restore")
 
-        # Write the entity file to its correct location using atomic write
-        from engine.utils import safe_write_json
+        # Write the entity to its correct location through the storage
         target_path = self.root / entity_member
-        safe_write_json(str(target_path), entity_data)
+        self.storage.write(target_path, entity_id, entity_data)
 
         return {
             "restored": True,
@@ -832,24 +859,10 @@ class BackupManager:
 
         Returns a dict mapping entity_id -> entity_data.
         """
-        entities: dict[str, dict] = {}
         entities_dir = self.user_world_dir / "entities"
-        if not entities_dir.exists():
-            return entities
-
-        for dirpath_str, _dirnames, filenames in os.walk(str(entities_dir)):
-            for fname in filenames:
-                if not fname.endswith(".json"):
-                    continue
-                fpath = os.path.join(dirpath_str, fname)
-                data = _safe_read_json(fpath)
-                if data is None:
-                    continue
-                eid = data.get("_meta", {}).get("id", "") or data.get("id", "")
-                if eid:
-                    entities[eid] = data
-
-        return entities
+        if self.storage.name == "json" and not entities_dir.exists():
+            return {}
+        return self.storage.load_all()
 
     @staticmethod
     def _compute_field_diffs(old_data: dict, new_data: dict) -> list[dict]:
@@ -25,6 +25,8 @@ import glob
 from datetime import datetime, timezone
 from pathlib import Path
 
+from engine.utils import safe_append_jsonl as _safe_append_jsonl
+from engine.utils import safe_read_json as _safe_read_json
 from engine.utils import safe_write_json as _safe_write_json
 
 
@@ -134,15 +136,15 @@ class BookkeepingManager:
 
     def _read_json(self, path):
         """Read and return a JSON file. Returns ``None`` on failure."""
-        try:
-            with open(path, "r", encoding="utf-8") as fh:
-                return json.load(fh)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return None
+        return _safe_read_json(str(path))
 
     def _write_json(self, path, data):
-        """Write *data* as pretty-printed JSON to *path* using atomic write."""
-        _safe_write_json(str(path), data)
+        """Write *data* as compact JSON to *path* using atomic write.
+
+        Everything written here is a derived index under
+        ``bookkeeping/indexes/``, so it skips pretty-printing.
+        """
+        _safe_write_json(str(path), data, indent=None)
 
     def log_event(self, event_type, data):
         """Append an event to the JSONL log and in-memory session list.
@@ -176,10 +178,7 @@ class BookkeepingManager:
             "event_type": event_type,
             "data": data,
         }
-        log_path = self._event_log_path()
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as fh:
-            fh.write(json.dumps(event, ensure_ascii=False) + "\n")
+        _safe_append_jsonl(str(self._event_log_path()), event, fsync=False)
 
         # Track events within the current session for summary generation
         self._session_events.append(event)
@@ -31,10 +31,16 @@ import time
 from collections import Counter
 from pathlib import Path
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import get_storage
 from engine.models.factory import ModelFactory as _ModelFactory
 from engine.utils import safe_read_json as _safe_read_json
 from engine.utils import extract_referenced_ids as _extract_referenced_ids_util
 
+# When claim candidates come from SQLite (see set_sqlite_sync), how many
+# bm25-ranked candidates to re-score per similar claim requested
+_SQL_CANDIDATES_PER_RESULT = 4
+
 
 def _tokenize(text: str) -> list[str]:
     """Split text into lowercase tokens for keyword matching.
@@ -92,6 +98,10 @@ class ConsistencyChecker:
         self.state_path = self.root / "user-world" / "state.json"
         self.templates_dir = self.root / "templates"
         self.registry_path = self.root / "engine" / "template_registry.json"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # Load template registry for quick template lookups
         self._registry: dict = self._load_registry()
@@ -101,10 +111,46 @@ class ConsistencyChecker:
         self._entity_cache: dict[str, dict] | None = None
         self._entity_cache_time: float = 0.0
         self._entity_cache_ttl: float = 30.0  # seconds
+        # {entity_id: sha1} of the on-disk versions held in the cache
+        self._journal_digests: dict[str, str] = {}
         # Inverted index: token -> set of (entity_id, claim_index) pairs
         self._claim_inverted_index: dict[str, set[tuple[str, int]]] | None = None
         # Lazy-loaded Pydantic model factory
         self._model_factory: _ModelFactory | None = None
+        # Optional SQLite mirror for claim candidate generation
+        self._sqlite_sync = None      # engine.sqlite_sync.SQLiteSyncEngine
+        self._sqlite_synced_at: float | None = None
+
+    def set_sqlite_sync(self, sync) -> None:
+        """Attach a SQLiteSyncEngine for FTS5-backed claim similarity.
+
+        When set, :meth:`find_similar_claims` takes its candidate claims
+        from the SQLite ``claim_search`` index (bm25-ranked) instead of
+        building an in-memory inverted index over every entity, and only
+        re-scores the top candidates in Python.  The mirror is
+        reconciled with the entity storage before first use and then at
+        most once per ``_entity_cache_ttl``, like the entity cache.
+
+        Parameters
+        ----------
+        sync : engine.sqlite_sync.SQLiteSyncEngine
+            An initialised SQLiteSyncEngine instance.
+        """
+        self._sqlite_sync = sync
+        self._sqlite_synced_at = None
+
+    def _refresh_sqlite_mirror(self) -> None:
+        """Reconcile the attached mirror if the cache TTL has passed.
+
+        Single-entity writes do not reach the mirror, so it is brought
+        up to date by storage stamps (reading only changed entities)
+        before its claims are trusted.
+        """
+        now = time.monotonic()
+        if (self._sqlite_synced_at is None
+                or now - self._sqlite_synced_at > self._entity_cache_ttl):
+            self._sqlite_sync.full_sync()
+            self._sqlite_synced_at = now
 
     def _get_model_factory(self) -> _ModelFactory:
         """Return the shared Pydantic ModelFactory (lazy-loaded)."""
@@ -163,33 +209,27 @@ class ConsistencyChecker:
 
         Returns a dict keyed by entity ID. Results are cached after
         the first call; call ``_invalidate_entity_cache()`` to force
-        a reload.  Cache auto-expires after ``_entity_cache_ttl`` seconds
-        to prevent stale reads during long-running sessions.
+        a reload.  After ``_entity_cache_ttl`` seconds the cache is
+        reconciled with the entity storage: only entities whose
+        documents changed are re-read, and cached entities with no
+        file (e.g. unsaved drafts passed to :meth:`check_entity`) are
+        dropped.
         """
-        # Auto-expire stale cache
-        if (
-            self._entity_cache is not None
-            and (time.monotonic() - self._entity_cache_time) > self._entity_cache_ttl
-        ):
-            self._entity_cache = None
-            self._claim_inverted_index = None
-
         if self._entity_cache is not None:
+            if (time.monotonic() - self._entity_cache_time) > self._entity_cache_ttl:
+                self._entity_cache_time = time.monotonic()
+                self.apply_changes(self.storage.changes_since(self._journal_digests))
+                stale = [eid for eid in self._entity_cache
+                         if eid not in self._journal_digests]
+                if stale:
+                    self.remove_cached_entities(stale)
             return self._entity_cache
 
         entities: dict[str, dict] = {}
-        if not self.entities_dir.exists():
-            self._entity_cache = entities
-            return entities
-
-        for json_path in self.entities_dir.rglob("*.json"):
-            data = _safe_read_json(str(json_path))
-            if not data:
-                continue
-            meta = data.get("_meta", {})
-            entity_id = meta.get("id") or data.get("id")
-            if entity_id:
-                entities[entity_id] = data
+        self._journal_digests = {}
+        if self.storage.name != "json" or self.entities_dir.exists():
+            entities = self.storage.load_all()
+            self._journal_digests = self.storage.entity_digests()
 
         self._entity_cache = entities
         self._entity_cache_time = time.monotonic()
@@ -231,6 +271,87 @@ class ConsistencyChecker:
         # Incrementally update the inverted index for this entity
         self._update_inverted_index_for_entity(entity_id, entity_data)
 
+    def update_cached_entities(self, entities: dict[str, dict]) -> None:
+        """Batch form of :meth:`update_cached_entity`.
+
+        Updates the entity cache and makes a single pass over the claim
+        inverted index for the whole batch.
+
+        Parameters
+        ----------
+        entities : dict[str, dict]
+            ``{entity_id: entity_data}`` full entity documents.
+        """
+        cache = self._load_all_entities()
+        cache.update(entities)
+        self._entity_cache_time = time.monotonic()
+
+        if self._claim_inverted_index is None or not entities:
+            return
+        index = self._claim_inverted_index
+        batch_ids = set(entities)
+        tokens_to_clean: list[str] = []
+        for token, pairs in index.items():
+            to_remove = {p for p in pairs if p[0] in batch_ids}
+            if to_remove:
+                pairs -= to_remove
+                if not pairs:
+                    tokens_to_clean.append(token)
+        for token in tokens_to_clean:
+            del index[token]
+        for entity_id, entity_data in entities.items():
+            for claim_idx, claim_obj in enumerate(entity_data.get("canon_claims", [])):
+                if isinstance(claim_obj, dict):
+                    text = claim_obj.get("claim", "")
+                elif isinstance(claim_obj, str):
+                    text = claim_obj
+                else:
+                    continue
+                for token in _tokenize(text):
+                    index.setdefault(token, set()).add((entity_id, claim_idx))
+
+    def remove_cached_entities(self, entity_ids) -> None:
+        """Drop entities from the cache and the claim inverted index.
+
+        Parameters
+        ----------
+        entity_ids : iterable of str
+            IDs of deleted entities.
+        """
+        ids = set(entity_ids)
+        if self._entity_cache is None or not ids:
+            return
+        for entity_id in ids:
+            self._entity_cache.pop(entity_id, None)
+        if self._claim_inverted_index is None:
+            return
+        index = self._claim_inverted_index
+        tokens_to_clean: list[str] = []
+        for token, pairs in index.items():
+            to_remove = {p for p in pairs if p[0] in ids}
+            if to_remove:
+                pairs -= to_remove
+                if not pairs:
+                    tokens_to_clean.append(token)
+        for token in tokens_to_clean:
+            del index[token]
+
+    def apply_changes(self, changes) -> None:
+        """Apply an :class:`~engine.entity_journal.ChangeSet` to the cache.
+
+        A no-op until the cache has been loaded (the first load reads
+        the current state anyway).
+        """
+        if self._entity_cache is None or not changes:
+            return
+        for entity_id in changes.removed:
+            self._journal_digests.pop(entity_id, None)
+        self._journal_digests.update(changes.digests)
+        self.remove_cached_entities(changes.removed)
+        upserts = changes.upserts()
+        if upserts:
+            self.update_cached_entities(upserts)
+
     def _get_all_canon_claims(self) -> list[dict]:
         """Collect all canon_claims from every existing entity.
 
@@ -763,6 +884,11 @@ class ConsistencyChecker:
         claims using Jaccard similarity. Returns the *top_n* most similar
         existing claims across all new claims.
 
+        Candidates are the claims sharing at least one token with the new
+        claims.  With a SQLite mirror attached (:meth:`set_sqlite_sync`)
+        only the best bm25-ranked candidates are fetched and scored;
+        otherwise they come from the in-memory inverted index.
+
         Parameters
         ----------
         claims : list
@@ -792,7 +918,8 @@ class ConsistencyChecker:
 
         # Tokenize all new claims
         new_tokens_per_claim = [_tokenize(text) for text in new_claim_texts]
-        # Also build a combined token set for broad matching
+        # Also build a combined token set for broad matching (stop words
+        # are already gone, so the SQLite OR query only has content words)
         all_new_tokens: set[str] = set()
         for tokens in new_tokens_per_claim:
             all_new_tokens.update(tokens)
@@ -800,19 +927,79 @@ class ConsistencyChecker:
         if not all_new_tokens:
             return []
 
-        # Use the inverted index to find only candidate claims that share
-        # at least one token with the new claims (avoids O(n*m) brute force).
+        candidates = None
+        if self._sqlite_sync is not None:
+            try:
+                self._refresh_sqlite_mirror()
+                candidates = self._sqlite_sync.similar_claims(
+                    all_new_tokens,
+                    exclude_entity_id=entity_id or None,
+                    limit=top_n * _SQL_CANDIDATES_PER_RESULT,
+                )
+            except Exception:
+                candidates = None  # fall back to the in-memory index
+        if candidates is None:
+            candidates = self._candidate_claims(all_new_tokens, entity_id)
+
+        # Score only the candidate claims
+        scored: list[tuple[float, dict, list[str]]] = []
+        for existing_info in candidates:
+            existing_tokens = _tokenize(existing_info["claim"])
+            if not existing_tokens:
+                continue
+
+            # Find the best similarity against any individual new claim
+            best_score = 0.0
+            best_matching: list[str] = []
+            for new_tokens in new_tokens_per_claim:
+                score = _keyword_similarity(new_tokens, existing_tokens)
+                if score > best_score:
+                    best_score = score
+                    best_matching = sorted(set(new_tokens) & set(existing_tokens))
+
+            # Also check against the combined token set (catches partial overlaps)
+            combined_score = _keyword_similarity(list(all_new_tokens), existing_tokens)
+            if combined_score > best_score:
+                best_score = combined_score
+                best_matching = sorted(all_new_tokens & set(existing_tokens))
+
+            if best_score > 0.05:  # Minimum threshold to be considered "similar"
+                scored.append((best_score, existing_info, best_matching))
+
+        # Sort by score descending and take top_n
+        scored.sort(key=lambda x: x[0], reverse=True)
+        results = []
+        for score, existing, matching in scored[:top_n]:
+            results.append({
+                "entity_id": existing["entity_id"],
+                "entity_name": existing["entity_name"],
+                "claim": existing["claim"],
+                "similarity_score": round(score, 3),
+                "matching_keywords": matching,
+            })
+
+        return results
+
+    def _candidate_claims(
+        self, tokens: set[str], entity_id: str | None = None
+    ) -> list[dict]:
+        """Return the existing claims sharing any of *tokens*.
+
+        Uses the inverted index to find only candidate claims (avoids
+        O(n*m) brute force).  Claims of *entity_id* are skipped.  Each
+        dict has ``entity_id``, ``entity_name``, ``claim`` and
+        ``references``.
+        """
         inverted_index = self._build_inverted_index()
         candidate_keys: set[tuple[str, int]] = set()
-        for token in all_new_tokens:
+        for token in tokens:
             if token in inverted_index:
                 candidate_keys.update(inverted_index[token])
 
         # Load entities for resolving candidate claims
         entities = self._load_all_entities()
 
-        # Score only the candidate claims
-        scored: list[tuple[float, dict, list[str]]] = []
+        candidates = []
         for cand_entity_id, claim_idx in candidate_keys:
             # Skip claims from the same entity
             if entity_id and cand_entity_id == entity_id:
@@ -839,48 +1026,13 @@ class ConsistencyChecker:
             if not existing_text:
                 continue
 
-            existing_tokens = _tokenize(existing_text)
-            if not existing_tokens:
-                continue
-
-            existing_info = {
+            candidates.append({
                 "entity_id": cand_entity_id,
                 "entity_name": cand_entity.get("name", cand_entity_id),
                 "claim": existing_text,
                 "references": references,
-            }
-
-            # Find the best similarity against any individual new claim
-            best_score = 0.0
-            best_matching: list[str] = []
-            for new_tokens in new_tokens_per_claim:
-                score = _keyword_similarity(new_tokens, existing_tokens)
-                if score > best_score:
-                    best_score = score
-                    best_matching = sorted(set(new_tokens) & set(existing_tokens))
-
-            # Also check against the combined token set (catches partial overlaps)
-            combined_score = _keyword_similarity(list(all_new_tokens), existing_tokens)
-            if combined_score > best_score:
-                best_score = combined_score
-                best_matching = sorted(all_new_tokens & set(existing_tokens))
-
-            if best_score > 0.05:  # Minimum threshold to be considered "similar"
-                scored.append((best_score, existing_info, best_matching))
-
-        # Sort by score descending and take top_n
-        scored.sort(key=lambda x: x[0], reverse=True)
-        results = []
-        for score, existing, matching in scored[:top_n]:
-            results.append({
-                "entity_id": existing["entity_id"],
-                "entity_name": existing["entity_name"],
-                "claim": existing["claim"],
-                "similarity_score": round(score, 3),
-                "matching_keywords": matching,
             })
-
-        return results
+        return candidates
 
     def _detect_keyword_conflicts(
         self,
@@ -20,19 +20,33 @@ Usage:
     refs = dm.get_cross_references(entity_id)
 """
 
+import contextlib
+import copy
+import hashlib
 import json
 import os
 import re
-import copy
 import secrets
 import threading
+import time
 import unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import get_storage
+from engine.entity_summary import EntitySummary, summaries_from_state, summary_dict
 from engine.models.factory import ModelFactory as _ModelFactory
+from engine.revision_store import RevisionStore
+from engine.utils import JSON_DECODE_ERRORS, get_json_codec, iter_json_files
+from engine.utils import batch as _write_batch
 from engine.utils import extract_referenced_ids as _extract_referenced_ids_util
-
+from engine.utils import json_loads as _json_loads
+from engine.utils import safe_read_json as _safe_read_json
+from engine.utils import safe_write_json as _safe_write_json
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -76,8 +90,66 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-from engine.utils import safe_read_json as _safe_read_json
-from engine.utils import safe_write_json as _safe_write_json
+def _load_entity_file(abs_path: str, rel_path: str):
+    """Read and parse one entity file (runs on a loader thread).
+
+    Returns ``(entity_id, data, rel_path, read_seconds, parse_seconds)``;
+    ``entity_id`` is ``None`` if the file is unreadable, corrupt or has
+    no ID.
+    """
+    t0 = time.perf_counter()
+    try:
+        with open(abs_path, "rb") as fh:
+            raw = fh.read()
+    except OSError:
+        return None, None, rel_path, time.perf_counter() - t0, 0.0
+    t1 = time.perf_counter()
+    try:
+        data = _json_loads(raw)
+    except JSON_DECODE_ERRORS:
+        return None, None, rel_path, t1 - t0, time.perf_counter() - t1
+    t2 = time.perf_counter()
+    if not isinstance(data, dict):
+        return None, None, rel_path, t1 - t0, t2 - t1
+    meta = data.get("_meta", {})
+    entity_id = meta.get("id") if isinstance(meta, dict) else None
+    entity_id = entity_id or data.get("id")
+    if not entity_id:
+        return None, None, rel_path, t1 - t0, t2 - t1
+    # Attach the relative path so downstream consumers can use it
+    if isinstance(meta, dict) and "_meta" in data:
+        meta.setdefault("_rel_path", rel_path)
+    else:
+        data["_rel_path"] = rel_path
+    return entity_id, data, rel_path, t1 - t0, t2 - t1
+
+
+def _resolve_batch_refs(obj, placeholders: dict[str, str]):
+    """Return a copy of *obj* with ``"@key"`` strings replaced by entity IDs.
+
+    Used by :meth:`DataManager.create_entities` so members of one batch
+    can reference each other before their IDs exist.
+    """
+    if isinstance(obj, str):
+        return placeholders.get(obj, obj)
+    if isinstance(obj, dict):
+        return {k: _resolve_batch_refs(v, placeholders) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_resolve_batch_refs(v, placeholders) for v in obj]
+    return obj
+
+
+def _copy_json(obj):
+    """Return a deep copy of a JSON-shaped value (dicts, lists, scalars).
+
+    Several times faster than ``copy.deepcopy`` for parsed JSON because
+    it skips the memo table and only handles the types JSON can produce.
+    """
+    if isinstance(obj, dict):
+        return {k: _copy_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_json(v) for v in obj]
+    return obj
 
 
 # ---------------------------------------------------------------------------
@@ -933,6 +1005,36 @@ def _detect_entity_type_key(template_id: str) -> str | None:
     return None
 
 
+def _prose_fields(entity_doc: dict) -> dict:
+    """Return the fields prose builders read (no internal/meta fields)."""
+    return {
+        k: v for k, v in entity_doc.items()
+        if not k.startswith("_") and k not in ("id", "canon_claims")
+    }
+
+
+def _prose_digest(clean: dict) -> str:
+    """Return a stable hash of the prose-relevant fields."""
+    raw = json.dumps(clean, sort_keys=True, separators=(",", ":"),
+                     ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _generate_prose_job(job: tuple[str, str, dict]) -> tuple[str, str]:
+    """Worker-pool task: ``(entity_id, template_id, clean) -> (entity_id, prose)``."""
+    entity_id, template_id, clean = job
+    return entity_id, DataManager._build_prose_for_type(clean, template_id)
+
+
+def _sort_value(value):
+    """Sort key that keeps mixed-type index values comparable."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    if isinstance(value, str):
+        return (1, 0, value.lower())
+    return (2, 0, str(value))
+
+
 def _validate_prose_against_data(prose: str, data: dict) -> list[str]:
     """Check whether user-written prose contradicts structured fields.
 
@@ -981,6 +1083,14 @@ class DataManager:
         # slug derivation.  Add more as templates are discovered.
     }
 
+    # Default bounds for the entity document cache.  Whichever limit is
+    # reached first triggers LRU eviction.  Tune via configure_doc_cache().
+    DOC_CACHE_MAX_ENTRIES = 512
+    DOC_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+    # Maximum number of generated prose paragraphs kept in memory.
+    PROSE_CACHE_MAX_ENTRIES = 2048
+
     def __init__(self, project_root: str):
         self.root = Path(project_root).resolve()
         self.entities_dir = self.root / "user-world" / "entities"
@@ -988,7 +1098,16 @@ class DataManager:
         self.templates_dir = self.root / "templates"
         self.registry_path = self.root / "engine" / "template_registry.json"
         self.bookkeeping_dir = self.root / "bookkeeping"
+        # Legacy one-file-per-snapshot directory (read-only; new
+        # snapshots go to the content-addressed revision store).
         self.snapshots_dir = self.bookkeeping_dir / "revisions" / "snapshots"
+        self.revision_store = RevisionStore(self.bookkeeping_dir / "revisions")
+        self.runtime_dir = self.root / "runtime"
+        self.path_index_path = self.runtime_dir / "entity_paths.json"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # Load the template registry (maps template_id -> metadata)
         self._registry: dict = self._load_registry()
@@ -1001,9 +1120,53 @@ class DataManager:
         # Lock to protect state read-modify-write cycles
         self._state_lock = threading.RLock()
         # Reverse index: target_id -> [(source_id, field_name), ...]
-        # Built lazily on first cross-reference query, invalidated on
-        # entity create/update/delete.
+        # Loaded lazily on first cross-reference query (from
+        # runtime/reverse_refs.json, re-parsing only files whose
+        # mtime/size changed) and patched incrementally on every write.
         self._reverse_refs: dict[str, list[tuple[str, str]]] | None = None
+        # Forward side of the same index, used to diff an entity's old and
+        # new outbound refs: source_id -> (mtime_ns, size, [(target, field)])
+        self._outbound_refs: dict[str, tuple[int, int, list[tuple[str, str]]]] = {}
+        self._reverse_refs_dirty = False
+        self.reverse_refs_path = self.runtime_dir / "reverse_refs.json"
+        # Per-phase timings of the most recent load_all_entity_data /
+        # iter_entity_data pass (seconds); empty until the first load.
+        self.last_load_timings: dict = {}
+        # Persistent entity_id -> relative file path index
+        # (runtime/entity_paths.json).  Loaded lazily, kept current on
+        # every mutation, and self-healed from a single directory walk
+        # when state.json's entity_index has drifted.
+        self._path_index: dict[str, str] | None = None
+        # mtime_ns of the entities directory and each type folder at the
+        # time of the last walk; if unchanged, a lookup miss is genuine.
+        self._path_index_dirs: dict[str, int] = {}
+        self._path_index_dirty = False
+        # Bounded LRU cache of parsed entity documents:
+        # entity_id -> (abs_path, mtime_ns, size, doc).  Entries are
+        # validated against the file's mtime/size on every hit so writes
+        # made outside this process (hooks) are picked up.
+        self._doc_cache: OrderedDict[str, tuple[str, int, int, dict]] = OrderedDict()
+        self._doc_cache_lock = threading.Lock()
+        self._doc_cache_max_entries = self.DOC_CACHE_MAX_ENTRIES
+        self._doc_cache_max_bytes = self.DOC_CACHE_MAX_BYTES
+        self._doc_cache_bytes = 0
+        self._doc_cache_hits = 0
+        self._doc_cache_misses = 0
+        self._doc_cache_evictions = 0
+        # Generated prose keyed by (template_id, hash of the prose-relevant
+        # fields), so updates that only touch _meta/internal fields skip
+        # the prose builders.  LRU-bounded by PROSE_CACHE_MAX_ENTRIES.
+        self._prose_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._prose_cache_lock = threading.Lock()
+        self._prose_cache_hits = 0
+        self._prose_cache_misses = 0
+        # Secondary indexes over entity_index for query_entities():
+        # field -> value -> {entity_id: None}, plus entity_id -> indexed
+        # values so entries can be moved when they change.  Built lazily
+        # and rebuilt if entity_index is replaced.
+        self._secondary: dict[str, dict] | None = None
+        self._secondary_keys: dict[str, tuple] = {}
+        self._secondary_source: dict | None = None
         # Optional references for scalability optimisations.
         # When set, _save_state() batches writes through StateStore
         # and search_entities() delegates to SQLite FTS5.
@@ -1071,9 +1234,10 @@ class DataManager:
             "session_log": [],
         }
         state = _safe_read_json(str(self.state_path), default=default_state)
-        # Ensure entity_index exists (older state files may lack it)
-        if "entity_index" not in state:
-            state["entity_index"] = {}
+        # Ensure entity_index exists (older state files may lack it) and
+        # hold it as compact EntitySummary records; utils.json_dumps turns
+        # them back into plain entries when state.json is written.
+        state["entity_index"] = summaries_from_state(state.get("entity_index", {}))
         return state
 
     def _save_state(self) -> None:
@@ -1093,6 +1257,7 @@ class DataManager:
             except Exception:
                 pass  # fall through to direct write
         _safe_write_json(str(self.state_path), self._state)
+        self._save_runtime_indexes()
 
     def flush_state(self) -> None:
         """Force an immediate write of state.json.
@@ -1100,6 +1265,7 @@ class DataManager:
         Call this on session end, app shutdown, or other critical
         points where data loss is unacceptable.
         """
+        self._save_runtime_indexes()
         if self._state_store is not None:
             try:
                 self._state_store.save()
@@ -1172,9 +1338,10 @@ class DataManager:
 
     def _entity_folder(self, entity_type: str) -> Path:
         """Return the directory where entities of *entity_type* are stored,
-        creating it if necessary."""
+        creating it if necessary (JSON storage only)."""
         folder = self.entities_dir / entity_type
-        os.makedirs(folder, exist_ok=True)
+        if self.storage.name == "json":
+            os.makedirs(folder, exist_ok=True)
         return folder
 
     def _entity_path_from_index(self, entity_id: str) -> str | None:
@@ -1185,23 +1352,338 @@ class DataManager:
         return None
 
     def _find_entity_file(self, entity_id: str) -> str | None:
-        """Find the JSON file for *entity_id*, searching the index first,
-        then falling back to a filesystem scan."""
-        # Try index
+        """Find the JSON file for *entity_id*.
+
+        Lookup order:
+
+        1. The state.json ``entity_index`` entry.
+        2. The persistent ID -> path index (``runtime/entity_paths.json``).
+        3. A single self-healing walk of the entities directory, only if
+           a folder has changed since the last walk.  Files already known
+           to the path index are not re-parsed.
+        """
+        # Try state index
         path = self._entity_path_from_index(entity_id)
         if path:
-            full = self.root / path if not os.path.isabs(path) else Path(path)
-            if full.exists():
+            full = self._abs_entity_path(path)
+            if self.storage.exists(full):
+                self._record_entity_path(entity_id, path)
                 return str(full)
 
-        # Fallback: walk entities directory
-        for json_path in self.entities_dir.rglob("*.json"):
-            data = _safe_read_json(str(json_path))
-            if data and data.get("_meta", {}).get("id") == entity_id:
-                return str(json_path)
+        # Try the persistent path index
+        index = self._get_path_index()
+        path = index.get(entity_id)
+        if path:
+            full = self._abs_entity_path(path)
+            if self.storage.exists(full):
+                return str(full)
+            self._forget_entity_path(entity_id)
+
+        # SQLite storage knows every document's path; no walk needed
+        if self.storage.name != "json":
+            path = self.storage.path_for(entity_id)
+            if path:
+                self._record_entity_path(entity_id, self.storage.rel_path(path))
+            return path
+
+        # Self-heal: re-walk the tree if anything changed on disk
+        if self._entities_dir_signature() != self._path_index_dirs:
+            self._rebuild_path_index()
+            path = self._path_index.get(entity_id)
+            if path:
+                return str(self._abs_entity_path(path))
 
         return None
 
+    def _abs_entity_path(self, path: str) -> Path:
+        """Resolve a stored (usually root-relative) entity path."""
+        return self.root / path if not os.path.isabs(path) else Path(path)
+
+    # ------------------------------------------------------------------
+    # Persistent ID -> path index (runtime/entity_paths.json)
+    # ------------------------------------------------------------------
+
+    def _get_path_index(self) -> dict[str, str]:
+        """Return the ID -> path index, loading it from disk on first use."""
+        if self._path_index is None:
+            data = _safe_read_json(str(self.path_index_path), default={})
+            if not isinstance(data, dict):
+                data = {}
+            paths = data.get("paths", {})
+            dirs = data.get("dirs", {})
+            self._path_index = paths if isinstance(paths, dict) else {}
+            self._path_index_dirs = dirs if isinstance(dirs, dict) else {}
+        return self._path_index
+
+    def _record_entity_path(self, entity_id: str, rel_path: str) -> None:
+        """Record (or confirm) the file path of *entity_id*."""
+        index = self._get_path_index()
+        if index.get(entity_id) != rel_path:
+            index[entity_id] = rel_path
+            self._path_index_dirty = True
+
+    def _forget_entity_path(self, entity_id: str) -> None:
+        """Drop *entity_id* from the path index (file deleted or moved)."""
+        index = self._get_path_index()
+        if index.pop(entity_id, None) is not None:
+            self._path_index_dirty = True
+
+    def _entities_dir_signature(self) -> dict[str, int]:
+        """Return ``{folder: mtime_ns}`` for the entities dir and its type folders.
+
+        Creating, deleting or renaming a file (including the atomic
+        temp-file replace used by every writer) bumps the mtime of the
+        containing folder, so an unchanged signature means no walk can
+        find anything new.
+        """
+        signature: dict[str, int] = {}
+        try:
+            signature["."] = os.stat(self.entities_dir).st_mtime_ns
+            with os.scandir(self.entities_dir) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        signature[entry.name] = entry.stat().st_mtime_ns
+        except OSError:
+            pass
+        return signature
+
+    def _rebuild_path_index(self) -> dict[str, str]:
+        """Rebuild the path index from a rescan of the entity storage.
+
+        For the JSON backend the shared journal only stats files; just
+        the new or changed ones are read.  The result is persisted
+        immediately.
+        """
+        signature = self._entities_dir_signature()
+        self.storage.scan()
+        rebuilt = self.storage.entity_paths()
+
+        self._path_index = rebuilt
+        self._path_index_dirs = signature
+        self._path_index_dirty = True
+        self._save_path_index()
+        return rebuilt
+
+    def apply_changes(self, changes) -> None:
+        """Apply an :class:`~engine.entity_journal.ChangeSet` from disk.
+
+        Used for entity files written outside this DataManager (e.g. by
+        ``hooks/validate_writes.py``): the path index and the state
+        ``entity_index`` are brought in line with the documents, and
+        removed entities are dropped from both.  The document cache and
+        the reverse cross-reference index follow the same changes.
+
+        With SQLite storage the JSON tree is only an inbox for such
+        external writers: upserted documents are imported into the
+        store and removals are ignored.  *changes* is never modified,
+        since other subscribers share it.
+        """
+        if not changes:
+            return
+        upserts = changes.upserts()
+        removed = changes.removed
+        if self.storage.name != "json":
+            removed = set()
+            for entity_id, doc in upserts.items():
+                rel_path = changes.paths.get(entity_id)
+                if rel_path:
+                    st = self.storage.write(self.root / rel_path, entity_id, doc)
+                    self._drop_cached_doc(entity_id)
+                    self._patch_reverse_refs(entity_id, doc, st)
+        else:
+            for entity_id, doc in upserts.items():
+                self._drop_cached_doc(entity_id)
+                rel_path = changes.paths.get(entity_id)
+                st = self.storage.stat(str(self.root / rel_path)) if rel_path else None
+                self._patch_reverse_refs(entity_id, doc, st)
+        for entity_id in removed:
+            self._drop_cached_doc(entity_id)
+            self._patch_reverse_refs(entity_id, None, None)
+            self._forget_entity_path(entity_id)
+        for entity_id, rel_path in changes.paths.items():
+            self._record_entity_path(entity_id, rel_path)
+        self._save_runtime_indexes()
+
+        with self._state_lock:
+            index = self._state.setdefault("entity_index", {})
+            dirty = False
+            for entity_id in removed:
+                if index.pop(entity_id, None) is not None:
+                    self._reindex_entity(entity_id)
+                    dirty = True
+            for entity_id, doc in upserts.items():
+                meta = doc.get("_meta") if isinstance(doc.get("_meta"), dict) else {}
+                old = index.get(entity_id, {})
+                entry = dict(old)
+                entry.update({
+                    "template_id": meta.get("template_id", entry.get("template_id", "")),
+                    "entity_type": meta.get("entity_type", entry.get("entity_type", "")),
+                    "name": doc.get("name", entry.get("name", entity_id)),
+                    "status": meta.get("status", entry.get("status", "draft")),
+                    "file_path": changes.paths.get(entity_id, entry.get("file_path", "")),
+                    "created_at": meta.get("created_at", entry.get("created_at", "")),
+                    "updated_at": meta.get("updated_at", entry.get("updated_at", "")),
+                })
+                if "step_created" in meta:
+                    entry["step_created"] = meta["step_created"]
+                if entry != old:
+                    index[entity_id] = EntitySummary.from_dict(entity_id, entry)
+                    self._reindex_entity(entity_id)
+                    dirty = True
+            if dirty:
+                self._save_state()
+
+    def _write_entity_file(self, entity_id: str, file_path: str, entity_doc: dict) -> None:
+        """Atomically write an entity document and record its path.
+
+        If the entities tree was unchanged since the last walk before this
+        write, the stored folder signature is advanced past our own write
+        so it does not trigger a needless self-heal walk.
+        """
+        before = self._entities_dir_signature()
+        st = self.storage.write(file_path, entity_id, entity_doc)
+        if st is not None:
+            self._cache_entity_doc(entity_id, file_path, _copy_json(entity_doc), st)
+        try:
+            rel_path = str(Path(file_path).relative_to(self.root)).replace("\\", "/")
+        except ValueError:
+            rel_path = str(file_path)
+        self._record_entity_path(entity_id, rel_path)
+        self._patch_reverse_refs(entity_id, entity_doc, st)
+        if before == self._path_index_dirs:
+            self._path_index_dirs = self._entities_dir_signature()
+
+    # ------------------------------------------------------------------
+    # Entity document cache (bounded LRU, mtime/size validated)
+    # ------------------------------------------------------------------
+
+    def configure_doc_cache(self, max_entries: int | None = None,
+                            max_bytes: int | None = None) -> None:
+        """Change the document cache bounds, evicting entries if needed.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached documents.  ``0`` disables the cache.
+        max_bytes : int, optional
+            Maximum total on-disk size of cached documents.
+        """
+        with self._doc_cache_lock:
+            if max_entries is not None:
+                self._doc_cache_max_entries = max(0, int(max_entries))
+            if max_bytes is not None:
+                self._doc_cache_max_bytes = max(0, int(max_bytes))
+            self._evict_doc_cache()
+
+    def doc_cache_stats(self) -> dict:
+        """Return hit/miss counters and current size of the document cache."""
+        with self._doc_cache_lock:
+            lookups = self._doc_cache_hits + self._doc_cache_misses
+            return {
+                "hits": self._doc_cache_hits,
+                "misses": self._doc_cache_misses,
+                "hit_rate": self._doc_cache_hits / lookups if lookups else 0.0,
+                "evictions": self._doc_cache_evictions,
+                "entries": len(self._doc_cache),
+                "bytes": self._doc_cache_bytes,
+                "max_entries": self._doc_cache_max_entries,
+                "max_bytes": self._doc_cache_max_bytes,
+            }
+
+    def clear_doc_cache(self) -> None:
+        """Drop every cached document (counters are kept)."""
+        with self._doc_cache_lock:
+            self._doc_cache.clear()
+            self._doc_cache_bytes = 0
+
+    def _read_entity_doc(self, entity_id: str, file_path: str,
+                         populate: bool = True) -> dict | None:
+        """Return a private copy of the entity document at *file_path*.
+
+        Served from the cache when the file's mtime and size still match
+        the cached entry; otherwise read from disk.  Bulk scans pass
+        ``populate=False`` so they can use warm entries without flushing
+        the working set out of the LRU.
+        """
+        st = self.storage.stat(file_path)
+        if st is None:
+            self._drop_cached_doc(entity_id)
+            return None
+
+        with self._doc_cache_lock:
+            cached = self._doc_cache.get(entity_id)
+            if (cached is not None and cached[0] == file_path
+                    and cached[1] == st.st_mtime_ns and cached[2] == st.st_size):
+                self._doc_cache.move_to_end(entity_id)
+                self._doc_cache_hits += 1
+                return _copy_json(cached[3])
+            self._doc_cache_misses += 1
+
+        data = self.storage.read(file_path)
+        if data is None:
+            self._drop_cached_doc(entity_id)
+            return None
+        if populate:
+            self._cache_entity_doc(entity_id, file_path, _copy_json(data), st)
+        return data
+
+    def _cache_entity_doc(self, entity_id: str, file_path: str, doc: dict,
+                          st: os.stat_result | None = None) -> None:
+        """Insert *doc* (owned by the cache from now on) for *entity_id*."""
+        if self._doc_cache_max_entries <= 0:
+            return
+        if st is None:
+            st = self.storage.stat(file_path)
+            if st is None:
+                return
+        with self._doc_cache_lock:
+            old = self._doc_cache.pop(entity_id, None)
+            if old is not None:
+                self._doc_cache_bytes -= old[2]
+            self._doc_cache[entity_id] = (file_path, st.st_mtime_ns, st.st_size, doc)
+            self._doc_cache_bytes += st.st_size
+            self._evict_doc_cache()
+
+    def _drop_cached_doc(self, entity_id: str) -> None:
+        """Remove *entity_id* from the document cache, if present."""
+        with self._doc_cache_lock:
+            old = self._doc_cache.pop(entity_id, None)
+            if old is not None:
+                self._doc_cache_bytes -= old[2]
+
+    def _evict_doc_cache(self) -> None:
+        """Evict least-recently-used entries until within bounds.
+
+        Caller must hold ``_doc_cache_lock``.
+        """
+        while self._doc_cache and (
+            len(self._doc_cache) > self._doc_cache_max_entries
+            or self._doc_cache_bytes > self._doc_cache_max_bytes
+        ):
+            _, old = self._doc_cache.popitem(last=False)
+            self._doc_cache_bytes -= old[2]
+            self._doc_cache_evictions += 1
+
+    def _save_runtime_indexes(self) -> None:
+        """Persist the runtime/ indexes kept alongside state.json."""
+        self._save_path_index()
+        self._save_reverse_refs()
+
+    def _save_path_index(self) -> None:
+        """Persist the path index if it has changed since the last save."""
+        if self._path_index is None or not self._path_index_dirty:
+            return
+        try:
+            _safe_write_json(
+                str(self.path_index_path),
+                {"paths": self._path_index, "dirs": self._path_index_dirs},
+                indent=None,
+                fsync=False,
+            )
+            self._path_index_dirty = False
+        except OSError:
+            pass  # the index is a cache; it will self-heal next time
+
     # ------------------------------------------------------------------
     # Prose generation (Lore Sync -- Task 3D)
     # ------------------------------------------------------------------
@@ -1223,11 +1705,40 @@ class DataManager:
             A readable narrative paragraph summarising the entity.
         """
         # Strip internal fields so prose builders only see content
-        clean = {
-            k: v for k, v in entity_data.items()
-            if not k.startswith("_") and k not in ("id", "canon_claims")
-        }
-        return self._build_prose_for_type(clean, template_id)
+        return self._cached_prose(_prose_fields(entity_data), template_id)
+
+    def _cached_prose(self, clean: dict, template_id: str) -> str:
+        """Return prose for *clean* fields, reusing a cached paragraph."""
+        key = (template_id, _prose_digest(clean))
+        with self._prose_cache_lock:
+            prose = self._prose_cache.get(key)
+            if prose is not None:
+                self._prose_cache.move_to_end(key)
+                self._prose_cache_hits += 1
+                return prose
+            self._prose_cache_misses += 1
+        prose = self._build_prose_for_type(clean, template_id)
+        with self._prose_cache_lock:
+            self._prose_cache[key] = prose
+            while len(self._prose_cache) > self.PROSE_CACHE_MAX_ENTRIES:
+                self._prose_cache.popitem(last=False)
+        return prose
+
+    def prose_cache_stats(self) -> dict:
+        """Return hit/miss counters and the size of the prose cache."""
+        with self._prose_cache_lock:
+            lookups = self._prose_cache_hits + self._prose_cache_misses
+            return {
+                "hits": self._prose_cache_hits,
+                "misses": self._prose_cache_misses,
+                "hit_rate": self._prose_cache_hits / lookups if lookups else 0.0,
+                "entries": len(self._prose_cache),
+            }
+
+    def clear_prose_cache(self) -> None:
+        """Drop every cached prose paragraph (e.g. after builders change)."""
+        with self._prose_cache_lock:
+            self._prose_cache.clear()
 
     @staticmethod
     def _build_prose_for_type(data: dict, template_id: str) -> str:
@@ -1260,11 +1771,7 @@ class DataManager:
             return
 
         # Auto-generate prose from structured fields
-        clean = {
-            k: v for k, v in entity_doc.items()
-            if not k.startswith("_") and k not in ("id", "canon_claims")
-        }
-        entity_doc["_prose"] = self._build_prose_for_type(clean, template_id)
+        entity_doc["_prose"] = self._cached_prose(_prose_fields(entity_doc), template_id)
         entity_doc["_prose_custom"] = False
         entity_doc.pop("_prose_warnings", None)
 
@@ -1303,17 +1810,48 @@ class DataManager:
             friendly = self._format_validation_errors(errors, template_id)
             raise ValueError(friendly)
 
-        # Determine entity type and folder
-        entity_type = self._entity_type_for_template(template_id)
-        folder = self._entity_folder(entity_type)
-
         # Generate unique ID
-        name = data.get("name", template_id)
-        entity_id = _generate_id(name)
+        entity_id = self._allocate_entity_id(data.get("name", template_id))
+
+        file_path_abs, entity_doc, index_entry = self._build_new_entity(
+            template_id, schema, entity_id, data, _now_iso(),
+        )
+
+        # Write entity file
+        self._write_entity_file(entity_id, str(file_path_abs), entity_doc)
+
+        # Update state.json entity index (locked to prevent concurrent corruption)
+        with self._state_lock:
+            self._state.setdefault("entity_index", {})[entity_id] = (
+                EntitySummary.from_dict(entity_id, index_entry)
+            )
+            self._reindex_entity(entity_id)
+            self._save_state()
+
+        return entity_id
 
+    def _allocate_entity_id(self, name: str, reserved: set[str] | None = None) -> str:
+        """Generate an entity ID that is not already in use.
+
+        *reserved* holds IDs handed out earlier in the same batch.
+        """
+        entity_id = _generate_id(name)
         # Ensure no collision (extremely unlikely but handle it)
-        while self._entity_path_from_index(entity_id) is not None:
+        while (self._entity_path_from_index(entity_id) is not None
+               or (reserved is not None and entity_id in reserved)):
             entity_id = _generate_id(name)
+        return entity_id
+
+    def _build_new_entity(self, template_id: str, schema: dict, entity_id: str,
+                          data: dict, now: str) -> tuple[Path, dict, dict]:
+        """Assemble the on-disk document and index entry for a new entity.
+
+        *data* must already have passed validation.  Returns
+        ``(absolute_file_path, entity_doc, index_entry)``.
+        """
+        # Determine entity type and folder
+        entity_type = self._entity_type_for_template(template_id)
+        folder = self._entity_folder(entity_type)
 
         # Build relative file path (relative to project root)
         filename = f"{entity_id}.json"
@@ -1321,7 +1859,6 @@ class DataManager:
         file_path_rel = str(file_path_abs.relative_to(self.root)).replace("\\", "/")
 
         # Build _meta section
-        now = _now_iso()
         meta = {
             "id": entity_id,
             "template_id": template_id,
@@ -1348,32 +1885,23 @@ class DataManager:
             entity_doc["_prose_custom"] = data.get("_prose_custom", True)
         self._apply_prose(entity_doc, template_id)
 
-        # Write entity file
-        _safe_write_json(str(file_path_abs), entity_doc)
-
-        # Update state.json entity index (locked to prevent concurrent corruption)
-        with self._state_lock:
-            self._state.setdefault("entity_index", {})[entity_id] = {
-                "template_id": template_id,
-                "entity_type": entity_type,
-                "name": data.get("name", entity_id),
-                "status": "draft",
-                "file_path": file_path_rel,
-                "created_at": now,
-                "updated_at": now,
-            }
-            self._save_state()
-
-        # Invalidate reverse-reference index (will be rebuilt on next query)
-        self._reverse_refs = None
-
-        return entity_id
+        index_entry = {
+            "template_id": template_id,
+            "entity_type": entity_type,
+            "name": data.get("name", entity_id),
+            "status": "draft",
+            "file_path": file_path_rel,
+            "created_at": now,
+            "updated_at": now,
+            "step_created": meta["step_created"],
+        }
+        return file_path_abs, entity_doc, index_entry
 
     def update_entity(self, entity_id: str, data: dict) -> None:
         """Update an existing entity's fields.
 
-        A snapshot of the previous version is saved to
-        ``bookkeeping/revisions/snapshots/`` before the update is written.
+        A snapshot of the previous version is saved to the revision
+        store (``bookkeeping/revisions/``) before the update is written.
 
         Parameters
         ----------
@@ -1391,6 +1919,27 @@ class DataManager:
         ValueError
             If the merged data fails schema validation.
         """
+        file_path, current = self._load_for_update(entity_id)
+
+        # Save revision snapshot
+        self._save_revision_snapshot(entity_id, current)
+
+        now = _now_iso()
+        merged = self._merge_entity_update(current, data, now)
+
+        # Write updated entity
+        self._write_entity_file(entity_id, file_path, merged)
+
+        # Update state index (locked to prevent concurrent corruption)
+        with self._state_lock:
+            self._apply_update_to_index(entity_id, data, now)
+            self._save_state()
+
+    def _load_for_update(self, entity_id: str) -> tuple[str, dict]:
+        """Return ``(file_path, current_doc)`` for an entity about to be updated.
+
+        Raises ``FileNotFoundError`` if the entity is missing or unreadable.
+        """
         file_path = self._find_entity_file(entity_id)
         if not file_path:
             raise FileNotFoundError(
@@ -1399,16 +1948,19 @@ class DataManager:
             )
 
         # Load current entity
-        current = _safe_read_json(file_path)
+        current = self._read_entity_doc(entity_id, file_path)
         if current is None:
             raise FileNotFoundError(
                 f"The file for entity '{entity_id}' exists but could not be read. "
                 f"It may be corrupted."
             )
+        return file_path, current
 
-        # Save revision snapshot
-        self._save_revision_snapshot(entity_id, current)
+    def _merge_entity_update(self, current: dict, data: dict, now: str) -> dict:
+        """Merge *data* into *current* and return the validated new document.
 
+        Raises ``ValueError`` if the merged data fails schema validation.
+        """
         # Determine template schema
         template_id = current.get("_meta", {}).get("template_id", "")
         schema = self._get_template_schema(template_id)
@@ -1426,7 +1978,6 @@ class DataManager:
             raise ValueError(friendly)
 
         # Update metadata
-        now = _now_iso()
         merged["_meta"]["updated_at"] = now
 
         # Re-extract canon claims
@@ -1442,21 +1993,310 @@ class DataManager:
             merged["_prose"] = data["_prose"]
             merged["_prose_custom"] = data.get("_prose_custom", True)
         self._apply_prose(merged, template_id)
+        return merged
 
-        # Write updated entity
-        _safe_write_json(file_path, merged)
+    def _apply_update_to_index(self, entity_id: str, data: dict, now: str) -> None:
+        """Refresh the state index entry after an update.
 
-        # Update state index (locked to prevent concurrent corruption)
-        with self._state_lock:
-            index_entry = self._state.get("entity_index", {}).get(entity_id, {})
-            index_entry["updated_at"] = now
-            if "name" in data:
-                index_entry["name"] = data["name"]
-            self._state.setdefault("entity_index", {})[entity_id] = index_entry
-            self._save_state()
+        Caller must hold ``_state_lock`` and save the state afterwards.
+        """
+        changes = {"updated_at": now}
+        if "name" in data:
+            changes["name"] = data["name"]
+        self._update_index_entry(entity_id, **changes)
+        self._reindex_entity(entity_id)
 
-        # Invalidate reverse-reference index (will be rebuilt on next query)
-        self._reverse_refs = None
+    def _update_index_entry(self, entity_id: str, **changes) -> None:
+        """Replace the index entry of *entity_id* with a copy carrying *changes*.
+
+        Entries are immutable :class:`EntitySummary` records.  Caller
+        must hold ``_state_lock`` (or be single-threaded) and reindex.
+        """
+        index = self._state.setdefault("entity_index", {})
+        entry = index.get(entity_id)
+        if isinstance(entry, EntitySummary):
+            index[entity_id] = entry.replace(**changes)
+        else:
+            index[entity_id] = EntitySummary.from_dict(entity_id, {**(entry or {}), **changes})
+
+    # ------------------------------------------------------------------
+    # Batch create / update
+    # ------------------------------------------------------------------
+
+    def create_entities(self, items: list) -> list[str]:
+        """Create many entities in one batch.
+
+        Everything is validated before anything is written, then all
+        files are written, the state index is updated and saved once,
+        and (if attached) the SQLite mirror is updated in a single
+        transaction.
+
+        Members of the batch may reference each other regardless of
+        order: give an item a ``"key"`` and use the string ``"@<key>"``
+        anywhere in another item's data (including nested objects and
+        lists).  Each placeholder is replaced by the generated entity ID
+        before validation.
+
+        Parameters
+        ----------
+        items : list
+            Each item is either a ``(template_id, data)`` tuple or a dict
+            with ``template_id``, ``data`` and an optional ``key``.
+
+        Returns
+        -------
+        list[str]
+            The new entity IDs, in the same order as *items*.
+
+        Raises
+        ------
+        ValueError
+            If any item is malformed, uses an unknown template, or fails
+            validation.  No files are written in that case.
+        """
+        if not items:
+            return []
+
+        # --- Normalise items and allocate IDs up front ---
+        normalised: list[tuple[str, dict]] = []
+        keys: dict[str, str] = {}
+        reserved: set[str] = set()
+        entity_ids: list[str] = []
+        for position, item in enumerate(items, 1):
+            if isinstance(item, dict):
+                template_id = item.get("template_id", "")
+                data = item.get("data", {})
+                key = item.get("key")
+            else:
+                template_id, data = item
+                key = None
+            if not template_id or not isinstance(data, dict):
+                raise ValueError(
+                    f"Batch item {position} needs a template_id and a data dict."
+                )
+            entity_id = self._allocate_entity_id(data.get("name", template_id), reserved)
+            reserved.add(entity_id)
+            entity_ids.append(entity_id)
+            if key is not None:
+                if key in keys:
+                    raise ValueError(f"Batch key '{key}' is used more than once.")
+                keys[key] = entity_id
+            normalised.append((template_id, data))
+
+        # --- Resolve intra-batch references and validate everything ---
+        placeholders = {f"@{k}": eid for k, eid in keys.items()}
+        prepared: list[tuple[str, dict, dict]] = []
+        problems: list[str] = []
+        for position, (template_id, data) in enumerate(normalised, 1):
+            resolved = _resolve_batch_refs(data, placeholders)
+            try:
+                schema = self._get_template_schema(template_id)
+            except ValueError as exc:
+                problems.append(f"Item {position}: {exc}")
+                continue
+            errors = self._validate_data(resolved, schema, template_id=template_id)
+            if errors:
+                label = resolved.get("name", f"item {position}")
+                problems.append(
+                    f"Item {position} ('{label}'):\n"
+                    + self._format_validation_errors(errors, template_id)
+                )
+                continue
+            prepared.append((template_id, schema, resolved))
+        if problems:
+            raise ValueError(
+                f"{len(problems)} of {len(items)} batch items failed validation; "
+                "nothing was saved.\n\n" + "\n\n".join(problems)
+            )
+
+        # Files and state.json share one group commit (see engine.utils.batch)
+        with _write_batch():
+            # --- Write files (removing any already written on failure) ---
+            now = _now_iso()
+            docs: dict[str, dict] = {}
+            entries: dict[str, dict] = {}
+            written: list[str] = []
+            try:
+                for entity_id, (template_id, schema, data) in zip(entity_ids, prepared, strict=True):
+                    file_path_abs, entity_doc, index_entry = self._build_new_entity(
+                        template_id, schema, entity_id, data, now,
+                    )
+                    self._write_entity_file(entity_id, str(file_path_abs), entity_doc)
+                    written.append(str(file_path_abs))
+                    docs[entity_id] = entity_doc
+                    entries[entity_id] = index_entry
+            except BaseException:
+                for path in written:
+                    self.storage.delete(path)
+                for entity_id in docs:
+                    self._drop_cached_doc(entity_id)
+                    self._forget_entity_path(entity_id)
+                raise
+
+            # --- One state update ---
+            with self._state_lock:
+                self._state.setdefault("entity_index", {}).update(
+                    (eid, EntitySummary.from_dict(eid, entry)) for eid, entry in entries.items()
+                )
+                for entity_id in entries:
+                    self._reindex_entity(entity_id)
+                self._save_state()
+
+        self._sync_batch_to_sqlite(docs)
+        return entity_ids
+
+    def update_entities(self, updates: dict[str, dict]) -> list[str]:
+        """Update many entities in one batch.
+
+        All merges are validated before anything is written.  Revision
+        snapshots are then saved, every file is written, and the state
+        index is updated and saved once.  The SQLite mirror (if attached)
+        is updated in a single transaction.
+
+        Parameters
+        ----------
+        updates : dict[str, dict]
+            ``{entity_id: fields_to_merge}``.
+
+        Returns
+        -------
+        list[str]
+            The updated entity IDs.
+
+        Raises
+        ------
+        FileNotFoundError
+            If any entity does not exist.  Nothing is written.
+        ValueError
+            If any merged entity fails validation.  Nothing is written.
+        """
+        if not updates:
+            return []
+
+        now = _now_iso()
+        prepared: list[tuple[str, str, dict, dict]] = []
+        problems: list[str] = []
+        for entity_id, data in updates.items():
+            file_path, current = self._load_for_update(entity_id)
+            snapshot = _copy_json(current)
+            try:
+                merged = self._merge_entity_update(current, data, now)
+            except ValueError as exc:
+                problems.append(f"Entity '{entity_id}':\n{exc}")
+                continue
+            prepared.append((entity_id, file_path, snapshot, merged))
+        if problems:
+            raise ValueError(
+                f"{len(problems)} of {len(updates)} batch updates failed validation; "
+                "nothing was saved.\n\n" + "\n\n".join(problems)
+            )
+
+        # Snapshots, files and state.json share one group commit
+        with _write_batch():
+            docs: dict[str, dict] = {}
+            for entity_id, file_path, snapshot, merged in prepared:
+                self._save_revision_snapshot(entity_id, snapshot)
+                self._write_entity_file(entity_id, file_path, merged)
+                docs[entity_id] = merged
+
+            with self._state_lock:
+                for entity_id, data in updates.items():
+                    self._apply_update_to_index(entity_id, data, now)
+                self._save_state()
+
+        self._sync_batch_to_sqlite(docs)
+        return list(docs)
+
+    def _sync_batch_to_sqlite(self, docs: dict[str, dict]) -> None:
+        """Mirror a batch into the attached SQLite engine in one transaction."""
+        if self._sqlite_sync is None or not docs:
+            return
+        # The mirror is rebuildable; full_sync will catch up
+        with contextlib.suppress(Exception):
+            self._sqlite_sync.sync_entities(docs)
+
+    def regenerate_all_prose(self, workers: int | None = None,
+                             processes: bool = False) -> dict:
+        """Regenerate auto-generated ``_prose`` for every entity on disk.
+
+        Run this after the prose builders change.  The prose cache is
+        cleared, entities are loaded with the parallel loader, and the
+        builders run on a worker pool.  Only entities whose prose actually
+        changed are rewritten (in one group commit), and the SQLite mirror
+        is updated in one transaction.  Entities with custom prose are
+        left alone, and ``updated_at`` is not touched.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Pool size for loading and prose generation.
+        processes : bool, optional
+            Use a process pool instead of threads.  Prose builders are
+            pure Python, so processes scale across cores on large worlds
+            at the cost of start-up time (default ``False``).
+
+        Returns
+        -------
+        dict
+            ``{"scanned", "regenerated", "unchanged", "custom",
+            "updated_ids", "elapsed_s"}``.
+        """
+        t0 = time.perf_counter()
+        self.clear_prose_cache()
+
+        docs: dict[str, dict] = {}
+        paths: dict[str, str] = {}
+        jobs: list[tuple[str, str, dict]] = []
+        custom = 0
+        for entity_id, doc in self.iter_entity_data(workers=workers):
+            # Drop the loader's _rel_path annotation before rewriting
+            meta = doc.get("_meta")
+            if isinstance(meta, dict):
+                rel_path = meta.pop("_rel_path", None)
+            else:
+                rel_path = doc.pop("_rel_path", None)
+            if doc.get("_prose_custom") is True and doc.get("_prose"):
+                custom += 1
+                continue
+            template_id = meta.get("template_id", "") if isinstance(meta, dict) else ""
+            docs[entity_id] = doc
+            paths[entity_id] = str(self._abs_entity_path(rel_path))
+            jobs.append((entity_id, template_id, _prose_fields(doc)))
+
+        pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        max_workers = max(1, min(workers or (os.cpu_count() or 1), len(jobs) or 1))
+        with pool_cls(max_workers=max_workers) as pool:
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            results = list(pool.map(_generate_prose_job, jobs, chunksize=chunksize))
+
+        changed: dict[str, dict] = {}
+        with _write_batch():
+            for entity_id, prose in results:
+                doc = docs[entity_id]
+                if doc.get("_prose") == prose and doc.get("_prose_custom") is False:
+                    continue
+                doc["_prose"] = prose
+                doc["_prose_custom"] = False
+                doc.pop("_prose_warnings", None)
+                self._write_entity_file(entity_id, paths[entity_id], doc)
+                changed[entity_id] = doc
+
+        # Warm the cache with the fresh paragraphs
+        with self._prose_cache_lock:
+            for (_, template_id, clean), (_, prose) in zip(jobs, results, strict=True):
+                if len(self._prose_cache) >= self.PROSE_CACHE_MAX_ENTRIES:
+                    break
+                self._prose_cache[(template_id, _prose_digest(clean))] = prose
+
+        self._sync_batch_to_sqlite(changed)
+        return {
+            "scanned": len(docs) + custom,
+            "regenerated": len(changed),
+            "unchanged": len(docs) - len(changed),
+            "custom": custom,
+            "updated_ids": list(changed),
+            "elapsed_s": time.perf_counter() - t0,
+        }
 
     def get_entity(self, entity_id: str) -> dict:
         """Load and return a single entity by ID.
@@ -1482,7 +2322,7 @@ class DataManager:
                 f"Could not find entity '{entity_id}'. "
                 f"It may have been deleted or the ID may be incorrect."
             )
-        data = _safe_read_json(file_path)
+        data = self._read_entity_doc(entity_id, file_path)
         if data is None:
             raise FileNotFoundError(
                 f"The file for entity '{entity_id}' exists but could not be read."
@@ -1503,17 +2343,182 @@ class DataManager:
         list[dict]
             A list of entity summary dicts from the state index, each
             containing: id, template_id, entity_type, name, status,
-            file_path, created_at, updated_at.
+            file_path, created_at, updated_at (and step_created for
+            entities created since it was indexed).
+
+        See Also
+        --------
+        query_entities : filtered, sorted, paginated lazy variant.
+        """
+        return list(self.query_entities(entity_type=entity_type or None))
+
+    def query_entities(self, entity_type=None, status=None, step=None,
+                       sort=None, limit: int | None = None, offset: int = 0,
+                       fields=None):
+        """Lazily iterate entity summaries matching the given filters.
+
+        Filtering uses per-type, per-status and per-step secondary
+        indexes, so only the entities in the smallest matching bucket
+        are visited -- browsing one type never touches the rest of the
+        world.
+
+        Parameters
+        ----------
+        entity_type, status, step : optional
+            Each filter takes one value or an iterable of values
+            (matching any of them).  ``step`` matches ``step_created``.
+        sort : str or list[str], optional
+            Index field(s) to sort by, e.g. ``"name"`` or
+            ``["entity_type", "-updated_at"]`` (``-`` for descending).
+            ``"id"`` sorts by the entity ID.  Missing values sort last.  Without *sort*, entities are
+            yielded in index (creation) order.
+        limit : int, optional
+            Maximum number of summaries to yield.
+        offset : int, optional
+            Number of matching summaries to skip first (default 0).
+        fields : list[str], optional
+            Project each summary to these index fields (``id`` is always
+            included).  Defaults to every index field.
+
+        Yields
+        ------
+        dict
+            Summary dicts shaped like :meth:`list_entities` entries.
         """
         index = self._state.get("entity_index", {})
-        results = []
-        for eid, meta in index.items():
-            if entity_type and meta.get("entity_type") != entity_type:
+        ids = self._matching_entity_ids(entity_type, status, step)
+
+        if sort:
+            keys = [sort] if isinstance(sort, str) else list(sort)
+            ids = list(ids)
+            # Stable multi-key sort: apply the least significant key first
+            for key in reversed(keys):
+                descending = key.startswith("-")
+                name = key.lstrip("-")
+                if name == "id":
+                    # The ID is the index key, not a field of the entry
+                    ids.sort(key=_sort_value, reverse=descending)
+                    continue
+                present = [i for i in ids if index.get(i, {}).get(name) is not None]
+                missing = [i for i in ids if index.get(i, {}).get(name) is None]
+                present.sort(key=lambda i: _sort_value(index[i][name]),
+                             reverse=descending)
+                ids = present + missing
+
+        stop = None if limit is None else offset + max(0, limit)
+        for eid in islice(ids, offset, stop):
+            meta = index.get(eid)
+            if meta is None:
+                continue  # removed while iterating
+            if fields is None:
+                yield summary_dict(eid, meta)
+            else:
+                entry = {f: meta.get(f) for f in fields if f != "id"}
+                entry["id"] = eid
+                yield entry
+
+    def count_entities(self, entity_type=None, status=None, step=None) -> int:
+        """Return how many entities match the filters of :meth:`query_entities`."""
+        if entity_type is None and status is None and step is None:
+            return self.entity_count
+        return sum(1 for _ in self._matching_entity_ids(entity_type, status, step))
+
+    def entity_type_counts(self) -> dict[str, int]:
+        """Return ``{entity_type: count}`` straight from the type index.
+
+        Entities without a type are counted under ``"unknown"``.
+        """
+        counts: dict[str, int] = {}
+        for etype, ids in self._get_secondary_indexes()["entity_type"].items():
+            if ids:
+                key = "unknown" if etype is None else etype
+                counts[key] = counts.get(key, 0) + len(ids)
+        return counts
+
+    # ------------------------------------------------------------------
+    # Secondary indexes over entity_index (type / status / step)
+    # ------------------------------------------------------------------
+
+    # Index field -> secondary index name.  Buckets are dicts used as
+    # insertion-ordered sets.
+    _SECONDARY_FIELDS = ("entity_type", "status", "step_created")
+
+    def _matching_entity_ids(self, entity_type, status, step):
+        """Return an iterable of IDs matching every given filter."""
+        secondary = self._get_secondary_indexes()
+        filters = []
+        for field, wanted in (("entity_type", entity_type), ("status", status),
+                              ("step_created", step)):
+            if wanted is None:
                 continue
-            entry = dict(meta)
-            entry["id"] = eid
-            results.append(entry)
-        return results
+            values = [wanted] if isinstance(wanted, (str, int)) else list(wanted)
+            buckets = [secondary[field].get(v, {}) for v in values]
+            if len(buckets) == 1:
+                filters.append(buckets[0])
+            else:
+                merged: dict[str, None] = {}
+                for bucket in buckets:
+                    merged.update(bucket)
+                filters.append(merged)
+
+        if not filters:
+            return list(self._state.get("entity_index", {}))
+        filters.sort(key=len)
+        smallest, rest = filters[0], filters[1:]
+        return [eid for eid in list(smallest) if all(eid in f for f in rest)]
+
+    def _get_secondary_indexes(self) -> dict[str, dict]:
+        """Return the secondary indexes, building them if needed.
+
+        They are rebuilt whenever ``entity_index`` has been replaced
+        (e.g. by :meth:`reload_state`); in-place changes are applied
+        incrementally through :meth:`_reindex_entity`.
+        """
+        index = self._state.get("entity_index", {})
+        if self._secondary is None or self._secondary_source is not index:
+            secondary = {field: {} for field in self._SECONDARY_FIELDS}
+            keys: dict[str, tuple] = {}
+            for eid, meta in index.items():
+                values = tuple(meta.get(f) for f in self._SECONDARY_FIELDS)
+                for field, value in zip(self._SECONDARY_FIELDS, values, strict=True):
+                    secondary[field].setdefault(value, {})[eid] = None
+                keys[eid] = values
+            self._secondary = secondary
+            self._secondary_keys = keys
+            self._secondary_source = index
+        return self._secondary
+
+    def _backfill_index_step(self, entity_id: str, doc: dict) -> None:
+        """Copy ``_meta.step_created`` into an index entry that predates it."""
+        entry = self._state.get("entity_index", {}).get(entity_id)
+        if entry is None or "step_created" in entry:
+            return
+        meta = doc.get("_meta")
+        if isinstance(meta, dict) and "step_created" in meta:
+            self._update_index_entry(entity_id, step_created=meta["step_created"])
+            self._reindex_entity(entity_id)
+
+    def _reindex_entity(self, entity_id: str) -> None:
+        """Move *entity_id* to the right buckets after its index entry changed."""
+        if self._secondary is None:
+            return  # built lazily on first query
+        index = self._state.get("entity_index", {})
+        if self._secondary_source is not index:
+            self._secondary = None
+            return
+        old = self._secondary_keys.pop(entity_id, None)
+        if old is not None:
+            for field, value in zip(self._SECONDARY_FIELDS, old, strict=True):
+                bucket = self._secondary[field].get(value)
+                if bucket is not None:
+                    bucket.pop(entity_id, None)
+        meta = index.get(entity_id)
+        if meta is None:
+            return
+        values = tuple(meta.get(f) for f in self._SECONDARY_FIELDS)
+        for field, value in zip(self._SECONDARY_FIELDS, values, strict=True):
+            self._secondary[field].setdefault(value, {})[entity_id] = None
+        self._secondary_keys[entity_id] = values
 
     @property
     def entity_count(self) -> int:
@@ -1543,38 +2548,121 @@ class DataManager:
         }
 
     def _build_reverse_refs(self) -> dict[str, list[tuple[str, str]]]:
-        """Build a reverse index mapping target_id -> [(source_id, field_name), ...].
+        """Return the reverse index mapping target_id -> [(source_id, field_name), ...].
 
-        Scans all entities once and caches the result.  Invalidated by
-        create_entity / update_entity so the next query rebuilds it.
+        On first use the persisted index (``runtime/reverse_refs.json``)
+        is loaded and validated entity-by-entity against each file's
+        mtime and size; only new or changed files are re-parsed.  After
+        that the index is patched in place by every write (see
+        :meth:`_patch_reverse_refs`), so it is never rebuilt wholesale.
         """
         if self._reverse_refs is not None:
             return self._reverse_refs
 
-        reverse: dict[str, list[tuple[str, str]]] = {}
-        index = self._state.get("entity_index", {})
+        persisted = _safe_read_json(str(self.reverse_refs_path), default={})
+        entries = persisted.get("entries", {}) if isinstance(persisted, dict) else {}
+        if not isinstance(entries, dict):
+            entries = {}
 
-        for eid, meta in index.items():
+        outbound: dict[str, tuple[int, int, list[tuple[str, str]]]] = {}
+        changed = False
+        entity_ids = set(self._state.get("entity_index", {})) | set(self._get_path_index())
+
+        for eid in entity_ids:
             file_path = self._find_entity_file(eid)
             if not file_path:
                 continue
-            entity_data = _safe_read_json(file_path)
-            if not entity_data:
+            st = self.storage.stat(file_path)
+            if st is None:
                 continue
-            template_id = entity_data.get("_meta", {}).get("template_id", "")
-            try:
-                schema = self._get_template_schema(template_id)
-            except (ValueError, TypeError):
+            entry = entries.get(eid)
+            if (isinstance(entry, list) and len(entry) == 3
+                    and entry[0] == st.st_mtime_ns and entry[1] == st.st_size):
+                outbound[eid] = (entry[0], entry[1], [tuple(r) for r in entry[2]])
                 continue
-            if not schema:
+            entity_data = self._read_entity_doc(eid, file_path, populate=False)
+            if not entity_data:
                 continue
-            refs = self._extract_referenced_ids(entity_data, schema)
+            outbound[eid] = (st.st_mtime_ns, st.st_size, self._outbound_refs_for(entity_data))
+            changed = True
+
+        if set(entries) != set(outbound):
+            changed = True
+
+        reverse: dict[str, list[tuple[str, str]]] = {}
+        for eid, (_, _, refs) in outbound.items():
             for ref_id, field_name in refs:
                 reverse.setdefault(ref_id, []).append((eid, field_name))
 
+        self._outbound_refs = outbound
         self._reverse_refs = reverse
+        if changed:
+            self._reverse_refs_dirty = True
+            self._save_reverse_refs()
         return reverse
 
+    def _outbound_refs_for(self, entity_data: dict) -> list[tuple[str, str]]:
+        """Return the ``(target_id, field_name)`` refs declared by *entity_data*."""
+        template_id = entity_data.get("_meta", {}).get("template_id", "")
+        try:
+            schema = self._get_template_schema(template_id)
+        except (ValueError, TypeError):
+            return []
+        if not schema:
+            return []
+        return self._extract_referenced_ids(entity_data, schema)
+
+    def _patch_reverse_refs(self, entity_id: str, entity_doc: dict | None,
+                            st: os.stat_result | None) -> None:
+        """Apply one entity's write to the reverse index.
+
+        Diffs the entity's previous outbound refs against the new ones
+        and touches only the affected target entries.  A no-op until the
+        index has been loaded (it is then validated against mtimes).
+        Without a stat the refs are still recorded, under a stamp no file
+        can match, so the next load re-parses the entity.  ``None`` for
+        *entity_doc* means the entity was removed.
+        """
+        if self._reverse_refs is None:
+            return
+        reverse = self._reverse_refs
+        new_refs = self._outbound_refs_for(entity_doc) if entity_doc is not None else []
+        old = self._outbound_refs.get(entity_id)
+        old_refs = old[2] if old is not None else []
+
+        if old_refs != new_refs:
+            for target in {t for t, _ in old_refs}:
+                pairs = [p for p in reverse.get(target, []) if p[0] != entity_id]
+                if pairs:
+                    reverse[target] = pairs
+                else:
+                    reverse.pop(target, None)
+            for ref_id, field_name in new_refs:
+                reverse.setdefault(ref_id, []).append((entity_id, field_name))
+
+        if entity_doc is None:
+            self._outbound_refs.pop(entity_id, None)
+        elif st is not None:
+            self._outbound_refs[entity_id] = (st.st_mtime_ns, st.st_size, new_refs)
+        else:
+            self._outbound_refs[entity_id] = (-1, -1, new_refs)
+        self._reverse_refs_dirty = True
+
+    def _save_reverse_refs(self) -> None:
+        """Persist the outbound side of the reverse index if it changed."""
+        if self._reverse_refs is None or not self._reverse_refs_dirty:
+            return
+        entries = {
+            eid: [mtime, size, [list(r) for r in refs]]
+            for eid, (mtime, size, refs) in self._outbound_refs.items()
+        }
+        try:
+            _safe_write_json(str(self.reverse_refs_path), {"entries": entries},
+                             indent=None, fsync=False)
+            self._reverse_refs_dirty = False
+        except OSError:
+            pass  # validated against mtimes on load, so a stale file is harmless
+
     def get_cross_references(self, entity_id: str) -> dict:
         """Find all entities that reference *entity_id* and all entities
         that *entity_id* references.
@@ -1673,19 +2761,26 @@ class DataManager:
         errors = self._validate_data(entity, schema, template_id=template_id)
         return errors
 
-    def search_entities(self, query: str) -> list[dict]:
+    def search_entities(self, query: str, limit: int | None = None,
+                        offset: int = 0) -> list[dict]:
         """Search entity names, tags, and descriptions for a keyword.
 
         When a :class:`~engine.sqlite_sync.SQLiteSyncEngine` is attached
         (via :meth:`set_sqlite_sync`), the search is delegated to the
         SQLite FTS5 full-text index for O(1)-style lookups instead of
-        scanning every entity file on disk.  Falls back to the original
-        in-memory scan if SQLite is unavailable.
+        scanning every entity file on disk, and results come back best
+        match first.  Names found on its trigram index (the query as part
+        of a name, or misspelled) follow the whole-word matches.  Falls
+        back to the original in-memory scan if SQLite is unavailable.
 
         Parameters
         ----------
         query : str
             The search term (case-insensitive substring match).
+        limit : int, optional
+            Maximum number of results (default: all).
+        offset : int, optional
+            Number of results to skip, for paging.
 
         Returns
         -------
@@ -1698,7 +2793,7 @@ class DataManager:
         # --- Fast path: delegate to SQLite FTS5 when available ---
         if self._sqlite_sync is not None:
             try:
-                return self._search_via_sqlite(query.strip())
+                return self._search_via_sqlite(query.strip(), limit, offset)
             except Exception:
                 pass  # fall through to file-based scan
 
@@ -1711,41 +2806,50 @@ class DataManager:
             # Check the index-level name first (fast path)
             name = meta.get("name", "")
             if query_lower in name.lower():
-                entry = dict(meta)
-                entry["id"] = eid
-                results.append(entry)
+                results.append(summary_dict(eid, meta))
                 continue
 
             # Load the full entity to search deeper fields
             file_path = self._find_entity_file(eid)
             if not file_path:
                 continue
-            entity = _safe_read_json(file_path)
+            entity = self._read_entity_doc(eid, file_path, populate=False)
             if not entity:
                 continue
 
             if self._entity_matches_query(entity, query_lower):
-                entry = dict(meta)
-                entry["id"] = eid
-                results.append(entry)
+                results.append(summary_dict(eid, meta))
 
-        return results
+        if limit is None:
+            return results[offset:]
+        return results[offset:offset + limit]
 
-    def _search_via_sqlite(self, query: str) -> list[dict]:
+    def _search_via_sqlite(self, query: str, limit: int | None = None,
+                           offset: int = 0) -> list[dict]:
         """Delegate a text search to the SQLite FTS5 index.
 
-        Converts the FTS5 result rows (which contain full entity
-        columns) into the same summary-dict shape returned by
+        Word matches come first, then the fuzzy name matches they do not
+        already include (``"thor"`` finds "Thor", then "Asathor").  The
+        ranked rows (which contain full entity columns) are converted
+        into the same summary-dict shape returned by
         :meth:`list_entities` so callers see a consistent interface.
         """
-        fts_rows = self._sqlite_sync.search(query)
+        # The first offset + limit rows of each list are enough to fill
+        # the requested page of the merged list
+        stop = None if limit is None else offset + limit
+        fts_rows = self._sqlite_sync.search(query, limit=stop)
+        seen = {row.get("id") for row in fts_rows}
+        for row in self._sqlite_sync.fuzzy_find(query, limit=stop):
+            if row.get("id") not in seen:
+                seen.add(row.get("id"))
+                fts_rows.append(row)
+        fts_rows = fts_rows[offset:stop]
         index = self._state.get("entity_index", {})
         results = []
         for row in fts_rows:
             eid = row.get("id", "")
             if eid in index:
-                entry = dict(index[eid])
-                entry["id"] = eid
+                entry = summary_dict(eid, index[eid])
             else:
                 # Entity in SQLite but not yet in state index -- build
                 # a minimal summary from the SQLite row.
@@ -1850,23 +2954,19 @@ class DataManager:
     # Revision snapshots
     # ------------------------------------------------------------------
 
-    def _save_revision_snapshot(self, entity_id: str, entity_data: dict) -> str:
-        """Save a timestamped snapshot of an entity before it is modified.
+    def _save_revision_snapshot(self, entity_id: str, entity_data: dict) -> dict:
+        """Save a snapshot of an entity before it is modified.
 
-        Returns the absolute path to the saved snapshot file.
+        Returns the revision-store version record (``version``,
+        ``timestamp``, ``hash``).
         """
-        os.makedirs(str(self.snapshots_dir), exist_ok=True)
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        filename = f"{entity_id}_{timestamp}.json"
-        snapshot_path = self.snapshots_dir / filename
-        _safe_write_json(str(snapshot_path), entity_data)
-        return str(snapshot_path)
+        return self.revision_store.save(entity_id, entity_data)
 
     # ------------------------------------------------------------------
     # Convenience / state helpers
     # ------------------------------------------------------------------
 
-    def load_all_entity_data(self) -> dict[str, dict]:
+    def load_all_entity_data(self, workers: int | None = None) -> dict[str, dict]:
         """Load every entity JSON file from disk in a single pass.
 
         Returns a dict mapping ``entity_id`` to the full entity document.
@@ -1874,32 +2974,152 @@ class DataManager:
         scans during startup (backup, SQLite sync, graph build all share
         the same pre-loaded data).
 
+        Files are read and parsed on a thread pool (see
+        :meth:`iter_entity_data`).  Per-phase timings of the last load
+        are available from :attr:`last_load_timings`.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Thread-pool size.  Defaults to the stdlib executor default.
+
         Returns
         -------
         dict[str, dict]
             ``{entity_id: entity_data}`` for every valid entity on disk.
         """
-        result: dict[str, dict] = {}
+        return dict(self.iter_entity_data(workers=workers))
+
+    def iter_entity_data(self, workers: int | None = None):
+        """Stream ``(entity_id, entity_data)`` pairs for every entity on disk.
+
+        The entities tree is walked once with ``os.scandir``; files are
+        then read and parsed on a thread pool using the fastest JSON
+        codec available (orjson, then msgspec, then stdlib ``json``).
+        At most a few batches per worker are in flight, so consumers can
+        start work before the whole world is in memory.
+
+        Each document gets ``_meta._rel_path`` (or a top-level
+        ``_rel_path`` when ``_meta`` is missing).  When the iterator is
+        exhausted, the path index is refreshed and
+        :attr:`last_load_timings` is updated with ``walk_s``,
+        ``read_s`` / ``parse_s`` (summed across workers), ``load_s``
+        (wall time of the read/parse phase), ``total_s``, ``files``,
+        ``entities``, ``workers`` and ``codec``.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Thread-pool size.  Defaults to the stdlib executor default.
+
+        Yields
+        ------
+        tuple[str, dict]
+        """
+        t_start = time.perf_counter()
+        if self.storage.name != "json":
+            yield from self._iter_stored_entity_data(t_start)
+            return
         if not self.entities_dir.exists():
-            return result
+            self.last_load_timings = {"total_s": 0.0, "files": 0, "entities": 0}
+            return
 
-        for json_path in self.entities_dir.rglob("*.json"):
-            data = _safe_read_json(str(json_path))
-            if data is None:
-                continue
-            meta = data.get("_meta", {})
-            entity_id = meta.get("id") or data.get("id")
-            if not entity_id:
-                continue
-            # Attach the relative path so downstream consumers can use it
-            rel_path = str(json_path.relative_to(self.root)).replace("\\", "/")
-            if "_meta" in data:
-                data["_meta"].setdefault("_rel_path", rel_path)
+        # --- Phase 1: directory walk ---
+        signature = self._entities_dir_signature()
+        prefix = str(self.entities_dir.relative_to(self.root)).replace("\\", "/")
+        files = [(abs_path, rel_path) for abs_path, rel_path, _ in
+                 iter_json_files(str(self.entities_dir), prefix)]
+        t_walked = time.perf_counter()
+
+        # --- Phase 2: parallel read + parse ---
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) + 4)
+        workers = max(1, min(workers, len(files) or 1))
+        read_s = 0.0
+        parse_s = 0.0
+        paths: dict[str, str] = {}
+        count = 0
+
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="entity-load") as pool:
+            pending: deque = deque()
+            window = workers * 4
+            file_iter = iter(files)
+            for abs_path, rel_path in file_iter:
+                pending.append(pool.submit(_load_entity_file, abs_path, rel_path))
+                if len(pending) >= window:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                nxt = next(file_iter, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_load_entity_file, *nxt))
+                entity_id, data, rel_path, t_read, t_parse = result
+                read_s += t_read
+                parse_s += t_parse
+                if entity_id is None:
+                    continue
+                paths[entity_id] = rel_path
+                count += 1
+                self._backfill_index_step(entity_id, data)
+                yield entity_id, data
+
+        t_end = time.perf_counter()
+
+        # A full walk is a free path-index refresh
+        self._path_index = paths
+        self._path_index_dirs = signature
+        self._path_index_dirty = True
+        self._save_path_index()
+
+        self.last_load_timings = {
+            "walk_s": t_walked - t_start,
+            "read_s": read_s,
+            "parse_s": parse_s,
+            "load_s": t_end - t_walked,
+            "total_s": time.perf_counter() - t_start,
+            "files": len(files),
+            "entities": count,
+            "workers": workers,
+            "codec": get_json_codec(),
+        }
+
+    def _iter_stored_entity_data(self, t_start: float):
+        """SQLite-storage variant of :meth:`iter_entity_data`.
+
+        One query returns every document; there is no walk, and
+        ``read_s`` covers fetching and decoding the rows.
+        """
+        paths = self.storage.entity_paths()
+        count = 0
+        for entity_id, data in self.storage.iter_documents():
+            rel_path = paths.get(entity_id, "")
+            meta = data.get("_meta")
+            if isinstance(meta, dict):
+                meta.setdefault("_rel_path", rel_path)
             else:
                 data["_rel_path"] = rel_path
-            result[entity_id] = data
-
-        return result
+            count += 1
+            self._backfill_index_step(entity_id, data)
+            yield entity_id, data
+        t_end = time.perf_counter()
+
+        self._path_index = paths
+        self._path_index_dirty = True
+        self._save_path_index()
+
+        self.last_load_timings = {
+            "walk_s": 0.0,
+            "read_s": t_end - t_start,
+            "parse_s": 0.0,
+            "load_s": t_end - t_start,
+            "total_s": time.perf_counter() - t_start,
+            "files": len(paths),
+            "entities": count,
+            "workers": 1,
+            "codec": get_json_codec(),
+            "storage": self.storage.name,
+        }
 
     def reload_state(self) -> None:
         """Re-read state.json from disk.  Useful after external changes."""
@@ -1930,11 +3150,11 @@ class DataManager:
         entity["_meta"]["updated_at"] = _now_iso()
 
         file_path = self._find_entity_file(entity_id)
-        _safe_write_json(file_path, entity)
+        self._write_entity_file(entity_id, file_path, entity)
 
         # Update state index
-        index_entry = self._state.get("entity_index", {}).get(entity_id, {})
-        index_entry["status"] = status
-        index_entry["updated_at"] = entity["_meta"]["updated_at"]
-        self._state["entity_index"][entity_id] = index_entry
+        self._update_index_entry(
+            entity_id, status=status, updated_at=entity["_meta"]["updated_at"],
+        )
+        self._reindex_entity(entity_id)
         self._save_state()
@@ -59,6 +59,15 @@ class EngineManager:
         # Lazy-loaded module instances
         self._modules = {}
 
+        # Optional live watcher for external entity writes
+        self._watcher = None
+        self._change_listeners = []
+        # Storage backend name, read once on the first change delivery
+        self._storage_backend = None
+
+        # Optional idle-time SQLite maintenance
+        self._maintenance = None
+
     # ------------------------------------------------------------------
     # Singleton access
     # ------------------------------------------------------------------
@@ -187,12 +196,250 @@ class EngineManager:
             module = self._get_module(module_name)
             return fn(module)
 
+    # ------------------------------------------------------------------
+    # Batch entity writes
+    # ------------------------------------------------------------------
+
+    def create_entities(self, items):
+        """Create a batch of entities and propagate it once to every cache.
+
+        Wraps :meth:`DataManager.create_entities` (one validation pass,
+        one state save) and then pushes the whole batch to the SQLite
+        mirror in one transaction, to the knowledge graph, and to the
+        consistency checker's entity cache -- each a single call.  Only
+        modules that have already been loaded are updated.
+
+        Parameters
+        ----------
+        items : list
+            See :meth:`DataManager.create_entities`.
+
+        Returns
+        -------
+        list[str]
+            The new entity IDs in input order.
+        """
+        with self.get_lock("data_manager"):
+            dm = self.data_manager
+            entity_ids = dm.create_entities(items)
+            docs = {eid: dm.get_entity(eid) for eid in entity_ids}
+        self._propagate_entity_batch(docs)
+        return entity_ids
+
+    def update_entities(self, updates):
+        """Update a batch of entities and propagate it once to every cache.
+
+        See :meth:`create_entities` and :meth:`DataManager.update_entities`.
+
+        Returns
+        -------
+        list[str]
+            The updated entity IDs.
+        """
+        with self.get_lock("data_manager"):
+            dm = self.data_manager
+            entity_ids = dm.update_entities(updates)
+            docs = {eid: dm.get_entity(eid) for eid in entity_ids}
+        self._propagate_entity_batch(docs)
+        return entity_ids
+
+    def regenerate_all_prose(self, workers=None, processes=False):
+        """Regenerate prose world-wide and propagate the rewritten entities.
+
+        See :meth:`DataManager.regenerate_all_prose`.
+
+        Returns
+        -------
+        dict
+            The DataManager job summary.
+        """
+        with self.get_lock("data_manager"):
+            dm = self.data_manager
+            result = dm.regenerate_all_prose(workers=workers, processes=processes)
+            docs = {eid: dm.get_entity(eid) for eid in result["updated_ids"]}
+        self._propagate_entity_batch(docs)
+        return result
+
+    def _propagate_entity_batch(self, docs):
+        """Push a batch of written entity documents to the loaded modules."""
+        if not docs:
+            return
+        dm = self._modules.get("data_manager")
+        sqlite = self._modules.get("sqlite_sync")
+        # DataManager already synced the batch if this engine is attached
+        if sqlite is not None and getattr(dm, "_sqlite_sync", None) is not sqlite:
+            try:
+                with self.get_lock("sqlite_sync"):
+                    sqlite.sync_entities(docs)
+            except Exception:
+                logger.warning("Batch SQLite sync failed", exc_info=True)
+
+        graph = self._modules.get("world_graph")
+        if graph is not None:
+            try:
+                with self.get_lock("world_graph"):
+                    graph.add_entities(docs)
+            except Exception:
+                logger.warning("Batch graph update failed", exc_info=True)
+
+        checker = self._modules.get("consistency_checker")
+        if checker is not None:
+            try:
+                with self.get_lock("consistency_checker"):
+                    checker.update_cached_entities(docs)
+            except Exception:
+                logger.warning("Batch consistency-cache update failed", exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Filesystem change journal
+    # ------------------------------------------------------------------
+
+    @property
+    def journal(self):
+        """The shared :class:`~engine.entity_journal.EntityJournal` for this root."""
+        from engine.entity_journal import get_journal
+        return get_journal(self.root)
+
+    def scan_entity_changes(self):
+        """Rescan the entities tree and apply the changes to loaded modules.
+
+        The scan only stats files; changed files are parsed once and the
+        resulting change set is applied to each loaded module under its
+        lock (path index, SQLite mirror, knowledge graph, consistency
+        cache), so edits made outside the app are picked up without a
+        full reload.  Change listeners are notified afterwards.
+
+        Returns
+        -------
+        ChangeSet
+            What changed since the previous scan.  While the entity
+            watcher runs, this also includes changes other modules'
+            scans found since its last delivery.
+        """
+        if self._watcher is not None:
+            return self._watcher.poll_now()
+        changes = self.journal.scan()
+        if changes:
+            self._on_entity_changes(changes)
+        return changes
+
+    def _apply_entity_changes(self, changes):
+        """Push a journal change set to every loaded module that accepts one.
+
+        Returns the change set as applied.  The journal shares *changes*
+        with its other subscribers, so it is copied, never modified.
+        """
+        if self._storage_backend is None:
+            from engine.entity_storage import configured_backend
+            self._storage_backend = configured_backend(self.root)
+        if self._storage_backend != "json" and changes.removed:
+            # The JSON tree is only an inbox for SQLite storage: a file
+            # disappearing from it does not delete the stored entity.
+            changes = changes.copy()
+            changes.removed = set()
+        for name in ("data_manager", "sqlite_sync", "world_graph", "consistency_checker"):
+            module = self._modules.get(name)
+            if module is None:
+                continue
+            try:
+                with self.get_lock(name):
+                    module.apply_changes(changes)
+            except Exception:
+                logger.warning("Applying entity changes to %s failed", name, exc_info=True)
+        return changes
+
+    def start_entity_watcher(self, listener=None, debounce=0.5,
+                             poll_interval=2.0, backend="auto"):
+        """Start watching ``user-world/`` for entity writes made elsewhere.
+
+        Every debounced change set is applied to the loaded modules (see
+        :meth:`scan_entity_changes`) and then passed to the registered
+        listeners.  Uses ``watchdog`` if installed, otherwise polling.
+
+        Parameters
+        ----------
+        listener : callable, optional
+            Extra ``listener(change_set)`` to register (see
+            :meth:`add_change_listener`).
+        debounce, poll_interval, backend
+            See :class:`~engine.entity_watcher.EntityWatcher`.
+
+        Returns
+        -------
+        EntityWatcher
+        """
+        from engine.entity_watcher import EntityWatcher
+
+        if listener is not None:
+            self.add_change_listener(listener)
+        if self._watcher is None:
+            self._watcher = EntityWatcher(
+                self.root, self._on_entity_changes, debounce=debounce,
+                poll_interval=poll_interval, backend=backend,
+            )
+        self._watcher.start()
+        return self._watcher
+
+    def stop_entity_watcher(self):
+        """Stop the entity watcher if it is running."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def start_sqlite_maintenance(self, **options):
+        """Start idle-time maintenance of the SQLite mirror.
+
+        Parameters
+        ----------
+        **options
+            Passed to
+            :class:`~engine.sqlite_maintenance.MaintenanceScheduler`
+            (``idle_seconds``, ``min_interval``, ``budget_seconds``, ...).
+
+        Returns
+        -------
+        MaintenanceScheduler
+        """
+        from engine.sqlite_maintenance import MaintenanceScheduler
+
+        if self._maintenance is None:
+            self._maintenance = MaintenanceScheduler(self.sqlite_sync, **options)
+        self._maintenance.start()
+        return self._maintenance
+
+    def stop_sqlite_maintenance(self):
+        """Stop the SQLite maintenance scheduler if it is running."""
+        if self._maintenance is not None:
+            self._maintenance.stop()
+            self._maintenance = None
+
+    def add_change_listener(self, listener):
+        """Call ``listener(change_set)`` after watcher changes are applied."""
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener):
+        """Unregister a listener added with :meth:`add_change_listener`."""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _on_entity_changes(self, changes):
+        """Watcher callback: update module caches, then notify listeners."""
+        changes = self._apply_entity_changes(changes)
+        for listener in list(self._change_listeners):
+            try:
+                listener(changes)
+            except Exception:
+                logger.warning("Entity change listener failed", exc_info=True)
+
     # ------------------------------------------------------------------
     # Lifecycle
     # ------------------------------------------------------------------
 
     def shutdown(self):
         """Release resources held by engine modules."""
+        self.stop_entity_watcher()
+        self.stop_sqlite_maintenance()
         # Close SQLite connection if open
         sqlite = self._modules.get("sqlite_sync")
         if sqlite is not None:
@@ -241,7 +488,13 @@ class EngineManager:
 
         if name == "consistency_checker":
             from engine.consistency_checker import ConsistencyChecker
-            return ConsistencyChecker(root)
+            checker = ConsistencyChecker(root)
+            # Claim candidates come from the mirror's FTS5 index
+            try:
+                checker.set_sqlite_sync(self._get_module("sqlite_sync"))
+            except Exception:
+                logger.warning("SQLite mirror unavailable for claim checks", exc_info=True)
+            return checker
 
         if name == "sqlite_sync":
             from engine.sqlite_sync import SQLiteSyncEngine
@@ -0,0 +1,536 @@
+"""
+engine/entity_journal.py -- Shared change journal for user-world/entities/
+
+Every engine module used to walk ``user-world/entities/`` with
+``rglob("*.json")`` and re-parse every file to find out what changed.
+The journal does that once, for everyone:
+
+* It keeps a manifest of ``rel_path -> (mtime_ns, size, sha1, entity_id)``
+  persisted to ``runtime/entity_manifest.json``.
+* :meth:`EntityJournal.scan` walks the tree with ``os.scandir`` and
+  only ``stat``\\s files; files whose mtime/size changed are read and
+  hashed, and only those whose content hash changed are parsed.
+* The result is a :class:`ChangeSet` (added / modified / removed entity
+  IDs, with the freshly parsed documents) that is pushed to every
+  subscriber, so modules update incrementally instead of rescanning.
+
+One journal is shared per project root (see :func:`get_journal`).
+
+Usage::
+
+    from engine.entity_journal import get_journal
+
+    journal = get_journal("C:/Worldbuilding-Interactive-Program")
+    journal.subscribe(lambda changes: print(changes.changed_ids()))
+    changes = journal.scan()
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from engine.utils import JSON_DECODE_ERRORS, iter_json_files
+from engine.utils import json_loads as _json_loads
+from engine.utils import safe_read_json as _safe_read_json
+from engine.utils import safe_write_json as _safe_write_json
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _entity_id_of(doc) -> str | None:
+    """Return the entity ID of a parsed document, or ``None``."""
+    if not isinstance(doc, dict):
+        return None
+    meta = doc.get("_meta")
+    entity_id = meta.get("id") if isinstance(meta, dict) else None
+    return entity_id or doc.get("id") or None
+
+
+def _read_and_parse(abs_path: str):
+    """Return ``(sha1, doc)`` for a file; ``doc`` is ``None`` if unparseable.
+
+    Returns ``(None, None)`` if the file cannot be read.
+    """
+    try:
+        with open(abs_path, "rb") as fh:
+            raw = fh.read()
+    except OSError:
+        return None, None
+    digest = hashlib.sha1(raw).hexdigest()
+    try:
+        doc = _json_loads(raw)
+    except JSON_DECODE_ERRORS:
+        doc = None
+    return digest, doc
+
+
+# ---------------------------------------------------------------------------
+# ChangeSet
+# ---------------------------------------------------------------------------
+
+class ChangeSet:
+    """Entities added, modified or removed since the previous scan.
+
+    Attributes
+    ----------
+    added, modified : dict[str, dict]
+        ``{entity_id: document}`` -- documents are freshly parsed, so
+        subscribers never need to re-read the file.
+    removed : set[str]
+        IDs whose files disappeared (or no longer carry that ID).
+    paths : dict[str, str]
+        ``{entity_id: rel_path}`` for every added or modified entity.
+    digests : dict[str, str]
+        ``{entity_id: sha1}`` content hash for every added or modified
+        entity.
+    """
+
+    __slots__ = ("added", "modified", "removed", "paths", "digests")
+
+    def __init__(self):
+        self.added: dict[str, dict] = {}
+        self.modified: dict[str, dict] = {}
+        self.removed: set[str] = set()
+        self.paths: dict[str, str] = {}
+        self.digests: dict[str, str] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def __repr__(self) -> str:
+        return (
+            f"ChangeSet(added={len(self.added)}, modified={len(self.modified)}, "
+            f"removed={len(self.removed)})"
+        )
+
+    def copy(self) -> "ChangeSet":
+        """Return a copy whose containers can be changed independently."""
+        other = ChangeSet()
+        other.added = dict(self.added)
+        other.modified = dict(self.modified)
+        other.removed = set(self.removed)
+        other.paths = dict(self.paths)
+        other.digests = dict(self.digests)
+        return other
+
+    def changed_ids(self) -> set[str]:
+        """Return every affected entity ID."""
+        return set(self.added) | set(self.modified) | self.removed
+
+    def upserts(self) -> dict[str, dict]:
+        """Return added and modified documents together."""
+        return {**self.added, **self.modified}
+
+    def merge(self, other: "ChangeSet") -> None:
+        """Fold a later change set into this one, in place.
+
+        Used by subscribers that buffer change sets between deliveries:
+        an entity added and then removed cancels out, and one removed
+        and then re-added becomes a modification.
+        """
+        for entity_id in other.removed:
+            if self.added.pop(entity_id, None) is None:
+                self.modified.pop(entity_id, None)
+                self.removed.add(entity_id)
+            self.paths.pop(entity_id, None)
+            self.digests.pop(entity_id, None)
+        for entity_id, doc in other.added.items():
+            if entity_id in self.removed:
+                self.removed.discard(entity_id)
+                self.modified[entity_id] = doc
+            else:
+                self.added[entity_id] = doc
+        for entity_id, doc in other.modified.items():
+            self.removed.discard(entity_id)
+            target = self.added if entity_id in self.added else self.modified
+            target[entity_id] = doc
+        self.paths.update(other.paths)
+        self.digests.update(other.digests)
+
+
+def diff_digests(known: dict[str, str], current: dict[str, str],
+                 iter_documents, paths: dict[str, str]) -> ChangeSet:
+    """Return what changed between a consumer's view and the store's.
+
+    Parameters
+    ----------
+    known : dict[str, str]
+        The consumer's ``{entity_id: token}`` map; updated in place.
+    current : dict[str, str]
+        The store's current ``{entity_id: token}`` map.
+    iter_documents : callable
+        ``iter_documents(entity_ids)`` yielding ``(entity_id, document)``;
+        only called for entities whose token differs.
+    paths : dict[str, str]
+        ``{entity_id: rel_path}`` for the store's entities.
+
+    Entities whose document can no longer be read are left out (and
+    stay stale in *known*, so they are retried next time).
+    """
+    changes = ChangeSet()
+    changes.removed = {eid for eid in known if eid not in current}
+    stale = [eid for eid, token in current.items() if known.get(eid) != token]
+    if stale:
+        for entity_id, doc in iter_documents(stale):
+            target = changes.modified if entity_id in known else changes.added
+            target[entity_id] = doc
+            changes.paths[entity_id] = paths.get(entity_id, "")
+            changes.digests[entity_id] = current[entity_id]
+    for entity_id in changes.removed:
+        del known[entity_id]
+    known.update(changes.digests)
+    return changes
+
+
+# ---------------------------------------------------------------------------
+# EntityJournal
+# ---------------------------------------------------------------------------
+
+class EntityJournal:
+    """Stat-based change journal over ``user-world/entities/``.
+
+    Parameters
+    ----------
+    project_root : str
+        Absolute path to the project root directory.
+    """
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, project_root: str):
+        self.root = Path(project_root).resolve()
+        self.entities_dir = self.root / "user-world" / "entities"
+        self.manifest_path = self.root / "runtime" / "entity_manifest.json"
+        self._prefix = str(self.entities_dir.relative_to(self.root)).replace("\\", "/")
+
+        self._lock = threading.RLock()
+        # rel_path -> [mtime_ns, size, sha1, entity_id or None]
+        self._manifest: dict[str, list] | None = None
+        # entity_id -> rel_path (derived from the manifest)
+        self._by_id: dict[str, str] = {}
+        self._manifest_dirty = False
+        self._subscribers: list = []
+        self.scan_count = 0
+
+    # ------------------------------------------------------------------
+    # Subscription
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback) -> None:
+        """Call ``callback(change_set)`` after every scan that finds changes.
+
+        Subscribers see every scan, whoever triggered it: modules that
+        rescan only to refresh the manifest (path-index rebuilds, graph
+        and SQLite freshness checks) still fan their changes out here.
+        Callbacks run on the scanning thread, outside the journal lock,
+        so they should only record the change set and return.
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """Stop notifying *callback*."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def scan(self) -> ChangeSet:
+        """Rescan the entities tree and return what changed.
+
+        Only files whose ``(mtime_ns, size)`` differ from the manifest
+        are read; of those, only files whose content hash changed are
+        reported.  The manifest is saved when anything changed.
+
+        The returned change set is relative to the previous scan by
+        *any* caller, so it is only complete for the caller if nobody
+        else scans in between.  Consumers that must see every change
+        should :meth:`subscribe` or track their own view with
+        :meth:`changes_since`.
+        """
+        with self._lock:
+            manifest = self._get_manifest()
+            changes = ChangeSet()
+            seen: set[str] = set()
+            dirty = False
+            old_ids: dict[str, str] = {}  # entity_id -> rel_path that lost it
+
+            stale: list[tuple[str, str, int, int]] = []
+            if self.entities_dir.exists():
+                for abs_path, rel_path, entry in iter_json_files(self.entities_dir, self._prefix):
+                    seen.add(rel_path)
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    known = manifest.get(rel_path)
+                    if known is None or known[0] != st.st_mtime_ns or known[1] != st.st_size:
+                        stale.append((abs_path, rel_path, st.st_mtime_ns, st.st_size))
+
+            # Read/hash/parse the stat-changed files in parallel
+            if stale:
+                workers = max(1, min(16, len(stale)))
+                with ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="journal") as pool:
+                    results = list(pool.map(lambda item: _read_and_parse(item[0]), stale))
+            else:
+                results = []
+
+            for (_, rel_path, mtime_ns, size), (digest, doc) in zip(stale, results, strict=True):
+                if digest is None:
+                    continue  # vanished or unreadable; retried next scan
+                known = manifest.get(rel_path)
+                entity_id = _entity_id_of(doc)
+                if known is not None and known[2] == digest:
+                    # Touched but unchanged content: refresh stat only
+                    known[0], known[1] = mtime_ns, size
+                    dirty = True
+                    continue
+                if known is not None and known[3] and known[3] != entity_id:
+                    old_ids[known[3]] = rel_path
+                manifest[rel_path] = [mtime_ns, size, digest, entity_id]
+                dirty = True
+                if entity_id is None:
+                    continue
+                previous = self._by_id.get(entity_id)
+                self._by_id[entity_id] = rel_path
+                changes.paths[entity_id] = rel_path
+                changes.digests[entity_id] = digest
+                if known is None and previous is None:
+                    changes.added[entity_id] = doc
+                else:
+                    changes.modified[entity_id] = doc
+
+            for rel_path in [p for p in manifest if p not in seen]:
+                entry = manifest.pop(rel_path)
+                dirty = True
+                if entry[3]:
+                    old_ids[entry[3]] = rel_path
+
+            for entity_id, rel_path in old_ids.items():
+                if self._by_id.get(entity_id) == rel_path:
+                    del self._by_id[entity_id]
+                    changes.removed.add(entity_id)
+                    changes.added.pop(entity_id, None)
+                    changes.modified.pop(entity_id, None)
+                    changes.paths.pop(entity_id, None)
+                    changes.digests.pop(entity_id, None)
+
+            self.scan_count += 1
+            if dirty or self._manifest_dirty:
+                self._save_manifest()
+            subscribers = list(self._subscribers) if changes else []
+
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception:
+                logger.warning("Entity journal subscriber %r failed", callback,
+                               exc_info=True)
+        return changes
+
+    def record_write(self, abs_path: str, entity_id: str) -> None:
+        """Record a write the caller made itself, so the next scan skips it.
+
+        Engine writers call this after saving an entity file; the change
+        has already been applied to their own caches, so reporting it
+        again as an external change would only cause redundant work.
+        The manifest is persisted by the next scan.
+        """
+        try:
+            rel_path = str(Path(abs_path).resolve().relative_to(self.root)).replace("\\", "/")
+        except ValueError:
+            return
+        with self._lock:
+            manifest = self._get_manifest()
+            try:
+                st = Path(abs_path).stat()
+                with open(abs_path, "rb") as fh:
+                    digest = hashlib.sha1(fh.read()).hexdigest()
+            except OSError:
+                return
+            old = manifest.get(rel_path)
+            if (old is not None and old[3] and old[3] != entity_id
+                    and self._by_id.get(old[3]) == rel_path):
+                del self._by_id[old[3]]
+            previous = self._by_id.get(entity_id)
+            if previous and previous != rel_path:
+                manifest.pop(previous, None)
+            manifest[rel_path] = [st.st_mtime_ns, st.st_size, digest, entity_id]
+            self._by_id[entity_id] = rel_path
+            self._manifest_dirty = True
+
+    # ------------------------------------------------------------------
+    # Manifest queries
+    # ------------------------------------------------------------------
+
+    def entity_paths(self) -> dict[str, str]:
+        """Return ``{entity_id: rel_path}`` as of the last scan."""
+        with self._lock:
+            self._get_manifest()
+            return dict(self._by_id)
+
+    def entity_digests(self) -> dict[str, str]:
+        """Return ``{entity_id: sha1}`` as of the last scan."""
+        with self._lock:
+            manifest = self._get_manifest()
+            return {eid: manifest[rel][2] for eid, rel in self._by_id.items()}
+
+    def entity_stamps(self) -> dict[str, tuple[str, int]]:
+        """Return ``{entity_id: (rel_path, mtime_ns)}`` as of the last scan."""
+        with self._lock:
+            manifest = self._get_manifest()
+            return {eid: (rel, manifest[rel][0]) for eid, rel in self._by_id.items()}
+
+    def changes_since(self, known: dict[str, str]) -> ChangeSet:
+        """Scan, then return what changed relative to a consumer's own view.
+
+        :meth:`scan` reports changes since the *previous scan by anyone*,
+        so a module that was not subscribed at the time would miss them.
+        A module that keeps its own ``{entity_id: sha1}`` map (seeded
+        from :meth:`entity_digests`) can call this instead; only entities
+        whose hash differs are read.  *known* is updated in place.
+        """
+        self.scan()
+        return diff_digests(known, self.entity_digests(), self.iter_documents,
+                            self.entity_paths())
+
+    def path_for(self, entity_id: str) -> str | None:
+        """Return the absolute path of *entity_id* as of the last scan."""
+        with self._lock:
+            self._get_manifest()
+            rel_path = self._by_id.get(entity_id)
+        return str(self.root / rel_path) if rel_path else None
+
+    def file_paths(self) -> list[str]:
+        """Return the absolute path of every JSON file, including ones
+        without a valid entity ID (corrupt or foreign files)."""
+        with self._lock:
+            return [str(self.root / rel) for rel in self._get_manifest()]
+
+    def fingerprint(self) -> str:
+        """Return a hash of the whole manifest's contents.
+
+        Two equal fingerprints mean the entities tree held exactly the
+        same files with the same contents -- a cheap freshness check for
+        derived caches.
+        """
+        with self._lock:
+            manifest = self._get_manifest()
+            h = hashlib.sha1()
+            for rel_path in sorted(manifest):
+                h.update(rel_path.encode("utf-8"))
+                h.update(b"\0")
+                h.update(str(manifest[rel_path][2]).encode("ascii"))
+                h.update(b"\n")
+            return h.hexdigest()
+
+    def read_entity(self, entity_id: str) -> dict | None:
+        """Read one entity's current document from disk."""
+        path = self.path_for(entity_id)
+        return _safe_read_json(path) if path else None
+
+    def iter_documents(self, entity_ids=None):
+        """Yield ``(entity_id, document)`` for the journal's entities.
+
+        Files are read on a small thread pool.  Call :meth:`scan` first
+        for an up-to-date view.
+
+        Parameters
+        ----------
+        entity_ids : iterable of str, optional
+            Restrict to these IDs (unknown IDs are skipped).
+        """
+        with self._lock:
+            self._get_manifest()
+            if entity_ids is None:
+                items = list(self._by_id.items())
+            else:
+                items = [(eid, self._by_id[eid]) for eid in entity_ids if eid in self._by_id]
+        if not items:
+            return
+        workers = max(1, min(16, len(items)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="journal") as pool:
+            docs = pool.map(lambda item: _safe_read_json(str(self.root / item[1])), items)
+            for (entity_id, _), doc in zip(items, docs, strict=True):
+                if _entity_id_of(doc) == entity_id:
+                    yield entity_id, doc
+
+    def load_all(self) -> dict[str, dict]:
+        """Scan, then return ``{entity_id: document}`` for every entity.
+
+        Documents parsed by the scan itself are reused, so a cold start
+        (empty manifest) reads each file once.
+        """
+        changes = self.scan()
+        entities = changes.upserts()
+        with self._lock:
+            rest = [eid for eid in self._by_id if eid not in entities]
+        entities.update(self.iter_documents(rest))
+        return entities
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _get_manifest(self) -> dict[str, list]:
+        """Return the in-memory manifest, loading it from disk once."""
+        if self._manifest is None:
+            data = _safe_read_json(str(self.manifest_path))
+            files = {}
+            if (isinstance(data, dict)
+                    and data.get("version") == self.MANIFEST_VERSION
+                    and isinstance(data.get("files"), dict)):
+                files = {
+                    rel: list(entry) for rel, entry in data["files"].items()
+                    if isinstance(entry, list) and len(entry) == 4
+                }
+            self._manifest = files
+            self._by_id = {entry[3]: rel for rel, entry in files.items() if entry[3]}
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        self._manifest_dirty = False
+        try:
+            _safe_write_json(
+                str(self.manifest_path),
+                {"version": self.MANIFEST_VERSION, "files": self._manifest},
+                indent=None,
+                fsync=False,  # a torn manifest just means a full rescan
+            )
+        except OSError:
+            logger.debug("Could not save entity manifest", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Shared instances
+# ---------------------------------------------------------------------------
+
+_journals: dict[str, EntityJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(project_root) -> EntityJournal:
+    """Return the shared :class:`EntityJournal` for *project_root*."""
+    key = str(Path(project_root).resolve())
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = EntityJournal(key)
+        return journal
+
+
+def reset_journals() -> None:
+    """Forget every shared journal (mainly for tests)."""
+    with _journals_lock:
+        _journals.clear()
@@ -0,0 +1,644 @@
+"""
+engine/entity_storage.py -- Pluggable storage backends for entity documents
+
+By default every entity lives in its own JSON file under
+``user-world/entities/<type>/<id>.json``, which makes every cold
+operation (startup load, health checks, backups, graph rebuilds)
+O(files).  This module puts a small storage interface between the
+engine and the documents, with two implementations:
+
+* :class:`JSONFileStorage` -- the original one-file-per-entity tree,
+  change-tracked by the shared :class:`~engine.entity_journal.EntityJournal`.
+* :class:`SQLiteEntityStorage` -- one row per entity in
+  ``user-world/entities.db`` (WAL mode).  ``SQLiteSyncEngine``'s tables
+  in ``runtime/worldbuilding.db`` remain the secondary indexes (FTS,
+  cross-references, claims) and are rebuilt from whichever backend is
+  active.
+
+Documents are always addressed by their *logical* path
+(``user-world/entities/<type>/<id>.json``), so ``entity_index``
+``file_path`` values mean the same thing under both backends and
+:func:`export_json_tree` can materialize the tree at any time.
+
+The active backend is recorded in ``user-world/storage.json``
+(``{"backend": "sqlite"}``); without that file the JSON backend is
+used.  Switch with :func:`migrate_storage` while the app is closed.
+
+Usage::
+
+    from engine.entity_storage import get_storage, migrate_storage
+
+    storage = get_storage("C:/Worldbuilding-Interactive-Program")
+    docs = storage.load_all()
+    migrate_storage("C:/Worldbuilding-Interactive-Program", "sqlite")
+"""
+
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import NamedTuple
+
+from engine.entity_journal import ChangeSet, diff_digests, get_journal
+from engine.utils import JSON_DECODE_ERRORS
+from engine.utils import json_dumps as _json_dumps
+from engine.utils import json_loads as _json_loads
+from engine.utils import safe_read_json as _safe_read_json
+from engine.utils import safe_write_json as _safe_write_json
+
+BACKENDS = ("json", "sqlite")
+
+# Root-relative files that belong to the storage layer itself; backups
+# export documents instead of copying these.
+STORAGE_FILES = frozenset({
+    "user-world/storage.json",
+    "user-world/entities.db",
+    "user-world/entities.db-wal",
+    "user-world/entities.db-shm",
+})
+
+
+class DocStat(NamedTuple):
+    """``os.stat_result``-compatible version stamp for a stored document."""
+
+    st_mtime_ns: int
+    st_size: int
+
+
+# ---------------------------------------------------------------------------
+# Interface
+# ---------------------------------------------------------------------------
+
+class EntityStorage(ABC):
+    """Base class for entity document storage backends.
+
+    Per-document methods take the document's absolute *logical* path
+    (``<root>/user-world/entities/<type>/<id>.json``).  ``stat()``
+    returns an object with ``st_mtime_ns`` and ``st_size`` that changes
+    on every write, so callers can validate their caches the same way
+    under every backend.
+
+    Parameters
+    ----------
+    project_root : str
+        Absolute path to the project root directory.
+    """
+
+    name = ""
+
+    def __init__(self, project_root: str):
+        self.root = Path(project_root).resolve()
+        self.entities_dir = self.root / "user-world" / "entities"
+
+    def rel_path(self, abs_path) -> str:
+        """Return the forward-slash, root-relative form of *abs_path*."""
+        path = Path(abs_path)
+        if path.is_absolute():
+            path = path.relative_to(self.root)
+        return str(path).replace("\\", "/")
+
+    # -- per-document --------------------------------------------------
+
+    @abstractmethod
+    def stat(self, abs_path):
+        """Return a stat-like version stamp, or ``None`` if absent."""
+
+    def exists(self, abs_path) -> bool:
+        """Return ``True`` if a document is stored at *abs_path*."""
+        return self.stat(abs_path) is not None
+
+    @abstractmethod
+    def read(self, abs_path) -> dict | None:
+        """Return the document at *abs_path*, or ``None``."""
+
+    @abstractmethod
+    def write(self, abs_path, entity_id: str, doc: dict):
+        """Store *doc* at *abs_path*; returns its new stat-like stamp."""
+
+    @abstractmethod
+    def delete(self, abs_path) -> bool:
+        """Remove the document at *abs_path*; returns ``True`` if it existed."""
+
+    # -- whole store ---------------------------------------------------
+
+    @abstractmethod
+    def scan(self) -> ChangeSet:
+        """Return what changed since the previous scan (by any caller)."""
+
+    @abstractmethod
+    def entity_paths(self) -> dict[str, str]:
+        """Return ``{entity_id: rel_path}`` for every stored entity."""
+
+    @abstractmethod
+    def entity_digests(self) -> dict[str, str]:
+        """Return ``{entity_id: token}``; a token changes when its document does."""
+
+    @abstractmethod
+    def entity_stamps(self) -> dict[str, tuple[str, int]]:
+        """Return ``{entity_id: (rel_path, mtime_ns)}`` without reading documents.
+
+        ``mtime_ns`` is the same stamp :meth:`stat` reports, so callers can
+        tell which documents changed since they last looked.
+        """
+
+    @abstractmethod
+    def iter_documents(self, entity_ids=None):
+        """Yield ``(entity_id, document)``, optionally for selected IDs."""
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """Return a hash that changes whenever any stored document changes."""
+
+    def load_all(self) -> dict[str, dict]:
+        """Return ``{entity_id: document}`` for every stored entity."""
+        self.scan()
+        return dict(self.iter_documents())
+
+    def path_for(self, entity_id: str) -> str | None:
+        """Return the absolute logical path of *entity_id*, or ``None``."""
+        rel_path = self.entity_paths().get(entity_id)
+        return str(self.root / rel_path) if rel_path else None
+
+    def read_entity(self, entity_id: str) -> dict | None:
+        """Return the stored document of *entity_id*, or ``None``."""
+        path = self.path_for(entity_id)
+        return self.read(path) if path else None
+
+    def count(self) -> int:
+        """Return the number of stored entities."""
+        return len(self.entity_paths())
+
+    def changes_since(self, known: dict[str, str]) -> ChangeSet:
+        """Return what changed relative to a consumer's ``{id: token}`` map.
+
+        Only documents whose token differs are read.  *known* is updated
+        in place (see :meth:`EntityJournal.changes_since`).
+        """
+        self.scan()
+        return diff_digests(known, self.entity_digests(), self.iter_documents,
+                            self.entity_paths())
+
+    def close(self) -> None:  # noqa: B027 -- optional hook, not abstract
+        """Release any resources held by the backend."""
+
+
+# ---------------------------------------------------------------------------
+# JSON file tree
+# ---------------------------------------------------------------------------
+
+class JSONFileStorage(EntityStorage):
+    """One JSON file per entity under ``user-world/entities/``."""
+
+    name = "json"
+
+    @property
+    def journal(self):
+        """The shared :class:`~engine.entity_journal.EntityJournal` for this root."""
+        return get_journal(self.root)
+
+    def stat(self, abs_path):
+        try:
+            return os.stat(abs_path)
+        except OSError:
+            return None
+
+    def read(self, abs_path) -> dict | None:
+        return _safe_read_json(str(abs_path))
+
+    def write(self, abs_path, entity_id: str, doc: dict):
+        _safe_write_json(str(abs_path), doc)
+        # Our own write is not an external change for watchers/scanners
+        self.journal.record_write(str(abs_path), entity_id)
+        return self.stat(abs_path)
+
+    def delete(self, abs_path) -> bool:
+        try:
+            os.remove(abs_path)
+            return True
+        except OSError:
+            return False
+
+    def scan(self) -> ChangeSet:
+        return self.journal.scan()
+
+    def load_all(self) -> dict[str, dict]:
+        return self.journal.load_all()
+
+    def entity_paths(self) -> dict[str, str]:
+        return self.journal.entity_paths()
+
+    def entity_digests(self) -> dict[str, str]:
+        return self.journal.entity_digests()
+
+    def entity_stamps(self) -> dict[str, tuple[str, int]]:
+        return self.journal.entity_stamps()
+
+    def iter_documents(self, entity_ids=None):
+        return self.journal.iter_documents(entity_ids)
+
+    def fingerprint(self) -> str:
+        return self.journal.fingerprint()
+
+    def path_for(self, entity_id: str) -> str | None:
+        return self.journal.path_for(entity_id)
+
+    def changes_since(self, known: dict[str, str]) -> ChangeSet:
+        return self.journal.changes_since(known)
+
+
+# ---------------------------------------------------------------------------
+# SQLite
+# ---------------------------------------------------------------------------
+
+_DOCUMENTS_SQL = """
+CREATE TABLE IF NOT EXISTS documents (
+    path      TEXT PRIMARY KEY,
+    entity_id TEXT NOT NULL UNIQUE,
+    doc       BLOB NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteEntityStorage(EntityStorage):
+    """One row per entity in ``user-world/entities.db``.
+
+    Each write stamps the row with a strictly increasing ``mtime_ns``,
+    which doubles as the change token for :meth:`entity_digests` and as
+    the cache-validation stamp returned by :meth:`stat`.  The connection
+    is opened lazily and shared by all threads under a lock.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, project_root: str, db_path=None):
+        super().__init__(project_root)
+        self.db_path = Path(db_path) if db_path else self.root / "user-world" / "entities.db"
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._last_ns = 0
+        self._scan_known: dict[str, str] | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_DOCUMENTS_SQL)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _next_stamp(self) -> int:
+        """Return a write stamp greater than every previous one."""
+        self._last_ns = max(time.time_ns(), self._last_ns + 1)
+        return self._last_ns
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -- per-document --------------------------------------------------
+
+    def stat(self, abs_path):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT mtime_ns, size FROM documents WHERE path = ?",
+                (self.rel_path(abs_path),),
+            ).fetchone()
+        return DocStat(row[0], row[1]) if row else None
+
+    def read(self, abs_path) -> dict | None:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT doc FROM documents WHERE path = ?", (self.rel_path(abs_path),),
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def write(self, abs_path, entity_id: str, doc: dict):
+        return self.write_many([(abs_path, entity_id, doc)])[0]
+
+    def write_many(self, items) -> list:
+        """Store ``(abs_path, entity_id, doc)`` items in one transaction.
+
+        Returns the new stat-like stamp of each item, in order.
+        """
+        stamps = []
+        with self._lock:
+            conn = self._connection()
+            try:
+                for abs_path, entity_id, doc in items:
+                    rel_path = self.rel_path(abs_path)
+                    blob = _json_dumps(doc, indent=None)
+                    stamp = DocStat(self._next_stamp(), len(blob))
+                    # An entity whose type changed moves to a new path
+                    conn.execute(
+                        "DELETE FROM documents WHERE entity_id = ? AND path <> ?",
+                        (entity_id, rel_path),
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO documents "
+                        "(path, entity_id, doc, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+                        (rel_path, entity_id, blob, stamp.st_mtime_ns, stamp.st_size),
+                    )
+                    stamps.append(stamp)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        return stamps
+
+    def delete(self, abs_path) -> bool:
+        with self._lock:
+            conn = self._connection()
+            cur = conn.execute("DELETE FROM documents WHERE path = ?", (self.rel_path(abs_path),))
+            conn.commit()
+        return cur.rowcount > 0
+
+    @staticmethod
+    def _decode(blob) -> dict | None:
+        try:
+            doc = _json_loads(blob)
+        except JSON_DECODE_ERRORS:
+            return None
+        return doc if isinstance(doc, dict) else None
+
+    # -- whole store ---------------------------------------------------
+
+    def scan(self) -> ChangeSet:
+        with self._lock:
+            if self._scan_known is None:
+                self._scan_known = {}
+            return diff_digests(self._scan_known, self.entity_digests(),
+                                self.iter_documents, self.entity_paths())
+
+    def load_all(self) -> dict[str, dict]:
+        with self._lock:
+            if self._scan_known is None:
+                # The first scan reads every row anyway; reuse it
+                return dict(self.scan().added)
+            return dict(self.iter_documents())
+
+    def changes_since(self, known: dict[str, str]) -> ChangeSet:
+        # Rows are only ever changed through this class (or another
+        # process using it), so there is nothing to rescan first.
+        with self._lock:
+            return super().changes_since(known)
+
+    def entity_paths(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._connection().execute(
+                "SELECT entity_id, path FROM documents"
+            ).fetchall())
+
+    def entity_digests(self) -> dict[str, str]:
+        with self._lock:
+            return {
+                eid: str(stamp) for eid, stamp in self._connection().execute(
+                    "SELECT entity_id, mtime_ns FROM documents"
+                )
+            }
+
+    def entity_stamps(self) -> dict[str, tuple[str, int]]:
+        with self._lock:
+            return {
+                eid: (path, stamp) for eid, path, stamp in self._connection().execute(
+                    "SELECT entity_id, path, mtime_ns FROM documents"
+                )
+            }
+
+    def iter_documents(self, entity_ids=None):
+        with self._lock:
+            conn = self._connection()
+            if entity_ids is None:
+                rows = conn.execute("SELECT entity_id, doc FROM documents").fetchall()
+            else:
+                ids = list(entity_ids)
+                rows = []
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    rows.extend(conn.execute(
+                        f"SELECT entity_id, doc FROM documents WHERE entity_id IN ({marks})",
+                        chunk,
+                    ).fetchall())
+        for entity_id, blob in rows:
+            doc = self._decode(blob)
+            if doc is not None:
+                yield entity_id, doc
+
+    def fingerprint(self) -> str:
+        h = hashlib.sha1()
+        with self._lock:
+            for path, stamp in self._connection().execute(
+                "SELECT path, mtime_ns FROM documents ORDER BY path"
+            ):
+                h.update(f"{path}\0{stamp}\n".encode())
+        return h.hexdigest()
+
+    def path_for(self, entity_id: str) -> str | None:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT path FROM documents WHERE entity_id = ?", (entity_id,),
+            ).fetchone()
+        return str(self.root / row[0]) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def checkpoint(self) -> None:
+        """Fold the WAL into the main database file (e.g. before copying it)."""
+        with self._lock:
+            self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+# ---------------------------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------------------------
+
+_storages: dict[str, EntityStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def _config_path(root: Path) -> Path:
+    return root / "user-world" / "storage.json"
+
+
+def configured_backend(project_root) -> str:
+    """Return the backend recorded in ``user-world/storage.json`` (default ``"json"``)."""
+    data = _safe_read_json(str(_config_path(Path(project_root).resolve())), default={})
+    backend = data.get("backend") if isinstance(data, dict) else None
+    return backend if backend in BACKENDS else "json"
+
+
+def _create_storage(root: Path, backend: str) -> EntityStorage:
+    if backend == "sqlite":
+        return SQLiteEntityStorage(str(root))
+    return JSONFileStorage(str(root))
+
+
+def get_storage(project_root) -> EntityStorage:
+    """Return the shared storage backend for *project_root*."""
+    root = Path(project_root).resolve()
+    key = str(root)
+    backend = configured_backend(root)
+    with _storages_lock:
+        storage = _storages.get(key)
+        if storage is None or storage.name != backend:
+            if storage is not None:
+                storage.close()
+            storage = _storages[key] = _create_storage(root, backend)
+        return storage
+
+
+def close_storage(project_root) -> None:
+    """Close and forget the shared backend for *project_root*."""
+    key = str(Path(project_root).resolve())
+    with _storages_lock:
+        storage = _storages.pop(key, None)
+    if storage is not None:
+        storage.close()
+
+
+def reset_storages() -> None:
+    """Close and forget every shared backend (mainly for tests)."""
+    with _storages_lock:
+        storages = list(_storages.values())
+        _storages.clear()
+    for storage in storages:
+        storage.close()
+
+
+# ---------------------------------------------------------------------------
+# Export and migration
+# ---------------------------------------------------------------------------
+
+def export_json_tree(project_root, dest_dir=None, storage: EntityStorage | None = None) -> int:
+    """Materialize every stored entity as a JSON file tree.
+
+    Parameters
+    ----------
+    project_root : str
+        Absolute path to the project root directory.
+    dest_dir : str, optional
+        Directory that takes the place of ``user-world/entities`` (files
+        keep their ``<type>/<id>.json`` layout).  Defaults to the live
+        entities directory.
+    storage : EntityStorage, optional
+        Source backend.  Defaults to the active one.
+
+    Returns
+    -------
+    int
+        The number of files written.
+    """
+    root = Path(project_root).resolve()
+    storage = storage or get_storage(root)
+    dest = Path(dest_dir) if dest_dir else root / "user-world" / "entities"
+    paths = storage.entity_paths()
+    written = 0
+    for entity_id, doc in storage.iter_documents():
+        rel_path = paths.get(entity_id)
+        if not rel_path:
+            continue
+        rel = Path(rel_path)
+        try:
+            rel = rel.relative_to(Path("user-world") / "entities")
+        except ValueError:
+            rel = Path(rel.name)
+        _safe_write_json(str(dest / rel), doc)
+        written += 1
+    return written
+
+
+def migrate_storage(project_root, backend: str, remove_source: bool = False) -> dict:
+    """Move every entity document to *backend* and make it the active one.
+
+    Run while the app is closed: open DataManager instances keep their
+    previous backend.
+
+    Parameters
+    ----------
+    project_root : str
+        Absolute path to the project root directory.
+    backend : str
+        ``"sqlite"`` or ``"json"``.
+    remove_source : bool, optional
+        Delete the old copy (JSON files or ``entities.db``) once the new
+        backend holds the same number of entities.
+
+    Returns
+    -------
+    dict
+        ``{"from", "to", "migrated", "removed"}``.
+
+    Raises
+    ------
+    ValueError
+        If *backend* is unknown.
+    RuntimeError
+        If the target does not end up with every entity.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend '{backend}'. Expected one of: {', '.join(BACKENDS)}."
+        )
+    root = Path(project_root).resolve()
+    current = configured_backend(root)
+    close_storage(root)
+    source = _create_storage(root, current)
+    result = {"from": current, "to": backend, "migrated": 0, "removed": 0}
+
+    try:
+        if current == backend:
+            result["migrated"] = source.count()
+            return result
+
+        docs = source.load_all()
+        paths = source.entity_paths()
+        if backend == "sqlite":
+            target = SQLiteEntityStorage(str(root))
+            try:
+                target.write_many(
+                    (root / paths[eid], eid, doc) for eid, doc in docs.items() if eid in paths
+                )
+                migrated = target.count()
+            finally:
+                target.close()
+        else:
+            migrated = export_json_tree(root, storage=source)
+        if migrated < len(docs):
+            raise RuntimeError(
+                f"Storage migration incomplete: {migrated} of {len(docs)} "
+                f"entities were written. The {current} copy is unchanged."
+            )
+        result["migrated"] = migrated
+        _safe_write_json(str(_config_path(root)), {"backend": backend})
+
+        if remove_source:
+            if current == "json":
+                for rel_path in paths.values():
+                    try:
+                        os.remove(root / rel_path)
+                        result["removed"] += 1
+                    except OSError:
+                        pass
+                get_journal(root).scan()
+            else:
+                source.close()
+                for suffix in ("", "-wal", "-shm"):
+                    with contextlib.suppress(OSError):
+                        os.remove(f"{source.db_path}{suffix}")
+                result["removed"] = len(docs)
+    finally:
+        source.close()
+    return result
@@ -0,0 +1,243 @@
+"""
+engine/entity_summary.py -- Compact records for the in-memory entity index
+
+``state.json``'s ``entity_index`` maps every entity ID to a small summary
+(template, type, name, status, file path, timestamps, creation step).
+Held as one dict per entity, that costs several hundred bytes per entry
+before counting the strings, most of which repeat: every god shares the
+same ``template_id``, ``entity_type`` and ``status``, and nearly every
+``file_path`` is just ``user-world/entities/<type>/<id>.json``.
+
+:class:`EntitySummary` is the in-memory form of one entry:
+
+* a ``__slots__`` object (no per-instance ``__dict__``);
+* ``template_id``, ``entity_type`` and ``status`` are interned, so each
+  distinct value is stored once;
+* the canonical ``file_path`` is derived from the type and ID instead of
+  being stored;
+* immutable -- use :meth:`EntitySummary.replace` to get an updated copy,
+  which also makes ``copy.deepcopy`` of the whole index cheap.
+
+It is a read-only :class:`~collections.abc.Mapping` with the same keys
+as the ``state.json`` entry, so code that reads ``entry["name"]`` or
+``entry.get("status")`` keeps working.  Plain dicts are produced only
+at serialization boundaries (:meth:`EntitySummary.to_dict`, and
+``engine.utils.json_dumps`` for whole states).
+
+Usage::
+
+    from engine.entity_summary import EntitySummary, summaries_from_state
+
+    index = summaries_from_state(state["entity_index"])
+    index[eid] = index[eid].replace(status="canon")
+"""
+
+import sys
+from collections.abc import Mapping
+
+# Keys of a state.json entity_index entry, in their on-disk order
+FIELDS = (
+    "template_id", "entity_type", "name", "status", "file_path",
+    "created_at", "updated_at", "step_created",
+)
+_FIELD_SET = frozenset(FIELDS)
+
+
+class _Missing:
+    """Marker for a key absent from the original entry."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "<missing>"
+
+
+_MISSING = _Missing()
+# Stored in place of a file_path that equals canonical_file_path()
+_CANONICAL = _Missing()
+_intern = sys.intern
+
+
+def _interned(value):
+    return _intern(value) if type(value) is str else value
+
+
+def canonical_file_path(entity_type: str, entity_id: str) -> str:
+    """Return the default root-relative file path of an entity."""
+    return f"user-world/entities/{entity_type}/{entity_id}.json"
+
+
+class EntitySummary(Mapping):
+    """Immutable, compact summary of one entity in the state index.
+
+    Parameters
+    ----------
+    entity_id : str
+        The entity ID (the key of the entry in ``entity_index``; not
+        itself one of the mapping keys).
+    template_id, entity_type, name, status, file_path, created_at,
+    updated_at, step_created : optional
+        The entry's fields.  Omitted fields are absent from the mapping,
+        exactly as in the ``state.json`` entry it came from.
+    extra : dict, optional
+        Any other keys found in the entry, kept verbatim.
+    """
+
+    __slots__ = (
+        "id", "template_id", "entity_type", "name", "status", "_file_path",
+        "created_at", "updated_at", "step_created", "_extra",
+    )
+
+    def __init__(self, entity_id, template_id=_MISSING, entity_type=_MISSING,
+                 name=_MISSING, status=_MISSING, file_path=_MISSING,
+                 created_at=_MISSING, updated_at=_MISSING, step_created=_MISSING,
+                 extra=None):
+        set_ = object.__setattr__
+        set_(self, "id", entity_id)
+        set_(self, "template_id", _interned(template_id))
+        set_(self, "entity_type", _interned(entity_type))
+        set_(self, "name", name)
+        set_(self, "status", _interned(status))
+        # Most entities live at their canonical path; derive it instead
+        if (type(file_path) is str and type(entity_type) is str
+                and file_path == canonical_file_path(entity_type, entity_id)):
+            file_path = _CANONICAL
+        set_(self, "_file_path", file_path)
+        set_(self, "created_at", created_at)
+        set_(self, "updated_at", updated_at)
+        set_(self, "step_created", step_created)
+        set_(self, "_extra", tuple(extra.items()) if extra else None)
+
+    @classmethod
+    def from_dict(cls, entity_id: str, entry) -> "EntitySummary":
+        """Build a summary from a ``state.json`` entry (or another summary)."""
+        if isinstance(entry, EntitySummary):
+            return entry if entry.id == entity_id else entry.replace(id=entity_id)
+        extra = None
+        if not entry.keys() <= _FIELD_SET:
+            extra = {k: v for k, v in entry.items() if k not in _FIELD_SET}
+        get = entry.get
+        return cls(
+            entity_id,
+            get("template_id", _MISSING), get("entity_type", _MISSING),
+            get("name", _MISSING), get("status", _MISSING),
+            get("file_path", _MISSING), get("created_at", _MISSING),
+            get("updated_at", _MISSING), get("step_created", _MISSING),
+            extra,
+        )
+
+    # -- immutability ----------------------------------------------------
+
+    def __setattr__(self, name, value):
+        raise AttributeError("EntitySummary is immutable; use replace()")
+
+    def __delattr__(self, name):
+        raise AttributeError("EntitySummary is immutable; use replace()")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (EntitySummary.from_dict, (self.id, self.to_dict()))
+
+    def replace(self, **changes) -> "EntitySummary":
+        """Return a copy with the given fields changed.
+
+        Any key may be given, including ``id`` and keys outside
+        :data:`FIELDS` (kept as extras).
+        """
+        entity_id = changes.pop("id", self.id)
+        data = self.to_dict()
+        data.update(changes)
+        return EntitySummary.from_dict(entity_id, data)
+
+    # -- Mapping ---------------------------------------------------------
+
+    def _stored_file_path(self):
+        """Return the entry's ``file_path`` (derived if canonical)."""
+        path = self._file_path
+        if path is _CANONICAL:
+            return canonical_file_path(self.entity_type, self.id)
+        return path
+
+    @property
+    def file_path(self):
+        path = self._stored_file_path()
+        return None if path is _MISSING else path
+
+    def _values(self):
+        return (
+            self.template_id, self.entity_type, self.name, self.status,
+            self._stored_file_path(), self.created_at, self.updated_at,
+            self.step_created,
+        )
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = self._stored_file_path() if key == "file_path" else getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra:
+            for extra_key, value in self._extra:
+                if extra_key == key:
+                    return value
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return f"EntitySummary({self.id!r}, {self.to_dict()!r})"
+
+    # -- serialization ---------------------------------------------------
+
+    def to_dict(self) -> dict:
+        """Return the ``state.json`` entry for this summary."""
+        data = {key: value for key, value in zip(FIELDS, self._values(), strict=True)
+                if value is not _MISSING}
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def as_summary(self) -> dict:
+        """Return the entry plus ``id`` (the :meth:`DataManager.list_entities` shape)."""
+        data = self.to_dict()
+        data["id"] = self.id
+        return data
+
+
+def summaries_from_state(entity_index) -> dict[str, EntitySummary]:
+    """Convert a ``state.json`` ``entity_index`` into ``{id: EntitySummary}``."""
+    if not isinstance(entity_index, dict):
+        return {}
+    return {
+        eid: EntitySummary.from_dict(eid, entry)
+        for eid, entry in entity_index.items()
+        if isinstance(entry, Mapping)
+    }
+
+
+def summary_dict(entity_id: str, entry) -> dict:
+    """Return a fresh ``{..., "id": entity_id}`` dict for an index entry."""
+    data = entry.to_dict() if isinstance(entry, EntitySummary) else dict(entry)
+    data["id"] = entity_id
+    return data
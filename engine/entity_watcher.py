@@ -0,0 +1,251 @@
+"""
+engine/entity_watcher.py -- Live watcher for external entity writes
+
+Entity files are written by the app and also by the Claude Code side
+(``hooks/validate_writes.py``), which the app used to notice only when a
+cache TTL expired or on a full rebuild.  :class:`EntityWatcher` watches
+``user-world/`` and, after a short debounce, rescans the shared
+:class:`~engine.entity_journal.EntityJournal` and hands the resulting
+change set to a callback.
+
+The watcher subscribes to the journal rather than relying on the
+return value of its own scans, so changes picked up by another
+module's scan (a path-index rebuild, a graph freshness check) are
+still delivered.  Subscriber callbacks only buffer the change set;
+delivery always happens on the watcher's thread or in
+:meth:`EntityWatcher.poll_now`.
+
+Two backends:
+
+* ``"watchdog"`` -- native filesystem notifications (inotify, FSEvents,
+  ReadDirectoryChangesW) via the optional ``watchdog`` package.
+* ``"polling"`` -- a background thread that rescans the journal every
+  ``poll_interval`` seconds.  Journal rescans are stat-only, so this is
+  cheap; it is used automatically when ``watchdog`` is not installed.
+
+Usage::
+
+    from engine.entity_watcher import EntityWatcher
+
+    watcher = EntityWatcher(root, lambda changes: print(changes))
+    watcher.start()
+    ...
+    watcher.stop()
+"""
+
+import logging
+import threading
+from pathlib import Path
+
+from engine.entity_journal import ChangeSet, get_journal
+
+logger = logging.getLogger(__name__)
+
+try:
+    from watchdog.events import FileSystemEventHandler as _FileSystemEventHandler
+    from watchdog.observers import Observer as _Observer
+except ImportError:
+    _FileSystemEventHandler = object
+    _Observer = None
+
+
+def watchdog_available() -> bool:
+    """Return ``True`` if the optional ``watchdog`` package is installed."""
+    return _Observer is not None
+
+
+class _EntityEventHandler(_FileSystemEventHandler):
+    """watchdog handler that forwards entity-file events to the watcher."""
+
+    def __init__(self, watcher: "EntityWatcher"):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = [getattr(event, "src_path", ""), getattr(event, "dest_path", "")]
+        if any(self._watcher.is_entity_path(p) for p in paths if p):
+            self._watcher.notify()
+
+
+class EntityWatcher:
+    """Debounced watcher that reports entity changes under ``user-world/``.
+
+    Parameters
+    ----------
+    project_root : str
+        Absolute path to the project root directory.
+    callback : callable
+        Called as ``callback(change_set)`` on the watcher thread for
+        every non-empty :class:`~engine.entity_journal.ChangeSet`.
+    debounce : float, optional
+        Quiet period in seconds after the last event before rescanning
+        (default 0.5).  Bursts of writes collapse into one change set.
+    poll_interval : float, optional
+        Rescan period for the polling backend (default 2.0 seconds).
+    backend : str, optional
+        ``"auto"`` (default), ``"watchdog"`` or ``"polling"``.
+    """
+
+    def __init__(self, project_root: str, callback, debounce: float = 0.5,
+                 poll_interval: float = 2.0, backend: str = "auto"):
+        if backend not in ("auto", "watchdog", "polling"):
+            raise ValueError(
+                f"Unknown watcher backend '{backend}'. "
+                f"Expected 'auto', 'watchdog' or 'polling'."
+            )
+        if backend == "watchdog" and not watchdog_available():
+            raise ValueError(
+                "The 'watchdog' package is not installed. "
+                "Install it with: pip install watchdog"
+            )
+        if backend == "auto":
+            backend = "watchdog" if watchdog_available() else "polling"
+
+        self.root = Path(project_root).resolve()
+        self.watch_dir = self.root / "user-world"
+        self.entities_dir = self.watch_dir / "entities"
+        self.journal = get_journal(self.root)
+        self.backend = backend
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._callback = callback
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._observer = None
+        self._pending: ChangeSet | None = None
+        self._pending_lock = threading.Lock()
+        self.batches_delivered = 0
+        self.journal.subscribe(self._on_journal_changes)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching.  The journal is scanned once first, so only
+        changes made after this call are reported."""
+        with self._lock:
+            if self.is_running:
+                return
+            self.journal.subscribe(self._on_journal_changes)
+            self.journal.scan()
+            self._take_pending()
+            self._stop.clear()
+            self._wake.clear()
+            if self.backend == "watchdog":
+                self.watch_dir.mkdir(parents=True, exist_ok=True)
+                self._observer = _Observer()
+                self._observer.schedule(
+                    _EntityEventHandler(self), str(self.watch_dir), recursive=True,
+                )
+                self._observer.daemon = True
+                self._observer.start()
+            self._thread = threading.Thread(
+                target=self._run, name="entity-watcher", daemon=True,
+            )
+            self._thread.start()
+            logger.debug("Entity watcher started (%s) on %s", self.backend, self.watch_dir)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop watching and wait for the watcher thread to exit.
+
+        A stopped watcher no longer tracks the journal; call
+        :meth:`start` again to resume.
+        """
+        with self._lock:
+            self.journal.unsubscribe(self._on_journal_changes)
+            self._stop.set()
+            self._wake.set()
+            if self._observer is not None:
+                try:
+                    self._observer.stop()
+                    self._observer.join(timeout)
+                except Exception:
+                    logger.debug("Error stopping watchdog observer", exc_info=True)
+                self._observer = None
+            if self._thread is not None:
+                self._thread.join(timeout)
+                self._thread = None
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def is_entity_path(self, path: str) -> bool:
+        """Return ``True`` if *path* is a JSON file under the entities dir."""
+        normalized = str(path).replace("\\", "/")
+        return (
+            normalized.endswith(".json")
+            and normalized.startswith(str(self.entities_dir).replace("\\", "/") + "/")
+        )
+
+    def notify(self) -> None:
+        """Report that something under the entities dir changed.
+
+        Called by the watchdog backend; may also be called directly by
+        code that knows it just wrote an entity file.
+        """
+        self._wake.set()
+
+    def poll_now(self):
+        """Rescan immediately and deliver any changes; returns the change set.
+
+        The result also includes changes found by other modules' scans
+        since the last delivery.
+        """
+        self.journal.scan()
+        changes = self._take_pending()
+        if changes:
+            self._deliver(changes)
+        return changes
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            timeout = self.poll_interval if self.backend == "polling" else None
+            woken = self._wake.wait(timeout)
+            if self._stop.is_set():
+                break
+            if woken:
+                # Debounce: keep waiting while events keep arriving
+                self._wake.clear()
+                while self._wake.wait(self.debounce):
+                    self._wake.clear()
+                    if self._stop.is_set():
+                        return
+            try:
+                self.poll_now()
+            except Exception:
+                logger.warning("Entity watcher rescan failed", exc_info=True)
+
+    def _on_journal_changes(self, changes) -> None:
+        """Journal subscriber: buffer *changes* until the next delivery."""
+        with self._pending_lock:
+            if self._pending is None:
+                self._pending = ChangeSet()
+            self._pending.merge(changes)
+        self._wake.set()
+
+    def _take_pending(self) -> ChangeSet:
+        with self._pending_lock:
+            changes, self._pending = self._pending, None
+        return changes if changes is not None else ChangeSet()
+
+    def _deliver(self, changes) -> None:
+        self.batches_delivered += 1
+        try:
+            self._callback(changes)
+        except Exception:
+            logger.warning("Entity watcher callback failed", exc_info=True)
@@ -26,15 +26,22 @@ Usage:
     erm.generate_health_report()
 """
 
+import glob
 import json
 import logging
 import os
-import glob
 import shutil
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import get_storage
+from engine.revision_store import RevisionStore
+from engine.utils import iter_json_files as _iter_json_files
+from engine.utils import safe_read_json as _safe_read_json
+from engine.utils import safe_write_json as _safe_write_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,10 +59,6 @@ def _now_stamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
 
-from engine.utils import safe_read_json as _safe_read_json
-from engine.utils import safe_write_json as _safe_write_json
-
-
 # ---------------------------------------------------------------------------
 # ErrorRecoveryManager
 # ---------------------------------------------------------------------------
@@ -82,8 +85,13 @@ class ErrorRecoveryManager:
         self.events_dir = self.bookkeeping_dir / "events"
         self.indexes_dir = self.bookkeeping_dir / "indexes"
         self.revisions_dir = self.bookkeeping_dir / "revisions"
-        self.snapshots_dir = self.revisions_dir / "snapshots"
+        self.snapshots_dir = self.revisions_dir / "snapshots"  # legacy layout
+        self.revision_store = RevisionStore(self.revisions_dir)
         self.backups_dir = self.root / "backups"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # Lazy-loaded engine references (avoid import errors if subsystems
         # are broken -- this module must always be importable).
@@ -154,16 +162,26 @@ class ErrorRecoveryManager:
     def _backup_file(self, file_path: str) -> str | None:
         """Create a timestamped backup of a file before modifying it.
 
-        Returns the backup path, or None if the file does not exist.
+        Documents held by SQLite entity storage are exported to the
+        backup as JSON.  Returns the backup path, or None if the file
+        does not exist.
         """
+        stored = None
         if not os.path.exists(file_path):
-            return None
+            if self.storage.name == "json":
+                return None
+            stored = self.storage.read(file_path)
+            if stored is None:
+                return None
         os.makedirs(str(self.backups_dir), exist_ok=True)
         rel = os.path.relpath(file_path, str(self.root))
         safe_name = rel.replace(os.sep, "_").replace("/", "_")
         backup_name = f"{_now_stamp()}_{safe_name}"
         backup_path = str(self.backups_dir / backup_name)
-        shutil.copy2(file_path, backup_path)
+        if stored is not None:
+            _safe_write_json(backup_path, stored)
+        else:
+            shutil.copy2(file_path, backup_path)
         return backup_path
 
     # ------------------------------------------------------------------
@@ -174,23 +192,25 @@ class ErrorRecoveryManager:
         """Yield (path, entity_type_folder) for every JSON file under entities/."""
         if not self.entities_dir.exists():
             return
-        for json_path in self.entities_dir.rglob("*.json"):
+        for abs_path, _, _ in _iter_json_files(self.entities_dir):
             # Determine the entity type from the immediate parent folder
-            entity_type = json_path.parent.name
-            yield str(json_path), entity_type
+            entity_type = os.path.basename(os.path.dirname(abs_path))
+            yield abs_path, entity_type
 
     def _load_all_entities(self) -> dict:
-        """Load all valid entity files. Returns dict of entity_id -> (path, data)."""
-        entities = {}
-        for path, _ in self._iter_entity_files():
-            data = _safe_read_json(path)
-            if data is None:
-                continue
-            meta = data.get("_meta", {})
-            entity_id = meta.get("id") or data.get("id")
-            if entity_id:
-                entities[entity_id] = (path, data)
-        return entities
+        """Load all valid entity files. Returns dict of entity_id -> (path, data).
+
+        Reads through the entity storage backend; for the JSON backend
+        the shared journal means unchanged files are not re-parsed.
+        """
+        if self.storage.name == "json" and not self.entities_dir.exists():
+            return {}
+        docs = self.storage.load_all()
+        paths = self.storage.entity_paths()
+        return {
+            entity_id: (str(self.root / paths[entity_id]), data)
+            for entity_id, data in docs.items() if entity_id in paths
+        }
 
     # ==================================================================
     # 1. HEALTH CHECKS
@@ -600,7 +620,7 @@ class ErrorRecoveryManager:
                 if eid not in json_entities:
                     file_path = meta.get("file_path", "")
                     abs_path = self.root / file_path if file_path else None
-                    if abs_path is None or not abs_path.exists():
+                    if abs_path is None or not self.storage.exists(abs_path):
                         issues.append({
                             "message": (
                                 f"Entity '{eid}' is listed in state.json but "
@@ -866,15 +886,15 @@ class ErrorRecoveryManager:
                         actions.append({
                             "action": "restore_from_snapshot",
                             "file": path,
-                            "snapshot": snapshot,
+                            "snapshot": snapshot["label"],
                             "message": f"Restore {basename} from revision snapshot.",
                         })
                         if not dry_run:
                             self._backup_file(path)
-                            shutil.copy2(snapshot, path)
+                            _safe_write_json(path, snapshot["data"])
                             self._log_recovery_action(
                                 "repair_json",
-                                f"Restored {basename} from snapshot {snapshot}."
+                                f"Restored {basename} from snapshot {snapshot['label']}."
                             )
                     else:
                         actions.append({
@@ -904,7 +924,7 @@ class ErrorRecoveryManager:
             try:
                 from engine.sqlite_sync import SQLiteSyncEngine
                 sync = SQLiteSyncEngine(str(self.root))
-                count = sync.full_sync()
+                count = sync.full_sync(force=True)
                 sync.close()
                 actions.append({
                     "action": "full_sync",
@@ -1146,7 +1166,7 @@ class ErrorRecoveryManager:
 
         # Step 3: Use the most recent version
         best = versions[0]  # Already sorted newest first
-        data = _safe_read_json(best["path"])
+        data = self.load_entity_version(best)
         if data is None:
             return {
                 "recovered": False,
@@ -1172,10 +1192,13 @@ class ErrorRecoveryManager:
     def find_entity_versions(self, entity_id: str) -> list:
         """Search all available sources for versions of an entity.
 
-        Searches: current file, revision snapshots, and backups directory.
+        Searches: current file, the revision store (plus any legacy
+        snapshot files), and backups directory.
 
         Returns a list of version dicts sorted by timestamp (newest first),
-        each with ``source``, ``path``, and ``timestamp``.
+        each with ``source``, ``path``, and ``timestamp``.  Revision-store
+        entries also carry ``version`` and ``hash``; their ``path`` is the
+        compressed blob, so read them with :meth:`load_entity_version`.
         """
         versions = []
 
@@ -1191,6 +1214,14 @@ class ErrorRecoveryManager:
             })
 
         # Source 2: Revision snapshots
+        for rev in self.revision_store.versions(entity_id):
+            versions.append({
+                "source": "revision_snapshot",
+                "path": str(self.revision_store.blob_path(rev["hash"])),
+                "timestamp": rev["timestamp"],
+                "version": rev["version"],
+                "hash": rev["hash"],
+            })
         if self.snapshots_dir.exists():
             pattern = str(self.snapshots_dir / f"{entity_id}_*.json")
             for snapshot_path in sorted(glob.glob(pattern), reverse=True):
@@ -1223,6 +1254,15 @@ class ErrorRecoveryManager:
         versions.sort(key=lambda v: v.get("timestamp", ""), reverse=True)
         return versions
 
+    def load_entity_version(self, version: dict):
+        """Return the document for one :meth:`find_entity_versions` entry.
+
+        Returns ``None`` if the version cannot be read.
+        """
+        if version.get("hash"):
+            return self.revision_store.load(version["hash"])
+        return _safe_read_json(version["path"])
+
     def rollback_entity(self, entity_id: str, version_timestamp: str) -> dict:
         """Roll back an entity to a specific version from revisions.
 
@@ -1256,7 +1296,7 @@ class ErrorRecoveryManager:
             }
 
         # Load the target version data
-        restore_data = _safe_read_json(target_version["path"])
+        restore_data = self.load_entity_version(target_version)
         if restore_data is None:
             return {
                 "success": False,
@@ -1273,14 +1313,13 @@ class ErrorRecoveryManager:
             meta = restore_data.get("_meta", {})
             entity_type = meta.get("entity_type", "unknown")
             entity_dir = self.entities_dir / entity_type
-            os.makedirs(str(entity_dir), exist_ok=True)
             current_path = str(entity_dir / f"{entity_id}.json")
 
         # Backup current file before overwriting
         self._backup_file(current_path)
 
         # Write the restored version
-        _safe_write_json(current_path, restore_data)
+        self.storage.write(current_path, entity_id, restore_data)
 
         self._log_recovery_action(
             "rollback_entity",
@@ -1748,7 +1787,7 @@ class ErrorRecoveryManager:
         path = self._find_entity_file(entity_id)
         if path is None:
             return None
-        data = _safe_read_json(path)
+        data = self.storage.read(path)
         if data is None:
             return None
         # Verify the entity ID matches
@@ -1772,17 +1811,13 @@ class ErrorRecoveryManager:
                 file_path = entry.get("file_path", "")
                 if file_path:
                     full = self.root / file_path if not os.path.isabs(file_path) else Path(file_path)
-                    if full.exists():
+                    if self.storage.exists(full):
                         return str(full)
 
-        # Fallback: scan entities directory
-        if self.entities_dir.exists():
-            for json_path in self.entities_dir.rglob("*.json"):
-                data = _safe_read_json(str(json_path))
-                if data and data.get("_meta", {}).get("id") == entity_id:
-                    return str(json_path)
-                if data and data.get("id") == entity_id:
-                    return str(json_path)
+        # Fallback: rescan the storage (stat-only for known JSON files)
+        if self.storage.name != "json" or self.entities_dir.exists():
+            self.storage.scan()
+            return self.storage.path_for(entity_id)
 
         return None
 
@@ -1809,8 +1844,17 @@ class ErrorRecoveryManager:
 
         return None
 
-    def _find_latest_snapshot(self, entity_id: str) -> str | None:
-        """Find the most recent revision snapshot for an entity."""
+    def _find_latest_snapshot(self, entity_id: str) -> dict | None:
+        """Find the most recent readable revision snapshot for an entity.
+
+        Returns ``{"label": ..., "data": ...}`` or ``None``.
+        """
+        for rev in self.revision_store.versions(entity_id):
+            data = self.revision_store.load(rev["hash"])
+            if data is not None:
+                return {"label": f"version {rev['version']} ({rev['timestamp']})",
+                        "data": data}
+
         if not self.snapshots_dir.exists():
             return None
 
@@ -1818,7 +1862,8 @@ class ErrorRecoveryManager:
         snapshots = sorted(glob.glob(pattern), reverse=True)
 
         for snapshot_path in snapshots:
-            if _safe_read_json(snapshot_path) is not None:
-                return snapshot_path
+            data = _safe_read_json(snapshot_path)
+            if data is not None:
+                return {"label": snapshot_path, "data": data}
 
         return None
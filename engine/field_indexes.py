@@ -0,0 +1,129 @@
+"""
+engine/field_indexes.py -- Registry of indexed entity fields
+
+The SQLite mirror (engine/sqlite_sync.py) stores each entity's full
+document in ``entities.data``, so any field can be filtered with
+``json_extract`` -- but without an index that means parsing every row.
+Fields that are queried often ("all gods of the sea domain", "cities
+with more than 10,000 people") get an expression index instead.
+
+Which fields are indexed is declared in the template schemas: a
+top-level property marked ``"x-indexed": true`` is indexed, e.g.::
+
+    "domain_primary": {
+      "type": "string",
+      "x-indexed": true,
+      "description": "The god's primary domain ..."
+    }
+
+:func:`collect_field_indexes` reads those markers into
+:class:`FieldIndex` records -- one per field name, merged across every
+template that declares it -- which
+:meth:`SQLiteSyncEngine.query_entities` accepts as filter and sort
+columns.
+
+Usage::
+
+    from engine.field_indexes import collect_field_indexes
+
+    fields = collect_field_indexes("C:/Worldbuilding-Interactive-Program/templates")
+    fields["domain_primary"].expression   # "json_extract(data, '$.domain_primary')"
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+# Template property marker that requests an index
+INDEX_MARKER = "x-indexed"
+
+# Prefix of the SQLite index names owned by this registry
+INDEX_PREFIX = "idx_field_"
+
+# Field names are spliced into SQL, so only plain identifiers qualify
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# JSON Schema scalar types that json_extract returns as SQL values
+_INDEXABLE_TYPES = frozenset({"string", "integer", "number", "boolean"})
+
+
+class FieldIndex(NamedTuple):
+    """One indexed entity field.
+
+    Attributes
+    ----------
+    name : str
+        The top-level document field, e.g. ``"population"``.
+    types : tuple[str, ...]
+        The JSON Schema types the declaring templates give it.
+    templates : tuple[str, ...]
+        ``$id`` of every template that marks the field as indexed.
+    """
+
+    name: str
+    types: tuple
+    templates: tuple
+
+    @property
+    def expression(self) -> str:
+        """The SQL expression the index is built on (and queries must use)."""
+        return f"json_extract(data, '$.{self.name}')"
+
+    @property
+    def index_name(self) -> str:
+        """Name of the SQLite index over :attr:`expression`."""
+        return f"{INDEX_PREFIX}{self.name}"
+
+    @property
+    def create_sql(self) -> str:
+        """``CREATE INDEX`` statement for this field."""
+        return (
+            f"CREATE INDEX IF NOT EXISTS {self.index_name} "
+            f"ON entities({self.expression})"
+        )
+
+
+def collect_field_indexes(templates_dir) -> dict[str, FieldIndex]:
+    """Return ``{field_name: FieldIndex}`` for every ``x-indexed`` property.
+
+    Parameters
+    ----------
+    templates_dir : str or pathlib.Path
+        The ``templates/`` directory to scan (recursively).  A missing
+        directory yields an empty registry.
+
+    Notes
+    -----
+    Properties whose names are not plain identifiers, or whose type is
+    not a JSON scalar (arrays and objects are not comparable with a
+    single index lookup), are ignored.
+    """
+    types: dict[str, set] = {}
+    templates: dict[str, list] = {}
+    root = Path(templates_dir)
+    if not root.is_dir():
+        return {}
+    for path in sorted(root.rglob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as fh:
+                schema = json.load(fh)
+        except (OSError, ValueError):
+            continue
+        properties = schema.get("properties") if isinstance(schema, dict) else None
+        if not isinstance(properties, dict):
+            continue
+        template_id = schema.get("$id", path.stem)
+        for name, prop in properties.items():
+            if not isinstance(prop, dict) or prop.get(INDEX_MARKER) is not True:
+                continue
+            declared = prop.get("type", "string")
+            declared = set(declared) if isinstance(declared, list) else {declared}
+            if not _FIELD_NAME.match(name) or not declared <= _INDEXABLE_TYPES:
+                continue
+            types.setdefault(name, set()).update(declared)
+            templates.setdefault(name, []).append(template_id)
+    return {
+        name: FieldIndex(name, tuple(sorted(types[name])), tuple(templates[name]))
+        for name in sorted(types)
+    }
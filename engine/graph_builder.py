@@ -21,6 +21,10 @@ import logging
 import os
 from pathlib import Path
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import get_storage
+from engine.utils import safe_read_json as _safe_read_json
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -31,8 +35,6 @@ except ImportError:
         "Install it with: pip install networkx"
     )
 
-from engine.utils import safe_read_json as _safe_read_json
-
 
 # ---------------------------------------------------------------------------
 # WorldGraph
@@ -53,6 +55,10 @@ class WorldGraph:
         self.entities_dir = self.root / "user-world" / "entities"
         self.templates_dir = self.root / "templates"
         self.state_path = self.root / "user-world" / "state.json"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # The directed graph -- nodes are entity IDs, edges are relationships
         self.graph: nx.DiGraph = nx.DiGraph()
@@ -133,22 +139,10 @@ class WorldGraph:
         if entities is not None:
             entity_files = dict(entities)
         else:
-            # Original behaviour: read from disk
-            entity_files = {}
-            if not self.entities_dir.exists():
+            # Read through the entity storage backend
+            if self.storage.name == "json" and not self.entities_dir.exists():
                 return
-
-            for json_path in self.entities_dir.rglob("*.json"):
-                data = _safe_read_json(str(json_path))
-                if not data:
-                    continue
-
-                meta = data.get("_meta", {})
-                entity_id = meta.get("id") or data.get("id")
-                if not entity_id:
-                    continue
-
-                entity_files[entity_id] = data
+            entity_files = self.storage.load_all()
 
         # Pass 1: create nodes
         for entity_id, data in entity_files.items():
@@ -244,6 +238,35 @@ class WorldGraph:
         # reverse index (O(1) lookup instead of O(n) file scan).
         self._add_inbound_edges_for(entity_id)
 
+    def add_entities(self, entities: dict[str, dict]) -> None:
+        """Add or refresh many entities at once.
+
+        All nodes are added before any edges are resolved, so members of
+        the batch may reference each other in any order.
+
+        Parameters
+        ----------
+        entities : dict[str, dict]
+            ``{entity_id: entity_data}`` full entity documents.
+        """
+        self._invalidate_undirected()
+        for entity_id in entities:
+            # Drop stale outbound edges of updated entities
+            if entity_id in self.graph:
+                self.graph.remove_edges_from(list(self.graph.out_edges(entity_id)))
+        for entity_id, entity_data in entities.items():
+            meta = entity_data.get("_meta", {})
+            self.graph.add_node(
+                entity_id,
+                entity_type=meta.get("entity_type", ""),
+                name=entity_data.get("name", entity_id),
+                file_path=meta.get("file_path", ""),
+                step_created=meta.get("step_created"),
+                status=meta.get("status", "draft"),
+            )
+        for entity_id, entity_data in entities.items():
+            self.add_entity(entity_id, entity_data)
+
     def add_relationship(
         self,
         source_id: str,
@@ -300,6 +323,24 @@ class WorldGraph:
         """
         self._dirty_ids.add(entity_id)
 
+    def apply_changes(self, changes) -> None:
+        """Apply an :class:`~engine.entity_journal.ChangeSet` to the graph.
+
+        Removed entities are dropped; added and modified ones are
+        re-added from the documents the journal already parsed.  A
+        no-op before the first build.
+        """
+        if not self._built or not changes:
+            return
+        for entity_id in changes.removed:
+            self.remove_entity(entity_id)
+            self._dirty_ids.discard(entity_id)
+        for entity_id, data in changes.upserts().items():
+            if entity_id in self.graph:
+                self.remove_entity(entity_id)
+            self.add_entity(entity_id, data)
+            self._dirty_ids.discard(entity_id)
+
     def rebuild_if_dirty(self) -> bool:
         """Incrementally refresh only dirty entities.
 
@@ -313,6 +354,8 @@ class WorldGraph:
         if not self._dirty_ids:
             return False
 
+        # Pick up files created since the last scan so path lookups hit
+        self.storage.scan()
         dirty = set(self._dirty_ids)
         self._dirty_ids.clear()
 
@@ -321,17 +364,8 @@ class WorldGraph:
             if eid in self.graph:
                 self.graph.remove_node(eid)
 
-            # Re-read entity from disk and re-add
-            entity_file = None
-            if self.entities_dir.exists():
-                for json_path in self.entities_dir.rglob("*.json"):
-                    data = _safe_read_json(str(json_path))
-                    if not data:
-                        continue
-                    meta = data.get("_meta", {})
-                    if (meta.get("id") or data.get("id")) == eid:
-                        entity_file = data
-                        break
+            # Re-read entity from storage (path lookup) and re-add
+            entity_file = self.storage.read_entity(eid)
 
             if entity_file is not None:
                 self.add_entity(eid, entity_file)
@@ -627,16 +661,13 @@ class WorldGraph:
         """Serialize the current graph to ``runtime/graph_cache.json``.
 
         Uses ``nx.node_link_data`` for a portable JSON representation.
-        Also stores the entity file count so staleness can be checked on
-        load.
+        Also stores the entity storage's content fingerprint so staleness
+        can be checked on load.
         """
         try:
             self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-            entity_count = 0
-            if self.entities_dir.exists():
-                entity_count = sum(1 for _ in self.entities_dir.rglob("*.json"))
             payload = {
-                "entity_file_count": entity_count,
+                "entity_fingerprint": self.storage.fingerprint(),
                 "graph": nx.node_link_data(self.graph),
             }
             with open(self._cache_path, "w", encoding="utf-8") as fh:
@@ -654,7 +685,8 @@ class WorldGraph:
         """Try to load the graph from ``runtime/graph_cache.json``.
 
         Returns ``True`` if the cache was loaded successfully and is
-        still fresh (entity file count matches).  Returns ``False`` if
+        still fresh (the entity storage fingerprint matches, i.e. no
+        entity file was added, removed or edited since it was saved).  Returns ``False`` if
         the cache is missing, corrupt, or stale.
         """
         if not self._cache_path.exists():
@@ -667,16 +699,14 @@ class WorldGraph:
             logger.debug("Failed to read graph cache", exc_info=True)
             return False
 
-        # Validate freshness: compare entity file count
-        cached_count = payload.get("entity_file_count", -1)
-        current_count = 0
-        if self.entities_dir.exists():
-            current_count = sum(1 for _ in self.entities_dir.rglob("*.json"))
-
-        if cached_count != current_count:
+        # Validate freshness: compare content fingerprints
+        self.storage.scan()
+        cached = payload.get("entity_fingerprint")
+        current = self.storage.fingerprint()
+        if cached != current:
             logger.debug(
-                "Graph cache stale: cached %d files, found %d on disk",
-                cached_count, current_count,
+                "Graph cache stale: fingerprint %s, found %s on disk",
+                cached, current,
             )
             return False
 
@@ -52,12 +52,14 @@ Dependencies: Python standard library only (json, pathlib, random, datetime, re)
 
 import json
 import logging
-import os
 import random
 import re
 from datetime import datetime, timezone
 from pathlib import Path
 
+from engine.utils import safe_append_jsonl as _append_jsonl
+from engine.utils import safe_read_json as _safe_read_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,10 +67,6 @@ logger = logging.getLogger(__name__)
 # Helpers
 # ---------------------------------------------------------------------------
 
-from engine.utils import safe_read_json as _safe_read_json
-from engine.utils import safe_write_json as _safe_write_json
-
-
 def _now_iso() -> str:
     """Return the current UTC time as an ISO 8601 string."""
     return datetime.now(timezone.utc).isoformat()
@@ -96,13 +94,6 @@ def _read_jsonl(path: str) -> list[dict]:
     return entries
 
 
-def _append_jsonl(path: str, record: dict) -> None:
-    """Append a single JSON record as a new line to a JSONL file."""
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(record, ensure_ascii=False) + "\n")
-
-
 # ---------------------------------------------------------------------------
 # Option ID generation
 # ---------------------------------------------------------------------------
@@ -380,15 +371,9 @@ class OptionGenerator:
         # Gather from data manager
         if self._data_manager:
             try:
-                all_entities = self._data_manager.list_entities()
-                result["all_entities"] = all_entities
-
-                # Count by type
-                type_counts: dict[str, int] = {}
-                for ent in all_entities:
-                    etype = ent.get("entity_type", "unknown")
-                    type_counts[etype] = type_counts.get(etype, 0) + 1
-                result["entity_count_by_type"] = type_counts
+                result["all_entities"] = self._data_manager.list_entities()
+                # Counts come straight from the per-type index
+                result["entity_count_by_type"] = self._data_manager.entity_type_counts()
             except Exception:
                 logger.exception("Failed to gather canon entities from DataManager")
 
@@ -931,7 +916,7 @@ class OptionGenerator:
         }
 
         # Append to option-history.jsonl
-        _append_jsonl(str(self._history_path), record)
+        _append_jsonl(str(self._history_path), record, fsync=False)
 
         # Record in bookkeeper if available
         if self._bookkeeper:
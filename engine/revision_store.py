@@ -0,0 +1,403 @@
+"""
+engine/revision_store.py -- Content-addressed revision snapshots
+
+Stores the pre-update snapshots that DataManager takes before every
+entity write.  Replaces the old one-file-per-snapshot layout
+(``revisions/snapshots/{id}_{timestamp}.json``), which collided on two
+updates within a second and forced readers to glob thousands of files.
+
+Layout (under ``bookkeeping/revisions/``)::
+
+    objects/ab/cdef0123...     one blob per distinct document (sha256 of
+                               its canonical JSON), compressed
+    chains/{entity_id}.jsonl   append-only version chain per entity:
+                               {"v": 3, "ts": "...", "h": "<sha256>"}
+
+Identical documents share one blob.  A blob may be stored as a
+top-level field delta against the entity's previous version; every
+``MAX_DELTA_CHAIN`` versions a full copy is stored instead so that
+reconstruction stays cheap.  Blobs are compressed with zstandard when
+it is installed, otherwise zlib.
+
+Listing an entity's versions reads only that entity's chain file, and
+loading a version reads at most ``MAX_DELTA_CHAIN`` blobs, so both stay
+fast regardless of how many revisions exist in total.
+
+Usage::
+
+    from engine.revision_store import RevisionStore
+
+    store = RevisionStore("C:/.../bookkeeping/revisions")
+    store.save("thorin-stormkeeper-a1b2", entity_doc)
+    for version in store.versions("thorin-stormkeeper-a1b2"):
+        print(version["version"], version["timestamp"])
+    doc = store.load_version("thorin-stormkeeper-a1b2", version=1)
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from engine.utils import JSON_DECODE_ERRORS
+from engine.utils import json_loads as _json_loads
+from engine.utils import safe_append_jsonl as _safe_append_jsonl
+from engine.utils import safe_read_json as _safe_read_json
+from engine.utils import safe_write_bytes as _safe_write_bytes
+
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Blob encoding
+# ---------------------------------------------------------------------------
+
+# One-byte blob header identifying the compression used.
+_RAW = b"J"
+_ZLIB = b"Z"
+_ZSTD = b"S"
+
+
+def _canonical(doc) -> bytes:
+    """Return the canonical JSON encoding used for content hashing.
+
+    Always uses the stdlib encoder (sorted keys, no whitespace) so the
+    hash does not depend on which JSON codec is active.
+    """
+    return json.dumps(
+        doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def _compress(raw: bytes, compression: str) -> bytes:
+    if compression == "zstd" and _zstd is not None:
+        return _ZSTD + _zstd.ZstdCompressor(level=3).compress(raw)
+    if compression in ("zlib", "zstd"):
+        return _ZLIB + zlib.compress(raw, 6)
+    return _RAW + raw
+
+
+def _decompress(blob: bytes) -> bytes:
+    kind, body = blob[:1], blob[1:]
+    if kind == _ZLIB:
+        return zlib.decompress(body)
+    if kind == _ZSTD:
+        if _zstd is None:
+            raise ValueError("blob is zstd-compressed but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(body)
+    if kind == _RAW:
+        return body
+    raise ValueError(f"unknown blob header {kind!r}")
+
+
+def _field_delta(base: dict, doc: dict) -> dict:
+    """Return a top-level delta turning *base* into *doc*."""
+    changed = {k: v for k, v in doc.items() if k not in base or base[k] != v}
+    removed = [k for k in base if k not in doc]
+    return {"set": changed, "unset": removed}
+
+
+def _file_size(path) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+def _end_torn_line(path) -> None:
+    """Terminate a partial last line (crash mid-append) before appending."""
+    try:
+        with open(path, "rb+") as fh:
+            fh.seek(0, os.SEEK_END)
+            if fh.tell() == 0:
+                return
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                fh.write(b"\n")
+    except OSError:
+        pass
+
+
+def default_compression() -> str:
+    """Return ``"zstd"`` when zstandard is installed, else ``"zlib"``."""
+    return "zstd" if _zstd is not None else "zlib"
+
+
+# ---------------------------------------------------------------------------
+# RevisionStore
+# ---------------------------------------------------------------------------
+
+class RevisionStore:
+    """Content-addressed, optionally delta-compressed entity snapshots.
+
+    Parameters
+    ----------
+    revisions_dir : str or pathlib.Path
+        The ``bookkeeping/revisions`` directory.
+    compression : str, optional
+        ``"zstd"``, ``"zlib"`` or ``"none"``.  Defaults to zstd when
+        installed, otherwise zlib.
+    delta : bool, optional
+        Store versions as deltas against the previous version when that
+        is smaller (default ``True``).
+    """
+
+    # A full copy is stored at least this often along a delta chain.
+    MAX_DELTA_CHAIN = 8
+
+    def __init__(self, revisions_dir, compression: str | None = None,
+                 delta: bool = True):
+        self.revisions_dir = Path(revisions_dir)
+        self.objects_dir = self.revisions_dir / "objects"
+        self.chains_dir = self.revisions_dir / "chains"
+        self.compression = compression or default_compression()
+        self.delta = delta
+        self._lock = threading.Lock()
+        # entity_id -> (version, timestamp, hash, delta_depth, chain_size)
+        # of the newest version, so saves do not re-read the chain file.
+        # chain_size detects appends made by another store instance.
+        self._heads: dict[str, tuple] = {}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def save(self, entity_id: str, doc: dict) -> dict:
+        """Record *doc* as the newest version of *entity_id*.
+
+        Saving a document identical to the current newest version is a
+        no-op that returns the existing version.
+
+        Returns
+        -------
+        dict
+            ``{"version", "timestamp", "hash"}`` of the stored version.
+        """
+        raw = _canonical(doc)
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            head = self._head(entity_id)
+            if head is not None and head[2] == digest:
+                return {"version": head[0], "timestamp": head[1], "hash": digest}
+
+            if self.blob_path(digest).exists():
+                depth = self._blob_depth(digest)  # deduplicated
+            else:
+                depth = self._write_blob(digest, raw, doc, head)
+
+            version = head[0] + 1 if head else 1
+            timestamp = datetime.now(UTC)
+            if head is not None:
+                # Keep timestamps strictly increasing so each one is a
+                # unique version key, even for saves in the same microsecond.
+                previous = datetime.fromisoformat(head[1])
+                if timestamp <= previous:
+                    timestamp = previous + timedelta(microseconds=1)
+            ts = timestamp.isoformat()
+
+            chain_path = self._chain_path(entity_id)
+            _end_torn_line(chain_path)
+            _safe_append_jsonl(str(chain_path), {"v": version, "ts": ts, "h": digest})
+            self._heads[entity_id] = (version, ts, digest, depth, _file_size(chain_path))
+        return {"version": version, "timestamp": ts, "hash": digest}
+
+    def _write_blob(self, digest: str, raw: bytes, doc: dict, head) -> int:
+        """Write a blob for *doc*; return its delta depth (0 = full copy)."""
+        payload = b"F" + raw
+        depth = 0
+        if self.delta and head is not None and isinstance(doc, dict):
+            base_depth = head[3]
+            if base_depth < self.MAX_DELTA_CHAIN - 1:
+                base = self.load(head[2])
+                if isinstance(base, dict):
+                    delta = {"base": head[2], **_field_delta(base, doc)}
+                    delta_raw = b"D" + _canonical(delta)
+                    if len(delta_raw) < len(payload):
+                        payload = delta_raw
+                        depth = base_depth + 1
+        # Durable before the chain entry that names it is appended
+        _safe_write_bytes(str(self.blob_path(digest)),
+                          bytes([depth]) + _compress(payload, self.compression))
+        return depth
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def versions(self, entity_id: str) -> list[dict]:
+        """Return every stored version of *entity_id*, newest first.
+
+        Each entry has ``version`` (1-based, increasing), ``timestamp``
+        (ISO 8601, unique per entity) and ``hash``.
+        """
+        entries = self._read_chain(entity_id)
+        return [
+            {"version": e["v"], "timestamp": e["ts"], "hash": e["h"]}
+            for e in reversed(entries)
+        ]
+
+    def latest(self, entity_id: str) -> dict | None:
+        """Return the newest stored document for *entity_id*, or ``None``."""
+        head = self._head(entity_id)
+        return self.load(head[2]) if head else None
+
+    def load_version(self, entity_id: str, version: int | None = None,
+                     timestamp: str | None = None) -> dict | None:
+        """Return the document for one version of *entity_id*.
+
+        Select the version by number or by timestamp (as returned by
+        :meth:`versions`); with neither, the newest version is returned.
+        Returns ``None`` if no matching version exists or it cannot be read.
+        """
+        if version is None and timestamp is None:
+            return self.latest(entity_id)
+        for entry in reversed(self._read_chain(entity_id)):
+            if entry["v"] == version or entry["ts"] == timestamp:
+                return self.load(entry["h"])
+        return None
+
+    def load(self, digest: str):
+        """Return the document stored under *digest*, or ``None``."""
+        try:
+            return self._load(digest, self.MAX_DELTA_CHAIN + 1)
+        except (OSError, ValueError, KeyError, zlib.error, *JSON_DECODE_ERRORS):
+            logger.warning("Could not read revision blob %s", digest, exc_info=True)
+            return None
+
+    def _load(self, digest: str, budget: int):
+        if budget <= 0:
+            raise ValueError("delta chain too long")
+        with open(self.blob_path(digest), "rb") as fh:
+            blob = fh.read()
+        payload = _decompress(blob[1:])
+        kind, body = payload[:1], payload[1:]
+        if kind == b"F":
+            return _json_loads(body)
+        delta = _json_loads(body)
+        doc = self._load(delta["base"], budget - 1)
+        for key in delta["unset"]:
+            doc.pop(key, None)
+        doc.update(delta["set"])
+        return doc
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the on-disk path of the blob stored under *digest*."""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def entity_ids(self) -> list[str]:
+        """Return the IDs of every entity with at least one stored version."""
+        if not self.chains_dir.exists():
+            return []
+        return sorted(
+            name[:-len(".jsonl")]
+            for name in os.listdir(self.chains_dir)
+            if name.endswith(".jsonl")
+        )
+
+    def stats(self) -> dict:
+        """Return blob/chain counts and the on-disk size of the store."""
+        blobs = 0
+        size = 0
+        if self.objects_dir.exists():
+            for fan in os.scandir(self.objects_dir):
+                if not fan.is_dir():
+                    continue
+                for entry in os.scandir(fan.path):
+                    blobs += 1
+                    size += entry.stat().st_size
+        return {
+            "blobs": blobs,
+            "blob_bytes": size,
+            "entities": len(self.entity_ids()),
+            "compression": self.compression,
+        }
+
+    # ------------------------------------------------------------------
+    # Legacy snapshots
+    # ------------------------------------------------------------------
+
+    def import_legacy_snapshots(self, snapshots_dir, remove: bool = False) -> int:
+        """Import old ``{id}_{timestamp}.json`` snapshot files.
+
+        Files are imported per entity in timestamp order.  With
+        *remove*, each file is deleted once its content is safely in the
+        store.
+
+        Returns
+        -------
+        int
+            Number of files imported.
+        """
+        snapshots_dir = Path(snapshots_dir)
+        if not snapshots_dir.exists():
+            return 0
+        imported = 0
+        for path in sorted(snapshots_dir.glob("*_*.json")):
+            entity_id = path.name.rsplit("_", 1)[0]
+            doc = _safe_read_json(str(path))
+            if doc is None:
+                continue
+            self.save(entity_id, doc)
+            imported += 1
+            if remove:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+        return imported
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _chain_path(self, entity_id: str) -> Path:
+        return self.chains_dir / f"{entity_id}.jsonl"
+
+    def _blob_depth(self, digest: str) -> int:
+        try:
+            with open(self.blob_path(digest), "rb") as fh:
+                return fh.read(1)[0]
+        except (OSError, IndexError):
+            return self.MAX_DELTA_CHAIN
+
+    def _head(self, entity_id: str):
+        chain_path = self._chain_path(entity_id)
+        size = _file_size(chain_path)
+        head = self._heads.get(entity_id)
+        if head is None or head[4] != size:
+            entries = self._read_chain(entity_id)
+            if not entries:
+                return None
+            last = entries[-1]
+            head = (last["v"], last["ts"], last["h"],
+                    self._blob_depth(last["h"]), size)
+            self._heads[entity_id] = head
+        return head
+
+    def _read_chain(self, entity_id: str) -> list[dict]:
+        """Return the chain entries for *entity_id*, oldest first.
+
+        A torn final line (from a crash mid-append) is ignored.
+        """
+        try:
+            with open(self._chain_path(entity_id), "rb") as fh:
+                lines = fh.read().splitlines()
+        except OSError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entry = _json_loads(line)
+            except JSON_DECODE_ERRORS:
+                continue
+            if isinstance(entry, dict) and {"v", "ts", "h"} <= entry.keys():
+                entries.append(entry)
+        return entries
@@ -0,0 +1,139 @@
+"""
+engine/sqlite_maintenance.py -- Idle-time upkeep of the SQLite mirror
+
+Every entity save rewrites that entity's rows in ``runtime/worldbuilding.db``.
+Over a day-long session the WAL file keeps growing, each FTS5 index
+splits into many small segments, and the planner statistics drift.
+:meth:`SQLiteSyncEngine.run_maintenance` puts all three right in a few
+budgeted steps; :class:`MaintenanceScheduler` runs it on a background
+thread whenever the engine has been idle for a while.
+
+A run is due when
+
+* there were writes since the last run, no write for ``idle_seconds``
+  and at least ``min_interval`` seconds have passed since the last run, or
+* the WAL file has grown past ``wal_limit_bytes`` -- then it runs even
+  while writes continue, so the WAL stays bounded under constant load.
+  If the previous run's checkpoint was blocked by a reader, the WAL
+  trigger also waits ``min_interval``, rather than retrying the whole
+  run every check while the reader holds on.
+
+Usage::
+
+    from engine.sqlite_maintenance import MaintenanceScheduler
+
+    scheduler = MaintenanceScheduler(sync, idle_seconds=30)
+    scheduler.start()
+    ...
+    scheduler.stop()
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceScheduler:
+    """Background thread that runs SQLite maintenance when the engine is idle.
+
+    Parameters
+    ----------
+    sync : SQLiteSyncEngine
+        The engine to maintain.
+    idle_seconds : float, optional
+        Quiet period after the last write before a run (default 30).
+    check_interval : float, optional
+        How often the thread checks whether a run is due (default 5).
+    min_interval : float, optional
+        Minimum seconds between idle-time runs (default 300).
+    wal_limit_bytes : int, optional
+        WAL size that triggers a run regardless of activity (default
+        64 MiB).
+    budget_seconds : float, optional
+        Budget of each run; see :meth:`SQLiteSyncEngine.run_maintenance`.
+    """
+
+    def __init__(self, sync, idle_seconds: float = 30.0, check_interval: float = 5.0,
+                 min_interval: float = 300.0, wal_limit_bytes: int = 64 * 1024 * 1024,
+                 budget_seconds: float | None = None):
+        self.sync = sync
+        self.idle_seconds = idle_seconds
+        self.check_interval = check_interval
+        self.min_interval = min_interval
+        self.wal_limit_bytes = wal_limit_bytes
+        self.budget_seconds = budget_seconds
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_run: float | None = None
+        self.runs = 0
+        self.last_report: dict = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="sqlite-maintenance", daemon=True,
+            )
+            self._thread.start()
+            logger.debug("SQLite maintenance scheduler started on %s", self.sync.db_path)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the scheduler and wait for a run in progress to finish."""
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join(timeout)
+                self._thread = None
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def is_due(self, now: float | None = None) -> bool:
+        """Return ``True`` if a maintenance run should happen now."""
+        now = time.monotonic() if now is None else now
+        interval_elapsed = self._last_run is None or now - self._last_run >= self.min_interval
+        if self.sync.wal_size() > self.wal_limit_bytes:
+            checkpoint_busy = self.last_report.get("checkpoint", {}).get("busy")
+            if interval_elapsed or not checkpoint_busy:
+                return True
+        if not self.sync.writes_since_maintenance:
+            return False
+        if now - self.sync.last_write_at < self.idle_seconds:
+            return False
+        return interval_elapsed
+
+    def run_now(self) -> dict:
+        """Run maintenance immediately; returns its report."""
+        report = self.sync.run_maintenance(budget_seconds=self.budget_seconds)
+        self._last_run = time.monotonic()
+        self.runs += 1
+        self.last_report = report
+        return report
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                if self.is_due():
+                    self.run_now()
+            except Exception:
+                logger.warning("SQLite maintenance failed", exc_info=True)
@@ -6,7 +6,9 @@ all JSON entity files stored in user-world/entities/.  The JSON files remain
 the authoritative source of truth; SQLite provides fast indexed queries and
 FTS5 full-text search.
 
-The database is always rebuildable from the JSON files via ``full_sync()``.
+The database is always rebuildable from the JSON files via
+``full_sync(force=True)``; a plain ``full_sync()`` only writes the
+entities whose source changed since the last sync.
 
 Usage:
     from engine.sqlite_sync import SQLiteSyncEngine
@@ -15,21 +17,42 @@ Usage:
     sync.full_sync()
 
     results = sync.search("storm god")
+    page = sync.search_page("stor", limit=20, prefix=True)
     gods = sync.query_by_type("gods")
     step7 = sync.query_by_step(7)
     stats = sync.get_stats()
+    sync.run_maintenance()          # when idle: ANALYZE, FTS merge, WAL checkpoint
     sync.close()
 """
 
+import contextlib
+import functools
+import hashlib
 import json
+import logging
 import os
+import re
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from pathlib import Path
+from typing import NamedTuple
 
+from engine.entity_journal import get_journal
+from engine.entity_storage import get_storage
+from engine.field_indexes import INDEX_PREFIX, collect_field_indexes
+from engine.utils import json_dumps as _json_dumps
 
 # ---------------------------------------------------------------------------
 # Schema DDL
 # ---------------------------------------------------------------------------
+#
+# The schema is versioned with ``PRAGMA user_version`` and upgraded by
+# the forward-only steps in SQLiteSyncEngine._MIGRATIONS.  The DDL below
+# is what step 1 creates; later schema changes belong in a new step,
+# not in these statements.
 
 _SCHEMA_SQL = """
 -- Main entity table
@@ -73,27 +96,302 @@ CREATE INDEX IF NOT EXISTS idx_xref_target ON cross_references(target_id);
 CREATE INDEX IF NOT EXISTS idx_claims_entity ON canon_claims(entity_id);
 """
 
-# FTS5 virtual table -- created separately because DROP/CREATE is used
-# during full rebuilds.
+# FTS5 virtual table -- created separately so a failure to create it
+# (no FTS5 in the SQLite build) does not stop the rest of the schema.
+# It is an external-content index over entity_search_content, whose
+# ``id`` is the rowid of the matching ``entities`` row; FTS5 reads that
+# table back for 'delete' and 'rebuild' commands and for snippets.
+# The 2- and 3-character prefix indexes keep search-as-you-type
+# (``search(..., prefix=True)``) from scanning the whole term list.
 _FTS_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS entity_search_content (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    entity_type TEXT,
+    tags TEXT,
+    description TEXT,
+    canon_claims_text TEXT
+);
+
 CREATE VIRTUAL TABLE IF NOT EXISTS entity_search USING fts5(
     name,
     entity_type,
     tags,
     description,
     canon_claims_text,
-    content='entities',
-    content_rowid='rowid',
+    content='entity_search_content',
+    content_rowid='id',
+    tokenize='porter unicode61',
+    prefix='2 3'
+);
+"""
+
+# Options an existing entity_search must have; older databases whose
+# index lacks any of them get it re-created by migration step 3.
+_FTS_REQUIRED_OPTIONS = ("content='entity_search_content'", "prefix='2 3'")
+
+# Migration step 4: canon_claims gets a stable ``id`` (implicit rowids
+# may be renumbered by VACUUM) and an FTS5 index over the claim text,
+# used for claim similarity (SQLiteSyncEngine.similar_claims).  Like
+# entity_search it is external-content, kept in step by the claim
+# upserts and deletes.
+_CLAIMS_WITH_ID_SQL = """
+CREATE TABLE canon_claims_v4 (
+    id INTEGER PRIMARY KEY,
+    entity_id TEXT NOT NULL,
+    claim TEXT NOT NULL,
+    refs TEXT
+);
+INSERT INTO canon_claims_v4 (entity_id, claim, refs)
+    SELECT entity_id, claim, refs FROM canon_claims ORDER BY rowid;
+DROP TABLE canon_claims;
+ALTER TABLE canon_claims_v4 RENAME TO canon_claims;
+CREATE INDEX IF NOT EXISTS idx_claims_entity ON canon_claims(entity_id);
+"""
+
+_CLAIM_FTS_CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS claim_search USING fts5(
+    claim,
+    content='canon_claims',
+    content_rowid='id',
     tokenize='porter unicode61'
 );
 """
 
+# Migration step 5: every name an entity goes by (its name plus any
+# aliases) and a trigram FTS5 index over them, for infix and
+# typo-tolerant name lookup (SQLiteSyncEngine.fuzzy_find).  The index
+# is external-content over entity_names, maintained like claim_search.
+_NAMES_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS entity_names (
+    id INTEGER PRIMARY KEY,
+    entity_id TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_names_entity ON entity_names(entity_id);
+"""
+
+_NAME_FTS_CREATE_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS name_search USING fts5(
+    name,
+    content='entity_names',
+    content_rowid='id',
+    tokenize='trigram'
+);
+"""
+
+# Candidate names for fuzzy_find(), given a name_search MATCH expression
+_NAME_CANDIDATES_SQL = """
+    SELECT n.entity_id, n.name
+    FROM name_search JOIN entity_names n ON n.id = name_search.rowid
+    WHERE name_search MATCH ?
+"""
+
+# Entity fields holding alternate names (a string or a list of strings)
+_ALIAS_FIELDS = ("aliases", "nicknames", "alternate_names")
+
+# fuzzy_find(): how many trigram candidates to re-rank per result
+# requested, and the cap when no limit is given
+_FUZZY_CANDIDATES_PER_RESULT = 10
+_FUZZY_MAX_CANDIDATES = 200
+
+# Migration step 6: a version counter per queried table, bumped in the
+# same transaction as any write that changes the table.  The query
+# result cache (SQLiteSyncEngine._cached_query) checks them, so writes
+# from other processes (hooks) invalidate it too.
+_VERSIONED_TABLES = ("entities", "cross_references", "canon_claims")
+
+_TABLE_VERSIONS_CREATE_SQL = """
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# highlight() markers around matched terms in similar_claims(); control
+# characters, so they cannot occur in claim text
+_MATCH_OPEN, _MATCH_CLOSE = "\x02", "\x03"
+_MATCHED_TERM = re.compile(f"{_MATCH_OPEN}(.*?){_MATCH_CLOSE}", re.DOTALL)
+
+# bm25() weights for the entity_search columns, in declaration order:
+# name, entity_type, tags, description, canon_claims_text.  A match in
+# the name counts most, then tags, description and canon claims.
+_SEARCH_WEIGHTS = (10.0, 1.0, 5.0, 2.0, 1.0)
+_RANK_SQL = "bm25(entity_search, {})".format(", ".join(str(w) for w in _SEARCH_WEIGHTS))
+
+# Pragmas for the bulk-load window (see SQLiteSyncEngine._bulk_load).
+# The database is a rebuildable mirror, so trading durability of the
+# load itself for speed is safe: a crash mid-load means a rebuild.
+_BULK_LOAD_PRAGMAS = (
+    ("synchronous", "OFF"),
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-65536"),  # 64 MiB
+)
+
+# Tables whose secondary indexes are dropped during a bulk load
+_BULK_LOAD_TABLES = ("entities", "cross_references", "canon_claims", "entity_names")
+
+# Recursive step of the graph traversal queries: follow every
+# cross-reference of a walked entity, in either direction.  Links to IDs
+# that are not synced entities are left out, as in the NetworkX
+# WorldGraph.  The OR join is answered from idx_xref_source and
+# idx_xref_target (a view over both directions would be materialised
+# in full on every query instead).
+_WALK_NEXT = "CASE WHEN x.source_id = walk.id THEN x.target_id ELSE x.source_id END"
+_WALK_FROM = """
+    FROM walk JOIN cross_references x
+        ON x.source_id = walk.id OR x.target_id = walk.id
+    WHERE x.target_id IN (SELECT id FROM entities)
+"""
+
+# Upper bound on the hop count of any traversal query
+MAX_TRAVERSAL_DEPTH = 10
+
+# Schema version a fully migrated database reports in PRAGMA
+# user_version; the version of the last SQLiteSyncEngine._MIGRATIONS step.
+SCHEMA_VERSION = 6
+
+# FTS5 indexes whose b-tree segments run_maintenance() merges
+_FTS_TABLES = ("entity_search", "claim_search", "name_search")
+
+# Read queries timed before and after maintenance, as (label, SQL).
+# Prefix and substring lookups touch every segment of their index, so
+# their cost tracks the segment count that maintenance keeps down.
+_MAINTENANCE_PROBES = (
+    ("search", "SELECT rowid FROM entity_search WHERE entity_search MATCH 'e*' LIMIT 50"),
+    ("claims", "SELECT rowid FROM claim_search WHERE claim_search MATCH 'e*' LIMIT 50"),
+    ("names", "SELECT rowid FROM name_search WHERE name_search MATCH 'the' LIMIT 50"),
+    ("by_type", "SELECT entity_type, COUNT(*) FROM entities GROUP BY entity_type"),
+)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-from engine.utils import safe_read_json as _safe_read_json
+logger = logging.getLogger(__name__)
+
+# Columns added to ``entities`` after the first release; databases
+# created before them are upgraded in place by migration step 2.
+_ADDED_ENTITY_COLUMNS = (
+    ("content_hash", "TEXT"),
+    ("source_mtime", "INTEGER"),
+)
+
+
+class _Migration(NamedTuple):
+    """One forward-only schema upgrade step.
+
+    Attributes
+    ----------
+    version : int
+        The ``user_version`` the database is at once the step has run.
+    description : str
+        What the step changes.
+    apply : callable
+        ``apply(engine)``; runs on the writer connection.  Steps must be
+        idempotent -- databases created before versioning start at
+        version 0 whatever they already contain, and a step interrupted
+        by a crash runs again.
+    resync : bool
+        Whether the step changes how rows are derived from the entity
+        documents.  If so every row is marked stale, and the next
+        ``full_sync()`` rewrites them through the ordinary incremental
+        reconciliation.  Steps that only add tables, columns or indexes
+        leave this ``False`` and need no resync.
+    """
+
+    version: int
+    description: str
+    apply: Callable
+    resync: bool = False
+
+
+def _content_hash(entity: dict, encoded: bytes | None = None) -> str:
+    """Return a hash of *entity*'s content for change detection.
+
+    The ``_rel_path`` keys some loaders attach are not part of the
+    document and are ignored, so the same file hashes the same however
+    it was loaded.  *encoded* is ``json_dumps(entity, indent=None)`` if
+    the caller already has it.
+    """
+    meta = entity.get("_meta")
+    has_meta_path = isinstance(meta, dict) and "_rel_path" in meta
+    if has_meta_path or "_rel_path" in entity:
+        entity = {k: v for k, v in entity.items() if k != "_rel_path"}
+        if has_meta_path:
+            entity["_meta"] = {k: v for k, v in meta.items() if k != "_rel_path"}
+        encoded = None
+    if encoded is None:
+        encoded = _json_dumps(entity, indent=None)
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def _search_row(rowid: int, entity: dict) -> tuple:
+    """Return the entity_search_content row for *entity*."""
+    return (
+        rowid,
+        entity.get("name", ""),
+        entity.get("_meta", {}).get("entity_type", ""),
+        _extract_text_field(entity, "tags"),
+        _extract_text_field(entity, "description"),
+        _extract_canon_claims_text(entity),
+    )
+
+
+def _claim_rows(entity_id: str, entity: dict) -> list[tuple[str, str, str]]:
+    """Return the ``(entity_id, claim, refs)`` canon_claims rows for *entity*."""
+    rows = []
+    for claim in entity.get("canon_claims", []):
+        if isinstance(claim, dict):
+            claim_text = claim.get("claim", "")
+            refs = _json_dumps(claim.get("references", []), indent=None).decode()
+        elif isinstance(claim, str):
+            claim_text = claim
+            refs = "[]"
+        else:
+            continue
+        if claim_text:
+            rows.append((entity_id, claim_text, refs))
+    return rows
+
+
+def _name_rows(entity_id: str, entity: dict) -> list[tuple[str, str]]:
+    """Return the ``(entity_id, name)`` entity_names rows for *entity*."""
+    names = [entity.get("name", entity_id)]
+    for field in _ALIAS_FIELDS:
+        value = entity.get(field)
+        names.extend([value] if isinstance(value, str) else value or ())
+    rows, seen = [], set()
+    for name in names:
+        if isinstance(name, str) and name.strip() and name.lower() not in seen:
+            seen.add(name.lower())
+            rows.append((entity_id, name.strip()))
+    return rows
+
+
+def _substring_distance(needle: str, haystack: str, cutoff: int | None = None) -> int:
+    """Return the fewest edits turning *needle* into a substring of *haystack*.
+
+    Levenshtein distance with free leading and trailing characters in
+    *haystack*, so ``"thor"`` is 0 from ``"asathor"`` and ``"stormkeper"``
+    is 1 from ``"thorin stormkeeper"``.  With *cutoff*, gives up (and
+    returns a larger value) as soon as the distance must exceed it.
+    """
+    previous = [0] * (len(haystack) + 1)
+    for i, char in enumerate(needle, start=1):
+        current = [i]
+        for j, other in enumerate(haystack, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char != other),
+            ))
+        previous = current
+        # A row's minimum never decreases further down the table
+        if cutoff is not None and min(previous) > cutoff:
+            break
+    return min(previous)
 
 
 def _extract_text_field(entity: dict, field: str) -> str:
@@ -184,6 +482,99 @@ def _extract_cross_references(entity: dict) -> list[tuple[str, str, str]]:
     return unique
 
 
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+
+class _ReaderPool:
+    """Read-only WAL connections to one database, one per thread.
+
+    Each thread gets its own connection on first use and keeps it for
+    later reads, so concurrent readers never share a connection (or a
+    lock) and, under WAL, never wait for the writer.  Connections of
+    threads that have exited are closed when the next one is opened.
+    """
+
+    def __init__(self, db_path: str):
+        # as_uri() percent-escapes '?', '#' and '%' in the path
+        self._uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[tuple[threading.Thread, sqlite3.Connection]] = []
+        self._closed = False
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and not self._closed:
+            return conn
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            # check_same_thread=False so that pruning and close() may
+            # close a connection from a thread other than its owner
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON")
+            alive = []
+            for thread, other in self._connections:
+                if thread.is_alive():
+                    alive.append((thread, other))
+                else:
+                    other.close()
+            alive.append((threading.current_thread(), conn))
+            self._connections = alive
+        self._local.conn = conn
+        return conn
+
+    def __len__(self):
+        return len(self._connections)
+
+    def close(self) -> None:
+        """Close every pooled connection; later reads raise."""
+        with self._lock:
+            self._closed = True
+            for _thread, conn in self._connections:
+                conn.close()
+            self._connections = []
+
+
+def _writes(method):
+    """Run an SQLiteSyncEngine method under the engine's writer lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _cached_query(*tables):
+    """Serve an SQLiteSyncEngine query from its result cache.
+
+    A cached result is reused until one of *tables* is written; see
+    :meth:`SQLiteSyncEngine.query_cache_stats`.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self._cached(method, tables, args, kwargs)
+        return wrapper
+    return decorate
+
+
+def _copy_result(value):
+    """Return a copy of a query result that callers may freely mutate."""
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    if isinstance(value, dict):
+        copied = value.copy()
+        for key, item in copied.items():
+            if isinstance(item, (list, dict)):
+                copied[key] = _copy_result(item)
+        return copied
+    return value
+
+
 # ---------------------------------------------------------------------------
 # SQLiteSyncEngine
 # ---------------------------------------------------------------------------
@@ -191,6 +582,12 @@ def _extract_cross_references(entity: dict) -> list[tuple[str, str, str]]:
 class SQLiteSyncEngine:
     """Sync layer that mirrors JSON entity files into a SQLite database.
 
+    Writes go through a single writer connection, serialised by an
+    internal lock.  Queries run on a pool of read-only connections, one
+    per calling thread, so they may be issued from any thread -- without
+    holding EngineManager's ``sqlite_sync`` lock -- concurrently with
+    each other and with syncs; each sees the last committed state.
+
     Parameters
     ----------
     project_root : str
@@ -198,53 +595,254 @@ class SQLiteSyncEngine:
         e.g. ``"C:/Worldbuilding-Interactive-Program"``.
     """
 
+    # Default bound of the query result cache (0 disables it)
+    QUERY_CACHE_MAX_ENTRIES = 128
+
+    # Defaults of run_maintenance(): wall-clock budget in seconds, rows
+    # ANALYZE samples per index, and b-tree pages per FTS5 merge step
+    MAINTENANCE_BUDGET_SECONDS = 0.5
+    MAINTENANCE_ANALYSIS_LIMIT = 1000
+    MAINTENANCE_MERGE_PAGES = 256
+    # Free pages returned to the OS per incremental vacuum step
+    MAINTENANCE_VACUUM_PAGES = 1024
+
     def __init__(self, project_root: str):
         self.root = Path(project_root).resolve()
         self.entities_dir = self.root / "user-world" / "entities"
         self.runtime_dir = self.root / "runtime"
         self.db_path = self.runtime_dir / "worldbuilding.db"
+        # Shared stat-based change journal over the entities tree
+        self.journal = get_journal(self.root)
+        # Where entity documents live (JSON file tree or SQLite)
+        self.storage = get_storage(self.root)
 
         # Ensure runtime/ exists
         os.makedirs(str(self.runtime_dir), exist_ok=True)
 
-        # Open (or create) the database
+        # Open (or create) the database.  This is the writer connection;
+        # queries use the per-thread read-only connections in _readers.
+        self._write_lock = threading.RLock()
         self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        # Let run_maintenance() hand free pages back to the OS.  Only
+        # takes effect on a new database, and must precede the switch
+        # to WAL; older databases keep auto_vacuum=NONE.
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         # Enable WAL mode for better concurrent read performance
         self._conn.execute("PRAGMA journal_mode=WAL")
         # Foreign keys are intentionally NOT enforced because
         # cross-references may point to entities not yet synced
         self._conn.execute("PRAGMA foreign_keys=OFF")
 
+        # Entity fields the templates mark "x-indexed" (see
+        # engine/field_indexes.py); query_entities() filters on them
+        self.field_indexes = {
+            name: field
+            for name, field in collect_field_indexes(self.root / "templates").items()
+            if name not in self._ALLOWED_COLUMNS
+        }
+
+        # Rows of each entity replaced by the open write transaction, as
+        # they were before and as rewritten: {entity_id: (xref_rows,
+        # claim_rows)}.  _commit() compares them to bump only the
+        # versions of tables that really changed.
+        self._old_rows: dict[str, tuple] = {}
+        self._new_rows: dict[str, list] = {}
+        self._dirty_tables: set[str] = set()
+
+        # LRU cache of query results: (method, args) -> (table
+        # versions, result).  Bounded by QUERY_CACHE_MAX_ENTRIES.
+        self._query_cache: OrderedDict[tuple, tuple] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._query_cache_max_entries = self.QUERY_CACHE_MAX_ENTRIES
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
+        self._query_cache_evictions = 0
+
+        # Write activity, for the idle-time maintenance scheduler (see
+        # engine/sqlite_maintenance.py): monotonic time of the last
+        # commit and commits since the last run_maintenance().
+        self.last_write_at = time.monotonic()
+        self.writes_since_maintenance = 0
+        # Report of the most recent run_maintenance()
+        self.last_maintenance: dict = {}
+
         # Create tables if they do not exist
         self._init_schema()
+        self._readers = _ReaderPool(str(self.db_path))
+        # Breakdown of the most recent full_sync() (see its docstring)
+        self.last_sync_stats: dict = {}
 
     # ------------------------------------------------------------------
     # Schema initialisation
     # ------------------------------------------------------------------
 
     def _init_schema(self) -> None:
-        """Create all tables, indexes, and the FTS5 virtual table."""
+        """Bring the schema up to :data:`SCHEMA_VERSION`.
+
+        Runs every migration step newer than the database's
+        ``user_version``, in order, recording the version after each
+        step so an interrupted upgrade resumes where it stopped.  A
+        database written by a newer program version is left as it is.
+        Expression indexes of the ``x-indexed`` template fields are
+        synced on every open, since they follow the templates rather
+        than the schema version.
+        """
+        self.schema_version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        for step in self._MIGRATIONS:
+            if step.version <= self.schema_version:
+                continue
+            step.apply(self)
+            if step.resync:
+                self._conn.execute(
+                    "UPDATE entities SET content_hash = NULL, source_mtime = NULL"
+                )
+            self._conn.execute(f"PRAGMA user_version = {int(step.version)}")
+            self._conn.commit()
+            self.schema_version = step.version
+        self._sync_field_indexes()
+        self._conn.commit()
+
+    # -- Migration steps ----------------------------------------------
+    #
+    # Append new steps to _MIGRATIONS below; never edit or reorder the
+    # released ones.
+
+    def _migrate_base_schema(self) -> None:
+        """Step 1: the entity, cross-reference and claim tables."""
         self._conn.executescript(_SCHEMA_SQL)
-        # FTS5 must be created in its own statement (not inside executescript
-        # for some SQLite builds, but generally fine).
+
+    def _migrate_change_columns(self) -> None:
+        """Step 2: the change-tracking columns full_sync() reconciles on."""
+        columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(entities)")
+        }
+        for column, decl in _ADDED_ENTITY_COLUMNS:
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE entities ADD COLUMN {column} {decl}")
+
+    def _migrate_search_index(self) -> None:
+        """Step 3: the external-content FTS5 index with prefix indexes.
+
+        Older databases indexed FTS5 directly over ``entities`` (which
+        lacks most of the indexed columns) or without prefix indexes.
+        Such an index is replaced and refilled from the stored rows --
+        the tokenizer and columns changed, so the index must be rebuilt,
+        but the entity rows themselves are still current.
+        """
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'entity_search'"
+        ).fetchone()
+        legacy_fts = row is not None and not all(
+            option in (row["sql"] or "") for option in _FTS_REQUIRED_OPTIONS
+        )
+        if legacy_fts:
+            self._conn.execute("DROP TABLE entity_search")
         try:
             self._conn.executescript(_FTS_CREATE_SQL)
         except sqlite3.OperationalError:
-            # FTS5 may already exist; that is fine.
-            pass
-        self._conn.commit()
+            # No FTS5 in this SQLite build; search() falls back to LIKE
+            return
+        if legacy_fts:
+            self._refill_search_index()
+
+    def _migrate_claim_search(self) -> None:
+        """Step 4: stable claim IDs and the claim_search FTS5 index.
+
+        The claim rows are copied as they are and the index is built
+        from them, so no resync is needed.
+        """
+        columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(canon_claims)")
+        }
+        if "id" not in columns:
+            self._conn.executescript(_CLAIMS_WITH_ID_SQL)
+        try:
+            self._conn.executescript(_CLAIM_FTS_CREATE_SQL)
+        except sqlite3.OperationalError:
+            # No FTS5 in this SQLite build; similar_claims() is unavailable
+            return
+        self._rebuild_claim_index()
+
+    def _migrate_name_search(self) -> None:
+        """Step 5: the entity_names table and its trigram index.
+
+        Filled from the stored rows (names from ``entities.name``,
+        aliases from ``entities.data``), so no resync is needed.
+        """
+        self._conn.executescript(_NAMES_CREATE_SQL)
+        self._conn.execute("DELETE FROM entity_names")
+        self._conn.executemany(
+            "INSERT INTO entity_names (entity_id, name) VALUES (?, ?)",
+            [
+                row
+                for entity_id, name, data in self._conn.execute(
+                    "SELECT id, name, data FROM entities"
+                )
+                for row in _name_rows(entity_id, {**json.loads(data), "name": name})
+            ],
+        )
+        try:
+            self._conn.executescript(_NAME_FTS_CREATE_SQL)
+        except sqlite3.OperationalError:
+            # No FTS5 trigram tokenizer; fuzzy_find() falls back to LIKE
+            return
+        self._rebuild_name_index()
+
+    def _migrate_table_versions(self) -> None:
+        """Step 6: the per-table version counters of the query cache."""
+        self._conn.executescript(_TABLE_VERSIONS_CREATE_SQL)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO table_versions (name) VALUES (?)",
+            [(table,) for table in _VERSIONED_TABLES],
+        )
+
+    _MIGRATIONS = (
+        _Migration(1, "entity, cross-reference and claim tables", _migrate_base_schema),
+        _Migration(2, "change-tracking columns on entities", _migrate_change_columns),
+        _Migration(3, "external-content FTS5 index with prefix indexes",
+                   _migrate_search_index),
+        _Migration(4, "claim IDs and claim_search FTS5 index", _migrate_claim_search),
+        _Migration(5, "entity_names table and trigram name_search index",
+                   _migrate_name_search),
+        _Migration(6, "table_versions for the query result cache", _migrate_table_versions),
+    )
+
+    def _sync_field_indexes(self) -> None:
+        """Create the expression index of every registered field.
+
+        Indexes of fields no longer marked in the templates are dropped.
+        """
+        existing = {
+            row["name"] for row in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'entities'"
+            ) if row["name"].startswith(INDEX_PREFIX)
+        }
+        wanted = {field.index_name: field for field in self.field_indexes.values()}
+        for name in existing - wanted.keys():
+            self._conn.execute(f'DROP INDEX "{name}"')
+        for name in wanted.keys() - existing:
+            self._conn.execute(wanted[name].create_sql)
 
     # ------------------------------------------------------------------
     # Full sync (session start)
     # ------------------------------------------------------------------
 
-    def full_sync(self, entities: dict[str, dict] | None = None) -> int:
-        """Rebuild the entire database from JSON entity files.
+    @_writes
+    def full_sync(self, entities: dict[str, dict] | None = None,
+                  force: bool = False) -> int:
+        """Bring the database in line with the entity storage.
 
-        Reads every ``*.json`` file under ``user-world/entities/``,
-        clears all existing data, and repopulates all tables including
-        the FTS5 search index.
+        By default this is a reconciliation: every ``entities`` row
+        records the content hash and source mtime it was built from, so
+        only added, changed and removed entities are written.  Sources
+        whose mtime moved but whose content hash did not just get their
+        row's mtime refreshed.  On an unchanged world nothing is read
+        beyond a stat of each file and one query.
+
+        With ``force=True`` all existing data is cleared and every table,
+        including the FTS5 search index, is rebuilt from scratch.
 
         Parameters
         ----------
@@ -254,64 +852,255 @@ class SQLiteSyncEngine:
             reading files from disk, avoiding a redundant I/O pass.
             Each entity_data dict should contain ``_meta._rel_path`` or
             ``_meta.file_path`` for the relative file path.
+        force : bool, optional
+            Truncate and reload everything (default ``False``).
 
         Returns
         -------
         int
-            The number of entities synced.
+            The number of entities in the database after the sync.
+            :attr:`last_sync_stats` has the breakdown (``added``,
+            ``modified``, ``removed``, ``touched``, ``unchanged``,
+            ``seconds``, ``mode``).
         """
-        # Clear existing data
-        self._conn.execute("DELETE FROM cross_references")
-        self._conn.execute("DELETE FROM canon_claims")
-        self._conn.execute("DELETE FROM entities")
-        # Rebuild FTS: drop and recreate
-        try:
-            self._conn.execute("DROP TABLE IF EXISTS entity_search")
-        except sqlite3.OperationalError:
-            pass
-        try:
-            self._conn.executescript(_FTS_CREATE_SQL)
-        except sqlite3.OperationalError:
-            pass
-
-        count = 0
-
-        if entities is not None:
-            # Use pre-loaded data
-            for entity_id, entity in entities.items():
-                meta = entity.get("_meta", {})
-                rel_path = meta.get("_rel_path", meta.get("file_path", ""))
-                self._upsert_entity_row(entity_id, entity, meta, rel_path)
-                self._upsert_cross_references(entity_id, entity)
-                self._upsert_canon_claims(entity_id, entity)
-                self._upsert_fts(entity_id, entity)
-                count += 1
+        t_start = time.perf_counter()
+        # Stat-only for the JSON backend; gives each source's current mtime
+        self.storage.scan()
+        stamps = self.storage.entity_stamps()
+        stats = (self._rebuild_all(entities, stamps) if force
+                 else self._reconcile(entities, stamps))
+        stats["seconds"] = time.perf_counter() - t_start
+        self.last_sync_stats = stats
+        return stats["total"]
+
+    def _rebuild_all(self, entities, stamps) -> dict:
+        """Truncate every table and reload all entities (``force=True``)."""
+        if entities is None:
+            # Read through the entity storage backend
+            entities = self.storage.load_all()
+        count = self._bulk_load(entities, stamps)
+        return {"mode": "rebuild", "total": count, "added": count, "modified": 0,
+                "removed": 0, "touched": 0, "unchanged": 0}
+
+    def _reconcile(self, entities, stamps) -> dict:
+        """Write only the entities whose source changed since their row was built."""
+        rows = {
+            row[0]: (row[1], row[2], row[3]) for row in self._conn.execute(
+                "SELECT id, file_path, source_mtime, content_hash FROM entities"
+            )
+        }
+        current = stamps if entities is None else entities
+
+        def rel_path_of(entity_id, entity=None):
+            stamp = stamps.get(entity_id)
+            if stamp:
+                return stamp[0]
+            meta = (entity or {}).get("_meta", {})
+            return meta.get("_rel_path", meta.get("file_path", ""))
+
+        if not rows and current:
+            # Empty database (first sync): nothing to reconcile against
+            stats = self._rebuild_all(entities, stamps)
+            stats["mode"] = "reconcile"
+            return stats
+
+        removed = [eid for eid in rows if eid not in current]
+        candidates = []
+        for entity_id in current:
+            row = rows.get(entity_id)
+            stamp = stamps.get(entity_id)
+            if (row is None or stamp is None or row[1] != stamp[1]
+                    or row[0] != stamp[0]):
+                candidates.append(entity_id)
+
+        if entities is None:
+            docs = dict(self.storage.iter_documents(candidates)) if candidates else {}
         else:
-            # Original behaviour: read from disk
-            entity_files = list(self.entities_dir.rglob("*.json"))
-            for file_path in entity_files:
-                entity = _safe_read_json(str(file_path))
+            docs = {eid: entities[eid] for eid in candidates}
+
+        stats = {"mode": "reconcile", "added": 0, "modified": 0,
+                 "removed": len(removed), "touched": 0}
+        missing = 0
+        try:
+            for entity_id in removed:
+                self._remove_entity_data(entity_id)
+            for entity_id in candidates:
+                entity = docs.get(entity_id)
                 if entity is None:
+                    missing += 1  # vanished since the scan
                     continue
-                meta = entity.get("_meta", {})
-                entity_id = meta.get("id", entity.get("id"))
-                if not entity_id:
+                row = rows.get(entity_id)
+                stamp = stamps.get(entity_id)
+                rel_path = rel_path_of(entity_id, entity)
+                source_mtime = stamp[1] if stamp else None
+                digest = _content_hash(entity)
+                if row is not None and row[2] == digest:
+                    self._conn.execute(
+                        "UPDATE entities SET file_path = ?, source_mtime = ? WHERE id = ?",
+                        (rel_path, source_mtime, entity_id),
+                    )
+                    self._dirty_tables.add("entities")
+                    stats["touched"] += 1
                     continue
-
-                rel_path = str(file_path.relative_to(self.root)).replace("\\", "/")
-                self._upsert_entity_row(entity_id, entity, meta, rel_path)
+                meta = entity.get("_meta", {})
+                self._remove_entity_data(entity_id)
+                self._upsert_entity_row(entity_id, entity, meta, rel_path,
+                                        source_mtime, digest)
                 self._upsert_cross_references(entity_id, entity)
                 self._upsert_canon_claims(entity_id, entity)
                 self._upsert_fts(entity_id, entity)
-                count += 1
+                stats["added" if row is None else "modified"] += 1
+        except BaseException:
+            self._rollback()
+            raise
+        self._commit()
 
-        self._conn.commit()
-        return count
+        stats["total"] = len(current) - missing
+        stats["unchanged"] = stats["total"] - len(candidates) + missing
+        return stats
+
+    # ------------------------------------------------------------------
+    # Bulk load
+    # ------------------------------------------------------------------
+
+    def _bulk_load(self, entities: dict[str, dict], stamps: dict) -> int:
+        """Replace the contents of every table with *entities*.
+
+        The fast path behind rebuilds.  Instead of four per-entity
+        upserts it builds each table's rows in memory and inserts them
+        with one ``executemany`` per table, with the secondary indexes
+        dropped (and re-created afterwards) and the FTS5 index filled by
+        a single ``'rebuild'`` command.  Runs in one transaction under
+        :data:`_BULK_LOAD_PRAGMAS`.
+
+        Returns
+        -------
+        int
+            The number of entities loaded.
+        """
+        entity_rows, xref_rows, claim_rows, search_rows, name_rows = [], [], [], [], []
+        for rowid, (entity_id, entity) in enumerate(entities.items(), start=1):
+            meta = entity.get("_meta", {})
+            stamp = stamps.get(entity_id)
+            rel_path = stamp[0] if stamp else meta.get("_rel_path", meta.get("file_path", ""))
+            entity_rows.append((rowid,) + self._entity_row(
+                entity_id, entity, meta, rel_path, stamp[1] if stamp else None))
+            xref_rows.extend(
+                (entity_id, target_id, rel_type, source_field)
+                for target_id, rel_type, source_field in _extract_cross_references(entity)
+            )
+            claim_rows.extend(_claim_rows(entity_id, entity))
+            search_rows.append(_search_row(rowid, entity))
+            name_rows.extend(_name_rows(entity_id, entity))
+
+        conn = self._conn
+        with self._bulk_load_pragmas():
+            try:
+                conn.execute("DELETE FROM cross_references")
+                conn.execute("DELETE FROM canon_claims")
+                conn.execute("DELETE FROM entity_names")
+                conn.execute("DELETE FROM entities")
+                placeholders = ", ".join("?" * len(_BULK_LOAD_TABLES))
+                indexes = conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                    f"AND sql IS NOT NULL AND tbl_name IN ({placeholders})",
+                    _BULK_LOAD_TABLES,
+                ).fetchall()
+                for index in indexes:
+                    conn.execute(f'DROP INDEX "{index["name"]}"')
+
+                conn.executemany(
+                    """
+                    INSERT INTO entities
+                        (rowid, id, entity_type, name, template_id, status,
+                         step_created, file_path, data, created_at, updated_at,
+                         content_hash, source_mtime)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    entity_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO cross_references "
+                    "(source_id, target_id, relationship_type, source_field) "
+                    "VALUES (?, ?, ?, ?)",
+                    xref_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO canon_claims (entity_id, claim, refs) VALUES (?, ?, ?)",
+                    claim_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO entity_names (entity_id, name) VALUES (?, ?)",
+                    name_rows,
+                )
+                for index in indexes:
+                    conn.execute(index["sql"])
+                self._load_search_index(search_rows)
+                self._rebuild_claim_index()
+                self._rebuild_name_index()
+                self._dirty_tables.update(_VERSIONED_TABLES)
+            except BaseException:
+                self._rollback()
+                raise
+            self._commit()
+        return len(entity_rows)
+
+    @contextlib.contextmanager
+    def _bulk_load_pragmas(self):
+        """Apply :data:`_BULK_LOAD_PRAGMAS`, restoring the old values on exit."""
+        saved = [
+            (name, self._conn.execute(f"PRAGMA {name}").fetchone()[0])
+            for name, _ in _BULK_LOAD_PRAGMAS
+        ]
+        for name, value in _BULK_LOAD_PRAGMAS:
+            self._conn.execute(f"PRAGMA {name} = {value}")
+        try:
+            yield
+        finally:
+            for name, value in saved:
+                self._conn.execute(f"PRAGMA {name} = {value}")
+
+    def _load_search_index(self, search_rows: list[tuple]) -> None:
+        """Replace the FTS5 content with *search_rows* and rebuild the index."""
+        try:
+            self._conn.execute("DELETE FROM entity_search_content")
+            self._conn.executemany(
+                """
+                INSERT INTO entity_search_content
+                    (id, name, entity_type, tags, description, canon_claims_text)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                search_rows,
+            )
+            self._conn.execute("INSERT INTO entity_search(entity_search) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            # No FTS5 in this SQLite build; search() falls back to LIKE
+            pass
+
+    def _rebuild_claim_index(self) -> None:
+        """Rebuild claim_search from the ``canon_claims`` rows."""
+        # No FTS5 in this SQLite build
+        with contextlib.suppress(sqlite3.OperationalError):
+            self._conn.execute("INSERT INTO claim_search(claim_search) VALUES ('rebuild')")
+
+    def _rebuild_name_index(self) -> None:
+        """Rebuild name_search from the ``entity_names`` rows."""
+        # No FTS5 trigram tokenizer in this SQLite build
+        with contextlib.suppress(sqlite3.OperationalError):
+            self._conn.execute("INSERT INTO name_search(name_search) VALUES ('rebuild')")
+
+    def _refill_search_index(self) -> None:
+        """Rebuild the FTS5 index from the ``entities`` rows."""
+        self._load_search_index([
+            _search_row(row["rowid"], json.loads(row["data"]))
+            for row in self._conn.execute("SELECT rowid, data FROM entities")
+        ])
 
     # ------------------------------------------------------------------
     # Incremental sync (single entity)
     # ------------------------------------------------------------------
 
+    @_writes
     def sync_entity(self, entity_id: str, entity_data: dict) -> None:
         """Create or update a single entity in the database.
 
@@ -332,12 +1121,77 @@ class SQLiteSyncEngine:
         self._remove_entity_data(entity_id)
 
         # Insert fresh data
-        self._upsert_entity_row(entity_id, entity_data, meta, file_path)
+        self._upsert_entity_row(entity_id, entity_data, meta, file_path,
+                                self._source_mtime(file_path))
         self._upsert_cross_references(entity_id, entity_data)
         self._upsert_canon_claims(entity_id, entity_data)
         self._upsert_fts(entity_id, entity_data)
-        self._conn.commit()
+        self._commit()
+
+    @_writes
+    def sync_entities(self, entities: dict[str, dict]) -> int:
+        """Create or update many entities in a single transaction.
+
+        Batch counterpart of :meth:`sync_entity` used by
+        ``DataManager.create_entities`` / ``update_entities``.  Either
+        every entity is written or, on error, none are.
 
+        Parameters
+        ----------
+        entities : dict[str, dict]
+            ``{entity_id: entity_data}`` full entity documents.
+
+        Returns
+        -------
+        int
+            The number of entities synced.
+        """
+        try:
+            for entity_id, entity_data in entities.items():
+                meta = entity_data.get("_meta", {})
+                file_path = meta.get("file_path", "")
+                self._remove_entity_data(entity_id)
+                self._upsert_entity_row(entity_id, entity_data, meta, file_path,
+                                        self._source_mtime(file_path))
+                self._upsert_cross_references(entity_id, entity_data)
+                self._upsert_canon_claims(entity_id, entity_data)
+                self._upsert_fts(entity_id, entity_data)
+        except BaseException:
+            self._rollback()
+            raise
+        self._commit()
+        return len(entities)
+
+    @_writes
+    def apply_changes(self, changes) -> int:
+        """Apply an :class:`~engine.entity_journal.ChangeSet` in one transaction.
+
+        Returns
+        -------
+        int
+            The number of entities written or removed.
+        """
+        if not changes:
+            return 0
+        try:
+            for entity_id in changes.removed:
+                self._remove_entity_data(entity_id)
+            for entity_id, entity_data in changes.upserts().items():
+                meta = entity_data.get("_meta", {})
+                rel_path = changes.paths.get(entity_id, meta.get("file_path", ""))
+                self._remove_entity_data(entity_id)
+                self._upsert_entity_row(entity_id, entity_data, meta, rel_path,
+                                        self._source_mtime(rel_path))
+                self._upsert_cross_references(entity_id, entity_data)
+                self._upsert_canon_claims(entity_id, entity_data)
+                self._upsert_fts(entity_id, entity_data)
+        except BaseException:
+            self._rollback()
+            raise
+        self._commit()
+        return len(changes.changed_ids())
+
+    @_writes
     def remove_entity(self, entity_id: str) -> None:
         """Remove an entity from all database tables.
 
@@ -347,20 +1201,40 @@ class SQLiteSyncEngine:
             The entity to remove.
         """
         self._remove_entity_data(entity_id)
-        self._conn.commit()
+        self._commit()
 
     # ------------------------------------------------------------------
     # Query methods
     # ------------------------------------------------------------------
 
-    def search(self, query: str) -> list[dict]:
-        """Full-text search via FTS5.
+    def search(self, query: str, limit: int | None = None, offset: int = 0,
+               prefix: bool = False, snippets: bool = False,
+               markers: tuple[str, str] = ("[", "]")) -> list[dict]:
+        """Full-text search via FTS5, best matches first.
+
+        Results are ordered by bm25 relevance with per-column weights
+        (:data:`_SEARCH_WEIGHTS`): a hit in the name outranks one in the
+        tags, which outranks the description and then canon claims.
 
         Parameters
         ----------
         query : str
-            The search query.  Supports FTS5 query syntax (implicit OR,
-            quoted phrases, column filters).
+            The search query.  Each word must match (implicit AND);
+            FTS5 operators in the input are treated as plain text.
+        limit : int, optional
+            Maximum number of results (default: all).
+        offset : int, optional
+            Number of results to skip, for paging.
+        prefix : bool, optional
+            Treat the last word as a prefix (search-as-you-type), so
+            ``"thor"`` matches "Thorin".
+        snippets : bool, optional
+            Add ``snippet`` (the best-matching fragment of any indexed
+            column) and ``name_highlight`` (the name with matches
+            marked) to each result.
+        markers : tuple[str, str], optional
+            Opening and closing strings placed around matched terms in
+            snippets and highlights (default ``("[", "]")``).
 
         Returns
         -------
@@ -372,25 +1246,200 @@ class SQLiteSyncEngine:
 
         # Sanitise the query: escape special FTS5 characters for safety,
         # but allow simple multi-word queries to work as implicit AND.
-        safe_query = self._sanitise_fts_query(query.strip())
+        safe_query = self._sanitise_fts_query(query.strip(), prefix=prefix)
+
+        columns = f"e.*, {_RANK_SQL} AS rank"
+        params: list = []
+        if snippets:
+            columns += (
+                ", snippet(entity_search, -1, ?, ?, '...', 12) AS snippet"
+                ", highlight(entity_search, 0, ?, ?) AS name_highlight"
+            )
+            params.extend(markers * 2)
+        params.append(safe_query)
+        sql = f"""
+            SELECT {columns}
+            FROM entity_search s
+            JOIN entities e ON e.rowid = s.rowid
+            WHERE entity_search MATCH ?
+            ORDER BY rank
+        """
+        sql += self._page_sql(limit, offset)
 
         try:
-            rows = self._conn.execute(
-                """
-                SELECT e.*, s.rank
-                FROM entity_search s
-                JOIN entities e ON e.rowid = s.rowid
-                WHERE entity_search MATCH ?
-                ORDER BY s.rank
-                """,
-                (safe_query,),
-            ).fetchall()
+            rows = self._reader().execute(sql, params).fetchall()
         except sqlite3.OperationalError:
             # If the FTS query syntax is invalid, fall back to LIKE search
-            return self._fallback_search(query.strip())
+            return self._fallback_search(query.strip(), limit, offset)
 
         return [self._row_to_dict(r) for r in rows]
 
+    def search_page(self, query: str, limit: int = 20, offset: int = 0,
+                    prefix: bool = False,
+                    markers: tuple[str, str] = ("[", "]")) -> dict:
+        """Return one page of ranked, highlighted search results.
+
+        Parameters
+        ----------
+        query, prefix, markers
+            See :meth:`search`.
+        limit : int, optional
+            Page size (default 20).
+        offset : int, optional
+            Number of results to skip.
+
+        Returns
+        -------
+        dict
+            ``query``, ``total`` (matches across all pages), ``limit``,
+            ``offset`` and ``results`` (:meth:`search` rows with
+            ``snippet`` and ``name_highlight``).
+        """
+        results = self.search(query, limit=limit, offset=offset, prefix=prefix,
+                              snippets=True, markers=markers)
+        return {
+            "query": query,
+            "total": self.count_matches(query, prefix=prefix),
+            "limit": limit,
+            "offset": offset,
+            "results": results,
+        }
+
+    def count_matches(self, query: str, prefix: bool = False) -> int:
+        """Return how many entities :meth:`search` would return for *query*."""
+        if not query or not query.strip():
+            return 0
+        safe_query = self._sanitise_fts_query(query.strip(), prefix=prefix)
+        try:
+            row = self._reader().execute(
+                "SELECT COUNT(*) FROM entity_search WHERE entity_search MATCH ?",
+                (safe_query,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            pattern = f"%{query.strip()}%"
+            row = self._reader().execute(
+                "SELECT COUNT(*) FROM entities "
+                "WHERE name LIKE ? OR entity_type LIKE ? OR data LIKE ?",
+                (pattern, pattern, pattern),
+            ).fetchone()
+        return row[0]
+
+    def fuzzy_find(self, query: str, limit: int | None = 10,
+                   max_distance: int | None = None) -> list[dict]:
+        """Find entities by (part of) a name or alias, tolerating typos.
+
+        Unlike :meth:`search`, which matches whole words, this finds
+        infixes (``"thor"`` in ``"Asathor"``) and misspellings
+        (``"Stormkeper"``).  Candidates come from the ``name_search``
+        trigram index (names sharing trigrams with *query*, best overlap
+        first) and are re-ranked by edit distance, so no table is
+        scanned.  Queries shorter than three characters have no trigrams
+        and are matched as plain substrings instead.
+
+        Parameters
+        ----------
+        query : str
+            The name, or part of it, as typed.
+        limit : int or None
+            Maximum number of entities (default 10; ``None`` for all
+            matches among the candidates).
+        max_distance : int, optional
+            Most edits allowed between *query* and the closest part of a
+            name.  Default: one per four characters of *query*.
+
+        Returns
+        -------
+        list[dict]
+            Entity rows plus ``matched_name`` (the name or alias that
+            matched) and ``distance``, closest first.
+        """
+        needle = " ".join(query.lower().split()) if query else ""
+        if not needle:
+            return []
+        if max_distance is None:
+            max_distance = len(needle) // 4
+        if limit is None:
+            pool = _FUZZY_MAX_CANDIDATES
+        else:
+            pool = max(1, min(int(limit) * _FUZZY_CANDIDATES_PER_RESULT,
+                              _FUZZY_MAX_CANDIDATES))
+
+        conn = self._reader()
+        best: dict[str, tuple] = {}
+        # q-gram filter: each edit spoils at most two of the query's
+        # bigrams, so a near miss must contain at least this many
+        bigrams = [needle[i:i + 2] for i in range(len(needle) - 1)]
+        min_shared = len(bigrams) - 2 * max_distance
+
+        def consider(candidates):
+            for entity_id, name in candidates:
+                lowered = name.lower()
+                if needle in lowered:
+                    distance = 0
+                elif max_distance and sum(b in lowered for b in bigrams) >= min_shared:
+                    distance = _substring_distance(needle, lowered, max_distance)
+                else:
+                    continue
+                if distance > max_distance:
+                    continue
+                key = (distance, not lowered.startswith(needle),
+                       abs(len(name) - len(needle)), name)
+                if entity_id not in best or key < best[entity_id]:
+                    best[entity_id] = key
+
+        trigrams = sorted({needle[i:i + 3] for i in range(len(needle) - 2)})
+        indexed = False
+        if trigrams:
+            try:
+                # Exact matches first: a phrase of trigrams is a substring
+                # match, and cheap (no ranking); names starting with the
+                # query are fetched separately so they are never crowded out.
+                phrase = '"' + needle.replace('"', '""') + '"'
+                for match in ("^" + phrase, phrase):
+                    consider(conn.execute(
+                        f"{_NAME_CANDIDATES_SQL} LIMIT ?", (match, pool),
+                    ).fetchall())
+                # Then near misses: names sharing the most trigrams, best
+                # bm25 first, unless exact matches already fill the page.
+                if max_distance and (limit is None or len(best) < limit):
+                    consider(conn.execute(
+                        f"{_NAME_CANDIDATES_SQL} ORDER BY bm25(name_search) LIMIT ?",
+                        (" OR ".join('"' + t.replace('"', '""') + '"' for t in trigrams),
+                         pool),
+                    ).fetchall())
+                indexed = True
+            except sqlite3.OperationalError:
+                pass  # no trigram index in this SQLite build
+        if not indexed:
+            # Too short for trigrams (or no index): plain substring match
+            escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            consider(conn.execute(
+                "SELECT entity_id, name FROM entity_names "
+                "WHERE name LIKE ? ESCAPE '\\' LIMIT ?",
+                (f"%{escaped}%", pool),
+            ).fetchall())
+
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        if not ranked:
+            return []
+
+        placeholders = ", ".join("?" * len(ranked))
+        rows = {
+            row["id"]: row for row in conn.execute(
+                f"SELECT * FROM entities WHERE id IN ({placeholders})",
+                [entity_id for entity_id, _ in ranked],
+            )
+        }
+        results = []
+        for entity_id, key in ranked:
+            if entity_id in rows:
+                result = self._row_to_dict(rows[entity_id])
+                result["matched_name"] = key[-1]
+                result["distance"] = key[0]
+                results.append(result)
+        return results
+
+    @_cached_query("entities")
     def query_by_type(self, entity_type: str) -> list[dict]:
         """Return all entities of a given type.
 
@@ -404,12 +1453,13 @@ class SQLiteSyncEngine:
         list[dict]
             Matching entity rows.
         """
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             "SELECT * FROM entities WHERE entity_type = ? ORDER BY name",
             (entity_type,),
         ).fetchall()
         return [self._row_to_dict(r) for r in rows]
 
+    @_cached_query("entities")
     def query_by_step(self, step_number: int) -> list[dict]:
         """Return all entities created at a specific step.
 
@@ -423,12 +1473,13 @@ class SQLiteSyncEngine:
         list[dict]
             Matching entity rows.
         """
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             "SELECT * FROM entities WHERE step_created = ? ORDER BY name",
             (step_number,),
         ).fetchall()
         return [self._row_to_dict(r) for r in rows]
 
+    @_cached_query("entities")
     def query_by_status(self, status: str) -> list[dict]:
         """Return all entities with the given status.
 
@@ -442,12 +1493,13 @@ class SQLiteSyncEngine:
         list[dict]
             Matching entity rows.
         """
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             "SELECT * FROM entities WHERE status = ? ORDER BY name",
             (status,),
         ).fetchall()
         return [self._row_to_dict(r) for r in rows]
 
+    @_cached_query("entities", "cross_references")
     def query_cross_references(self, entity_id: str) -> dict:
         """Return all cross-references for an entity.
 
@@ -461,20 +1513,22 @@ class SQLiteSyncEngine:
         dict
             ``{"outgoing": [...], "incoming": [...]}``.
             Each item is a dict with ``source_id`` or ``target_id``,
-            ``relationship_type``, and ``source_field``.
+            ``relationship_type``, and ``source_field``.  Links to
+            targets that are not in the database (e.g. a removed
+            entity, whose inbound links are kept) are left out.
         """
-        outgoing = self._conn.execute(
+        outgoing = self._reader().execute(
             """
             SELECT cr.target_id, cr.relationship_type, cr.source_field,
                    e.name AS target_name, e.entity_type AS target_type
             FROM cross_references cr
-            LEFT JOIN entities e ON e.id = cr.target_id
+            JOIN entities e ON e.id = cr.target_id
             WHERE cr.source_id = ?
             """,
             (entity_id,),
         ).fetchall()
 
-        incoming = self._conn.execute(
+        incoming = self._reader().execute(
             """
             SELECT cr.source_id, cr.relationship_type, cr.source_field,
                    e.name AS source_name, e.entity_type AS source_type
@@ -490,6 +1544,7 @@ class SQLiteSyncEngine:
             "incoming": [dict(r) for r in incoming],
         }
 
+    @_cached_query("canon_claims")
     def query_claims(self, entity_id: str | None = None,
                      keyword: str | None = None) -> list[dict]:
         """Return canon claims, optionally filtered.
@@ -521,12 +1576,85 @@ class SQLiteSyncEngine:
         if conditions:
             where_clause = "WHERE " + " AND ".join(conditions)
 
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             f"SELECT entity_id, claim, refs FROM canon_claims {where_clause}",
             params,
         ).fetchall()
         return [dict(r) for r in rows]
 
+    def similar_claims(self, terms, exclude_entity_id: str | None = None,
+                       limit: int = 50) -> list[dict]:
+        """Return the canon claims best matching any of *terms*, by bm25.
+
+        Candidate generation for claim similarity checks: the claim_search
+        index finds every claim sharing a (stemmed) term with *terms* and
+        ranks them, so callers only need to re-score the top *limit*.
+
+        Parameters
+        ----------
+        terms : str or iterable of str
+            Words to match, e.g. the content words of a new entity's
+            claims; a single string is split into its words.  Any one
+            of them matching is enough.
+        exclude_entity_id : str, optional
+            Leave out this entity's own claims.
+        limit : int
+            Maximum number of candidates (default 50).
+
+        Returns
+        -------
+        list[dict]
+            ``entity_id``, ``entity_name``, ``claim``, ``references``
+            (list), ``score`` (bm25 relevance, higher is better) and
+            ``matched_terms`` (the words of the claim that matched,
+            lowercased), best match first.
+
+        Raises
+        ------
+        sqlite3.OperationalError
+            If the SQLite build has no FTS5; callers fall back to their
+            own scan.
+        """
+        if isinstance(terms, str):
+            terms = [terms]
+        words = sorted({
+            word for term in terms for word in str(term).lower().split() if word
+        })
+        if not words:
+            return []
+        match = " OR ".join('"' + word.replace('"', '""') + '"' for word in words)
+        rows = self._reader().execute(
+            """
+            SELECT c.entity_id, e.name, c.claim, c.refs,
+                   bm25(claim_search) AS rank,
+                   highlight(claim_search, 0, ?, ?) AS marked
+            FROM claim_search
+            JOIN canon_claims c ON c.id = claim_search.rowid
+            LEFT JOIN entities e ON e.id = c.entity_id
+            WHERE claim_search MATCH ? AND c.entity_id IS NOT ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (_MATCH_OPEN, _MATCH_CLOSE, match, exclude_entity_id, max(0, int(limit))),
+        ).fetchall()
+        results = []
+        for row in rows:
+            try:
+                references = json.loads(row["refs"] or "[]")
+            except ValueError:
+                references = []
+            results.append({
+                "entity_id": row["entity_id"],
+                "entity_name": row["name"] or row["entity_id"],
+                "claim": row["claim"],
+                "references": references,
+                "score": -row["rank"],
+                "matched_terms": sorted({
+                    term.lower() for term in _MATCHED_TERM.findall(row["marked"])
+                }),
+            })
+        return results
+
     # Allowed tables and columns for structured queries
     _ALLOWED_TABLES = frozenset({"entities", "cross_references", "canon_claims"})
     _ALLOWED_COLUMNS = frozenset({
@@ -598,16 +1726,10 @@ class SQLiteSyncEngine:
 
         if params is None:
             params = ()
-        # Open a separate read-only connection for user-supplied queries
-        # to prevent any write operations even if the keyword filter is bypassed.
-        db_path = str(self.db_path)
-        ro_conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        ro_conn.row_factory = sqlite3.Row
-        try:
-            rows = ro_conn.execute(sql, params).fetchall()
-            return [dict(r) for r in rows]
-        finally:
-            ro_conn.close()
+        # Pooled connections are opened read-only (and query_only), which
+        # prevents any write even if the keyword filter is bypassed.
+        rows = self._reader().execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
 
     def query_entities(
         self,
@@ -622,13 +1744,24 @@ class SQLiteSyncEngine:
         SQL injection.  Prefer this over :meth:`advanced_query` when
         querying entities.
 
+        Besides the table's columns, filters and sorting accept every
+        field in :attr:`field_indexes` -- document fields the templates
+        mark ``"x-indexed"`` -- which are answered from an expression
+        index rather than a scan::
+
+            sync.query_entities([("entity_type", "=", "gods"),
+                                 ("domain_primary", "=", "sea")])
+
         Parameters
         ----------
         filters : list[tuple], optional
             List of ``(column, operator, value)`` tuples.  Column and
-            operator are validated against whitelists.
+            operator are validated against whitelists.  ``IN`` and
+            ``NOT IN`` take a sequence of values, ``BETWEEN`` a
+            ``(low, high)`` pair.
         order_by : str, optional
-            Column name to sort by (must be in whitelist).
+            Column or indexed field to sort by; prefix with ``-`` for
+            descending order.
         limit : int
             Maximum rows to return (default 100, max 1000).
         offset : int
@@ -642,31 +1775,215 @@ class SQLiteSyncEngine:
         params = []
 
         for col, op, val in (filters or []):
-            if col not in self._ALLOWED_COLUMNS:
-                raise ValueError(f"Column '{col}' is not in the allowed list")
+            target = self._query_column(col)
             op_upper = op.upper().strip()
             if op_upper not in self._ALLOWED_OPERATORS:
                 raise ValueError(f"Operator '{op}' is not allowed")
-            clauses.append(f"{col} {op_upper} ?")
-            params.append(val)
+            if op_upper in ("IN", "NOT IN"):
+                values = [val] if isinstance(val, (str, bytes)) else list(val)
+                if not values:
+                    raise ValueError(f"{op_upper} needs at least one value")
+                clauses.append(f"{target} {op_upper} ({', '.join('?' * len(values))})")
+                params.extend(values)
+            elif op_upper == "BETWEEN":
+                low, high = val
+                clauses.append(f"{target} BETWEEN ? AND ?")
+                params.extend((low, high))
+            else:
+                clauses.append(f"{target} {op_upper} ?")
+                params.append(val)
 
         sql = "SELECT * FROM entities"
         if clauses:
             sql += " WHERE " + " AND ".join(clauses)
 
         if order_by:
-            if order_by.lstrip("-") not in self._ALLOWED_COLUMNS:
+            col_name = order_by.lstrip("-")
+            if col_name not in self._ALLOWED_COLUMNS and col_name not in self.field_indexes:
                 raise ValueError(f"Order column '{order_by}' is not allowed")
             direction = "DESC" if order_by.startswith("-") else "ASC"
-            col_name = order_by.lstrip("-")
-            sql += f" ORDER BY {col_name} {direction}"
+            sql += f" ORDER BY {self._query_column(col_name)} {direction}"
 
         limit = min(max(1, limit), 1000)
         sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
 
-        rows = self._conn.execute(sql, params).fetchall()
+        rows = self._reader().execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
+
+    def _query_column(self, column: str) -> str:
+        """Return the SQL for a query_entities() column or indexed field."""
+        if column in self._ALLOWED_COLUMNS:
+            return column
+        field = self.field_indexes.get(column)
+        if field is not None:
+            return field.expression
+        raise ValueError(f"Column '{column}' is not in the allowed list")
+
+    # ------------------------------------------------------------------
+    # Graph traversal (recursive CTEs over cross_references)
+    # ------------------------------------------------------------------
+    #
+    # These answer neighbourhood and path questions straight from the
+    # database, so short-lived processes (hooks, tools) need not build
+    # the NetworkX WorldGraph.  Edges are followed in both directions.
+    # Every walk is guarded against cycles: walks with a depth dedupe
+    # (entity, depth) pairs and stop at the depth limit, and the
+    # component walk dedupes entities, so each entity is expanded once.
+
+    def graph_neighbors(self, entity_id: str, depth: int = 1) -> list[dict]:
+        """Return the entities within *depth* relationship hops.
+
+        SQL counterpart of :meth:`WorldGraph.get_neighbors`.
+
+        Parameters
+        ----------
+        entity_id : str
+            The starting entity.
+        depth : int
+            How many hops to traverse (clamped to
+            ``0..MAX_TRAVERSAL_DEPTH``).
+
+        Returns
+        -------
+        list[dict]
+            ``id``, ``name``, ``entity_type`` and ``depth`` (hop count
+            of the shortest connection) of every entity reached,
+            excluding the start, nearest first.  Empty if the entity is
+            not in the database.
+        """
+        depth = max(0, min(int(depth), MAX_TRAVERSAL_DEPTH))
+        if depth == 0 or not self._entity_exists(entity_id):
+            return []
+        rows = self._reader().execute(
+            f"""
+            WITH RECURSIVE walk(id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT {_WALK_NEXT}, walk.depth + 1 {_WALK_FROM}
+                AND walk.depth < ?
+            )
+            SELECT walk.id AS id, e.name AS name, e.entity_type AS entity_type,
+                   MIN(walk.depth) AS depth
+            FROM walk JOIN entities e ON e.id = walk.id
+            WHERE walk.id != ?
+            GROUP BY walk.id
+            ORDER BY depth, walk.id
+            """,
+            (entity_id, depth, entity_id),
+        ).fetchall()
         return [dict(r) for r in rows]
 
+    def graph_shortest_path(self, entity_a: str, entity_b: str,
+                            max_depth: int = 6) -> list[tuple[str, str]]:
+        """Find a shortest relationship path between two entities.
+
+        SQL counterpart of :meth:`WorldGraph.find_path`: a breadth-first
+        walk from *entity_a* (a recursive CTE) gives every entity's hop
+        distance, and the path is traced back from *entity_b* through
+        neighbours one hop closer (the smallest ID on ties).
+
+        Parameters
+        ----------
+        entity_a, entity_b : str
+            Start and end entity IDs.
+        max_depth : int
+            Longest path searched, in hops (clamped to
+            ``MAX_TRAVERSAL_DEPTH``).
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            ``(entity_id, relationship_type)`` pairs from *entity_a* to
+            *entity_b*; the first pair's relationship is ``""``.  Empty
+            if either entity is missing or they are not connected within
+            *max_depth* hops.
+        """
+        if not (self._entity_exists(entity_a) and self._entity_exists(entity_b)):
+            return []
+        if entity_a == entity_b:
+            return [(entity_a, "")]
+        max_depth = max(0, min(int(max_depth), MAX_TRAVERSAL_DEPTH))
+        conn = self._reader()
+        distance = dict(conn.execute(
+            f"""
+            WITH RECURSIVE walk(id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT {_WALK_NEXT}, walk.depth + 1 {_WALK_FROM}
+                AND walk.depth < ?
+            )
+            SELECT id, MIN(depth) FROM walk GROUP BY id
+            """,
+            (entity_a, max_depth),
+        ).fetchall())
+        if entity_b not in distance:
+            return []
+
+        path = []
+        current = entity_b
+        while current != entity_a:
+            closer = distance[current] - 1
+            links = conn.execute(
+                """
+                SELECT CASE WHEN source_id = ? THEN target_id ELSE source_id END AS other,
+                       relationship_type
+                FROM cross_references
+                WHERE (source_id = ? OR target_id = ?)
+                  AND target_id IN (SELECT id FROM entities)
+                ORDER BY other, relationship_type
+                """,
+                (current, current, current),
+            ).fetchall()
+            previous, rel = next((b, r) for b, r in links if distance.get(b) == closer)
+            path.append((current, rel))
+            current = previous
+        path.append((entity_a, ""))
+        path.reverse()
+        return path
+
+    def graph_component(self, entity_id: str, limit: int | None = None) -> list[str]:
+        """Return the connected component that contains *entity_id*.
+
+        Parameters
+        ----------
+        entity_id : str
+            The entity whose component to find.
+        limit : int, optional
+            Stop after this many members (the walk is cut off, so on
+            large components which members are returned is arbitrary).
+
+        Returns
+        -------
+        list[str]
+            Sorted IDs of every entity connected to *entity_id* through
+            any chain of relationships, including itself.  Empty if the
+            entity is not in the database.
+        """
+        if not self._entity_exists(entity_id):
+            return []
+        rows = self._reader().execute(
+            f"""
+            WITH RECURSIVE walk(id) AS (
+                SELECT ?
+                UNION
+                SELECT {_WALK_NEXT} {_WALK_FROM}
+                LIMIT ?
+            )
+            SELECT id FROM walk ORDER BY id
+            """,
+            (entity_id, -1 if limit is None else max(1, int(limit))),
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def same_component(self, entity_a: str, entity_b: str) -> bool:
+        """Return whether two entities are connected by any relationship chain."""
+        return entity_b in self.graph_component(entity_a)
+
+    def _entity_exists(self, entity_id: str) -> bool:
+        return self._reader().execute(
+            "SELECT 1 FROM entities WHERE id = ?", (entity_id,)
+        ).fetchone() is not None
+
     def get_stats(self) -> dict:
         """Return database statistics.
 
@@ -675,29 +1992,38 @@ class SQLiteSyncEngine:
         dict
             Contains ``total_entities``, ``by_type`` (dict),
             ``by_status`` (dict), ``total_cross_references``,
-            ``total_canon_claims``.
+            ``total_canon_claims``, ``schema_version`` and
+            ``query_cache`` (see :meth:`query_cache_stats`).
         """
-        total = self._conn.execute(
+        stats = self._table_stats()
+        stats["schema_version"] = self.schema_version
+        stats["query_cache"] = self.query_cache_stats()
+        return stats
+
+    @_cached_query(*_VERSIONED_TABLES)
+    def _table_stats(self) -> dict:
+        """Row counts for :meth:`get_stats`."""
+        total = self._reader().execute(
             "SELECT COUNT(*) AS cnt FROM entities"
         ).fetchone()["cnt"]
 
-        by_type_rows = self._conn.execute(
+        by_type_rows = self._reader().execute(
             "SELECT entity_type, COUNT(*) AS cnt FROM entities "
             "GROUP BY entity_type ORDER BY cnt DESC"
         ).fetchall()
         by_type = {r["entity_type"]: r["cnt"] for r in by_type_rows}
 
-        by_status_rows = self._conn.execute(
+        by_status_rows = self._reader().execute(
             "SELECT status, COUNT(*) AS cnt FROM entities "
             "GROUP BY status ORDER BY cnt DESC"
         ).fetchall()
         by_status = {r["status"]: r["cnt"] for r in by_status_rows}
 
-        xref_count = self._conn.execute(
+        xref_count = self._reader().execute(
             "SELECT COUNT(*) AS cnt FROM cross_references"
         ).fetchone()["cnt"]
 
-        claims_count = self._conn.execute(
+        claims_count = self._reader().execute(
             "SELECT COUNT(*) AS cnt FROM canon_claims"
         ).fetchone()["cnt"]
 
@@ -709,15 +2035,277 @@ class SQLiteSyncEngine:
             "total_canon_claims": claims_count,
         }
 
+    # ------------------------------------------------------------------
+    # Query result cache
+    # ------------------------------------------------------------------
+    #
+    # query_by_type/step/status, query_cross_references, query_claims
+    # and get_stats repeat on every prompt build with no change in
+    # between, so their results are cached.  Each result is tagged with
+    # the versions (table_versions) of the tables it reads and reused
+    # until one of them is bumped by a write -- from this engine or any
+    # other process.
+
+    def configure_query_cache(self, max_entries: int | None = None) -> None:
+        """Resize the query result cache.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of cached results.  ``0`` disables the cache.
+        """
+        with self._query_cache_lock:
+            if max_entries is not None:
+                self._query_cache_max_entries = max(0, int(max_entries))
+            self._evict_query_cache()
+
+    def query_cache_stats(self) -> dict:
+        """Return hit/miss counters and current size of the query cache."""
+        with self._query_cache_lock:
+            lookups = self._query_cache_hits + self._query_cache_misses
+            return {
+                "hits": self._query_cache_hits,
+                "misses": self._query_cache_misses,
+                "hit_rate": self._query_cache_hits / lookups if lookups else 0.0,
+                "evictions": self._query_cache_evictions,
+                "entries": len(self._query_cache),
+                "max_entries": self._query_cache_max_entries,
+            }
+
+    def clear_query_cache(self) -> None:
+        """Drop every cached result (counters are kept)."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    #
+    # sync_entity() replaces an entity by deleting and re-inserting its
+    # rows, so a long session leaves the WAL file growing (readers keep
+    # the auto-checkpoint from resetting it), every FTS5 index split
+    # into many small segments, and the planner statistics stale.
+    # run_maintenance() puts that right in small steps and is meant to
+    # be called when the engine is idle (see MaintenanceScheduler in
+    # engine/sqlite_maintenance.py).
+
+    @_writes
+    def run_maintenance(self, budget_seconds: float | None = None,
+                        analysis_limit: int | None = None,
+                        merge_pages: int | None = None,
+                        vacuum_pages: int | None = None) -> dict:
+        """Refresh statistics, merge FTS segments and checkpoint the WAL.
+
+        Steps, in order:
+
+        1. ``PRAGMA optimize`` (a sampled ``ANALYZE`` on the first run).
+        2. FTS5 ``'merge'`` of every search index, a few pages at a
+           time, until its segments are merged or the budget runs out.
+        3. ``PRAGMA incremental_vacuum`` if the database has free pages
+           and was created with ``auto_vacuum=INCREMENTAL``.
+        4. ``PRAGMA wal_checkpoint(TRUNCATE)``, which resets the WAL.
+
+        Steps 1-3 are skipped once *budget_seconds* has elapsed; the
+        checkpoint always runs, since bounding the WAL is the point.
+
+        Parameters
+        ----------
+        budget_seconds : float, optional
+            Wall-clock budget (default :attr:`MAINTENANCE_BUDGET_SECONDS`).
+        analysis_limit : int, optional
+            Rows ``ANALYZE`` samples per index (default
+            :attr:`MAINTENANCE_ANALYSIS_LIMIT`; 0 reads every row).
+        merge_pages : int, optional
+            Pages written per FTS5 merge step (default
+            :attr:`MAINTENANCE_MERGE_PAGES`).
+        vacuum_pages : int, optional
+            Pages freed per incremental vacuum (default
+            :attr:`MAINTENANCE_VACUUM_PAGES`).
+
+        Returns
+        -------
+        dict
+            ``steps`` (completed), ``skipped`` (out of budget),
+            ``checkpoint`` (``busy``, ``log_frames``,
+            ``checkpointed_frames``), ``duration_ms``, and ``before`` /
+            ``after`` snapshots of :meth:`maintenance_snapshot`.  Also
+            kept as :attr:`last_maintenance`.
+        """
+        budget = self.MAINTENANCE_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+        limit = self.MAINTENANCE_ANALYSIS_LIMIT if analysis_limit is None else analysis_limit
+        pages = self.MAINTENANCE_MERGE_PAGES if merge_pages is None else merge_pages
+        vacuum = self.MAINTENANCE_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+
+        started = time.perf_counter()
+        deadline = started + budget
+        before = self.maintenance_snapshot()
+        steps: list[str] = []
+        skipped: list[str] = []
+
+        def in_budget(step):
+            if time.perf_counter() < deadline:
+                return True
+            skipped.append(step)
+            return False
+
+        if in_budget("optimize"):
+            self._maintain_statistics(limit)
+            steps.append("optimize")
+        for table in self._fts_tables():
+            if in_budget(f"merge:{table}"):
+                if self._merge_fts_segments(table, pages, deadline):
+                    steps.append(f"merge:{table}")
+                else:
+                    skipped.append(f"merge:{table}")
+        # Merging frees the pages of the old segments, so look again
+        free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        incremental = self._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        if free and incremental and in_budget("incremental_vacuum"):
+            # execute() steps this pragma once, freeing a single page;
+            # executescript() runs it to completion
+            self._conn.executescript(f"PRAGMA incremental_vacuum({int(vacuum)});")
+            steps.append("incremental_vacuum")
+
+        busy, log_frames, checkpointed = self._conn.execute(
+            "PRAGMA wal_checkpoint(TRUNCATE)"
+        ).fetchone()
+        steps.append("checkpoint")
+        self.writes_since_maintenance = 0
+
+        after = self.maintenance_snapshot()
+        report = {
+            "steps": steps,
+            "skipped": skipped,
+            "checkpoint": {
+                "busy": bool(busy),
+                "log_frames": log_frames,
+                "checkpointed_frames": checkpointed,
+            },
+            "duration_ms": (time.perf_counter() - started) * 1000.0,
+            "before": before,
+            "after": after,
+        }
+        self.last_maintenance = report
+        logger.info(
+            "SQLite maintenance in %.1f ms: db %d -> %d bytes, wal %d -> %d bytes, "
+            "fts segments %d -> %d, probe queries %.2f -> %.2f ms%s",
+            report["duration_ms"], before["db_bytes"], after["db_bytes"],
+            before["wal_bytes"], after["wal_bytes"],
+            sum(before["fts_segments"].values()), sum(after["fts_segments"].values()),
+            sum(before["probe_ms"].values()), sum(after["probe_ms"].values()),
+            f" (skipped: {', '.join(skipped)})" if skipped else "",
+        )
+        return report
+
+    @_writes
+    def maintenance_snapshot(self) -> dict:
+        """Return the sizes and query timings run_maintenance() reports.
+
+        Returns
+        -------
+        dict
+            ``db_bytes`` and ``wal_bytes`` (file sizes), ``page_count``,
+            ``freelist_pages``, ``fts_segments`` (``{index: count}``)
+            and ``probe_ms`` (``{probe: milliseconds}``, see
+            ``_MAINTENANCE_PROBES``).
+        """
+        def size(path):
+            try:
+                return os.path.getsize(path)
+            except OSError:
+                return 0
+
+        segments = {}
+        for table in self._fts_tables():
+            segments[table] = self._conn.execute(
+                f"SELECT COUNT(DISTINCT segid) FROM {table}_idx"
+            ).fetchone()[0]
+        probes = {}
+        for label, sql in _MAINTENANCE_PROBES:
+            start = time.perf_counter()
+            try:
+                self._conn.execute(sql).fetchall()
+            except sqlite3.OperationalError:
+                continue  # index missing from this SQLite build
+            probes[label] = (time.perf_counter() - start) * 1000.0
+        return {
+            "db_bytes": size(self.db_path),
+            "wal_bytes": size(f"{self.db_path}-wal"),
+            "page_count": self._conn.execute("PRAGMA page_count").fetchone()[0],
+            "freelist_pages": self._conn.execute("PRAGMA freelist_count").fetchone()[0],
+            "fts_segments": segments,
+            "probe_ms": probes,
+        }
+
+    def wal_size(self) -> int:
+        """Size of the write-ahead log file in bytes (0 if there is none)."""
+        try:
+            return os.path.getsize(f"{self.db_path}-wal")
+        except OSError:
+            return 0
+
+    def _maintain_statistics(self, analysis_limit: int) -> None:
+        """Refresh the planner statistics, sampling at most *analysis_limit* rows."""
+        self._conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+        analysed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if analysed is None:
+            self._conn.execute("ANALYZE")
+        else:
+            # 0x10002: re-analyse any table whose row count drifted,
+            # not only those this connection happened to query
+            self._conn.execute("PRAGMA optimize = 0x10002")
+        self._conn.commit()
+
+    def _fts_tables(self) -> list[str]:
+        """Return the FTS5 indexes this database actually has.
+
+        Builds without FTS5, or without its trigram tokenizer, run with
+        some of ``_FTS_TABLES`` missing.
+        """
+        present = {
+            row[0] for row in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+        return [table for table in _FTS_TABLES if table in present]
+
+    def _merge_fts_segments(self, table: str, pages: int, deadline: float) -> bool:
+        """Merge *table*'s segments step by step until done or *deadline*.
+
+        Each step writes about *pages* pages and commits.  FTS5 reports
+        "nothing left to merge" by changing fewer than two rows.  Returns
+        ``True`` if the index was fully merged.
+        """
+        # A negative page count merges every level down to one segment,
+        # not just levels that have reached the automerge threshold
+        step = -abs(int(pages)) or -1
+        while time.perf_counter() < deadline:
+            changes = self._conn.total_changes
+            self._conn.execute(
+                f"INSERT INTO {table}({table}, rank) VALUES ('merge', ?)", (step,)
+            )
+            self._conn.commit()
+            if self._conn.total_changes - changes < 2:
+                return True
+        return False
+
     # ------------------------------------------------------------------
     # Connection management
     # ------------------------------------------------------------------
 
+    def _reader(self) -> sqlite3.Connection:
+        """Return the calling thread's read-only connection."""
+        return self._readers.get()
+
     def close(self) -> None:
-        """Close the database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close the writer connection and every pooled reader."""
+        with self._write_lock:
+            self._readers.close()
+            if self._conn:
+                self._conn.close()
+                self._conn = None
 
     def __enter__(self):
         """Support usage as a context manager."""
@@ -728,37 +2316,136 @@ class SQLiteSyncEngine:
         self.close()
         return False
 
+    # ------------------------------------------------------------------
+    # Internal: write transactions and the query result cache
+    # ------------------------------------------------------------------
+
+    def _commit(self) -> None:
+        """Commit the write transaction, bumping the changed tables' versions.
+
+        An entity rewritten with the same cross-references (or claims)
+        as before leaves that table's version, and the cached queries
+        over it, alone.
+        """
+        dirty = self._dirty_tables
+        for entity_id in self._old_rows.keys() | self._new_rows.keys():
+            before = self._old_rows.get(entity_id, ([], []))
+            after = self._new_rows.get(entity_id, ([], []))
+            if before[0] != after[0]:
+                dirty.add("cross_references")
+            if before[1] != after[1]:
+                dirty.add("canon_claims")
+        if dirty:
+            self._conn.executemany(
+                "UPDATE table_versions SET version = version + 1 WHERE name = ?",
+                [(table,) for table in sorted(dirty)],
+            )
+        self._conn.commit()
+        self._reset_write_tracking()
+        self.last_write_at = time.monotonic()
+        self.writes_since_maintenance += 1
+
+    def _rollback(self) -> None:
+        """Roll back the write transaction."""
+        self._conn.rollback()
+        self._reset_write_tracking()
+
+    def _reset_write_tracking(self) -> None:
+        self._old_rows.clear()
+        self._new_rows.clear()
+        self._dirty_tables.clear()
+
+    def _cached(self, method, tables, args, kwargs):
+        """Return ``method(self, *args, **kwargs)``, from the cache if current."""
+        try:
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            key = None  # unhashable arguments: not cacheable
+        if key is None or self._query_cache_max_entries <= 0:
+            return method(self, *args, **kwargs)
+
+        versions = dict(self._reader().execute("SELECT name, version FROM table_versions"))
+        tag = tuple(versions.get(table) for table in tables)
+        with self._query_cache_lock:
+            entry = self._query_cache.get(key)
+            if entry is not None and entry[0] == tag:
+                self._query_cache.move_to_end(key)
+                self._query_cache_hits += 1
+                return _copy_result(entry[1])
+            self._query_cache_misses += 1
+
+        result = method(self, *args, **kwargs)
+        with self._query_cache_lock:
+            self._query_cache[key] = (tag, result)
+            self._query_cache.move_to_end(key)
+            self._evict_query_cache()
+        return _copy_result(result)
+
+    def _evict_query_cache(self) -> None:
+        """Drop least recently used results beyond the cache bound."""
+        while len(self._query_cache) > self._query_cache_max_entries:
+            self._query_cache.popitem(last=False)
+            self._query_cache_evictions += 1
+
     # ------------------------------------------------------------------
     # Internal: row insertion helpers
     # ------------------------------------------------------------------
 
+    def _source_mtime(self, rel_path: str) -> int | None:
+        """Return the storage mtime stamp of the document at *rel_path*."""
+        if not rel_path:
+            return None
+        st = self.storage.stat(self.root / rel_path)
+        return st.st_mtime_ns if st is not None else None
+
     def _upsert_entity_row(self, entity_id: str, entity: dict,
-                           meta: dict, file_path: str) -> None:
-        """Insert or replace a single entity row."""
+                           meta: dict, file_path: str,
+                           source_mtime: int | None = None,
+                           content_hash: str | None = None) -> None:
+        """Insert or replace a single entity row.
+
+        *source_mtime* and *content_hash* let :meth:`full_sync` skip the
+        entity next time if its source is unchanged.
+        """
+        self._dirty_tables.add("entities")
         self._conn.execute(
             """
             INSERT OR REPLACE INTO entities
                 (id, entity_type, name, template_id, status,
-                 step_created, file_path, data, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 step_created, file_path, data, created_at, updated_at,
+                 content_hash, source_mtime)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (
-                entity_id,
-                meta.get("entity_type", ""),
-                entity.get("name", entity_id),
-                meta.get("template_id", ""),
-                meta.get("status", "draft"),
-                meta.get("step_created"),
-                file_path,
-                json.dumps(entity, ensure_ascii=False),
-                meta.get("created_at", ""),
-                meta.get("updated_at", ""),
-            ),
+            self._entity_row(entity_id, entity, meta, file_path,
+                             source_mtime, content_hash),
+        )
+
+    @staticmethod
+    def _entity_row(entity_id: str, entity: dict, meta: dict, file_path: str,
+                    source_mtime: int | None = None,
+                    content_hash: str | None = None) -> tuple:
+        """Return the ``entities`` column values for one entity."""
+        encoded = _json_dumps(entity, indent=None)
+        return (
+            entity_id,
+            meta.get("entity_type", ""),
+            entity.get("name", entity_id),
+            meta.get("template_id", ""),
+            meta.get("status", "draft"),
+            meta.get("step_created"),
+            file_path,
+            encoded.decode(),
+            meta.get("created_at", ""),
+            meta.get("updated_at", ""),
+            content_hash or _content_hash(entity, encoded),
+            source_mtime,
         )
 
     def _upsert_cross_references(self, entity_id: str, entity: dict) -> None:
         """Insert cross-reference rows for an entity."""
         xrefs = _extract_cross_references(entity)
+        self._new_rows.setdefault(entity_id, [[], []])[0] = xrefs
         for target_id, rel_type, source_field in xrefs:
             self._conn.execute(
                 """
@@ -770,28 +2457,27 @@ class SQLiteSyncEngine:
             )
 
     def _upsert_canon_claims(self, entity_id: str, entity: dict) -> None:
-        """Insert canon claim rows for an entity."""
-        claims = entity.get("canon_claims", [])
-        for claim in claims:
-            if isinstance(claim, dict):
-                claim_text = claim.get("claim", "")
-                refs = json.dumps(claim.get("references", []), ensure_ascii=False)
-            elif isinstance(claim, str):
-                claim_text = claim
-                refs = "[]"
-            else:
-                continue
-            if claim_text:
+        """Insert canon claim rows for an entity, and index their text."""
+        rows = _claim_rows(entity_id, entity)
+        self._new_rows.setdefault(entity_id, [[], []])[1] = [row[1:] for row in rows]
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO canon_claims (entity_id, claim, refs) VALUES (?, ?, ?)",
+                rows,
+            )
+            # No FTS5 in this SQLite build
+            with contextlib.suppress(sqlite3.OperationalError):
                 self._conn.execute(
-                    "INSERT INTO canon_claims (entity_id, claim, refs) VALUES (?, ?, ?)",
-                    (entity_id, claim_text, refs),
+                    "INSERT INTO claim_search(rowid, claim) "
+                    "SELECT id, claim FROM canon_claims WHERE entity_id = ?",
+                    (entity_id,),
                 )
 
     def _upsert_fts(self, entity_id: str, entity: dict) -> None:
         """Insert a row into the FTS5 index for full-text search.
 
-        The FTS5 table uses content='entities' and content_rowid='rowid',
-        so we need to supply the rowid of the corresponding entities row.
+        The indexed text is stored in entity_search_content under the
+        rowid of the corresponding entities row.
         """
         # Get the rowid assigned to this entity
         row = self._conn.execute(
@@ -799,22 +2485,42 @@ class SQLiteSyncEngine:
         ).fetchone()
         if row is None:
             return
-        rowid = row["rowid"]
-
-        name = entity.get("name", "")
-        entity_type = entity.get("_meta", {}).get("entity_type", "")
-        tags = _extract_text_field(entity, "tags")
-        description = _extract_text_field(entity, "description")
-        claims_text = _extract_canon_claims_text(entity)
+        self._upsert_names(entity_id, entity)
+        values = _search_row(row["rowid"], entity)
+        try:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO entity_search_content
+                    (id, name, entity_type, tags, description, canon_claims_text)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                values,
+            )
+            self._conn.execute(
+                """
+                INSERT INTO entity_search(rowid, name, entity_type, tags,
+                                          description, canon_claims_text)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                values,
+            )
+        except sqlite3.OperationalError:
+            # No FTS5 in this SQLite build
+            pass
 
-        self._conn.execute(
-            """
-            INSERT INTO entity_search(rowid, name, entity_type, tags,
-                                      description, canon_claims_text)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (rowid, name, entity_type, tags, description, claims_text),
+    def _upsert_names(self, entity_id: str, entity: dict) -> None:
+        """Insert an entity's names and aliases, and index them."""
+        self._conn.executemany(
+            "INSERT INTO entity_names (entity_id, name) VALUES (?, ?)",
+            _name_rows(entity_id, entity),
         )
+        # No FTS5 trigram tokenizer in this SQLite build
+        with contextlib.suppress(sqlite3.OperationalError):
+            self._conn.execute(
+                "INSERT INTO name_search(rowid, name) "
+                "SELECT id, name FROM entity_names WHERE entity_id = ?",
+                (entity_id,),
+            )
 
     def _remove_entity_data(self, entity_id: str) -> None:
         """Remove all data for an entity from all tables (including FTS)."""
@@ -822,16 +2528,32 @@ class SQLiteSyncEngine:
         row = self._conn.execute(
             "SELECT rowid FROM entities WHERE id = ?", (entity_id,)
         ).fetchone()
+        if row is not None:
+            self._dirty_tables.add("entities")
+        # Keep the rows as they were before this transaction, for _commit()
+        if entity_id not in self._old_rows:
+            self._old_rows[entity_id] = (
+                [tuple(r) for r in self._conn.execute(
+                    "SELECT target_id, relationship_type, source_field "
+                    "FROM cross_references WHERE source_id = ? ORDER BY rowid",
+                    (entity_id,),
+                )],
+                [tuple(r) for r in self._conn.execute(
+                    "SELECT claim, refs FROM canon_claims WHERE entity_id = ? ORDER BY id",
+                    (entity_id,),
+                )],
+            )
+        self._new_rows.pop(entity_id, None)
 
         if row is not None:
             rowid = row["rowid"]
             # Remove from FTS index
             try:
-                # For content-synced FTS5, we must supply the old content
-                # when deleting.  Fetch the current FTS data first.
+                # For external-content FTS5, we must supply the old content
+                # when deleting.  Fetch the indexed text first.
                 fts_row = self._conn.execute(
                     "SELECT name, entity_type, tags, description, canon_claims_text "
-                    "FROM entity_search WHERE rowid = ?",
+                    "FROM entity_search_content WHERE id = ?",
                     (rowid,),
                 ).fetchone()
                 if fts_row:
@@ -845,19 +2567,42 @@ class SQLiteSyncEngine:
                          fts_row["tags"], fts_row["description"],
                          fts_row["canon_claims_text"]),
                     )
+                    self._conn.execute(
+                        "DELETE FROM entity_search_content WHERE id = ?", (rowid,)
+                    )
             except sqlite3.OperationalError:
                 # If FTS is in a bad state, just proceed
                 pass
 
-        # Remove from relational tables
+        # Remove from relational tables.  Only the entity's own (outgoing)
+        # references go: inbound ones belong to the referencing entities,
+        # which still hold them -- removing them here made every
+        # re-sync of an entity cut its incoming links.
         self._conn.execute(
-            "DELETE FROM cross_references WHERE source_id = ? OR target_id = ?",
-            (entity_id, entity_id),
+            "DELETE FROM cross_references WHERE source_id = ?",
+            (entity_id,),
         )
+        with contextlib.suppress(sqlite3.OperationalError):
+            # External content again: the index needs the old claim text
+            self._conn.execute(
+                "INSERT INTO claim_search(claim_search, rowid, claim) "
+                "SELECT 'delete', id, claim FROM canon_claims WHERE entity_id = ?",
+                (entity_id,),
+            )
         self._conn.execute(
             "DELETE FROM canon_claims WHERE entity_id = ?",
             (entity_id,),
         )
+        with contextlib.suppress(sqlite3.OperationalError):
+            self._conn.execute(
+                "INSERT INTO name_search(name_search, rowid, name) "
+                "SELECT 'delete', id, name FROM entity_names WHERE entity_id = ?",
+                (entity_id,),
+            )
+        self._conn.execute(
+            "DELETE FROM entity_names WHERE entity_id = ?",
+            (entity_id,),
+        )
         self._conn.execute(
             "DELETE FROM entities WHERE id = ?",
             (entity_id,),
@@ -868,12 +2613,13 @@ class SQLiteSyncEngine:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _sanitise_fts_query(query: str) -> str:
+    def _sanitise_fts_query(query: str, prefix: bool = False) -> str:
         """Convert a plain-text query into a safe FTS5 query string.
 
         Wraps each word in double quotes to prevent FTS5 syntax errors
         from user input containing special characters like ``*``, ``-``,
-        ``(``, etc.  Multiple words become implicit AND matches.
+        ``(``, etc.  Multiple words become implicit AND matches.  With
+        *prefix* the last word becomes a prefix query (``"thor"*``).
         """
         words = query.split()
         if not words:
@@ -885,18 +2631,30 @@ class SQLiteSyncEngine:
             clean = word.replace('"', '')
             if clean:
                 safe_parts.append(f'"{clean}"')
-        return " ".join(safe_parts) if safe_parts else '""'
+        if not safe_parts:
+            return '""'
+        if prefix:
+            safe_parts[-1] += "*"
+        return " ".join(safe_parts)
 
-    def _fallback_search(self, query: str) -> list[dict]:
+    @staticmethod
+    def _page_sql(limit: int | None, offset: int) -> str:
+        """Return the ``LIMIT``/``OFFSET`` clause for a page of results."""
+        if limit is None:
+            return f" LIMIT -1 OFFSET {max(0, int(offset))}" if offset else ""
+        return f" LIMIT {max(0, int(limit))} OFFSET {max(0, int(offset))}"
+
+    def _fallback_search(self, query: str, limit: int | None = None,
+                         offset: int = 0) -> list[dict]:
         """Simple LIKE-based search used when FTS5 fails."""
         pattern = f"%{query}%"
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             """
             SELECT * FROM entities
             WHERE name LIKE ? OR entity_type LIKE ?
                OR data LIKE ?
             ORDER BY name
-            """,
+            """ + self._page_sql(limit, offset),
             (pattern, pattern, pattern),
         ).fetchall()
         return [self._row_to_dict(r) for r in rows]
@@ -6,17 +6,327 @@ _clean_schema_for_validation) that were previously copy-pasted across
 14+ engine modules and hook files.
 
 All JSON writes use atomic temp-file-then-os.replace() to prevent
-data corruption from crashes or concurrent access.
+data corruption from crashes or concurrent access.  JSON encoding and
+decoding go through a pluggable codec (orjson or msgspec when installed,
+stdlib ``json`` otherwise).  Fsyncs can be coalesced with :func:`batch`.
 """
 
+import atexit
 import json
 import logging
 import os
 import tempfile
+import threading
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
 
+# ---------------------------------------------------------------------------
+# JSON codec selection
+# ---------------------------------------------------------------------------
+#
+# orjson and msgspec are optional accelerators.  Both produce UTF-8 bytes
+# directly, so the helpers below always work in bytes; the stdlib codec
+# encodes/decodes at the edges to match.  Output is interchangeable: any
+# codec can read what any other wrote.
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _json_default(obj):
+    """Serialise objects that know their JSON form (``to_dict()``), e.g.
+    the compact :class:`~engine.entity_summary.EntitySummary` records."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+def _stdlib_dumps(obj, indent):
+    if indent is None:
+        text = json.dumps(obj, ensure_ascii=False, separators=_COMPACT_SEPARATORS,
+                          default=_json_default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=indent, default=_json_default)
+    return text.encode("utf-8")
+
+
+_CODECS = {"json": (_stdlib_loads, _stdlib_dumps)}
+
+# Exceptions raised for malformed input by any installed codec.
+JSON_DECODE_ERRORS = (ValueError,)
+
+try:
+    import orjson as _orjson
+
+    _ORJSON_OPTS = _orjson.OPT_NON_STR_KEYS
+
+    def _orjson_dumps(obj, indent):
+        if indent is None:
+            return _orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTS)
+        if indent == 2:
+            return _orjson.dumps(obj, default=_json_default,
+                                 option=_ORJSON_OPTS | _orjson.OPT_INDENT_2)
+        # orjson only supports two-space indentation.
+        return _stdlib_dumps(obj, indent)
+
+    _CODECS["orjson"] = (_orjson.loads, _orjson_dumps)
+except ImportError:
+    pass
+
+try:
+    import msgspec as _msgspec
+
+    _msgspec_decoder = _msgspec.json.Decoder()
+    _msgspec_encoder = _msgspec.json.Encoder(enc_hook=_json_default)
+
+    def _msgspec_dumps(obj, indent):
+        raw = _msgspec_encoder.encode(obj)
+        if indent is None:
+            return raw
+        return _msgspec.json.format(raw, indent=indent)
+
+    _CODECS["msgspec"] = (_msgspec_decoder.decode, _msgspec_dumps)
+    JSON_DECODE_ERRORS = (ValueError, _msgspec.DecodeError)
+except ImportError:
+    pass
+
+_CODEC_PREFERENCE = ("orjson", "msgspec", "json")
+
+_codec_name = next(name for name in _CODEC_PREFERENCE if name in _CODECS)
+_loads, _dumps = _CODECS[_codec_name]
+
+
+def available_json_codecs():
+    """Return the names of the JSON codecs importable in this environment.
+
+    Returns
+    -------
+    list[str]
+        Codec names in preference order; ``"json"`` is always present.
+    """
+    return [name for name in _CODEC_PREFERENCE if name in _CODECS]
+
+
+def get_json_codec():
+    """Return the name of the active JSON codec (``orjson``, ``msgspec`` or ``json``)."""
+    return _codec_name
+
+
+def set_json_codec(name):
+    """Select the JSON codec used by the helpers in this module.
+
+    The fastest installed codec is selected automatically at import
+    time; this is mainly useful for benchmarks and tests.
+
+    Parameters
+    ----------
+    name : str
+        One of :func:`available_json_codecs`.
+
+    Raises
+    ------
+    ValueError
+        If *name* is not installed.
+    """
+    global _codec_name, _loads, _dumps
+    if name not in _CODECS:
+        raise ValueError(
+            f"JSON codec '{name}' is not available "
+            f"(installed: {', '.join(available_json_codecs())})"
+        )
+    _codec_name = name
+    _loads, _dumps = _CODECS[name]
+
+
+def json_loads(data):
+    """Parse JSON from *data* (``bytes`` or ``str``) with the active codec.
+
+    Raises
+    ------
+    ValueError
+        If *data* is not valid JSON.  msgspec raises its own
+        ``DecodeError``; catch :data:`JSON_DECODE_ERRORS` to cover every
+        codec.
+    """
+    return _loads(data)
+
+
+def json_dumps(obj, *, indent=2):
+    """Serialise *obj* to UTF-8 JSON bytes with the active codec.
+
+    Parameters
+    ----------
+    obj
+        JSON-serialisable object.
+    indent : int or None, optional
+        Indentation level (default 2).  ``None`` produces compact output
+        with no whitespace, intended for machine-only files such as the
+        ``runtime/`` caches and bookkeeping indexes.
+
+    Returns
+    -------
+    bytes
+    """
+    return _dumps(obj, indent)
+
+
+# ---------------------------------------------------------------------------
+# Group commit (deferred fsync)
+# ---------------------------------------------------------------------------
+#
+# Inside ``with batch():`` -- or within the configured group-commit
+# window -- writes and appends still reach the OS immediately (readers
+# see them at once), but their fsyncs are deferred and coalesced: each
+# appended file is fsynced once and each touched directory is fsynced
+# once when the outermost batch exits or the window elapses.  Batches
+# are per-thread, so a batch never delays another thread's durability.
+#
+# Atomic writes always fsync their temp file before the rename, so a
+# crash can lose a deferred write but never leave a torn file.  Only
+# the directory fsync that makes the rename durable is deferred.
+
+# os.fsync needs a writable handle on Windows; directories cannot be
+# fsynced there at all.
+_FSYNC_FLAGS = os.O_RDWR if os.name == "nt" else os.O_RDONLY
+
+
+class _PendingSync:
+    """Files and directories awaiting a coalesced fsync."""
+
+    __slots__ = ("files", "dirs")
+
+    def __init__(self):
+        self.files = set()
+        self.dirs = set()
+
+    def flush(self):
+        """Fsync every pending directory, then every pending file.
+
+        Directories go first so that renamed files (whose data is
+        already on disk) become durable before any appended record
+        that was written after them, e.g. a log entry naming a file.
+        """
+        files, dirs = self.files, self.dirs
+        self.files, self.dirs = set(), set()
+        if os.name != "nt":
+            for path in dirs:
+                _fsync_path(path, os.O_RDONLY)
+        for path in files:
+            _fsync_path(path, _FSYNC_FLAGS)
+
+
+def _fsync_path(path, flags):
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        logger.warning("fsync failed for %s", path, exc_info=True)
+    finally:
+        os.close(fd)
+
+
+_batch_local = threading.local()
+_window_lock = threading.Lock()
+_window_pending = _PendingSync()
+_window_seconds = 0.0
+_window_timer = None
+
+
+@contextmanager
+def batch():
+    """Group the current thread's JSON writes and appends into one commit.
+
+    Batches nest; fsyncs are issued when the outermost batch exits
+    (including on error, so everything already written is made
+    durable).  On exit, durability is the same as if each write had
+    been issued on its own.
+
+    Examples
+    --------
+    >>> with batch():                                    # doctest: +SKIP
+    ...     for record in records:
+    ...         safe_append_jsonl(log_path, record)
+    """
+    depth = getattr(_batch_local, "depth", 0)
+    if depth == 0:
+        _batch_local.pending = _PendingSync()
+    _batch_local.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch_local.depth = depth
+        if depth == 0:
+            pending = _batch_local.pending
+            _batch_local.pending = None
+            pending.flush()
+
+
+def in_batch():
+    """Return ``True`` if the current thread is inside :func:`batch`."""
+    return getattr(_batch_local, "depth", 0) > 0
+
+
+def set_group_commit_window(seconds):
+    """Defer fsyncs outside :func:`batch` by up to *seconds*.
+
+    With a non-zero window, writes issued close together share one
+    fsync per file/directory, at the cost of a crash inside the window
+    losing those writes.  ``0`` (the default) keeps the immediate
+    behaviour and flushes anything still pending.
+
+    Parameters
+    ----------
+    seconds : float
+        Window length; negative values are treated as ``0``.
+    """
+    global _window_seconds
+    _window_seconds = max(0.0, float(seconds))
+    if not _window_seconds:
+        flush_pending_writes()
+
+
+def flush_pending_writes():
+    """Immediately fsync everything deferred by the group-commit window."""
+    global _window_timer
+    with _window_lock:
+        if _window_timer is not None:
+            _window_timer.cancel()
+            _window_timer = None
+        _window_pending.flush()
+
+
+def _defer_sync(files=(), dirs=()):
+    """Queue fsyncs for a batch or the window; ``False`` means sync now."""
+    global _window_timer
+    pending = getattr(_batch_local, "pending", None)
+    if pending is not None:
+        pending.files.update(files)
+        pending.dirs.update(dirs)
+        return True
+    if not _window_seconds:
+        return False
+    with _window_lock:
+        _window_pending.files.update(files)
+        _window_pending.dirs.update(dirs)
+        if _window_timer is None:
+            _window_timer = threading.Timer(_window_seconds, flush_pending_writes)
+            _window_timer.daemon = True
+            _window_timer.start()
+    return True
+
+
+atexit.register(flush_pending_writes)
+
+
 # ---------------------------------------------------------------------------
 # JSON I/O (atomic writes)
 # ---------------------------------------------------------------------------
@@ -37,18 +347,19 @@ def safe_read_json(path, default=None):
         Parsed JSON content, or *default* on failure.
     """
     try:
-        with open(path, "r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        with open(path, "rb") as fh:
+            return _loads(fh.read())
+    except (OSError, *JSON_DECODE_ERRORS):
         return default
 
 
-def safe_write_json(path, data, *, indent=2):
+def safe_write_json(path, data, *, indent=2, fsync=True):
     """Atomically write *data* as JSON to *path*.
 
     Uses a temporary file in the same directory followed by
     ``os.replace()`` so that readers never see a partially-written file.
-    Parent directories are created if they do not exist.
+    Parent directories are created if they do not exist.  See
+    :func:`safe_write_bytes` for the fsync behaviour.
 
     Parameters
     ----------
@@ -56,8 +367,33 @@ def safe_write_json(path, data, *, indent=2):
         Absolute path to the target JSON file.
     data
         JSON-serialisable object to write.
-    indent : int, optional
-        JSON indentation level (default 2).
+    indent : int or None, optional
+        JSON indentation level (default 2).  Pass ``None`` for compact
+        output in machine-only files.
+    fsync : bool, optional
+        ``False`` skips every fsync, for caches that are rebuilt when
+        found corrupt (default ``True``).
+    """
+    safe_write_bytes(path, _dumps(data, indent), fsync=fsync)
+
+
+def safe_write_bytes(path, payload, *, fsync=True):
+    """Atomically write the bytes *payload* to *path*.
+
+    The temp file's data is fsynced before ``os.replace()``, so a crash
+    never leaves a torn file behind.  The parent directory is fsynced
+    right after the rename, or once at commit inside :func:`batch` (or
+    the group-commit window).
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Absolute path to the target file.
+    payload : bytes
+        The complete new file contents.
+    fsync : bool, optional
+        ``False`` skips every fsync and leaves flushing to the OS
+        (default ``True``).
     """
     path = str(path)
     parent = os.path.dirname(path)
@@ -66,8 +402,11 @@ def safe_write_json(path, data, *, indent=2):
     # Write to a temp file in the same directory, then atomically replace.
     fd, tmp_path = tempfile.mkstemp(dir=parent, suffix=".tmp")
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=indent, ensure_ascii=False)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+            if fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
         os.replace(tmp_path, path)
     except BaseException:
         # Clean up the temp file on any failure.
@@ -76,14 +415,17 @@ def safe_write_json(path, data, *, indent=2):
         except OSError:
             pass
         raise
+    if fsync and not _defer_sync(dirs=(parent,)) and os.name != "nt":
+        _fsync_path(parent, os.O_RDONLY)
 
 
-def safe_append_jsonl(path, record):
+def safe_append_jsonl(path, record, *, fsync=True):
     """Append a single JSON record to a JSONL (JSON Lines) file.
 
-    Uses a temporary file and rename for atomicity when the file
-    does not yet exist.  For existing files, appends in place (the
-    append is a single ``write`` call to minimise partial-write risk).
+    The append is a single ``write`` call to minimise partial-write
+    risk, followed by an fsync.  Inside :func:`batch` (or the
+    group-commit window) the fsync is deferred and shared with every
+    other append to the same file.
 
     Parameters
     ----------
@@ -91,16 +433,47 @@ def safe_append_jsonl(path, record):
         Absolute path to the JSONL file.
     record
         JSON-serialisable object to append as one line.
+    fsync : bool, optional
+        ``False`` skips the fsync entirely and leaves flushing to the
+        OS, for high-frequency logs that never needed durability
+        (default ``True``).
     """
     path = str(path)
     parent = os.path.dirname(path)
     os.makedirs(parent, exist_ok=True)
 
-    line = json.dumps(record, ensure_ascii=False) + "\n"
-    with open(path, "a", encoding="utf-8") as fh:
+    line = _dumps(record, None) + b"\n"
+    created = not os.path.exists(path)
+    with open(path, "ab") as fh:
         fh.write(line)
+        if not fsync:
+            return
         fh.flush()
-        os.fsync(fh.fileno())
+        if not _defer_sync(files=(path,), dirs=(parent,) if created else ()):
+            os.fsync(fh.fileno())
+
+
+def iter_json_files(root, rel_prefix=""):
+    """Yield ``(abs_path, rel_path, dir_entry)`` for every ``*.json`` under *root*.
+
+    Uses ``os.scandir`` directly, which avoids the per-entry ``Path``
+    objects that ``rglob`` creates; ``dir_entry.stat()`` is cached by
+    the OS on Windows.  *rel_prefix* is prepended to the forward-slash
+    path relative to *root*.  Unreadable directories are skipped.
+    """
+    stack = [(str(root), rel_prefix)]
+    while stack:
+        directory, rel_dir = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel))
+                    elif entry.name.endswith(".json"):
+                        yield entry.path, rel, entry
+        except OSError:
+            continue
 
 
 # ---------------------------------------------------------------------------
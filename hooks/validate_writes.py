@@ -82,11 +82,21 @@ def main():
         print(f"[validate_writes] No entity ID found in: {file_path}")
         return
 
+    # --- Open the SQLite mirror (claim candidates for the check, sync after) ---
+    sync = None
+    try:
+        from engine.sqlite_sync import SQLiteSyncEngine
+        sync = SQLiteSyncEngine(PROJECT_ROOT)
+    except Exception as e:
+        print(f"[validate_writes] SQLite open error: {e}")
+
     # --- Run ConsistencyChecker ---
     validation_passed = True
     try:
         from engine.consistency_checker import ConsistencyChecker
         cc = ConsistencyChecker(PROJECT_ROOT)
+        if sync is not None:
+            cc.set_sqlite_sync(sync)
         result = cc.check_entity(entity_data, template_id=template_id)
 
         if not result.get("passed", False):
@@ -108,16 +118,16 @@ def main():
         print(f"[validate_writes] Consistency check error: {e}")
 
     # --- Sync to SQLite (even if validation has warnings, sync on pass) ---
-    if validation_passed:
+    if validation_passed and sync is not None:
         try:
-            from engine.sqlite_sync import SQLiteSyncEngine
-            sync = SQLiteSyncEngine(PROJECT_ROOT)
             sync.sync_entity(entity_id, entity_data)
-            sync.close()
         except Exception as e:
             print(f"[validate_writes] SQLite sync error: {e}")
+    if sync is not None:
+        sync.close()
 
-        # --- Update the knowledge graph ---
+    # --- Update the knowledge graph ---
+    if validation_passed:
         try:
             from engine.graph_builder import WorldGraph
             wg = WorldGraph(PROJECT_ROOT)
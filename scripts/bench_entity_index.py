@@ -0,0 +1,100 @@
+"""
+Memory benchmark for the in-memory entity index (engine/entity_summary.py).
+
+Builds an ``entity_index`` of N entries the way DataManager gets one --
+by parsing a state.json payload -- and measures, with ``tracemalloc``,
+the memory held by the index as plain dicts and as EntitySummary
+records.  Also times loading, ``get_state()``-style deep copies and
+serializing the index back to JSON.
+
+Usage::
+
+    python scripts/bench_entity_index.py [--count 100000]
+"""
+import argparse
+import copy
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from engine import utils  # noqa: E402
+from engine.entity_summary import summaries_from_state  # noqa: E402
+
+_TYPES = [("god-profile", "gods"), ("settlement-profile", "settlements"),
+          ("species-profile", "species"), ("religion-profile", "religions")]
+
+
+def state_payload(count):
+    """Return a state.json payload (bytes) with *count* index entries."""
+    index = {}
+    for i in range(count):
+        template_id, entity_type = _TYPES[i % len(_TYPES)]
+        entity_id = f"entity-{i:06d}-{i * 7919 % 65536:04x}"
+        index[entity_id] = {
+            "template_id": template_id,
+            "entity_type": entity_type,
+            "name": f"Entity {i}",
+            "status": "canon" if i % 3 else "draft",
+            "file_path": f"user-world/entities/{entity_type}/{entity_id}.json",
+            "created_at": "2026-01-01T00:00:00.000000+00:00",
+            "updated_at": "2026-01-02T00:00:00.000000+00:00",
+            "step_created": i % 52 + 1,
+        }
+    return utils.json_dumps({"entity_index": index}, indent=None)
+
+
+def measure(build):
+    """Return ``(result, bytes_retained, seconds)`` for ``build()``.
+
+    Timing comes from an untraced run; tracemalloc slows allocation.
+    """
+    gc.collect()
+    t0 = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000,
+                        help="number of index entries (default 100000)")
+    args = parser.parse_args()
+    payload = state_payload(args.count)
+
+    def as_dicts():
+        return utils.json_loads(payload)["entity_index"]
+
+    def as_summaries():
+        return summaries_from_state(utils.json_loads(payload)["entity_index"])
+
+    print(f"{args.count} entries, codec {utils.get_json_codec()}")
+    print(f"{'form':<10} {'MiB':>8} {'B/entry':>8} {'load s':>8} "
+          f"{'deepcopy s':>11} {'dump s':>8}")
+    for label, build in (("dict", as_dicts), ("summary", as_summaries)):
+        index, retained, load_s = measure(build)
+        t0 = time.perf_counter()
+        copy.deepcopy(index)
+        copy_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        utils.json_dumps({"entity_index": index})
+        dump_s = time.perf_counter() - t0
+        print(f"{label:<10} {retained / 1048576:8.1f} {retained / args.count:8.0f} "
+              f"{load_s:8.3f} {copy_s:11.3f} {dump_s:8.3f}")
+        del index
+
+
+if __name__ == "__main__":
+    main()
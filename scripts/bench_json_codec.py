@@ -0,0 +1,146 @@
+"""
+Micro-benchmark for the JSON codec layer in engine/utils.py.
+
+Builds a realistic entity corpus (or uses the entities under
+``user-world/entities`` when ``--world`` is given), then times in-memory
+encode/decode plus ``safe_write_json`` / ``safe_read_json`` with every
+installed codec in both pretty (indent=2) and compact output modes.
+
+Usage::
+
+    python scripts/bench_json_codec.py [--count N] [--repeat R] [--world]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from engine import utils  # noqa: E402
+
+
+def synthetic_entity(i):
+    """Return an entity document shaped like a filled-in god profile."""
+    entity_id = f"god-{i:05d}-a1b2"
+    return {
+        "name": f"God {i}",
+        "title": "Lord of Storms and Thunder",
+        "domain_primary": "storms",
+        "domains_secondary": ["war", "sky", "sea"],
+        "alignment": "neutral",
+        "personality": "Stern but fair. " * 20,
+        "appearance": "A towering figure wreathed in cloud. " * 10,
+        "symbols": ["hammer", "lightning bolt", "eagle"],
+        "worshippers": "Sailors and soldiers across the northern coast.",
+        "relationships": [
+            {"target_id": f"god-{(i + k) % 1000:05d}-a1b2",
+             "relationship_type": "rival", "description": "Ancient feud."}
+            for k in range(1, 6)
+        ],
+        "canon_claims": [
+            {"claim": f"God {i} forged the first storm.", "references": []},
+        ],
+        "_meta": {
+            "id": entity_id,
+            "template_id": "god-profile",
+            "entity_type": "gods",
+            "status": "canon",
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-02T00:00:00+00:00",
+            "step_created": 7,
+            "file_path": f"user-world/entities/gods/{entity_id}.json",
+        },
+        "_prose": "A long narrative paragraph about this deity. " * 30,
+    }
+
+
+def world_entities():
+    """Return every entity document under user-world/entities."""
+    docs = []
+    for path in (PROJECT_ROOT / "user-world" / "entities").rglob("*.json"):
+        doc = utils.safe_read_json(str(path))
+        if isinstance(doc, dict):
+            docs.append(doc)
+    return docs
+
+
+def bench(codec, docs, indent, repeat, workdir):
+    """Time *docs* in memory and on disk.
+
+    Returns ``(encode_s, decode_s, write_s, read_s, total_bytes)``; the
+    encode/decode columns isolate the codec from filesystem overhead.
+    """
+    utils.set_json_codec(codec)
+    paths = [os.path.join(workdir, f"{i}.json") for i in range(len(docs))]
+    best_enc = best_dec = best_write = best_read = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        blobs = [utils.json_dumps(doc, indent=indent) for doc in docs]
+        t1 = time.perf_counter()
+        for blob in blobs:
+            utils.json_loads(blob)
+        t2 = time.perf_counter()
+        best_enc = min(best_enc, t1 - t0)
+        best_dec = min(best_dec, t2 - t1)
+        t0 = time.perf_counter()
+        for path, doc in zip(paths, docs, strict=True):
+            utils.safe_write_json(path, doc, indent=indent)
+        t1 = time.perf_counter()
+        for path in paths:
+            utils.safe_read_json(path)
+        t2 = time.perf_counter()
+        best_write = min(best_write, t1 - t0)
+        best_read = min(best_read, t2 - t1)
+    size = sum(os.path.getsize(p) for p in paths)
+    return best_enc, best_dec, best_write, best_read, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000,
+                        help="number of synthetic entities (default 2000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="best-of repetitions (default 3)")
+    parser.add_argument("--world", action="store_true",
+                        help="use the entities in user-world/ instead")
+    args = parser.parse_args()
+
+    docs = world_entities() if args.world else [
+        synthetic_entity(i) for i in range(args.count)
+    ]
+    if not docs:
+        print("No entities to benchmark.")
+        return
+
+    active = utils.get_json_codec()
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for codec in utils.available_json_codecs():
+                for indent in (2, None):
+                    rows.append((codec, indent, *bench(
+                        codec, docs, indent, args.repeat, workdir,
+                    )))
+    finally:
+        utils.set_json_codec(active)
+
+    base = {row[1]: row[2:6] for row in rows if row[0] == "json"}
+    print(f"{len(docs)} entities, best of {args.repeat} "
+          f"(speedup vs stdlib json in brackets)")
+    print(f"{'codec':<8} {'mode':<8} {'encode s':>16} {'decode s':>16} "
+          f"{'write s':>16} {'read s':>16} {'MiB':>6}")
+    for codec, indent, *timings, size in rows:
+        cells = " ".join(
+            f"{t:9.3f} ({b / t:4.1f}x)" for t, b in zip(timings, base[indent], strict=True)
+        )
+        print(f"{codec:<8} {'pretty' if indent else 'compact':<8} {cells} "
+              f"{size / 1048576:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark the entity storage backends in engine/entity_storage.py.
+
+For each world size, builds a synthetic world under a temporary
+directory with both the JSON file tree and the SQLite store, then times:
+
+* ``write``  -- storing every entity (JSON inside one group commit,
+  SQLite in one transaction)
+* ``cold``   -- ``load_all()`` on a fresh backend with no manifest
+* ``rescan`` -- ``scan()`` with nothing changed
+* ``reads``  -- 1000 random single-entity reads
+* ``update`` -- rewriting 100 entities one at a time
+
+Usage::
+
+    python scripts/bench_storage_backends.py [--counts 1000,10000,100000]
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from engine import utils  # noqa: E402
+from engine.entity_journal import reset_journals  # noqa: E402
+from engine.entity_storage import JSONFileStorage, SQLiteEntityStorage  # noqa: E402
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+from bench_json_codec import synthetic_entity  # noqa: E402
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _disk_bytes(path):
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(dirpath, f)) for f in files)
+    return total
+
+
+def bench(backend, root, docs):
+    """Time one backend on *docs*; returns ``{column: seconds}`` plus ``bytes``."""
+    items = [
+        (Path(root) / doc["_meta"]["file_path"], doc["_meta"]["id"], doc) for doc in docs
+    ]
+    make = JSONFileStorage if backend == "json" else SQLiteEntityStorage
+    storage = make(root)
+    row = {}
+
+    def write_all():
+        if backend == "json":
+            with utils.batch():
+                for path, entity_id, doc in items:
+                    storage.write(path, entity_id, doc)
+        else:
+            storage.write_many(items)
+
+    row["write"] = _timed(write_all)
+    storage.close()
+
+    # Cold start: no journal manifest, no open connection
+    reset_journals()
+    with contextlib.suppress(OSError):
+        os.remove(os.path.join(root, "runtime", "entity_manifest.json"))
+    storage = make(root)
+    row["cold"] = _timed(storage.load_all)
+    row["rescan"] = _timed(storage.scan)
+
+    sample = random.Random(0).sample(items, min(1000, len(items)))
+    row["reads"] = _timed(lambda: [storage.read(path) for path, _, _ in sample])
+
+    def update():
+        for path, entity_id, doc in sample[:100]:
+            doc["personality"] = "Changed. " * 20
+            storage.write(path, entity_id, doc)
+
+    row["update"] = _timed(update)
+    storage.close()
+    row["bytes"] = (
+        _disk_bytes(os.path.join(root, "user-world", "entities")) if backend == "json"
+        else sum(_disk_bytes(p) if os.path.isdir(p) else os.path.getsize(p)
+                 for p in (f"{storage.db_path}{s}" for s in ("", "-wal"))
+                 if os.path.exists(p))
+    )
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", default="1000,10000",
+                        help="comma-separated world sizes (default 1000,10000)")
+    args = parser.parse_args()
+    counts = [int(c) for c in args.counts.split(",") if c.strip()]
+
+    columns = ("write", "cold", "rescan", "reads", "update")
+    print(f"{'entities':>9} {'backend':<8} "
+          + " ".join(f"{c + ' s':>9}" for c in columns) + f" {'MiB':>8}")
+    for count in counts:
+        docs = [synthetic_entity(i) for i in range(count)]
+        for backend in ("json", "sqlite"):
+            with tempfile.TemporaryDirectory() as root:
+                row = bench(backend, root, docs)
+            reset_journals()
+            cells = " ".join(f"{row[c]:9.3f}" for c in columns)
+            print(f"{count:>9} {backend:<8} {cells} {row['bytes'] / 1048576:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -134,6 +134,20 @@ class TestEventLogging:
         assert event["event_type"] == BookkeepingManager.EVENT_STEP_STATUS_CHANGED
         assert event["data"]["new_status"] == "in_progress"
 
+    def test_log_event_does_not_fsync(self, tmp_path, monkeypatch):
+        """Event appends should not fsync each record."""
+        import engine.utils
+
+        bm = BookkeepingManager(str(tmp_path / "bookkeeping"))
+        bm.start_session()
+        calls = []
+        monkeypatch.setattr(engine.utils.os, "fsync", calls.append)
+        for n in range(5):
+            bm.log_event("custom_event", {"n": n})
+        assert calls == []
+        with open(bm._event_log_path(), encoding="utf-8") as fh:
+            assert len(fh.readlines()) == 6
+
     def test_session_ended_event(self, tmp_path):
         """end_session should record a session_ended event."""
         bm = BookkeepingManager(str(tmp_path / "bookkeeping"))
@@ -8,6 +8,7 @@ Validates:
     - check_rules validates cross-references
     - check_rules catches bidirectional relationship mismatches
     - check_semantic prepares proper context
+    - find_similar_claims with and without the SQLite claim index
     - format_human_message produces readable output
     - Full check_entity pipeline
 """
@@ -17,6 +18,7 @@ import os
 import pytest
 
 from engine.consistency_checker import ConsistencyChecker
+from engine.sqlite_sync import SQLiteSyncEngine
 
 
 # ---------------------------------------------------------------------------
@@ -220,6 +222,60 @@ class TestCheckSemantic:
         assert isinstance(result["similar_existing_claims"], list)
 
 
+class TestFindSimilarClaimsSQLite:
+    """Tests for find_similar_claims with a SQLite mirror attached."""
+
+    CLAIMS = [{"claim": "Storm Rival's primary domain is storms", "references": []}]
+
+    def test_same_results_as_inverted_index(self, temp_world):
+        """SQLite candidates are re-scored exactly like the in-memory ones."""
+        expected = ConsistencyChecker(temp_world).find_similar_claims(self.CLAIMS)
+        assert expected
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            cc = ConsistencyChecker(temp_world)
+            cc.set_sqlite_sync(sync)
+            assert cc.find_similar_claims(self.CLAIMS) == expected
+            assert cc._claim_inverted_index is None  # never built
+
+    def test_excludes_own_entity(self, temp_world):
+        """Claims of the entity being checked are not returned."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            cc = ConsistencyChecker(temp_world)
+            cc.set_sqlite_sync(sync)
+            found = cc.find_similar_claims(self.CLAIMS, entity_id="thorin-stormkeeper-a1b2")
+            assert all(c["entity_id"] != "thorin-stormkeeper-a1b2" for c in found)
+
+    def test_stale_mirror_is_reconciled(self, temp_world):
+        """Claims written since the mirror was synced are still found."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            cc = ConsistencyChecker(temp_world)
+            cc.set_sqlite_sync(sync)
+            found = cc.find_similar_claims(self.CLAIMS)
+            assert found == ConsistencyChecker(temp_world).find_similar_claims(self.CLAIMS)
+
+    def test_stop_words_stay_out_of_the_query(self, temp_world, monkeypatch):
+        """Only content words are sent to the FTS5 OR query."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            terms = []
+            monkeypatch.setattr(sync, "similar_claims",
+                                lambda words, **kw: terms.extend(words) or [])
+            cc = ConsistencyChecker(temp_world)
+            cc.set_sqlite_sync(sync)
+            cc.find_similar_claims(["The god of the storms is angry"])
+            assert sorted(terms) == ["angry", "god", "storms"]
+
+    def test_falls_back_when_sqlite_fails(self, temp_world):
+        """A closed or broken mirror falls back to the inverted index."""
+        sync = SQLiteSyncEngine(temp_world)
+        sync.full_sync()
+        sync.close()
+        cc = ConsistencyChecker(temp_world)
+        cc.set_sqlite_sync(sync)
+        assert cc.find_similar_claims(self.CLAIMS)
+
+
 # ---------------------------------------------------------------------------
 # Human Message Formatting
 # ---------------------------------------------------------------------------
@@ -246,6 +246,50 @@ class TestSearch:
         results = dm.search_entities("xyzzyplughfrobozz")
         assert results == []
 
+    def test_search_paging(self, temp_world):
+        """limit/offset should page results with and without SQLite."""
+        from engine.sqlite_sync import SQLiteSyncEngine
+
+        dm = DataManager(temp_world)
+        everything = dm.search_entities("a")
+        assert dm.search_entities("a", limit=1, offset=1) == everything[1:2]
+
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            dm.set_sqlite_sync(sync)
+            ranked = dm.search_entities("storms")
+            assert ranked
+            assert dm.search_entities("storms", limit=1) == ranked[:1]
+            assert dm.search_entities("storms", offset=len(ranked)) == []
+
+    def test_search_infix_and_typo_via_sqlite(self, temp_world):
+        """Name fragments and misspellings are found on the trigram index."""
+        from engine.sqlite_sync import SQLiteSyncEngine
+
+        dm = DataManager(temp_world)
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            dm.set_sqlite_sync(sync)
+            assert [r["id"] for r in dm.search_entities("ormkee")] == ["thorin-stormkeeper-a1b2"]
+            assert [r["id"] for r in dm.search_entities("Stormkeper")] == ["thorin-stormkeeper-a1b2"]
+            assert dm.search_entities("ormkee", offset=1) == []
+
+    def test_search_merges_word_and_name_matches(self, temp_world, sample_god_data):
+        """Whole-word hits come first, then names containing the query."""
+        from engine.sqlite_sync import SQLiteSyncEngine
+
+        dm = DataManager(temp_world)
+        asathor = dm.create_entity("god-profile", {**sample_god_data, "name": "Asathor"})
+        thor = dm.create_entity("god-profile", {**sample_god_data, "name": "Thor"})
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            dm.set_sqlite_sync(sync)
+            ids = [r["id"] for r in dm.search_entities("thor")]
+            assert ids[0] == thor
+            assert asathor in ids
+            assert len(ids) == len(set(ids))
+            assert dm.search_entities("thor", limit=1, offset=1) == dm.search_entities("thor")[1:2]
+
 
 # ---------------------------------------------------------------------------
 # Validate
@@ -385,3 +429,534 @@ class TestCustomProse:
 
         assert entity["_prose_custom"] is False
         assert len(entity.get("_prose", "")) > 0
+
+
+# ---------------------------------------------------------------------------
+# Persistent ID -> path index
+# ---------------------------------------------------------------------------
+
+class TestEntityPathIndex:
+    """Tests for the runtime/entity_paths.json ID -> path index."""
+
+    def test_create_persists_path_index(self, temp_world, sample_god_data):
+        """Creating an entity should record its path in runtime/entity_paths.json."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+
+        index_path = os.path.join(temp_world, "runtime", "entity_paths.json")
+        with open(index_path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        assert data["paths"][entity_id] == f"user-world/entities/gods/{entity_id}.json"
+
+    def test_lookup_survives_state_drift(self, temp_world, sample_god_data):
+        """An entity missing from state.json should still resolve via the path index."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+
+        fresh = DataManager(temp_world)
+        del fresh._state["entity_index"][entity_id]
+        fresh.update_entity(entity_id, {"personality": "Drifted."})
+        assert fresh.get_entity(entity_id)["personality"] == "Drifted."
+
+    def test_self_heals_for_externally_written_file(self, temp_world):
+        """A file written outside DataManager is found with one walk, then cached."""
+        dm = DataManager(temp_world)
+        dm.get_entity("thorin-stormkeeper-a1b2")  # prime the index
+
+        external = {
+            "name": "Outside Writer",
+            "_meta": {"id": "outside-writer-9999", "template_id": "god-profile"},
+        }
+        ext_path = os.path.join(
+            temp_world, "user-world", "entities", "gods", "hand-named.json",
+        )
+        with open(ext_path, "w", encoding="utf-8") as fh:
+            json.dump(external, fh)
+
+        assert dm._find_entity_file("outside-writer-9999") == ext_path
+        assert dm._get_path_index()["outside-writer-9999"].endswith("hand-named.json")
+
+    def test_missing_id_does_not_rewalk_unchanged_tree(self, temp_world, monkeypatch):
+        """Repeated misses on an unchanged tree should not walk the directory again."""
+        dm = DataManager(temp_world)
+        assert dm._find_entity_file("no-such-entity-0000") is None
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("unexpected directory walk")
+
+        monkeypatch.setattr(dm, "_rebuild_path_index", _fail)
+        assert dm._find_entity_file("no-such-entity-0000") is None
+
+    def test_deleted_file_is_forgotten(self, temp_world, sample_god_data):
+        """If an indexed file disappears, lookups return None and the entry is dropped."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        del dm._state["entity_index"][entity_id]
+        os.remove(os.path.join(temp_world, "user-world", "entities", "gods", f"{entity_id}.json"))
+
+        assert dm._find_entity_file(entity_id) is None
+        assert entity_id not in dm._get_path_index()
+
+
+# ---------------------------------------------------------------------------
+# Entity document cache
+# ---------------------------------------------------------------------------
+
+class TestDocCache:
+    """Tests for the bounded, mtime-validated entity document cache."""
+
+    def test_repeat_reads_hit_cache(self, temp_world):
+        """A second get_entity for an unchanged file should be a cache hit."""
+        dm = DataManager(temp_world)
+        dm.get_entity("thorin-stormkeeper-a1b2")
+        dm.get_entity("thorin-stormkeeper-a1b2")
+        stats = dm.doc_cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_returned_documents_are_private_copies(self, temp_world):
+        """Mutating a returned document must not corrupt the cached copy."""
+        dm = DataManager(temp_world)
+        first = dm.get_entity("thorin-stormkeeper-a1b2")
+        first["name"] = "Mutated"
+        first["_meta"]["status"] = "mutated"
+        second = dm.get_entity("thorin-stormkeeper-a1b2")
+        assert second["name"] == "Thorin Stormkeeper"
+        assert second["_meta"]["status"] == "draft"
+
+    def test_writes_are_written_through(self, temp_world, sample_god_data):
+        """create/update/set_entity_status should leave a fresh cache entry."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.update_entity(entity_id, {"personality": "Cached."})
+        dm.set_entity_status(entity_id, "canon")
+        before = dm.doc_cache_stats()["misses"]
+
+        entity = dm.get_entity(entity_id)
+        assert entity["personality"] == "Cached."
+        assert entity["_meta"]["status"] == "canon"
+        assert dm.doc_cache_stats()["misses"] == before
+
+    def test_external_write_invalidates_entry(self, temp_world):
+        """A file rewritten outside DataManager should be re-read, not served stale."""
+        dm = DataManager(temp_world)
+        entity = dm.get_entity("thorin-stormkeeper-a1b2")
+
+        entity["personality"] = "Rewritten by a hook with a longer personality text."
+        path = os.path.join(
+            temp_world, "user-world", "entities", "gods", "thorin-stormkeeper-a1b2.json",
+        )
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(entity, fh)
+
+        assert dm.get_entity("thorin-stormkeeper-a1b2")["personality"].startswith("Rewritten")
+        assert dm.doc_cache_stats()["misses"] == 2
+
+    def test_entry_bound_evicts_lru(self, temp_world):
+        """The cache should never hold more entries than configured."""
+        dm = DataManager(temp_world)
+        dm.configure_doc_cache(max_entries=1)
+        dm.get_entity("thorin-stormkeeper-a1b2")
+        dm.get_entity("havenport-e5f6")
+        stats = dm.doc_cache_stats()
+        assert stats["entries"] == 1
+        assert stats["evictions"] == 1
+
+    def test_byte_bound_evicts(self, temp_world):
+        """A byte budget smaller than one document keeps the cache empty."""
+        dm = DataManager(temp_world)
+        dm.configure_doc_cache(max_bytes=10)
+        dm.get_entity("thorin-stormkeeper-a1b2")
+        assert dm.doc_cache_stats()["entries"] == 0
+        assert dm.doc_cache_stats()["bytes"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Batch create / update
+# ---------------------------------------------------------------------------
+
+class TestBatchOperations:
+    """Tests for DataManager.create_entities and update_entities."""
+
+    def test_create_entities_with_forward_reference(self, temp_world, sample_god_data):
+        """Batch members can reference later members via "@key" placeholders."""
+        dm = DataManager(temp_world)
+        first = dict(sample_god_data, name="Asha")
+        first["relationships"] = [
+            {"target_id": "@brin", "relationship_type": "sibling"},
+        ]
+        second = dict(sample_god_data, name="Brin")
+        ids = dm.create_entities([
+            {"template_id": "god-profile", "data": first, "key": "asha"},
+            {"template_id": "god-profile", "data": second, "key": "brin"},
+        ])
+
+        assert len(ids) == 2
+        asha = dm.get_entity(ids[0])
+        assert asha["relationships"][0]["target_id"] == ids[1]
+        refs = dm.get_cross_references(ids[1])
+        assert any(r["id"] == ids[0] for r in refs["referenced_by"])
+
+    def test_create_entities_single_state_save(self, temp_world, sample_god_data, monkeypatch):
+        """A batch should save state once, not once per entity."""
+        dm = DataManager(temp_world)
+        saves = []
+        original = dm._save_state
+        monkeypatch.setattr(dm, "_save_state", lambda: (saves.append(1), original()))
+
+        dm.create_entities([("god-profile", dict(sample_god_data, name=f"God {i}"))
+                            for i in range(5)])
+        assert len(saves) == 1
+        assert dm.entity_count == 7
+
+    def test_create_entities_all_or_nothing(self, temp_world, sample_god_data):
+        """If any item fails validation, no entity is written."""
+        dm = DataManager(temp_world)
+        bad = dict(sample_god_data, alignment="chaotic-banana")
+        with pytest.raises(ValueError, match="nothing was saved"):
+            dm.create_entities([
+                ("god-profile", dict(sample_god_data, name="Good")),
+                ("god-profile", bad),
+            ])
+        assert dm.entity_count == 2
+        gods_dir = os.path.join(temp_world, "user-world", "entities", "gods")
+        assert os.listdir(gods_dir) == ["thorin-stormkeeper-a1b2.json"]
+
+    def test_update_entities(self, temp_world, sample_god_data):
+        """update_entities should merge every update and refresh the index."""
+        dm = DataManager(temp_world)
+        ids = dm.create_entities([("god-profile", dict(sample_god_data, name=n))
+                                  for n in ("One", "Two")])
+        dm.update_entities({
+            ids[0]: {"personality": "First."},
+            ids[1]: {"name": "Renamed"},
+        })
+        assert dm.get_entity(ids[0])["personality"] == "First."
+        assert dm.get_state()["entity_index"][ids[1]]["name"] == "Renamed"
+
+    def test_update_entities_validates_before_writing(self, temp_world, sample_god_data):
+        """A failing update leaves every entity in the batch untouched."""
+        dm = DataManager(temp_world)
+        ids = dm.create_entities([("god-profile", dict(sample_god_data, name=n))
+                                  for n in ("One", "Two")])
+        with pytest.raises(ValueError):
+            dm.update_entities({
+                ids[0]: {"personality": "Should not land."},
+                ids[1]: {"alignment": "chaotic-banana"},
+            })
+        assert dm.get_entity(ids[0])["personality"] == sample_god_data["personality"]
+
+
+# ---------------------------------------------------------------------------
+# Incremental reverse cross-reference index
+# ---------------------------------------------------------------------------
+
+class TestReverseRefIndex:
+    """Tests for the incrementally maintained, persisted reverse index."""
+
+    def _linked_pair(self, dm, sample_god_data):
+        target = dm.create_entity("god-profile", dict(sample_god_data, name="Target"))
+        source_data = dict(sample_god_data, name="Source")
+        source_data["relationships"] = [
+            {"target_id": target, "relationship_type": "rival"},
+        ]
+        source = dm.create_entity("god-profile", source_data)
+        return source, target
+
+    def test_updates_patch_index_in_place(self, temp_world, sample_god_data):
+        """Edits should patch the loaded index rather than discard it."""
+        dm = DataManager(temp_world)
+        dm._build_reverse_refs()
+        index = dm._reverse_refs
+        source, target = self._linked_pair(dm, sample_god_data)
+
+        refs = dm.get_cross_references(target)
+        assert [r["id"] for r in refs["referenced_by"]] == [source]
+
+        dm.update_entity(source, {"relationships": []})
+        assert dm.get_cross_references(target)["referenced_by"] == []
+        assert dm._reverse_refs is index
+
+    def test_persisted_index_loads_without_parsing(self, temp_world, sample_god_data,
+                                                   monkeypatch):
+        """A fresh DataManager should reuse runtime/reverse_refs.json for unchanged files."""
+        dm = DataManager(temp_world)
+        dm._build_reverse_refs()
+        source, target = self._linked_pair(dm, sample_god_data)
+        dm.flush_state()
+
+        fresh = DataManager(temp_world)
+
+        def _no_parse(*args, **kwargs):
+            raise AssertionError("unchanged entity was re-parsed")
+
+        monkeypatch.setattr(fresh, "_read_entity_doc", _no_parse)
+        reverse = fresh._build_reverse_refs()
+        assert (source, "relationships.target_id") in reverse[target]
+
+    def test_external_edit_is_reparsed(self, temp_world, sample_god_data):
+        """A file changed behind the index's back is re-read on load."""
+        dm = DataManager(temp_world)
+        dm._build_reverse_refs()
+        source, target = self._linked_pair(dm, sample_god_data)
+        dm.flush_state()
+
+        path = os.path.join(temp_world, "user-world", "entities", "gods", f"{source}.json")
+        with open(path, encoding="utf-8") as fh:
+            doc = json.load(fh)
+        doc["relationships"] = []
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+
+        fresh = DataManager(temp_world)
+        assert target not in fresh._build_reverse_refs()
+
+    def test_write_without_stat_keeps_sides_consistent(self, temp_world, sample_god_data,
+                                                       monkeypatch):
+        """A write the backend cannot stat must still be undoable by the next edit."""
+        dm = DataManager(temp_world)
+        dm._build_reverse_refs()
+        source, target = self._linked_pair(dm, sample_god_data)
+
+        write = dm.storage.write
+
+        def _write_no_stat(*args, **kwargs):
+            write(*args, **kwargs)
+            return None
+
+        monkeypatch.setattr(dm.storage, "write", _write_no_stat)
+        dm.update_entity(source, {"description": "Edited without a stat."})
+        assert [r["id"] for r in dm.get_cross_references(target)["referenced_by"]] == [source]
+
+        dm.update_entity(source, {"relationships": []})
+        assert dm.get_cross_references(target)["referenced_by"] == []
+
+
+# ---------------------------------------------------------------------------
+# Parallel world loader
+# ---------------------------------------------------------------------------
+
+class TestParallelLoader:
+    """Tests for load_all_entity_data / iter_entity_data."""
+
+    def test_parallel_matches_serial(self, temp_world, sample_god_data):
+        """Loading with many workers should give the same result as one worker."""
+        dm = DataManager(temp_world)
+        for i in range(5):
+            dm.create_entity("god-profile", {**sample_god_data, "name": f"God {i}"})
+
+        serial = dm.load_all_entity_data(workers=1)
+        parallel = dm.load_all_entity_data(workers=8)
+        assert serial == parallel
+        assert len(parallel) == len(dm.list_entities())
+
+    def test_streaming_yields_pairs_with_rel_path(self, temp_world):
+        """iter_entity_data should yield (id, doc) pairs carrying _rel_path."""
+        dm = DataManager(temp_world)
+        pairs = dict(dm.iter_entity_data())
+        assert "thorin-stormkeeper-a1b2" in pairs
+        doc = pairs["thorin-stormkeeper-a1b2"]
+        assert doc["_meta"]["_rel_path"] == (
+            "user-world/entities/gods/thorin-stormkeeper-a1b2.json"
+        )
+
+    def test_corrupt_and_non_entity_files_are_skipped(self, temp_world):
+        """Unparseable files and JSON without an ID should not abort the load."""
+        gods_dir = os.path.join(temp_world, "user-world", "entities", "gods")
+        with open(os.path.join(gods_dir, "broken.json"), "w", encoding="utf-8") as fh:
+            fh.write("{not json")
+        with open(os.path.join(gods_dir, "list.json"), "w", encoding="utf-8") as fh:
+            json.dump([1, 2, 3], fh)
+
+        dm = DataManager(temp_world)
+        loaded = dm.load_all_entity_data()
+        assert "thorin-stormkeeper-a1b2" in loaded
+        assert dm.last_load_timings["files"] == len(loaded) + 2
+
+    def test_timings_reported(self, temp_world):
+        """A completed load should record per-phase timings."""
+        dm = DataManager(temp_world)
+        loaded = dm.load_all_entity_data(workers=64)
+        timings = dm.last_load_timings
+        for key in ("walk_s", "read_s", "parse_s", "load_s", "total_s"):
+            assert timings[key] >= 0.0
+        assert timings["entities"] == len(loaded)
+        assert timings["workers"] == timings["files"]  # capped at the file count
+        assert timings["codec"] in ("orjson", "msgspec", "json")
+
+
+# ---------------------------------------------------------------------------
+# Prose cache and bulk regeneration
+# ---------------------------------------------------------------------------
+
+class TestProseCache:
+    """Tests for memoized prose generation and regenerate_all_prose."""
+
+    def test_unchanged_content_hits_cache(self, temp_world, sample_god_data):
+        """An update that leaves prose fields alone should not rebuild prose."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        misses = dm.prose_cache_stats()["misses"]
+
+        dm.update_entity(entity_id, {"canon_claims": []})
+        stats = dm.prose_cache_stats()
+        assert stats["misses"] == misses
+        assert stats["hits"] >= 1
+
+    def test_changed_content_regenerates(self, temp_world, sample_god_data):
+        """Changing a prose-relevant field should produce new prose."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        before = dm.get_entity(entity_id)["_prose"]
+
+        dm.update_entity(entity_id, {"name": "Renamed Deity"})
+        after = dm.get_entity(entity_id)["_prose"]
+        assert after != before
+        assert "Renamed Deity" in after
+
+    def _tamper(self, temp_world, entity_id):
+        path = os.path.join(temp_world, "user-world", "entities", "gods", f"{entity_id}.json")
+        with open(path, encoding="utf-8") as fh:
+            doc = json.load(fh)
+        doc["_prose"] = "Stale prose from an old builder."
+        doc["_prose_custom"] = False
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+
+    def test_regenerate_all_prose(self, temp_world, sample_god_data):
+        """Stale prose should be rewritten; fresh and custom prose left alone."""
+        dm = DataManager(temp_world)
+        stale_id = dm.create_entity("god-profile", sample_god_data)
+        custom_id = dm.create_entity("god-profile", {
+            **sample_god_data, "name": "Custom God",
+            "_prose": "Hand-written prose about Custom God.", "_prose_custom": True,
+        })
+        self._tamper(temp_world, stale_id)
+
+        result = dm.regenerate_all_prose(workers=2)
+        assert stale_id in result["updated_ids"]
+        assert custom_id not in result["updated_ids"]
+        assert result["custom"] >= 1
+        assert result["scanned"] == result["regenerated"] + result["unchanged"] + result["custom"]
+
+        fresh = DataManager(temp_world)
+        doc = fresh.get_entity(stale_id)
+        assert "Thorin Stormkeeper" in doc["_prose"]
+        assert "_rel_path" not in doc["_meta"]
+        assert fresh.get_entity(custom_id)["_prose"] == "Hand-written prose about Custom God."
+
+        again = dm.regenerate_all_prose()
+        assert again["regenerated"] == 0
+
+    def test_regenerate_all_prose_with_processes(self, temp_world, sample_god_data):
+        """The process-pool variant should produce the same prose."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        expected = dm.get_entity(entity_id)["_prose"]
+        self._tamper(temp_world, entity_id)
+
+        result = dm.regenerate_all_prose(workers=2, processes=True)
+        assert entity_id in result["updated_ids"]
+        assert dm.get_entity(entity_id)["_prose"] == expected
+
+
+# ---------------------------------------------------------------------------
+# Query API and secondary indexes
+# ---------------------------------------------------------------------------
+
+class TestQueryEntities:
+    """Tests for query_entities / count_entities / entity_type_counts."""
+
+    def _populate(self, dm, sample_god_data):
+        ids = [
+            dm.create_entity("god-profile", {**sample_god_data, "name": name})
+            for name in ("Zeta", "alpha", "Mu")
+        ]
+        dm.set_entity_status(ids[1], "canon")
+        return ids
+
+    def test_filters_by_type_and_status(self, temp_world, sample_god_data):
+        """Type and status filters should intersect."""
+        dm = DataManager(temp_world)
+        ids = self._populate(dm, sample_god_data)
+
+        canon_gods = list(dm.query_entities(entity_type="gods", status="canon"))
+        assert [e["id"] for e in canon_gods] == [ids[1]]
+        assert dm.count_entities(entity_type="gods", status="draft") == (
+            len(dm.list_entities(entity_type="gods")) - 1
+        )
+
+    def test_multi_value_filter(self, temp_world):
+        """A filter given several values should match any of them."""
+        dm = DataManager(temp_world)
+        both = list(dm.query_entities(entity_type=["gods", "settlements"]))
+        assert len(both) == len(dm.list_entities())
+
+    def test_sort_limit_offset_and_projection(self, temp_world, sample_god_data):
+        """Sorting is case-insensitive; limit/offset page; fields project."""
+        dm = DataManager(temp_world)
+        self._populate(dm, sample_god_data)
+
+        names = [e["name"] for e in dm.query_entities(
+            entity_type="gods", sort="name", fields=["name"])]
+        assert names == sorted(names, key=str.lower)
+
+        page = list(dm.query_entities(entity_type="gods", sort="-name",
+                                      limit=2, offset=1, fields=["name"]))
+        assert [e["name"] for e in page] == sorted(names, key=str.lower, reverse=True)[1:3]
+        assert set(page[0]) == {"id", "name"}
+
+    def test_sort_by_id(self, temp_world, sample_god_data):
+        """``id`` sorts by the entity ID, which is not a field of the entry."""
+        dm = DataManager(temp_world)
+        self._populate(dm, sample_god_data)
+        ids = [e["id"] for e in dm.query_entities(entity_type="gods")]
+
+        assert [e["id"] for e in dm.query_entities(entity_type="gods", sort="id")] == sorted(ids)
+        assert [e["id"] for e in dm.query_entities(entity_type="gods", sort="-id")] == (
+            sorted(ids, reverse=True)
+        )
+
+    def test_type_counts_keep_unknown_bucket(self, temp_world):
+        """Entries without an entity_type are counted under "unknown"."""
+        dm = DataManager(temp_world)
+        dm._state["entity_index"]["untyped-1234"] = {"name": "Untyped", "status": "draft"}
+        counts = dm.entity_type_counts()
+        assert counts["unknown"] == 1
+        assert None not in counts
+
+    def test_query_is_lazy(self, temp_world):
+        """query_entities should return an iterator, not a list."""
+        dm = DataManager(temp_world)
+        result = dm.query_entities()
+        assert iter(result) is result
+
+    def test_indexes_follow_mutations(self, temp_world, sample_god_data):
+        """Status changes and new entities should move between buckets."""
+        dm = DataManager(temp_world)
+        assert dm.count_entities(status="canon") == 0  # builds the indexes
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        assert entity_id in [e["id"] for e in dm.query_entities(status="draft")]
+
+        dm.set_entity_status(entity_id, "canon")
+        assert [e["id"] for e in dm.query_entities(status="canon")] == [entity_id]
+        assert entity_id not in [e["id"] for e in dm.query_entities(status="draft")]
+        assert dm.entity_type_counts()["gods"] == len(dm.list_entities(entity_type="gods"))
+
+    def test_step_filter(self, temp_world, sample_god_data):
+        """New entities should be filterable by the step they were created in."""
+        dm = DataManager(temp_world)
+        dm._state["current_step"] = 7
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        assert [e["id"] for e in dm.query_entities(step=7)] == [entity_id]
+
+    def test_reload_state_rebuilds_indexes(self, temp_world, sample_god_data):
+        """Replacing the state should not leave stale secondary indexes."""
+        dm = DataManager(temp_world)
+        assert dm.count_entities(entity_type="gods") >= 1
+        other = DataManager(temp_world)
+        other.create_entity("god-profile", sample_god_data)
+
+        before = dm.count_entities(entity_type="gods")
+        dm.reload_state()
+        assert dm.count_entities(entity_type="gods") == before + 1
@@ -291,7 +291,46 @@ class TestModuleInitialization:
         from engine.graph_builder import WorldGraph
         assert isinstance(wg, WorldGraph)
 
+    def test_consistency_checker_uses_sqlite_mirror(self, em):
+        """The consistency checker is created with the SQLite mirror attached."""
+        checker = em.consistency_checker
+        assert checker._sqlite_sync is em.sqlite_sync
+        claims = [{"claim": "Storm Rival's primary domain is storms", "references": []}]
+        assert checker.find_similar_claims(claims)
+
     def test_create_module_unknown_raises(self, em):
         """_create_module with an unknown name should raise KeyError."""
         with pytest.raises(KeyError, match="Unknown module"):
             em._create_module("totally_unknown")
+
+
+# ---------------------------------------------------------------------------
+# Batch writes
+# ---------------------------------------------------------------------------
+
+class TestBatchWrites:
+    """Tests for EngineManager.create_entities / update_entities."""
+
+    def test_create_entities_propagates_to_loaded_modules(self, em, sample_god_data):
+        """A batch should reach SQLite and the graph in one call each."""
+        sqlite = em.sqlite_sync
+        graph = em.world_graph
+        graph.build_graph()
+        with patch.object(sqlite, "sync_entities", wraps=sqlite.sync_entities) as sync_spy, \
+                patch.object(graph, "add_entities", wraps=graph.add_entities) as graph_spy:
+            ids = em.create_entities([
+                ("god-profile", dict(sample_god_data, name="Alpha")),
+                ("god-profile", dict(sample_god_data, name="Beta")),
+            ])
+        assert sync_spy.call_count == 1
+        assert graph_spy.call_count == 1
+        assert all(eid in graph.graph for eid in ids)
+        assert sqlite.get_stats()["total_entities"] == 2
+        em.shutdown()
+
+    def test_update_entities_skips_unloaded_modules(self, em, sample_god_data):
+        """Modules that were never loaded are not instantiated by a batch."""
+        ids = em.create_entities([("god-profile", sample_god_data)])
+        em.update_entities({ids[0]: {"personality": "Batch."}})
+        assert "world_graph" not in em._modules
+        assert em.data_manager.get_entity(ids[0])["personality"] == "Batch."
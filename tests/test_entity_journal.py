@@ -0,0 +1,259 @@
+"""
+Tests for engine/entity_journal.py -- the shared filesystem change journal.
+
+Validates:
+    - Cold scans report every entity as added
+    - Rescans are stat-only and report nothing when nothing changed
+    - Modified, removed and moved files produce the right change set
+    - Touched-but-identical files are not reported
+    - Subscribers are notified and changes_since() tracks per-consumer views
+    - The manifest persists across journal instances
+    - Module integration (WorldGraph cache, ConsistencyChecker, EngineManager)
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from engine.consistency_checker import ConsistencyChecker
+from engine.data_manager import DataManager
+from engine.entity_journal import ChangeSet, EntityJournal, get_journal, reset_journals
+from engine.graph_builder import WorldGraph
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+GOD_PATH = "user-world/entities/gods/thorin-stormkeeper-a1b2.json"
+TOWN_ID = "havenport-e5f6"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_journals():
+    """Do not share journals between tests."""
+    reset_journals()
+    yield
+    reset_journals()
+
+
+def _rewrite(root, rel_path, **changes):
+    """Rewrite an entity file with *changes* applied, bumping its mtime."""
+    path = os.path.join(root, rel_path)
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    doc.update(changes)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Scanning
+# ---------------------------------------------------------------------------
+
+class TestScan:
+    """Tests for EntityJournal.scan change detection."""
+
+    def test_cold_scan_adds_everything(self, temp_world):
+        """The first scan should report every entity as added."""
+        changes = EntityJournal(temp_world).scan()
+        assert set(changes.added) == {GOD_ID, TOWN_ID}
+        assert changes.paths[GOD_ID] == GOD_PATH
+        assert not changes.modified and not changes.removed
+
+    def test_unchanged_rescan_is_empty(self, temp_world):
+        """A rescan with no edits should report nothing."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        assert not journal.scan()
+
+    def test_modified_file(self, temp_world):
+        """Editing a file should report it as modified with the new document."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        _rewrite(temp_world, GOD_PATH, name="Thorin the Elder")
+
+        changes = journal.scan()
+        assert set(changes.modified) == {GOD_ID}
+        assert changes.modified[GOD_ID]["name"] == "Thorin the Elder"
+
+    def test_touched_identical_file_is_not_reported(self, temp_world):
+        """An mtime bump without a content change should not be reported."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        path = os.path.join(temp_world, GOD_PATH)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert not journal.scan()
+
+    def test_removed_file(self, temp_world):
+        """Deleting a file should report its entity as removed."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        os.remove(os.path.join(temp_world, GOD_PATH))
+
+        changes = journal.scan()
+        assert changes.removed == {GOD_ID}
+        assert journal.path_for(GOD_ID) is None
+
+    def test_moved_file_is_modified(self, temp_world):
+        """Moving a file to another folder keeps the entity (modified, not removed)."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        target_dir = os.path.join(temp_world, "user-world", "entities", "deities")
+        os.makedirs(target_dir)
+        os.replace(os.path.join(temp_world, GOD_PATH),
+                   os.path.join(target_dir, f"{GOD_ID}.json"))
+
+        changes = journal.scan()
+        assert set(changes.modified) == {GOD_ID}
+        assert not changes.removed
+        assert journal.path_for(GOD_ID).endswith(os.path.join("deities", f"{GOD_ID}.json"))
+
+    def test_corrupt_file_is_listed_but_not_an_entity(self, temp_world):
+        """Corrupt files appear in file_paths() but never as entities."""
+        bad = os.path.join(temp_world, "user-world", "entities", "gods", "bad.json")
+        with open(bad, "w", encoding="utf-8") as fh:
+            fh.write("{not json")
+        journal = EntityJournal(temp_world)
+        changes = journal.scan()
+        assert set(changes.added) == {GOD_ID, TOWN_ID}
+        assert any(p.endswith("bad.json") for p in journal.file_paths())
+
+    def test_manifest_persists(self, temp_world):
+        """A new journal instance should resume from the saved manifest."""
+        EntityJournal(temp_world).scan()
+        fresh = EntityJournal(temp_world)
+        assert not fresh.scan()
+        assert fresh.path_for(TOWN_ID) is not None
+
+    def test_fingerprint_tracks_content(self, temp_world):
+        """The fingerprint should change when any entity file changes."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        before = journal.fingerprint()
+        _rewrite(temp_world, GOD_PATH, name="Changed")
+        journal.scan()
+        assert journal.fingerprint() != before
+
+
+# ---------------------------------------------------------------------------
+# Consumers
+# ---------------------------------------------------------------------------
+
+class TestConsumers:
+    """Tests for subscribers and per-consumer change tracking."""
+
+    def test_subscribers_are_notified(self, temp_world):
+        """Subscribers should receive non-empty change sets only."""
+        journal = get_journal(temp_world)
+        received = []
+        journal.subscribe(received.append)
+        journal.scan()
+        journal.scan()
+        assert len(received) == 1
+        journal.unsubscribe(received.append)
+
+    def test_subscribers_see_scans_made_elsewhere(self, temp_world):
+        """A scan by another module should still reach subscribers."""
+        journal = get_journal(temp_world)
+        journal.scan()
+        received = []
+        journal.subscribe(received.append)
+        _rewrite(temp_world, GOD_PATH, name="Elsewhere")
+
+        DataManager(temp_world)._find_entity_file("zzz-9999")  # rescans on a miss
+        assert len(received) == 1
+        assert received[0].modified[GOD_ID]["name"] == "Elsewhere"
+        journal.unsubscribe(received.append)
+
+    def test_merge_change_sets(self):
+        """merge should cancel add+remove and turn remove+add into a modify."""
+        first, second = ChangeSet(), ChangeSet()
+        first.added = {"a": {"id": "a"}}
+        first.removed = {"b"}
+        second.removed = {"a"}
+        second.added = {"b": {"id": "b"}}
+        second.paths = {"b": "b.json"}
+        first.merge(second)
+        assert not first.added and not first.removed
+        assert set(first.modified) == {"b"}
+        assert first.paths == {"b": "b.json"}
+
+    def test_get_journal_is_shared(self, temp_world):
+        """get_journal should return one instance per project root."""
+        assert get_journal(temp_world) is get_journal(os.path.join(temp_world, "."))
+
+    def test_changes_since_sees_changes_consumed_elsewhere(self, temp_world):
+        """A consumer's own view should catch edits another scan already reported."""
+        journal = EntityJournal(temp_world)
+        journal.scan()
+        known = journal.entity_digests()
+        _rewrite(temp_world, GOD_PATH, name="Elsewhere")
+        journal.scan()  # someone else consumes the change
+
+        changes = journal.changes_since(known)
+        assert set(changes.modified) == {GOD_ID}
+        assert not journal.changes_since(known)
+
+    def test_load_all(self, temp_world):
+        """load_all should return every entity document."""
+        docs = EntityJournal(temp_world).load_all()
+        assert docs[GOD_ID]["name"] == "Thorin Stormkeeper"
+        assert set(docs) == {GOD_ID, TOWN_ID}
+
+
+# ---------------------------------------------------------------------------
+# Module integration
+# ---------------------------------------------------------------------------
+
+class TestModuleIntegration:
+    """Tests for engine modules reading through the journal."""
+
+    def test_graph_cache_detects_edits(self, temp_world):
+        """An edited entity (same file count) should invalidate the graph cache."""
+        graph = WorldGraph(temp_world)
+        graph.build_graph()
+        graph.save_cache()
+        assert WorldGraph(temp_world).load_cache()
+
+        _rewrite(temp_world, GOD_PATH, name="Renamed")
+        assert not WorldGraph(temp_world).load_cache()
+
+    def test_graph_apply_changes(self, temp_world):
+        """apply_changes should update and remove graph nodes."""
+        graph = WorldGraph(temp_world)
+        graph.build_graph(entities=graph.journal.load_all())
+        _rewrite(temp_world, GOD_PATH, name="Renamed")
+        os.remove(os.path.join(temp_world, "user-world", "entities",
+                               "settlements", f"{TOWN_ID}.json"))
+
+        graph.apply_changes(graph.journal.scan())
+        assert graph.graph.nodes[GOD_ID]["name"] == "Renamed"
+        assert TOWN_ID not in graph.graph
+
+    def test_checker_reconciles_on_ttl(self, temp_world):
+        """An expired checker cache should pick up only the changed entity."""
+        checker = ConsistencyChecker(temp_world)
+        checker._load_all_entities()
+        _rewrite(temp_world, GOD_PATH, name="Reconciled")
+        get_journal(temp_world).scan()  # another module consumes the change
+
+        checker._entity_cache_ttl = 0.0
+        time.sleep(0.001)
+        assert checker._load_all_entities()[GOD_ID]["name"] == "Reconciled"
+
+    def test_engine_manager_scan(self, temp_world):
+        """scan_entity_changes should push edits to loaded modules."""
+        from engine.engine_manager import EngineManager
+
+        em = EngineManager(temp_world)
+        checker = em.consistency_checker
+        checker._load_all_entities()
+        em.journal.scan()
+        _rewrite(temp_world, GOD_PATH, name="Pushed")
+
+        changes = em.scan_entity_changes()
+        assert GOD_ID in changes.modified
+        assert checker._entity_cache[GOD_ID]["name"] == "Pushed"
@@ -0,0 +1,279 @@
+"""
+Tests for engine/entity_storage.py -- pluggable entity storage backends.
+
+Validates:
+    - The SQLite backend round-trips documents and stamps every write
+    - Change tracking (scan / changes_since) over the SQLite backend
+    - Migration JSON -> SQLite -> JSON and JSON-tree export
+    - DataManager, SQLiteSyncEngine, WorldGraph and BackupManager running
+      on SQLite storage
+"""
+
+import json
+import os
+
+import pytest
+
+from engine.backup_manager import BackupManager
+from engine.data_manager import DataManager
+from engine.engine_manager import EngineManager
+from engine.entity_journal import reset_journals
+from engine.entity_storage import (
+    EntityStorage,
+    JSONFileStorage,
+    SQLiteEntityStorage,
+    configured_backend,
+    export_json_tree,
+    get_storage,
+    migrate_storage,
+    reset_storages,
+)
+from engine.graph_builder import WorldGraph
+from engine.sqlite_sync import SQLiteSyncEngine
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+GOD_PATH = "user-world/entities/gods/thorin-stormkeeper-a1b2.json"
+TOWN_ID = "havenport-e5f6"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_storages():
+    """Do not share journals or storage backends between tests."""
+    reset_journals()
+    reset_storages()
+    yield
+    reset_storages()
+    reset_journals()
+
+
+@pytest.fixture
+def sqlite_world(temp_world):
+    """temp_world migrated to SQLite storage, with the JSON files removed."""
+    migrate_storage(temp_world, "sqlite", remove_source=True)
+    return temp_world
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+
+class TestSQLiteEntityStorage:
+    """Tests for SQLiteEntityStorage itself."""
+
+    def test_round_trip(self, tmp_path):
+        """Written documents should read back, stat and delete."""
+        storage = SQLiteEntityStorage(str(tmp_path))
+        path = tmp_path / "user-world" / "entities" / "gods" / "a.json"
+        try:
+            st = storage.write(path, "a", {"name": "A"})
+            assert storage.read(path) == {"name": "A"}
+            assert storage.stat(path) == st
+            assert storage.read_entity("a") == {"name": "A"}
+            assert storage.entity_paths() == {"a": "user-world/entities/gods/a.json"}
+            assert storage.delete(path)
+            assert not storage.exists(path)
+            assert storage.read(path) is None
+        finally:
+            storage.close()
+
+    def test_every_write_changes_stamp(self, tmp_path):
+        """Rewriting a document with the same size must change its stamp."""
+        storage = SQLiteEntityStorage(str(tmp_path))
+        path = tmp_path / "user-world" / "entities" / "gods" / "a.json"
+        try:
+            first = storage.write(path, "a", {"name": "A"})
+            second = storage.write(path, "a", {"name": "B"})
+            assert second.st_mtime_ns > first.st_mtime_ns
+        finally:
+            storage.close()
+
+    def test_type_change_moves_row(self, tmp_path):
+        """Writing an entity under a new path should drop the old row."""
+        storage = SQLiteEntityStorage(str(tmp_path))
+        entities = tmp_path / "user-world" / "entities"
+        try:
+            storage.write(entities / "gods" / "a.json", "a", {"name": "A"})
+            storage.write(entities / "deities" / "a.json", "a", {"name": "A"})
+            assert storage.count() == 1
+            assert storage.path_for("a").endswith(os.path.join("deities", "a.json"))
+        finally:
+            storage.close()
+
+    def test_incomplete_backend_fails_on_construction(self, tmp_path):
+        """A backend missing abstract methods should not be instantiable."""
+        class Partial(EntityStorage):
+            def stat(self, abs_path):
+                return None
+
+        with pytest.raises(TypeError):
+            Partial(str(tmp_path))
+
+    def test_rel_path(self, tmp_path):
+        """rel_path should return the forward-slash, root-relative path."""
+        storage = SQLiteEntityStorage(str(tmp_path))
+        path = storage.root / "user-world" / "entities" / "gods" / "a.json"
+        assert storage.rel_path(path) == "user-world/entities/gods/a.json"
+        assert storage.rel_path("user-world/x.json") == "user-world/x.json"
+
+    def test_scan_and_changes_since(self, tmp_path):
+        """scan() reports new writes once; changes_since() tracks its own view."""
+        storage = SQLiteEntityStorage(str(tmp_path))
+        path = tmp_path / "user-world" / "entities" / "gods" / "a.json"
+        try:
+            storage.write(path, "a", {"name": "A"})
+            assert set(storage.scan().added) == {"a"}
+            assert not storage.scan()
+
+            known = storage.entity_digests()
+            before = storage.fingerprint()
+            storage.write(path, "a", {"name": "B"})
+            changes = storage.changes_since(known)
+            assert changes.modified["a"] == {"name": "B"}
+            assert storage.fingerprint() != before
+
+            storage.delete(path)
+            assert storage.changes_since(known).removed == {"a"}
+        finally:
+            storage.close()
+
+
+# ---------------------------------------------------------------------------
+# Migration
+# ---------------------------------------------------------------------------
+
+class TestMigration:
+    """Tests for switching backends and exporting the JSON tree."""
+
+    def test_default_backend_is_json(self, temp_world):
+        """Without storage.json the JSON backend should be active."""
+        assert configured_backend(temp_world) == "json"
+        assert isinstance(get_storage(temp_world), JSONFileStorage)
+
+    def test_unknown_backend_rejected(self, temp_world):
+        """An unknown backend name should raise ValueError."""
+        with pytest.raises(ValueError):
+            migrate_storage(temp_world, "lmdb")
+
+    def test_json_to_sqlite(self, temp_world):
+        """Migration should copy every entity and switch the active backend."""
+        result = migrate_storage(temp_world, "sqlite", remove_source=True)
+        assert result["migrated"] == 2
+        assert result["removed"] == 2
+        assert configured_backend(temp_world) == "sqlite"
+        assert not os.path.exists(os.path.join(temp_world, GOD_PATH))
+
+        storage = get_storage(temp_world)
+        assert isinstance(storage, SQLiteEntityStorage)
+        assert storage.read_entity(GOD_ID)["name"] == "Thorin Stormkeeper"
+        assert storage.path_for(TOWN_ID).endswith(f"{TOWN_ID}.json")
+
+    def test_sqlite_to_json(self, sqlite_world):
+        """Migrating back should restore the one-file-per-entity tree."""
+        result = migrate_storage(sqlite_world, "json", remove_source=True)
+        assert result["migrated"] == 2
+        assert configured_backend(sqlite_world) == "json"
+        assert not os.path.exists(os.path.join(sqlite_world, "user-world", "entities.db"))
+        with open(os.path.join(sqlite_world, GOD_PATH), encoding="utf-8") as fh:
+            assert json.load(fh)["name"] == "Thorin Stormkeeper"
+
+    def test_export_json_tree(self, sqlite_world, tmp_path):
+        """export_json_tree should write <type>/<id>.json under the target."""
+        dest = tmp_path / "export"
+        assert export_json_tree(sqlite_world, str(dest)) == 2
+        assert (dest / "gods" / f"{GOD_ID}.json").is_file()
+        assert configured_backend(sqlite_world) == "sqlite"
+
+
+# ---------------------------------------------------------------------------
+# Engine modules on SQLite storage
+# ---------------------------------------------------------------------------
+
+class TestModulesOnSQLite:
+    """Tests for engine modules reading and writing through SQLite storage."""
+
+    def test_data_manager_crud(self, sqlite_world, sample_god_data):
+        """DataManager should read, create and update without JSON files."""
+        dm = DataManager(sqlite_world)
+        assert dm.get_entity(GOD_ID)["name"] == "Thorin Stormkeeper"
+
+        sample_god_data["name"] = "Mira Sunweaver"
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.update_entity(entity_id, {"personality": "Bright."})
+        assert dm.get_entity(entity_id)["personality"] == "Bright."
+
+        rel_path = dm._state["entity_index"][entity_id]["file_path"]
+        assert not os.path.exists(os.path.join(sqlite_world, rel_path))
+        assert dm.storage.read_entity(entity_id)["personality"] == "Bright."
+        assert {e["id"] for e in dm.list_entities()} >= {GOD_ID, TOWN_ID, entity_id}
+
+    def test_iter_entity_data(self, sqlite_world):
+        """Bulk loads should come from the store and report its name."""
+        dm = DataManager(sqlite_world)
+        assert set(dm.load_all_entity_data()) == {GOD_ID, TOWN_ID}
+        assert dm.last_load_timings["storage"] == "sqlite"
+
+    def test_external_json_is_imported(self, sqlite_world):
+        """A JSON file dropped into the tree is imported by apply_changes."""
+        dm = DataManager(sqlite_world)
+        doc = dm.get_entity(GOD_ID)
+        doc["name"] = "Thorin the Imported"
+        path = os.path.join(sqlite_world, GOD_PATH)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+
+        dm.apply_changes(dm.journal.scan())
+        assert dm.storage.read_entity(GOD_ID)["name"] == "Thorin the Imported"
+        assert dm.get_entity(GOD_ID)["name"] == "Thorin the Imported"
+
+        os.remove(path)
+        dm.apply_changes(dm.journal.scan())
+        assert GOD_ID in dm._state["entity_index"]
+
+    def test_inbox_removals_leave_change_set_intact(self, sqlite_world, monkeypatch):
+        """EngineManager filters inbox removals on a copy, reading storage.json once."""
+        import engine.entity_storage
+
+        em = EngineManager(sqlite_world)
+        dm = em.data_manager
+        path = os.path.join(sqlite_world, GOD_PATH)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(dm.get_entity(GOD_ID), fh)
+        em._on_entity_changes(em.journal.scan())
+
+        reads = []
+        real = engine.entity_storage.configured_backend
+        monkeypatch.setattr(engine.entity_storage, "configured_backend",
+                            lambda root: reads.append(root) or real(root))
+        os.remove(path)
+        changes = em.journal.scan()
+        em._on_entity_changes(changes)
+        assert changes.removed == {GOD_ID}
+        assert GOD_ID in dm._state["entity_index"]
+        assert reads == []
+
+    def test_sync_and_graph(self, sqlite_world):
+        """SQLiteSyncEngine and WorldGraph should build from the store."""
+        sync = SQLiteSyncEngine(sqlite_world)
+        try:
+            assert sync.full_sync() == 2
+        finally:
+            sync.close()
+        graph = WorldGraph(sqlite_world)
+        graph.build_graph()
+        assert {GOD_ID, TOWN_ID} <= set(graph.graph.nodes)
+
+    def test_backup_round_trip(self, sqlite_world):
+        """Backups hold a JSON tree and restore back into the store."""
+        bm = BackupManager(sqlite_world)
+        meta = bm.create_backup()
+        assert meta["entity_count"] == 2
+
+        dm = DataManager(sqlite_world)
+        dm.update_entity(GOD_ID, {"personality": "Changed."})
+        bm.restore_backup(meta["path"], confirm=True)
+
+        assert configured_backend(sqlite_world) == "sqlite"
+        storage = get_storage(sqlite_world)
+        assert storage.count() == 2
+        assert storage.read_entity(GOD_ID)["personality"] != "Changed."
+        assert not os.path.exists(os.path.join(sqlite_world, GOD_PATH))
@@ -0,0 +1,143 @@
+"""
+Tests for engine/entity_summary.py -- compact entity index records.
+
+Validates:
+    - Round-tripping state.json entries (including extra and absent keys)
+    - Canonical file paths are derived, other paths are kept
+    - Immutability, replace(), copying and pickling
+    - JSON serialization through engine.utils
+    - DataManager keeps its index as EntitySummary records
+"""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from engine.data_manager import DataManager
+from engine.entity_summary import EntitySummary, summaries_from_state, summary_dict
+from engine.utils import json_dumps
+
+ENTRY = {
+    "template_id": "god-profile",
+    "entity_type": "gods",
+    "name": "Thorin",
+    "status": "draft",
+    "file_path": "user-world/entities/gods/thorin-a1b2.json",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "updated_at": "2026-01-02T00:00:00+00:00",
+    "step_created": 7,
+}
+
+
+# ---------------------------------------------------------------------------
+# EntitySummary
+# ---------------------------------------------------------------------------
+
+class TestEntitySummary:
+    """Tests for the record type itself."""
+
+    def test_round_trip(self):
+        """to_dict() should reproduce the original entry exactly."""
+        summary = EntitySummary.from_dict("thorin-a1b2", ENTRY)
+        assert summary.to_dict() == ENTRY
+        assert summary == ENTRY
+        assert list(summary) == list(ENTRY)
+
+    def test_absent_and_extra_keys(self):
+        """Missing keys stay missing and unknown keys are preserved."""
+        summary = EntitySummary.from_dict("x", {"name": "X", "legacy": [1, 2]})
+        assert "step_created" not in summary
+        assert summary.get("status", "none") == "none"
+        assert summary["legacy"] == [1, 2]
+        assert summary.to_dict() == {"name": "X", "legacy": [1, 2]}
+
+    def test_file_path(self):
+        """Canonical paths are derived; other paths are stored as given."""
+        summary = EntitySummary.from_dict("thorin-a1b2", ENTRY)
+        assert summary["file_path"] == ENTRY["file_path"]
+        moved = summary.replace(file_path="user-world/elsewhere.json")
+        assert moved["file_path"] == "user-world/elsewhere.json"
+
+    def test_immutable(self):
+        """Assignments should fail; replace() returns an updated copy."""
+        summary = EntitySummary.from_dict("thorin-a1b2", ENTRY)
+        with pytest.raises(AttributeError):
+            summary.status = "canon"
+        with pytest.raises(TypeError):
+            summary["status"] = "canon"
+        updated = summary.replace(status="canon")
+        assert updated["status"] == "canon"
+        assert summary["status"] == "draft"
+
+    def test_strings_are_interned(self):
+        """Repeated type/status/template strings should share one object."""
+        a = EntitySummary.from_dict("a", json.loads(json.dumps(ENTRY)))
+        b = EntitySummary.from_dict("b", json.loads(json.dumps(ENTRY)))
+        assert a.entity_type is b.entity_type
+        assert a.status is b.status
+
+    def test_copy_and_pickle(self):
+        """deepcopy shares records; pickling round-trips them."""
+        summary = EntitySummary.from_dict("thorin-a1b2", ENTRY)
+        assert copy.deepcopy({"x": summary})["x"] is summary
+        assert pickle.loads(pickle.dumps(summary)) == summary
+
+    def test_json_serialization(self):
+        """json_dumps should write summaries as plain entries."""
+        index = summaries_from_state({"thorin-a1b2": ENTRY})
+        assert json.loads(json_dumps({"entity_index": index})) == {
+            "entity_index": {"thorin-a1b2": ENTRY}
+        }
+
+    def test_summary_dict(self):
+        """summary_dict should add the ID for records and plain dicts alike."""
+        summary = EntitySummary.from_dict("thorin-a1b2", ENTRY)
+        assert summary_dict("thorin-a1b2", summary) == {**ENTRY, "id": "thorin-a1b2"}
+        assert summary_dict("y", {"name": "Y"}) == {"name": "Y", "id": "y"}
+
+
+# ---------------------------------------------------------------------------
+# DataManager integration
+# ---------------------------------------------------------------------------
+
+class TestDataManagerIndex:
+    """Tests for DataManager holding its index as EntitySummary records."""
+
+    def test_index_records(self, temp_world, sample_god_data):
+        """Loaded, created and updated entries should all be records."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.set_entity_status(entity_id, "canon")
+        dm.update_entity(entity_id, {"name": "Renamed"})
+
+        index = dm._state["entity_index"]
+        assert all(isinstance(e, EntitySummary) for e in index.values())
+        assert index[entity_id]["status"] == "canon"
+        assert index[entity_id]["name"] == "Renamed"
+
+        listed = {e["id"]: e for e in dm.list_entities()}
+        assert type(listed[entity_id]) is dict
+        assert listed[entity_id]["name"] == "Renamed"
+
+    def test_state_file_round_trip(self, temp_world, sample_god_data):
+        """state.json should hold plain entries that reload as records."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.flush_state()
+
+        with open(dm.state_path, encoding="utf-8") as fh:
+            on_disk = json.load(fh)["entity_index"][entity_id]
+        assert on_disk == dm._state["entity_index"][entity_id].to_dict()
+        assert on_disk["file_path"].endswith(f"{entity_id}.json")
+
+        reloaded = DataManager(temp_world)
+        assert reloaded._state["entity_index"][entity_id] == on_disk
+
+    def test_get_state_copy(self, temp_world):
+        """get_state() should be safe to mutate without touching the index."""
+        dm = DataManager(temp_world)
+        state = dm.get_state()
+        state["entity_index"].clear()
+        assert dm.entity_count == 2
@@ -0,0 +1,194 @@
+"""
+Tests for engine/entity_watcher.py -- live watching of external entity writes.
+
+Validates:
+    - Backend selection and validation
+    - The polling backend delivers debounced change sets
+    - Writes made through DataManager are not reported as external
+    - DataManager.apply_changes keeps entity_index in line with disk
+    - EngineManager pushes watcher changes into loaded module caches
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from engine.data_manager import DataManager
+from engine.engine_manager import EngineManager
+from engine.entity_journal import get_journal, reset_journals
+from engine.entity_watcher import EntityWatcher, watchdog_available
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+GOD_PATH = "user-world/entities/gods/thorin-stormkeeper-a1b2.json"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_journals():
+    """Do not share journals between tests."""
+    reset_journals()
+    yield
+    reset_journals()
+
+
+def _rewrite(root, rel_path, **changes):
+    """Rewrite an entity file with *changes* applied, bumping its mtime."""
+    path = os.path.join(root, rel_path)
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    doc.update(changes)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    return doc
+
+
+class _Collector:
+    """Thread-safe callback that records delivered change sets."""
+
+    def __init__(self):
+        self.batches = []
+        self.event = threading.Event()
+
+    def __call__(self, changes):
+        self.batches.append(changes)
+        self.event.set()
+
+
+# ---------------------------------------------------------------------------
+# EntityWatcher
+# ---------------------------------------------------------------------------
+
+class TestEntityWatcher:
+    """Tests for the watcher itself."""
+
+    def test_auto_backend(self, temp_world):
+        """'auto' should pick watchdog when installed, else polling."""
+        watcher = EntityWatcher(temp_world, lambda c: None)
+        assert watcher.backend == ("watchdog" if watchdog_available() else "polling")
+
+    def test_unknown_backend_rejected(self, temp_world):
+        """An unknown backend name should raise ValueError."""
+        with pytest.raises(ValueError):
+            EntityWatcher(temp_world, lambda c: None, backend="kqueue")
+
+    def test_is_entity_path(self, temp_world):
+        """Only JSON files under user-world/entities count."""
+        watcher = EntityWatcher(temp_world, lambda c: None)
+        assert watcher.is_entity_path(os.path.join(temp_world, GOD_PATH))
+        assert not watcher.is_entity_path(os.path.join(temp_world, "user-world", "state.json"))
+
+    def test_polling_delivers_changes(self, temp_world):
+        """An external edit should arrive as one change set."""
+        collector = _Collector()
+        watcher = EntityWatcher(temp_world, collector, debounce=0.01,
+                                poll_interval=0.02, backend="polling")
+        watcher.start()
+        try:
+            assert watcher.is_running
+            _rewrite(temp_world, GOD_PATH, name="Watched")
+            assert collector.event.wait(5)
+        finally:
+            watcher.stop()
+        assert not watcher.is_running
+        assert collector.batches[0].modified[GOD_ID]["name"] == "Watched"
+
+    def test_start_ignores_existing_files(self, temp_world):
+        """Files present before start() should not be reported."""
+        collector = _Collector()
+        watcher = EntityWatcher(temp_world, collector, backend="polling")
+        watcher.start()
+        watcher.stop()
+        assert not watcher.poll_now()
+        assert collector.batches == []
+
+    def test_changes_scanned_elsewhere_are_delivered(self, temp_world):
+        """An edit consumed by another module's scan should still be delivered."""
+        get_journal(temp_world).scan()
+        collector = _Collector()
+        watcher = EntityWatcher(temp_world, collector, backend="polling")
+        _rewrite(temp_world, GOD_PATH, name="Hooked")
+
+        DataManager(temp_world)._find_entity_file("zzz-9999")  # rescans on a miss
+        changes = watcher.poll_now()
+        assert changes.modified[GOD_ID]["name"] == "Hooked"
+        assert collector.batches == [changes]
+        assert not watcher.poll_now()
+
+    def test_data_manager_writes_are_not_external(self, temp_world, sample_god_data):
+        """Entities written through DataManager should not show up in a scan."""
+        dm = DataManager(temp_world)
+        dm.journal.scan()
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.update_entity(entity_id, {"personality": "Quiet."})
+        assert not dm.journal.scan()
+        assert dm.journal.path_for(entity_id) is not None
+
+
+# ---------------------------------------------------------------------------
+# Cache coherence
+# ---------------------------------------------------------------------------
+
+class TestCacheCoherence:
+    """Tests for pushing external changes into module caches."""
+
+    def test_data_manager_apply_changes(self, temp_world):
+        """External edits and deletions should update entity_index."""
+        dm = DataManager(temp_world)
+        journal = get_journal(temp_world)
+        journal.scan()
+        _rewrite(temp_world, GOD_PATH, name="Renamed", _meta={
+            **dm.get_entity(GOD_ID)["_meta"], "status": "canon",
+        })
+        dm.apply_changes(journal.scan())
+        entry = dm._state["entity_index"][GOD_ID]
+        assert entry["name"] == "Renamed"
+        assert entry["status"] == "canon"
+        assert [e["id"] for e in dm.query_entities(status="canon")] == [GOD_ID]
+
+        os.remove(os.path.join(temp_world, GOD_PATH))
+        dm.apply_changes(journal.scan())
+        assert GOD_ID not in dm._state["entity_index"]
+
+    def test_apply_changes_patches_cross_references(self, temp_world, sample_god_data):
+        """External edits and deletions should reach the reverse index."""
+        dm = DataManager(temp_world)
+        target = dm.create_entity("god-profile", dict(sample_god_data, name="Target"))
+        journal = get_journal(temp_world)
+        journal.scan()
+        assert dm.get_cross_references(target)["referenced_by"] == []
+        dm.get_entity(GOD_ID)  # cached before the external edit
+
+        _rewrite(temp_world, GOD_PATH, relationships=[
+            {"target_id": target, "relationship_type": "rival"},
+        ])
+        dm.apply_changes(journal.scan())
+        assert [r["id"] for r in dm.get_cross_references(target)["referenced_by"]] == [GOD_ID]
+        assert target in [r["id"] for r in dm.get_cross_references(GOD_ID)["references"]]
+        assert dm.get_entity(GOD_ID)["relationships"][0]["target_id"] == target
+
+        os.remove(os.path.join(temp_world, GOD_PATH))
+        dm.apply_changes(journal.scan())
+        assert dm.get_cross_references(target)["referenced_by"] == []
+
+    def test_engine_manager_watcher(self, temp_world):
+        """Watcher changes should reach loaded modules and listeners."""
+        em = EngineManager(temp_world)
+        checker = em.consistency_checker
+        checker._load_all_entities()
+        graph = em.world_graph
+        graph.build_graph(entities=graph.journal.load_all())
+
+        collector = _Collector()
+        em.start_entity_watcher(collector, debounce=0.01, poll_interval=0.02,
+                                backend="polling")
+        try:
+            _rewrite(temp_world, GOD_PATH, name="Live")
+            assert collector.event.wait(5)
+        finally:
+            em.shutdown()
+
+        assert checker._entity_cache[GOD_ID]["name"] == "Live"
+        assert graph.graph.nodes[GOD_ID]["name"] == "Live"
@@ -272,6 +272,124 @@ class TestSharedUtils:
         with open(str(path), "r") as fh:
             assert json.load(fh)["v"] == 2
 
+    def test_json_codecs_round_trip(self, tmp_path):
+        from engine import utils
+        data = {"name": "Þórr", "tags": ["storm", "war"], "n": 3, "f": 1.5}
+        active = utils.get_json_codec()
+        try:
+            for name in utils.available_json_codecs():
+                utils.set_json_codec(name)
+                for indent in (2, None):
+                    path = tmp_path / f"{name}-{indent}.json"
+                    utils.safe_write_json(str(path), data, indent=indent)
+                    with open(str(path), encoding="utf-8") as fh:
+                        assert json.load(fh) == data
+                    assert utils.safe_read_json(str(path)) == data
+        finally:
+            utils.set_json_codec(active)
+
+    def test_compact_output_has_no_whitespace(self, tmp_path):
+        from engine.utils import safe_write_json
+        path = tmp_path / "compact.json"
+        safe_write_json(str(path), {"a": [1, 2], "b": {"c": "d"}}, indent=None)
+        assert path.read_text(encoding="utf-8") == '{"a":[1,2],"b":{"c":"d"}}'
+
+    def test_pretty_output_matches_stdlib(self, tmp_path):
+        from engine.utils import safe_write_json
+        data = {"name": "Þórr", "nested": {"list": [1, 2], "empty": {}}}
+        path = tmp_path / "pretty.json"
+        safe_write_json(str(path), data)
+        expected = json.dumps(data, indent=2, ensure_ascii=False)
+        assert path.read_text(encoding="utf-8") == expected
+
+    def test_set_unknown_codec_raises(self):
+        from engine.utils import set_json_codec
+        with pytest.raises(ValueError):
+            set_json_codec("no-such-codec")
+
+    def test_safe_append_jsonl(self, tmp_path):
+        from engine.utils import safe_append_jsonl
+        path = tmp_path / "log" / "events.jsonl"
+        safe_append_jsonl(str(path), {"i": 1})
+        safe_append_jsonl(str(path), {"i": 2})
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["i"] for line in lines] == [1, 2]
+
+    def test_batch_coalesces_fsyncs(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+        log = tmp_path / "events.jsonl"
+        with utils.batch():
+            for i in range(20):
+                utils.safe_append_jsonl(str(log), {"i": i})
+            assert synced == []
+            for i in range(5):
+                utils.safe_write_json(str(tmp_path / f"{i}.json"), {"i": i})
+            assert len(synced) == 5  # temp files are synced before the rename
+            assert len(log.read_text(encoding="utf-8").splitlines()) == 20
+        expected = 6 if os.name == "nt" else 7  # + the log file and its directory
+        assert len(synced) == expected
+
+    def test_unbatched_write_syncs_file_and_directory(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        utils.safe_write_json(str(tmp_path / "a.json"), {"i": 1})
+        assert len(synced) == (1 if os.name == "nt" else 2)
+
+    def test_write_without_fsync(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        utils.safe_write_json(str(tmp_path / "a.json"), {"i": 1}, fsync=False)
+        assert synced == []
+        assert json.loads((tmp_path / "a.json").read_text(encoding="utf-8")) == {"i": 1}
+
+    def test_unbatched_append_fsyncs_each_record(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        for i in range(3):
+            utils.safe_append_jsonl(str(tmp_path / "events.jsonl"), {"i": i})
+        assert len(synced) == 3
+
+    def test_nested_batch_commits_at_outermost_exit(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        with utils.batch():
+            with utils.batch():
+                utils.safe_append_jsonl(str(tmp_path / "a.jsonl"), {"i": 1})
+            assert synced == []
+            assert utils.in_batch()
+        assert synced
+        assert not utils.in_batch()
+
+    def test_batch_commits_on_error(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        with pytest.raises(RuntimeError), utils.batch():
+            utils.safe_append_jsonl(str(tmp_path / "a.jsonl"), {"i": 1})
+            raise RuntimeError("boom")
+        assert synced
+
+    def test_group_commit_window(self, tmp_path, monkeypatch):
+        from engine import utils
+        synced = []
+        monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd))
+        utils.set_group_commit_window(60)
+        try:
+            for i in range(5):
+                utils.safe_append_jsonl(str(tmp_path / "a.jsonl"), {"i": i})
+            assert synced == []
+            utils.flush_pending_writes()
+            assert synced
+        finally:
+            utils.set_group_commit_window(0)
+
     def test_clean_schema_strips_custom_fields(self):
         from engine.utils import clean_schema_for_validation
         schema = {
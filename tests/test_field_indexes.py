@@ -0,0 +1,122 @@
+"""
+Tests for engine/field_indexes.py -- indexed entity fields.
+
+Validates:
+    - x-indexed properties are collected from the template schemas
+    - Non-scalar and non-identifier properties are ignored
+    - SQLiteSyncEngine creates (and drops) the expression indexes
+    - query_entities filters and sorts on indexed fields via the index
+"""
+
+import json
+
+import pytest
+
+from engine.field_indexes import collect_field_indexes
+from engine.sqlite_sync import SQLiteSyncEngine
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+TOWN_ID = "havenport-e5f6"
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class TestCollectFieldIndexes:
+    """Tests for reading x-indexed markers from templates."""
+
+    def test_project_templates(self, temp_world):
+        """The shipped templates declare the commonly queried fields."""
+        fields = collect_field_indexes(f"{temp_world}/templates")
+        assert {"domain_primary", "alignment", "population", "founding_date"} <= set(fields)
+        assert fields["population"].types == ("integer",)
+        assert set(fields["alignment"].templates) == {"god-profile", "organization-profile"}
+        assert fields["domain_primary"].expression == "json_extract(data, '$.domain_primary')"
+
+    def test_ignored_properties(self, tmp_path):
+        """Arrays, objects and odd names are not indexable."""
+        schema = {
+            "$id": "thing",
+            "properties": {
+                "tags": {"type": "array", "x-indexed": True},
+                "odd name": {"type": "string", "x-indexed": True},
+                "size": {"type": "integer", "x-indexed": True},
+                "colour": {"type": "string"},
+            },
+        }
+        (tmp_path / "thing.json").write_text(json.dumps(schema), encoding="utf-8")
+        assert list(collect_field_indexes(tmp_path)) == ["size"]
+
+    def test_missing_directory(self, tmp_path):
+        """A world without templates has no indexed fields."""
+        assert collect_field_indexes(tmp_path / "nope") == {}
+
+
+# ---------------------------------------------------------------------------
+# SQLite integration
+# ---------------------------------------------------------------------------
+
+class TestIndexedQueries:
+    """Tests for query_entities over indexed fields."""
+
+    @staticmethod
+    def _index_names(sync):
+        return {
+            row[0] for row in sync._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+
+    def test_indexes_created_and_pruned(self, temp_world):
+        """Registered fields get an index; unregistered ones lose theirs."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert "idx_field_domain_primary" in self._index_names(sync)
+            sync._conn.execute(
+                "CREATE INDEX idx_field_retired ON entities(json_extract(data, '$.retired'))"
+            )
+            sync._conn.commit()
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert "idx_field_retired" not in self._index_names(sync)
+
+    def test_filter_uses_index(self, temp_world):
+        """An equality filter on an indexed field should be an index lookup."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            results = sync.query_entities([("domain_primary", "=", "storms")])
+            assert [r["id"] for r in results] == [GOD_ID]
+
+            plan = " ".join(
+                row["detail"] for row in sync._conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM entities WHERE "
+                    + sync.field_indexes["domain_primary"].expression + " = ?",
+                    ("storms",),
+                )
+            )
+            assert "idx_field_domain_primary" in plan
+
+    def test_range_in_and_order(self, temp_world):
+        """Comparison, IN, BETWEEN and ordering work on indexed fields."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert [r["id"] for r in sync.query_entities([("population", ">", 1000)])] == [TOWN_ID]
+            assert sync.query_entities([("population", "BETWEEN", (1, 10))]) == []
+            found = sync.query_entities([("alignment", "IN", ["good", "complex"])])
+            assert [r["id"] for r in found] == [GOD_ID]
+            ordered = sync.query_entities(order_by="-population")
+            assert ordered[0]["id"] == TOWN_ID
+
+    def test_unknown_field_rejected(self, temp_world):
+        """Fields that are neither columns nor indexed are refused."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            with pytest.raises(ValueError):
+                sync.query_entities([("symbol", "=", "x")])
+            with pytest.raises(ValueError):
+                sync.query_entities(order_by="symbol")
+
+    def test_bulk_load_keeps_field_indexes(self, temp_world):
+        """Rebuilds drop and re-create the expression indexes too."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            before = self._index_names(sync)
+            sync.full_sync(force=True)
+            assert self._index_names(sync) == before
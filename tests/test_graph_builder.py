@@ -264,3 +264,30 @@ class TestCrossRefExtraction:
 
         step29 = wg.get_entities_for_step(29)
         assert "havenport-e5f6" in step29
+
+
+# ---------------------------------------------------------------------------
+# Batch add
+# ---------------------------------------------------------------------------
+
+class TestAddEntities:
+    """Tests for WorldGraph.add_entities."""
+
+    def test_batch_references_resolve_in_any_order(self, temp_world):
+        """An edge to a later batch member should be created immediately."""
+        wg = WorldGraph(temp_world)
+        wg.build_graph()
+
+        def _god(eid, target):
+            return {
+                "name": eid,
+                "_meta": {"id": eid, "template_id": "god-profile", "entity_type": "gods"},
+                "relationships": [{"target_id": target, "relationship_type": "ally"}],
+            }
+
+        wg.add_entities({
+            "first-0001": _god("first-0001", "second-0002"),
+            "second-0002": _god("second-0002", "first-0001"),
+        })
+        assert wg.graph.has_edge("first-0001", "second-0002")
+        assert wg.graph.has_edge("second-0002", "first-0001")
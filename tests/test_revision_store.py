@@ -0,0 +1,164 @@
+"""
+Tests for engine/revision_store.py -- content-addressed revision snapshots.
+
+Validates:
+    - save / versions / load_version round trips
+    - Deduplication of identical documents
+    - Unique timestamps for rapid successive saves
+    - Delta chains and periodic full copies
+    - Compression modes and torn chain lines
+    - Importing legacy snapshot files
+    - DataManager and ErrorRecoveryManager integration
+"""
+
+import json
+import os
+
+import pytest
+
+from engine.data_manager import DataManager
+from engine.error_recovery import ErrorRecoveryManager
+from engine.revision_store import RevisionStore
+
+
+def _doc(i, **extra):
+    return {
+        "name": "Thorin",
+        "personality": "Stern. " * 50,
+        "counter": i,
+        "_meta": {"id": "thorin-a1b2", "updated_at": f"2026-01-01T00:00:{i:02d}"},
+        **extra,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Return a RevisionStore in a temporary directory."""
+    return RevisionStore(tmp_path / "revisions")
+
+
+# ---------------------------------------------------------------------------
+# Core store behaviour
+# ---------------------------------------------------------------------------
+
+class TestRevisionStore:
+    """Tests for RevisionStore save and read APIs."""
+
+    def test_round_trip(self, store):
+        """Saved versions should be listed newest first and load back intact."""
+        store.save("thorin-a1b2", _doc(1))
+        store.save("thorin-a1b2", _doc(2))
+
+        versions = store.versions("thorin-a1b2")
+        assert [v["version"] for v in versions] == [2, 1]
+        assert store.load_version("thorin-a1b2", version=1) == _doc(1)
+        assert store.load_version("thorin-a1b2",
+                                  timestamp=versions[0]["timestamp"]) == _doc(2)
+        assert store.latest("thorin-a1b2") == _doc(2)
+
+    def test_rapid_saves_get_unique_timestamps(self, store):
+        """Saves within the same second must not collide."""
+        for i in range(20):
+            store.save("thorin-a1b2", _doc(i))
+        timestamps = [v["timestamp"] for v in store.versions("thorin-a1b2")]
+        assert len(set(timestamps)) == 20
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    def test_identical_documents_are_deduplicated(self, store):
+        """Re-saving the newest document is a no-op; equal docs share a blob."""
+        first = store.save("thorin-a1b2", _doc(1))
+        again = store.save("thorin-a1b2", _doc(1))
+        assert again == first
+        assert len(store.versions("thorin-a1b2")) == 1
+
+        store.save("other-c3d4", _doc(1))
+        assert store.stats()["blobs"] == 1
+
+    def test_long_delta_chains_reconstruct(self, store):
+        """Every version should load correctly across several delta chains."""
+        n = RevisionStore.MAX_DELTA_CHAIN * 3
+        for i in range(n):
+            store.save("thorin-a1b2", _doc(i))
+        for i in range(n):
+            assert store.load_version("thorin-a1b2", version=i + 1) == _doc(i)
+
+    def test_deltas_are_smaller_than_full_copies(self, tmp_path):
+        """Delta storage should use less space than full copies."""
+        full = RevisionStore(tmp_path / "full", compression="none", delta=False)
+        delta = RevisionStore(tmp_path / "delta", compression="none")
+        for i in range(10):
+            full.save("thorin-a1b2", _doc(i))
+            delta.save("thorin-a1b2", _doc(i))
+        assert delta.stats()["blob_bytes"] < full.stats()["blob_bytes"] / 2
+
+    def test_removed_fields_are_restored(self, store):
+        """A delta that drops a field should reconstruct without it."""
+        store.save("thorin-a1b2", _doc(1, title="Lord"))
+        store.save("thorin-a1b2", _doc(2))
+        assert "title" not in store.load_version("thorin-a1b2", version=2)
+        assert store.load_version("thorin-a1b2", version=1)["title"] == "Lord"
+
+    @pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+    def test_compression_modes(self, tmp_path, compression):
+        """Every compression mode should round-trip (zstd falls back to zlib)."""
+        store = RevisionStore(tmp_path / compression, compression=compression)
+        store.save("thorin-a1b2", _doc(1))
+        assert RevisionStore(tmp_path / compression).latest("thorin-a1b2") == _doc(1)
+
+    def test_torn_chain_line_is_ignored(self, store):
+        """A partial trailing line from a crash should not break reads or saves."""
+        store.save("thorin-a1b2", _doc(1))
+        with open(store.chains_dir / "thorin-a1b2.jsonl", "a", encoding="utf-8") as fh:
+            fh.write('{"v": 2, "ts"')
+        fresh = RevisionStore(store.revisions_dir)
+        assert [v["version"] for v in fresh.versions("thorin-a1b2")] == [1]
+        fresh.save("thorin-a1b2", _doc(2))
+        assert fresh.load_version("thorin-a1b2", version=2) == _doc(2)
+
+    def test_import_legacy_snapshots(self, store, tmp_path):
+        """Old {id}_{timestamp}.json files should be imported in order."""
+        legacy = tmp_path / "snapshots"
+        legacy.mkdir()
+        for i, stamp in enumerate(["20260101T000000Z", "20260102T000000Z"]):
+            with open(legacy / f"thorin-a1b2_{stamp}.json", "w", encoding="utf-8") as fh:
+                json.dump(_doc(i), fh)
+
+        assert store.import_legacy_snapshots(legacy, remove=True) == 2
+        assert store.latest("thorin-a1b2") == _doc(1)
+        assert os.listdir(legacy) == []
+
+
+# ---------------------------------------------------------------------------
+# Integration
+# ---------------------------------------------------------------------------
+
+class TestRevisionIntegration:
+    """Tests for DataManager / ErrorRecoveryManager use of the store."""
+
+    def test_updates_record_versions(self, temp_world, sample_god_data):
+        """Each update should add one version and no legacy snapshot files."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.update_entity(entity_id, {"personality": "First."})
+        dm.update_entity(entity_id, {"personality": "Second."})
+
+        versions = dm.revision_store.versions(entity_id)
+        assert len(versions) == 2
+        assert dm.revision_store.latest(entity_id)["personality"] == "First."
+        assert not os.listdir(dm.snapshots_dir)
+
+    def test_rollback_from_revision_store(self, temp_world, sample_god_data):
+        """rollback_entity should restore a version listed by find_entity_versions."""
+        dm = DataManager(temp_world)
+        entity_id = dm.create_entity("god-profile", sample_god_data)
+        dm.update_entity(entity_id, {"personality": "Changed."})
+
+        erm = ErrorRecoveryManager(temp_world)
+        snapshots = [v for v in erm.find_entity_versions(entity_id)
+                     if v["source"] == "revision_snapshot"]
+        assert len(snapshots) == 1
+        result = erm.rollback_entity(entity_id, snapshots[0]["timestamp"])
+        assert result["success"]
+
+        fresh = DataManager(temp_world)
+        assert fresh.get_entity(entity_id)["personality"] == sample_god_data["personality"]
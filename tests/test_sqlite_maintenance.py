@@ -0,0 +1,127 @@
+"""
+Tests for engine/sqlite_maintenance.py -- idle-time SQLite maintenance.
+
+Validates:
+    - A run is due only after writes followed by an idle period
+    - min_interval spaces idle-time runs; an oversized WAL overrides it
+      unless the last checkpoint was blocked by a reader
+    - The background thread runs maintenance and stops cleanly
+    - EngineManager starts the scheduler and stops it on shutdown
+"""
+
+import time
+
+import pytest
+
+from engine.engine_manager import EngineManager
+from engine.entity_journal import reset_journals
+from engine.sqlite_maintenance import MaintenanceScheduler
+from engine.sqlite_sync import SQLiteSyncEngine
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_journals():
+    """Do not share journals between tests."""
+    reset_journals()
+    yield
+    reset_journals()
+
+
+@pytest.fixture
+def sync(temp_world):
+    engine = SQLiteSyncEngine(temp_world)
+    yield engine
+    engine.close()
+
+
+# ---------------------------------------------------------------------------
+# Scheduling
+# ---------------------------------------------------------------------------
+
+class TestIsDue:
+    """Tests for deciding when maintenance should run."""
+
+    def test_needs_writes_then_idle(self, sync):
+        """No writes means nothing to do; fresh writes mean not idle yet."""
+        scheduler = MaintenanceScheduler(sync, idle_seconds=60, wal_limit_bytes=1 << 40)
+        sync.run_maintenance()
+        assert not scheduler.is_due()
+
+        sync.full_sync()
+        assert not scheduler.is_due()
+        assert scheduler.is_due(now=sync.last_write_at + 61)
+
+    def test_min_interval(self, sync):
+        """Idle-time runs are at least min_interval apart."""
+        scheduler = MaintenanceScheduler(sync, idle_seconds=0, min_interval=3600,
+                                         wal_limit_bytes=1 << 40)
+        sync.full_sync()
+        scheduler.run_now()
+        sync.full_sync(force=True)
+        assert not scheduler.is_due()
+        assert scheduler.is_due(now=time.monotonic() + 3601)
+
+    def test_wal_limit_overrides_idle(self, sync):
+        """A WAL over the limit is due even while writes continue."""
+        scheduler = MaintenanceScheduler(sync, idle_seconds=3600, wal_limit_bytes=0)
+        sync.full_sync()
+        assert sync.wal_size() > 0
+        assert scheduler.is_due()
+        scheduler.run_now()
+        assert sync.wal_size() == 0
+        assert not scheduler.is_due()
+
+    def test_busy_checkpoint_backs_off(self, sync):
+        """A WAL left oversized by a blocked checkpoint waits min_interval."""
+        scheduler = MaintenanceScheduler(sync, idle_seconds=3600, min_interval=600,
+                                         wal_limit_bytes=0)
+        sync._conn.execute("PRAGMA busy_timeout = 50")  # don't wait on the reader
+        reader = sync._reader()
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM entities").fetchone()
+        try:
+            sync.full_sync()
+            report = scheduler.run_now()
+            assert report["checkpoint"]["busy"]
+            assert sync.wal_size() > 0
+            assert not scheduler.is_due()
+            assert scheduler.is_due(now=time.monotonic() + 601)
+        finally:
+            reader.execute("COMMIT")
+
+
+# ---------------------------------------------------------------------------
+# Background thread
+# ---------------------------------------------------------------------------
+
+class TestSchedulerThread:
+    """Tests for the scheduler lifecycle."""
+
+    def test_runs_when_idle(self, sync):
+        """The thread picks up an idle engine with pending writes."""
+        sync.full_sync()
+        scheduler = MaintenanceScheduler(sync, idle_seconds=0, check_interval=0.01)
+        scheduler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while scheduler.runs == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+        assert scheduler.runs >= 1
+        assert scheduler.last_report["after"]["wal_bytes"] == 0
+        assert not scheduler.is_running
+
+    def test_engine_manager_lifecycle(self, temp_world):
+        """EngineManager owns one scheduler and stops it on shutdown."""
+        em = EngineManager(temp_world)
+        scheduler = em.start_sqlite_maintenance(idle_seconds=0, check_interval=0.01)
+        try:
+            assert scheduler.is_running
+            assert em.start_sqlite_maintenance() is scheduler
+            assert scheduler.sync is em.sqlite_sync
+        finally:
+            em.shutdown()
+        assert not scheduler.is_running
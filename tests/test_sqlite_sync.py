@@ -3,22 +3,38 @@ Tests for engine/sqlite_sync.py -- SQLiteSyncEngine for FTS5 search.
 
 Validates:
     - full_sync with sample entities
+    - full_sync reconciliation (only changed entities are written)
+    - Bulk loading (indexes, pragmas, FTS rebuild, rollback)
+    - Schema versioning and in-place migrations
+    - Per-thread read-only connections alongside the writer
     - sync_entity (incremental)
-    - search with FTS5
+    - search with FTS5 (weighted ranking, snippets, paging, prefixes)
+    - fuzzy_find over the trigram name index (infixes, typos, aliases)
     - query_by_type, query_by_step, query_by_status
     - query_cross_references
-    - query_claims
+    - query_claims, similar_claims (claim_search FTS5 index)
     - advanced_query blocks dangerous SQL
     - get_stats
+    - Query result cache (per-table versions, hit rates)
+    - run_maintenance (statistics, FTS segment merging, WAL checkpoint)
 
 Uses temp directories and in-memory strategies to avoid touching real data.
 """
 
 import json
 import os
+import shutil
+import sqlite3
+import threading
+
 import pytest
 
-from engine.sqlite_sync import SQLiteSyncEngine
+from engine.entity_journal import reset_journals
+from engine.entity_storage import reset_storages
+from engine.sqlite_sync import _SCHEMA_SQL, SCHEMA_VERSION, SQLiteSyncEngine, _Migration
+
+GOD_ID = "thorin-stormkeeper-a1b2"
+GOD_PATH = os.path.join("user-world", "entities", "gods", "thorin-stormkeeper-a1b2.json")
 
 
 # ---------------------------------------------------------------------------
@@ -90,6 +106,324 @@ class TestFullSync:
             sync.close()
 
 
+class TestReconcile:
+    """Tests for full_sync only writing what changed."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_journals(self):
+        """Do not share journals or storage backends between tests."""
+        reset_journals()
+        reset_storages()
+        yield
+        reset_storages()
+        reset_journals()
+
+    @staticmethod
+    def _rewrite(root, **changes):
+        """Rewrite the god's file with *changes*, bumping its mtime."""
+        path = os.path.join(root, GOD_PATH)
+        with open(path, encoding="utf-8") as fh:
+            doc = json.load(fh)
+        doc.update(changes)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def test_unchanged_world_writes_nothing(self, temp_world):
+        """A second sync of an unchanged world should skip every entity."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert sync.last_sync_stats["added"] == 2
+            assert sync.full_sync() == 2
+            stats = sync.last_sync_stats
+            assert stats["unchanged"] == 2
+            assert stats["added"] == stats["modified"] == stats["removed"] == 0
+
+    def test_modified_and_removed(self, temp_world):
+        """Edited entities are rewritten and deleted ones removed."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            self._rewrite(temp_world, name="Thorin Renamed")
+            os.remove(os.path.join(temp_world, "user-world", "entities",
+                                   "settlements", "havenport-e5f6.json"))
+            assert sync.full_sync() == 1
+            stats = sync.last_sync_stats
+            assert stats["modified"] == 1 and stats["removed"] == 1
+            assert [r["id"] for r in sync.search("Renamed")] == [GOD_ID]
+            assert sync.get_stats()["total_entities"] == 1
+
+    def test_touched_file_is_not_rewritten(self, temp_world):
+        """An mtime bump without a content change only refreshes the row."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            self._rewrite(temp_world)
+            sync.full_sync()
+            assert sync.last_sync_stats["touched"] == 1
+            assert sync.last_sync_stats["modified"] == 0
+            sync.full_sync()
+            assert sync.last_sync_stats["unchanged"] == 2
+
+    def test_preloaded_entities_match_stored_rows(self, temp_world):
+        """Loader-added _rel_path keys must not count as a change."""
+        from engine.data_manager import DataManager
+
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            sync.full_sync(entities=DataManager(temp_world).load_all_entity_data())
+            assert sync.last_sync_stats["unchanged"] == 2
+
+    def test_force_rebuilds(self, temp_world):
+        """force=True should truncate and reload every entity."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert sync.full_sync(force=True) == 2
+            assert sync.last_sync_stats["mode"] == "rebuild"
+            assert len(sync.search("Thorin")) == 1
+
+    def test_legacy_database_is_upgraded(self, temp_world):
+        """A database created before the change-tracking columns is upgraded."""
+        runtime = os.path.join(temp_world, "runtime")
+        os.makedirs(runtime, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(runtime, "worldbuilding.db"))
+        conn.execute(
+            "CREATE TABLE entities (id TEXT PRIMARY KEY, entity_type TEXT NOT NULL, "
+            "name TEXT NOT NULL, template_id TEXT NOT NULL, status TEXT DEFAULT 'draft', "
+            "step_created INTEGER, file_path TEXT NOT NULL, data JSON NOT NULL, "
+            "created_at TEXT, updated_at TEXT)"
+        )
+        conn.commit()
+        conn.close()
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert sync.full_sync() == 2
+
+
+class TestBulkLoad:
+    """Tests for the executemany bulk loader behind rebuilds."""
+
+    @staticmethod
+    def _indexes(sync):
+        return sorted(
+            row[0] for row in sync._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+            )
+        )
+
+    def test_indexes_and_pragmas_restored(self, temp_world):
+        """Dropped indexes come back and load pragmas are reverted."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            indexes = self._indexes(sync)
+            synchronous = sync._conn.execute("PRAGMA synchronous").fetchone()[0]
+            assert sync.full_sync(force=True) == 2
+            assert self._indexes(sync) == indexes
+            assert sync._conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+
+    def test_search_index_consistent(self, temp_world):
+        """The rebuilt FTS index should pass integrity-check and track removals."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync(force=True)
+            assert len(sync.search("Thorin")) == 1
+            sync.remove_entity(GOD_ID)
+            assert sync.search("Thorin") == []
+            sync._conn.execute(
+                "INSERT INTO entity_search(entity_search) VALUES ('integrity-check')"
+            )
+
+    def test_claims_and_references_loaded(self, temp_world):
+        """Canon claims and cross-references should be bulk inserted."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync(force=True)
+            stats = sync.get_stats()
+            assert stats["total_canon_claims"] > 0
+            assert stats["total_cross_references"] > 0
+
+    def test_failed_load_rolls_back(self, temp_world, monkeypatch):
+        """An error mid-load should leave the previous contents and indexes."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            indexes = self._indexes(sync)
+
+            def fail(rows):
+                raise RuntimeError("boom")
+
+            monkeypatch.setattr(sync, "_load_search_index", fail)
+            with pytest.raises(RuntimeError):
+                sync.full_sync(force=True)
+            assert sync.get_stats()["total_entities"] == 2
+            assert self._indexes(sync) == indexes
+
+    def test_legacy_search_index_replaced(self, temp_world):
+        """An FTS index over the entities table is rebuilt on open."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            sync._conn.execute("DROP TABLE entity_search")
+            sync._conn.execute(
+                "CREATE VIRTUAL TABLE entity_search USING fts5(name, entity_type, "
+                "tags, description, canon_claims_text, content='entities', "
+                "content_rowid='rowid', tokenize='porter unicode61')"
+            )
+            sync._conn.execute("PRAGMA user_version = 0")  # pre-versioning
+            sync._conn.commit()
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert [r["id"] for r in sync.search("Thorin")] == [GOD_ID]
+
+
+class TestSchemaMigrations:
+    """Tests for the PRAGMA user_version migrations."""
+
+    @staticmethod
+    def _user_version(sync):
+        return sync._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def test_new_database_is_current(self, temp_world):
+        """A fresh database runs every step and records the last version."""
+        assert SQLiteSyncEngine._MIGRATIONS[-1].version == SCHEMA_VERSION
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert self._user_version(sync) == SCHEMA_VERSION
+            assert sync.get_stats()["schema_version"] == SCHEMA_VERSION
+
+    def test_unversioned_database_upgraded_in_place(self, temp_world):
+        """A pre-versioning database keeps its rows and gains the new schema."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            sync._conn.execute("ALTER TABLE entities DROP COLUMN content_hash")
+            sync._conn.execute("ALTER TABLE entities DROP COLUMN source_mtime")
+            sync._conn.execute("PRAGMA user_version = 0")
+            sync._conn.commit()
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert self._user_version(sync) == SCHEMA_VERSION
+            columns = {row["name"] for row in sync._conn.execute("PRAGMA table_info(entities)")}
+            assert {"content_hash", "source_mtime"} <= columns
+            assert [r["id"] for r in sync.search("Thorin")] == [GOD_ID]
+
+    def test_base_schema_is_step_one_only(self):
+        """Step 1's DDL predates the change-tracking columns step 2 adds."""
+        conn = sqlite3.connect(":memory:")
+        conn.executescript(_SCHEMA_SQL)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(entities)")}
+        conn.close()
+        assert "updated_at" in columns
+        assert not {"content_hash", "source_mtime"} & columns
+
+    def test_current_database_runs_no_steps(self, temp_world, monkeypatch):
+        """Re-opening an up-to-date database applies nothing."""
+        SQLiteSyncEngine(temp_world).close()
+        applied = []
+        steps = tuple(
+            step._replace(apply=lambda engine, v=step.version: applied.append(v))
+            for step in SQLiteSyncEngine._MIGRATIONS
+        )
+        monkeypatch.setattr(SQLiteSyncEngine, "_MIGRATIONS", steps)
+        SQLiteSyncEngine(temp_world).close()
+        assert applied == []
+
+    def test_only_resync_steps_rewrite_rows(self, temp_world, monkeypatch):
+        """Additive steps keep rows; a resync step has full_sync rewrite them."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+        additive = _Migration(
+            SCHEMA_VERSION + 1, "test index",
+            lambda engine: engine._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_test_name ON entities(name)"
+            ),
+        )
+        monkeypatch.setattr(SQLiteSyncEngine, "_MIGRATIONS",
+                            SQLiteSyncEngine._MIGRATIONS + (additive,))
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert sync.last_sync_stats["modified"] == 0
+            assert sync.last_sync_stats["mode"] == "reconcile"
+
+        resync = _Migration(SCHEMA_VERSION + 2, "test resync", lambda engine: None, resync=True)
+        monkeypatch.setattr(SQLiteSyncEngine, "_MIGRATIONS",
+                            SQLiteSyncEngine._MIGRATIONS + (resync,))
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert self._user_version(sync) == SCHEMA_VERSION + 2
+            sync.full_sync()
+            assert sync.last_sync_stats["mode"] == "reconcile"
+            assert sync.last_sync_stats["modified"] == sync.get_stats()["total_entities"]
+
+    def test_newer_database_left_alone(self, temp_world):
+        """A database from a newer program version is not downgraded."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 5}")
+            sync._conn.commit()
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert self._user_version(sync) == SCHEMA_VERSION + 5
+
+
+class TestReaderPool:
+    """Tests for the pooled read-only connections."""
+
+    def test_one_connection_per_thread(self, temp_world):
+        """Each thread reuses its own reader, distinct from the writer."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            main = sync._reader()
+            assert sync._reader() is main
+            assert main is not sync._conn
+
+            seen = []
+
+            def worker():
+                seen.append((sync._reader(), len(sync.search("Thorin"))))
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+            assert seen[0][0] is not main
+            assert seen[0][1] == 1
+
+    def test_readers_are_read_only(self, temp_world):
+        """Pooled connections must reject writes."""
+        with SQLiteSyncEngine(temp_world) as sync, pytest.raises(sqlite3.OperationalError):
+            sync._reader().execute("DELETE FROM entities")
+
+    def test_reads_do_not_wait_for_writer(self, temp_world):
+        """A read during an open write transaction sees the committed state."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            with sync._write_lock:
+                sync._conn.execute("DELETE FROM entities")
+                result = []
+                thread = threading.Thread(
+                    target=lambda: result.append(sync.get_stats()["total_entities"])
+                )
+                thread.start()
+                thread.join(timeout=5)
+                sync._conn.rollback()
+            assert result == [2]
+
+    def test_uri_special_characters_in_path(self, temp_world):
+        """Readers open the right file when the project path needs URI escaping."""
+        root = os.path.join(os.path.dirname(temp_world), "odd?#%20world")
+        shutil.copytree(temp_world, root)
+        with SQLiteSyncEngine(root) as sync:
+            sync.full_sync()
+            assert [r["id"] for r in sync.search("Thorin")] == [GOD_ID]
+            assert sync._reader().execute("PRAGMA database_list").fetchone()[2] == str(
+                sync.db_path.resolve())
+
+    def test_dead_thread_connections_pruned(self, temp_world):
+        """Readers of exited threads are closed when a new one opens."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            thread = threading.Thread(target=sync._reader)
+            thread.start()
+            thread.join()
+            assert len(sync._readers) == 1
+            sync._reader()
+            assert len(sync._readers) == 1
+
+    def test_close_closes_readers(self, temp_world):
+        """After close() queries should fail rather than reopen."""
+        sync = SQLiteSyncEngine(temp_world)
+        sync.full_sync()
+        sync.search("Thorin")
+        sync.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            sync.search("Thorin")
+
+
 # ---------------------------------------------------------------------------
 # Incremental Sync
 # ---------------------------------------------------------------------------
@@ -193,6 +527,117 @@ class TestSearch:
         finally:
             sync.close()
 
+    @staticmethod
+    def _ranked_world(sync):
+        """Sync entities that match "tempest" in different columns."""
+        by_name = _make_sample_entity("tempest-0001", "Tempest", "gods", "god-profile")
+        by_desc = _make_sample_entity("calm-0002", "Calm", "gods", "god-profile")
+        by_desc["description"] = "Once fought a tempest"
+        by_claim = _make_sample_entity("still-0003", "Still", "gods", "god-profile")
+        by_claim["canon_claims"] = [{"claim": "Still outlasted a tempest"}]
+        sync.sync_entities({"still-0003": by_claim, "calm-0002": by_desc,
+                            "tempest-0001": by_name})
+
+    def test_weighted_ranking(self, temp_world):
+        """Name matches rank above description matches, then canon claims."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            self._ranked_world(sync)
+            results = sync.search("tempest")
+            assert [r["id"] for r in results] == ["tempest-0001", "calm-0002", "still-0003"]
+            assert results[0]["rank"] <= results[1]["rank"] <= results[2]["rank"]
+
+    def test_paging_and_total(self, temp_world):
+        """limit/offset page through results; search_page reports the total."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            self._ranked_world(sync)
+            assert [r["id"] for r in sync.search("tempest", limit=1, offset=1)] == ["calm-0002"]
+            page = sync.search_page("tempest", limit=2)
+            assert page["total"] == 3
+            assert len(page["results"]) == 2
+            assert sync.search_page("tempest", limit=2, offset=2)["results"][0]["id"] == "still-0003"
+
+    def test_snippets_and_highlights(self, temp_world):
+        """Snippets and name highlights should mark the matched terms."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            self._ranked_world(sync)
+            results = sync.search("tempest", snippets=True, markers=("<b>", "</b>"))
+            assert results[0]["name_highlight"] == "<b>Tempest</b>"
+            assert "<b>tempest</b>" in results[1]["snippet"]
+
+    def test_prefix_search(self, temp_world):
+        """With prefix=True the last word matches as a prefix."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert sync.search("Tho") == []
+            assert [r["id"] for r in sync.search("Thor", prefix=True)] == [
+                "thorin-stormkeeper-a1b2"
+            ]
+            assert sync.count_matches("thori", prefix=True) == 1
+
+    def test_prefix_index_configured(self, temp_world):
+        """The FTS5 table should carry 2- and 3-character prefix indexes."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sql = sync._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'entity_search'"
+            ).fetchone()[0]
+            assert "prefix='2 3'" in sql
+
+
+class TestFuzzyFind:
+    """Tests for fuzzy_find and the trigram name index."""
+
+    def test_infix_typo_and_alias(self, temp_world):
+        """Infixes, near misses and aliases all resolve to the entity."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            entity = _make_sample_entity("asathor-0001", "Asathor", "gods", "god-profile")
+            entity["nicknames"] = ["The Old Thunder"]
+            sync.sync_entity("asathor-0001", entity)
+
+            found = sync.fuzzy_find("thor")
+            assert [r["id"] for r in found] == [GOD_ID, "asathor-0001"]  # prefix first
+            assert found[0]["distance"] == 0 and found[0]["entity_type"] == "gods"
+            typo = sync.fuzzy_find("Stormkeper")
+            assert [(r["id"], r["distance"]) for r in typo] == [(GOD_ID, 1)]
+            assert sync.fuzzy_find("Stormkeper", max_distance=0) == []
+            alias = sync.fuzzy_find("thunder")
+            assert [(r["id"], r["matched_name"]) for r in alias] == [
+                ("asathor-0001", "The Old Thunder")
+            ]
+
+    def test_short_and_unmatched_queries(self, temp_world):
+        """One- and two-letter queries match as substrings; junk finds nothing."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert {r["id"] for r in sync.fuzzy_find("po")} == {"havenport-e5f6"}
+            assert sync.fuzzy_find("qqqqqq") == []
+            assert sync.fuzzy_find("  ") == []
+            assert len(sync.fuzzy_find("o", limit=1)) == 1
+
+    def test_index_follows_renames_and_removal(self, temp_world):
+        """Renaming or removing an entity updates its indexed names."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            entity = _make_sample_entity("rename-0001", "Velmora", "gods", "god-profile")
+            sync.sync_entity("rename-0001", entity)
+            entity["name"] = "Kestrith"
+            sync.sync_entity("rename-0001", entity)
+            assert sync.fuzzy_find("velmora") == []
+            assert [r["id"] for r in sync.fuzzy_find("kestr")] == ["rename-0001"]
+            sync.remove_entity("rename-0001")
+            assert sync.fuzzy_find("kestr") == []
+            sync._conn.execute("INSERT INTO name_search(name_search) VALUES ('integrity-check')")
+
+    def test_rebuild_and_migration_fill_index(self, temp_world):
+        """Bulk loads and the schema migration both populate the names."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync(force=True)
+            assert [r["id"] for r in sync.fuzzy_find("havnport")] == ["havenport-e5f6"]
+            sync._conn.executescript(
+                "DROP TABLE name_search; DROP TABLE entity_names; PRAGMA user_version = 4;"
+            )
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert [r["id"] for r in sync.fuzzy_find("havnport")] == ["havenport-e5f6"]
+
 
 # ---------------------------------------------------------------------------
 # Query Methods
@@ -256,6 +701,94 @@ class TestQueryCrossReferences:
         finally:
             sync.close()
 
+    def test_links_to_removed_entity_are_hidden(self, temp_world):
+        """Kept links to a removed entity reappear only once it is synced again."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["b-0002"], "b-0002": []})
+            outgoing = sync.query_cross_references("a-0001")["outgoing"]
+            assert [r["target_id"] for r in outgoing] == ["b-0002"]
+
+            sync.remove_entity("b-0002")
+            assert sync.query_cross_references("a-0001")["outgoing"] == []
+
+            _sync_chain(sync, {"b-0002": []})
+            incoming = sync.query_cross_references("b-0002")["incoming"]
+            assert [r["source_id"] for r in incoming] == ["a-0001"]
+
+
+# ---------------------------------------------------------------------------
+# Graph traversal
+# ---------------------------------------------------------------------------
+
+def _sync_chain(sync, links):
+    """Sync linked sample gods; *links* maps each ID to its targets."""
+    for entity_id, targets in links.items():
+        entity = _make_sample_entity(entity_id, entity_id.title(), "gods", "god-profile")
+        entity["relationships"] = [
+            {"target_id": target, "relationship_type": "ally"} for target in targets
+        ]
+        entity["pantheon_id"] = None
+        sync.sync_entity(entity_id, entity)
+
+
+class TestGraphTraversal:
+    """Tests for the recursive-CTE traversal queries."""
+
+    def test_neighbors_by_depth(self, temp_world):
+        """Neighbours are found in both directions, nearest first."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["b-0002"], "b-0002": ["c-0003"], "c-0003": []})
+            one = sync.graph_neighbors("b-0002")
+            assert sorted((n["id"], n["depth"]) for n in one) == [("a-0001", 1), ("c-0003", 1)]
+            two = sync.graph_neighbors("a-0001", depth=2)
+            assert [(n["id"], n["depth"]) for n in two] == [("b-0002", 1), ("c-0003", 2)]
+            assert two[0]["entity_type"] == "gods"
+
+    def test_missing_entity_and_dangling_links(self, temp_world):
+        """Unknown starts and links to unsynced IDs yield nothing."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["ghost-9999"]})
+            assert sync.graph_neighbors("a-0001") == []
+            assert sync.graph_neighbors("nobody-0000") == []
+            assert sync.graph_shortest_path("a-0001", "ghost-9999") == []
+            assert sync.graph_component("nobody-0000") == []
+
+    def test_cycles_terminate(self, temp_world):
+        """A cycle is walked once, at its shortest distances."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["b-0002"], "b-0002": ["c-0003"], "c-0003": ["a-0001"]})
+            found = sync.graph_neighbors("a-0001", depth=10)
+            assert sorted((n["id"], n["depth"]) for n in found) == [("b-0002", 1), ("c-0003", 1)]
+            assert sync.graph_component("a-0001") == ["a-0001", "b-0002", "c-0003"]
+
+    def test_shortest_path(self, temp_world):
+        """Paths match the WorldGraph.find_path shape."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {
+                "a-0001": ["b-0002"], "b-0002": ["c-0003"], "c-0003": ["d-0004"], "d-0004": [],
+            })
+            path = sync.graph_shortest_path("a-0001", "d-0004")
+            assert path == [("a-0001", ""), ("b-0002", "ally"), ("c-0003", "ally"), ("d-0004", "ally")]
+            assert sync.graph_shortest_path("a-0001", "d-0004", max_depth=2) == []
+            assert sync.graph_shortest_path("a-0001", "a-0001") == [("a-0001", "")]
+
+    def test_components(self, temp_world):
+        """Component membership separates unconnected entities."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["b-0002"], "b-0002": [], "z-0009": []})
+            assert sync.same_component("a-0001", "b-0002")
+            assert not sync.same_component("a-0001", "z-0009")
+            assert sync.graph_component("a-0001", limit=1) == ["a-0001"]
+
+    def test_remove_keeps_inbound_links(self, temp_world):
+        """Removing an entity keeps the links other entities make to it."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            _sync_chain(sync, {"a-0001": ["b-0002"], "b-0002": []})
+            sync.remove_entity("b-0002")
+            assert sync.graph_neighbors("a-0001") == []
+            _sync_chain(sync, {"b-0002": []})
+            assert [n["id"] for n in sync.graph_neighbors("a-0001")] == ["b-0002"]
+
 
 # ---------------------------------------------------------------------------
 # Canon Claims
@@ -295,6 +828,52 @@ class TestQueryClaims:
             sync.close()
 
 
+class TestSimilarClaims:
+    """Tests for the claim_search index and similar_claims."""
+
+    def test_ranked_with_matched_terms(self, temp_world):
+        """Stemmed matches are returned best first with the words that matched."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            found = sync.similar_claims(["storm", "domain"])
+            assert found[0]["entity_id"] == GOD_ID
+            assert found[0]["matched_terms"] == ["domain", "storms"]
+            assert found[0]["entity_name"] == "Thorin Stormkeeper"
+            assert found[0]["score"] >= found[-1]["score"] > 0
+            assert sync.similar_claims(["storm"], exclude_entity_id=GOD_ID) == []
+            assert sync.similar_claims([]) == []
+            assert sync.similar_claims("storm domain") == found
+
+    def test_index_follows_entity_updates(self, temp_world):
+        """Re-syncing or removing an entity updates its indexed claims."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            entity = _make_sample_entity("calm-0001", "Calm", "gods", "god-profile")
+            sync.sync_entity("calm-0001", entity)
+            entity["canon_claims"] = [{"claim": "Calm rules the tides", "references": []}]
+            sync.sync_entity("calm-0001", entity)
+            assert [c["claim"] for c in sync.similar_claims(["tide"])] == ["Calm rules the tides"]
+            assert sync.similar_claims(["greater"]) == []
+            sync.remove_entity("calm-0001")
+            assert sync.similar_claims(["tide"]) == []
+            sync._conn.execute("INSERT INTO claim_search(claim_search) VALUES ('integrity-check')")
+
+    def test_rebuild_and_claims_table_upgrade(self, temp_world):
+        """Bulk loads refill the index; claim tables without IDs are migrated."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync(force=True)
+            assert sync.similar_claims(["storms"])
+            sync._conn.executescript(
+                "DROP TABLE claim_search;"
+                "CREATE TABLE old_claims AS SELECT entity_id, claim, refs FROM canon_claims;"
+                "DROP TABLE canon_claims;"
+                "ALTER TABLE old_claims RENAME TO canon_claims;"
+                "PRAGMA user_version = 3;"
+            )
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert [c["entity_id"] for c in sync.similar_claims(["storms"])] == [GOD_ID]
+            assert len(sync.query_claims(entity_id=GOD_ID)) == 3
+
+
 # ---------------------------------------------------------------------------
 # Advanced Query (Safety)
 # ---------------------------------------------------------------------------
@@ -383,6 +962,159 @@ class TestGetStats:
             sync.close()
 
 
+# ---------------------------------------------------------------------------
+# Query result cache
+# ---------------------------------------------------------------------------
+
+class TestQueryCache:
+    """Tests for the version-tagged query result cache."""
+
+    def test_repeat_queries_hit(self, temp_world):
+        """Identical queries are served from the cache as private copies."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            first = sync.query_by_type("gods")
+            first[0]["name"] = "Mutated"
+            again = sync.query_by_type("gods")
+            assert again[0]["name"] == "Thorin Stormkeeper"
+            stats = sync.get_stats()["query_cache"]
+            assert stats["hits"] >= 1 and stats["entries"] >= 1
+            assert 0 < stats["hit_rate"] <= 1
+
+    def test_writes_invalidate_only_changed_tables(self, temp_world):
+        """An edit that keeps claims and links keeps their queries cached."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            entity = _make_sample_entity("calm-0001", "Calm", "gods", "god-profile")
+            sync.sync_entity("calm-0001", entity)
+            sync.query_by_type("gods")
+            sync.query_claims(entity_id="calm-0001")
+
+            entity["description"] = "A quiet deity"
+            sync.sync_entity("calm-0001", entity)
+            hits = sync.query_cache_stats()["hits"]
+            sync.query_claims(entity_id="calm-0001")
+            assert sync.query_cache_stats()["hits"] == hits + 1
+            gods = sync.query_by_type("gods")
+            assert sync.query_cache_stats()["hits"] == hits + 1
+            assert json.loads(gods[0]["data"])["description"] == "A quiet deity"
+
+            entity["canon_claims"] = [{"claim": "Calm is quiet", "references": []}]
+            sync.sync_entity("calm-0001", entity)
+            assert [c["claim"] for c in sync.query_claims(entity_id="calm-0001")] == ["Calm is quiet"]
+
+    def test_other_connection_writes_invalidate(self, temp_world):
+        """Writes made through another engine (e.g. a hook process) are seen."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            assert sync.get_stats()["total_entities"] == 2
+            with SQLiteSyncEngine(temp_world) as other:
+                other.remove_entity(GOD_ID)
+            assert sync.get_stats()["total_entities"] == 1
+            assert sync.query_by_type("gods") == []
+
+    def test_configure_and_clear(self, temp_world):
+        """A zero-sized cache is bypassed; clearing drops entries."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            sync.query_by_step(7)
+            sync.clear_query_cache()
+            assert sync.query_cache_stats()["entries"] == 0
+            sync.configure_query_cache(max_entries=0)
+            sync.query_by_step(7)
+            sync.query_by_step(7)
+            assert sync.query_cache_stats()["entries"] == 0
+            sync.configure_query_cache(max_entries=1)
+            sync.query_by_step(7)
+            sync.query_by_status("draft")
+            stats = sync.query_cache_stats()
+            assert stats["entries"] == 1 and stats["evictions"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Maintenance
+# ---------------------------------------------------------------------------
+
+class TestMaintenance:
+    """Tests for run_maintenance (ANALYZE, FTS merge, WAL checkpoint)."""
+
+    @staticmethod
+    def _churn(sync, rounds=5):
+        """Rewrite a handful of entities several times, one commit each."""
+        for i in range(rounds):
+            for n in range(4):
+                entity = _make_sample_entity(f"churn-{n:04d}", f"Churn {n}", "gods", "god-profile")
+                entity["description"] = f"Revision {i}"
+                sync.sync_entity(f"churn-{n:04d}", entity)
+
+    def test_bounds_wal_and_segments(self, temp_world):
+        """A run truncates the WAL and merges each FTS index to one segment."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            self._churn(sync)
+            assert sync.writes_since_maintenance > 0
+            report = sync.run_maintenance(budget_seconds=10)
+
+            assert report["skipped"] == []
+            assert report["steps"][0] == "optimize" and report["steps"][-1] == "checkpoint"
+            assert report["before"]["wal_bytes"] > 0
+            assert report["after"]["wal_bytes"] == 0 == sync.wal_size()
+            assert sum(report["before"]["fts_segments"].values()) > 3
+            assert set(report["after"]["fts_segments"].values()) == {1}
+            assert set(report["after"]["probe_ms"]) == {"search", "claims", "names", "by_type"}
+            assert sync.writes_since_maintenance == 0
+            assert sync.last_maintenance is report
+            assert sync._conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()[0] == 1
+
+            # Maintenance rewrites no content, so searches are unchanged
+            assert [r["id"] for r in sync.search("Thorin")] == [GOD_ID]
+
+    def test_zero_budget_only_checkpoints(self, temp_world):
+        """Out of budget, every step but the checkpoint is skipped."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            report = sync.run_maintenance(budget_seconds=0)
+            assert report["steps"] == ["checkpoint"]
+            assert "optimize" in report["skipped"]
+            assert "merge:entity_search" in report["skipped"]
+
+    def test_missing_fts_index_is_skipped(self, temp_world):
+        """Builds without the trigram tokenizer have no name_search to merge."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            sync.full_sync()
+            sync._conn.execute("DROP TABLE name_search")
+            sync._conn.commit()
+            self._churn(sync, rounds=2)
+            report = sync.run_maintenance(budget_seconds=10)
+            assert "merge:entity_search" in report["steps"]
+            assert not any("name_search" in step for step in report["steps"] + report["skipped"])
+            assert "name_search" not in report["after"]["fts_segments"]
+            assert "names" not in report["after"]["probe_ms"]
+
+    def test_incremental_vacuum_frees_pages(self, temp_world):
+        """New databases use incremental auto-vacuum, so free pages are released."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            assert sync._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            for n in range(50):
+                entity = _make_sample_entity(f"bulky-{n:04d}", f"Bulky {n}", "gods", "god-profile")
+                entity["description"] = "storm " * 2000
+                sync.sync_entity(f"bulky-{n:04d}", entity)
+            for n in range(50):
+                sync.remove_entity(f"bulky-{n:04d}")
+            report = sync.run_maintenance(budget_seconds=10)
+            assert "incremental_vacuum" in report["steps"]
+            assert report["after"]["freelist_pages"] < report["before"]["freelist_pages"]
+
+    def test_commits_record_write_activity(self, temp_world):
+        """Commits update the idle clock the scheduler reads."""
+        with SQLiteSyncEngine(temp_world) as sync:
+            before = sync.last_write_at
+            sync.full_sync()
+            assert sync.writes_since_maintenance >= 1
+            assert sync.last_write_at >= before
+
+
 # ---------------------------------------------------------------------------
 # Context Manager
 # ---------------------------------------------------------------------------
@@ -396,3 +1128,40 @@ class TestContextManager:
             sync.full_sync()
             stats = sync.get_stats()
             assert stats["total_entities"] >= 1
+
+
+# ---------------------------------------------------------------------------
+# Batch sync
+# ---------------------------------------------------------------------------
+
+class TestSyncEntities:
+    """Tests for SQLiteSyncEngine.sync_entities."""
+
+    def test_sync_entities_inserts_batch(self, temp_world):
+        """sync_entities should insert every entity of the batch."""
+        sync = SQLiteSyncEngine(temp_world)
+        try:
+            sync.full_sync()
+            batch = {
+                f"batch-god-{i:04d}": _make_sample_entity(
+                    f"batch-god-{i:04d}", f"Batch God {i}", "gods", "god-profile",
+                )
+                for i in range(3)
+            }
+            assert sync.sync_entities(batch) == 3
+            assert sync.get_stats()["by_type"]["gods"] == 4
+            assert len(sync.search("Batch")) == 3
+        finally:
+            sync.close()
+
+    def test_sync_entities_replaces_existing(self, temp_world):
+        """Re-syncing an entity in a batch should not duplicate its rows."""
+        sync = SQLiteSyncEngine(temp_world)
+        try:
+            entity = _make_sample_entity("dup-0001", "Dup", "gods", "god-profile")
+            sync.sync_entities({"dup-0001": entity})
+            sync.sync_entities({"dup-0001": entity})
+            claims = sync.query_claims(entity_id="dup-0001")
+            assert len(claims) == 2
+        finally:
+            sync.close()